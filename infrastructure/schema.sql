@@ -132,6 +132,105 @@ COMMENT ON TABLE legiscan_cache IS 'LegiScan API response cache - replaces data/
 COMMENT ON COLUMN legiscan_cache.response_data IS 'Full LegiScan getBill API response';
 COMMENT ON COLUMN legiscan_cache.expires_at IS 'Optional cache expiration timestamp';
 
+-- ============================================================================
+-- Table: bill_text_cache
+-- Extracted bill text, gzip-compressed (replaces data/cache/legiscan_cache/bill_text_*.txt)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS bill_text_cache (
+    doc_id VARCHAR(50) PRIMARY KEY,  -- LegiScan document ID
+    content_hash CHAR(64) NOT NULL,  -- SHA-256 of the extracted text
+    extractor_version VARCHAR(50) NOT NULL,  -- Version of the extractor engine (src/text_extraction.py)
+    text_gzip BYTEA NOT NULL,
+    text_length INT,
+    cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Schema 1.4 stored extractor_version as INT
+ALTER TABLE bill_text_cache ALTER COLUMN extractor_version TYPE VARCHAR(50) USING extractor_version::text;
+
+COMMENT ON TABLE bill_text_cache IS 'Extracted bill text cache - avoids re-downloading and re-parsing documents';
+COMMENT ON COLUMN bill_text_cache.extractor_version IS 'Rows from other extractor versions are ignored and overwritten';
+
+-- ============================================================================
+-- Tables: bill_documents, bill_document_refs
+-- Raw LegiScan bill documents (PDF, HTML, ...), gzip-compressed and stored once
+-- per content hash (replaces data/cache/documents/)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS bill_documents (
+    content_hash CHAR(64) PRIMARY KEY,  -- SHA-256 of the decoded document
+    document_gzip BYTEA NOT NULL,
+    size_bytes BIGINT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS bill_document_refs (
+    doc_id VARCHAR(50) PRIMARY KEY,  -- LegiScan document ID
+    content_hash CHAR(64) NOT NULL REFERENCES bill_documents(content_hash),
+    mime_type VARCHAR(100),
+    cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_bill_document_refs_hash ON bill_document_refs(content_hash);
+
+COMMENT ON TABLE bill_documents IS 'Raw bill document cache - lets text be re-extracted without calling LegiScan';
+COMMENT ON TABLE bill_document_refs IS 'Maps LegiScan doc_id to the cached document content';
+
+-- ============================================================================
+-- Table: analysis_checkpoints
+-- Append-only journal of finished bills for resumable analysis runs
+-- (replaces data/cache/checkpoints/*.jsonl)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS analysis_checkpoints (
+    id BIGSERIAL PRIMARY KEY,
+    run_id VARCHAR(255) NOT NULL,
+    record JSONB NOT NULL,  -- bill_id, input_hash and analysis for one bill
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_checkpoints_run_id ON analysis_checkpoints(run_id);
+
+COMMENT ON TABLE analysis_checkpoints IS 'Per-bill checkpoint journal used by --resume';
+
+-- ============================================================================
+-- Table: dirty_bills
+-- Bills whose LegiScan change_hash changed since they were last filtered
+-- (replaces data/cache/sync/*_dirty.json)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS dirty_bills (
+    source VARCHAR(255) NOT NULL,  -- Raw data identifier, e.g. ct_bills_2025
+    bill_id BIGINT NOT NULL,
+    marked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, bill_id)
+);
+
+COMMENT ON TABLE dirty_bills IS 'Bills changed by incremental sync, pending re-filter and re-analysis';
+
+-- ============================================================================
+-- Table: llm_response_cache
+-- Content-addressed LLM completion cache (see src/llm_cache.py)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key CHAR(64) PRIMARY KEY,  -- SHA-256 of provider/model, params and messages
+    provider VARCHAR(255),
+    response TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP  -- Optional TTL
+);
+
+-- Indexes for LRU and TTL eviction
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_accessed ON llm_response_cache(last_accessed_at);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires ON llm_response_cache(expires_at);
+
+COMMENT ON TABLE llm_response_cache IS 'LLM completion cache keyed by prompt hash';
+COMMENT ON COLUMN llm_response_cache.last_accessed_at IS 'Updated on every hit; used for LRU size eviction';
+
 -- ============================================================================
 -- Table: pipeline_runs
 -- Tracks pipeline execution history and status
@@ -268,12 +367,18 @@ CREATE OR REPLACE FUNCTION clean_expired_cache()
 RETURNS INTEGER AS $$
 DECLARE
     deleted_count INTEGER;
+    llm_deleted_count INTEGER;
 BEGIN
     DELETE FROM legiscan_cache
     WHERE expires_at IS NOT NULL AND expires_at < NOW();
 
     GET DIAGNOSTICS deleted_count = ROW_COUNT;
-    RETURN deleted_count;
+
+    DELETE FROM llm_response_cache
+    WHERE expires_at IS NOT NULL AND expires_at < NOW();
+
+    GET DIAGNOSTICS llm_deleted_count = ROW_COUNT;
+    RETURN deleted_count + llm_deleted_count;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -387,4 +492,28 @@ INSERT INTO schema_version (version, description)
 VALUES ('1.0', 'Initial schema for LegiScan Bill Analysis Pipeline')
 ON CONFLICT (version) DO NOTHING;
 
+INSERT INTO schema_version (version, description)
+VALUES ('1.1', 'Add llm_response_cache table')
+ON CONFLICT (version) DO NOTHING;
+
+INSERT INTO schema_version (version, description)
+VALUES ('1.2', 'Add dirty_bills table for incremental sync')
+ON CONFLICT (version) DO NOTHING;
+
+INSERT INTO schema_version (version, description)
+VALUES ('1.3', 'Add analysis_checkpoints table for resumable runs')
+ON CONFLICT (version) DO NOTHING;
+
+INSERT INTO schema_version (version, description)
+VALUES ('1.4', 'Add bill_text_cache table')
+ON CONFLICT (version) DO NOTHING;
+
+INSERT INTO schema_version (version, description)
+VALUES ('1.5', 'Store per-engine extractor versions in bill_text_cache')
+ON CONFLICT (version) DO NOTHING;
+
+INSERT INTO schema_version (version, description)
+VALUES ('1.6', 'Add bill_documents and bill_document_refs tables')
+ON CONFLICT (version) DO NOTHING;
+
 COMMENT ON TABLE schema_version IS 'Tracks database schema versions and migration history';
@@ -136,6 +136,28 @@ def cmd_analyze(args):
     return 1
 
 
+def cmd_reextract(args):
+    """Re-extract cached bill documents with the current extractors"""
+    if not check_docker():
+        return 1
+    check_containers()
+
+    info("Re-extracting bill text from cached documents...")
+    cmd = 'python scripts/reextract_bill_text.py'
+    if args.workers:
+        cmd += f' --workers {args.workers}'
+    if args.dry_run:
+        info("DRY RUN: nothing will be written")
+        cmd += ' --dry-run'
+    if args.diff_lines is not None:
+        cmd += f' --diff-lines {args.diff_lines}'
+
+    if run_docker_cmd(cmd):
+        success("Bill text cache re-extracted")
+        return 0
+    return 1
+
+
 def cmd_run(args):
     """Run full pipeline"""
     info("Running full pipeline...")
@@ -197,28 +219,26 @@ def cmd_results(args):
     info("Analysis Results Summary:")
 
     script = """
-import json, sys
-from pathlib import Path
+import sys
+from src.storage_provider import StorageProviderFactory
 
-analyzed_dir = Path('data/analyzed')
-if not analyzed_dir.exists():
+# Runs in either result format (JSON or streamed JSONL)
+storage_provider = StorageProviderFactory.create_from_env()
+run_ids = storage_provider.list_analysis_results()
+if not run_ids:
     print('No analysis results found')
     sys.exit(0)
 
-files = list(analyzed_dir.glob('*_relevant.json'))
-if not files:
-    print('No relevant bills found')
-    sys.exit(0)
-
 total = 0
-for f in files:
-    with open(f) as fh:
-        bills = json.load(fh)
-        count = len(bills)
-        total += count
-        print(f'{f.name}: {count} relevant bills')
-
-print(f'\\nTotal: {total} relevant bills across all files')
+for run_id in run_ids:
+    count = sum(
+        1 for result in storage_provider.iter_analysis_results(run_id)
+        if result.get('analysis', {}).get('is_relevant', False)
+    )
+    total += count
+    print(f'{run_id}: {count} relevant bills')
+
+print(f'\\nTotal: {total} relevant bills across all runs')
 """
 
     run_docker_cmd(['python', '-c', script])
@@ -232,29 +252,31 @@ def cmd_view(args):
     check_containers()
 
     script = """
-import json
-from pathlib import Path
-
-f = Path('data/analyzed/analysis_results_relevant.json')
-if not f.exists():
+from src.storage_provider import StorageProviderFactory
+
+storage_provider = StorageProviderFactory.create_from_env()
+try:
+    bills = [
+        result for result in storage_provider.iter_analysis_results('analysis_results')
+        if result.get('analysis', {}).get('is_relevant', False)
+    ]
+except FileNotFoundError:
     print('No analysis results found. Run: python pipeline.py analyze')
     exit(1)
 
-with open(f) as fh:
-    bills = json.load(fh)
-    print(f'Total relevant bills: {len(bills)}\\n')
-
-    if bills:
-        for i, bill in enumerate(bills[:3], 1):
-            print(f'Bill {i}:')
-            print(f'  Number: {bill["bill"]["bill_number"]}')
-            print(f'  Title: {bill["bill"]["title"][:80]}...')
-            print(f'  Categories: {bill["analysis"]["categories"]}')
-            print(f'  Status: {bill["analysis"].get("bill_status", "Unknown")}')
-            print()
-
-        if len(bills) > 3:
-            print(f'... and {len(bills) - 3} more bills')
+print(f'Total relevant bills: {len(bills)}\\n')
+
+if bills:
+    for i, bill in enumerate(bills[:3], 1):
+        print(f'Bill {i}:')
+        print(f'  Number: {bill["bill"]["bill_number"]}')
+        print(f'  Title: {bill["bill"]["title"][:80]}...')
+        print(f'  Categories: {bill["analysis"]["categories"]}')
+        print(f'  Status: {bill["analysis"].get("bill_status", "Unknown")}')
+        print()
+
+    if len(bills) > 3:
+        print(f'... and {len(bills) - 3} more bills')
 """
 
     run_docker_cmd(['python', '-c', script])
@@ -337,6 +359,7 @@ Examples:
   python pipeline.py analyze                  # Run analysis pass
   python pipeline.py run                      # Run full pipeline
   python pipeline.py run --test               # Quick test (5 bills)
+  python pipeline.py reextract --dry-run      # Preview re-extracted bill text
   python pipeline.py results                  # View results
   python pipeline.py shell                    # Open container shell
         '''
@@ -368,6 +391,12 @@ Examples:
     run_parser.add_argument('--state', help='State code (default: CT)')
     run_parser.add_argument('--year', type=int, help='Year (default: 2025)')
 
+    # Re-extract command
+    reextract_parser = subparsers.add_parser('reextract', help='Re-extract cached bill documents (no API calls)')
+    reextract_parser.add_argument('--workers', type=int, help='Parallel extraction workers (default: CPU count)')
+    reextract_parser.add_argument('--dry-run', action='store_true', help='Show changes as diffs without writing')
+    reextract_parser.add_argument('--diff-lines', type=int, help='Diff lines per document in dry run (default: 20)')
+
     # Other commands
     subparsers.add_parser('shell', help='Open bash shell in container')
     subparsers.add_parser('logs', help='Show container logs')
@@ -392,6 +421,7 @@ Examples:
         'filter': cmd_filter,
         'analyze': cmd_analyze,
         'run': cmd_run,
+        'reextract': cmd_reextract,
         'shell': cmd_shell,
         'logs': cmd_logs,
         'status': cmd_status,
@@ -7,6 +7,11 @@ This script reads analyzed JSON files and provides statistics including:
 - Highest similarity score with bill ID
 - Lowest similarity score with bill ID
 - Average similarity score
+
+Besides a *_relevant.json file, it accepts an analysis run ID (or a
+streamed analysis_*.jsonl file), read through the storage provider with
+iter_analysis_results so runs saved with result_format 'jsonl' work too;
+for a run, the relevant bills are counted.
 """
 
 import json
@@ -14,29 +19,71 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def analyze_bill_file(file_path: str) -> Optional[Dict]:
+from src.result_stream import JSONL_SUFFIXES
+from src.storage_provider import StorageProviderFactory
+
+
+def load_analyzed_bills(file_path: str) -> Optional[List[Dict]]:
     """
-    Analyze a single JSON file containing analyzed bills.
+    Load analyzed bills from a JSON file or a stored analysis run.
 
     Args:
-        file_path: Path to the JSON file
+        file_path: Path to a *_relevant.json file, or an analysis run ID / JSONL file
 
     Returns:
-        Dictionary containing statistics, or None if file couldn't be processed
+        List of {"bill": {...}, "analysis": {...}} records, or None if they couldn't be loaded
     """
+    if file_path.endswith('.json'):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            print(f"Error: File not found: {file_path}")
+            return None
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON in {file_path}: {e}")
+            return None
+
+        # Saved with stats: {"summary": ..., "timing_stats": ..., "results": [...]}
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            data = data['results']
+        if not isinstance(data, list):
+            print(f"Error: Expected a list of bills, got {type(data)}")
+            return None
+        return data
+
+    run_id = Path(file_path).name
+    for suffix in sorted(JSONL_SUFFIXES.values(), key=len, reverse=True):
+        if run_id.endswith(suffix):
+            run_id = run_id[:-len(suffix)]
+            break
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        storage_provider = StorageProviderFactory.create_from_env()
+        return [
+            result for result in storage_provider.iter_analysis_results(run_id)
+            if result.get('analysis', {}).get('is_relevant', False)
+        ]
     except FileNotFoundError:
-        print(f"Error: File not found: {file_path}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in {file_path}: {e}")
+        print(f"Error: Analysis results not found: {run_id}")
         return None
 
-    if not isinstance(data, list):
-        print(f"Error: Expected a list of bills, got {type(data)}")
+
+def analyze_bill_file(file_path: str) -> Optional[Dict]:
+    """
+    Analyze a single JSON file (or analysis run) containing analyzed bills.
+
+    Args:
+        file_path: Path to the JSON file, or an analysis run ID / JSONL file
+
+    Returns:
+        Dictionary containing statistics, or None if file couldn't be processed
+    """
+    data = load_analyzed_bills(file_path)
+    if data is None:
         return None
 
     if len(data) == 0:
@@ -144,15 +191,16 @@ def print_statistics(stats: Dict) -> None:
 def main():
     """Main function to run the analysis."""
     if len(sys.argv) < 2:
-        print("Usage: python analyze_bill_stats.py <path_to_analyzed_json_file>")
+        print("Usage: python analyze_bill_stats.py <path_to_analyzed_json_file | analysis_run_id>")
         print("\nExample:")
         print("  python analyze_bill_stats.py ../data/analyzed/analysis_alan_ct_bills_2025_relevant.json")
+        print("  python analyze_bill_stats.py analysis_alan_ct_bills_2025")
         sys.exit(1)
 
     file_path = sys.argv[1]
 
     # Check if file exists
-    if not Path(file_path).exists():
+    if file_path.endswith('.json') and not Path(file_path).exists():
         print(f"Error: File does not exist: {file_path}")
         sys.exit(1)
 
@@ -175,7 +223,7 @@ def main():
     stats_dir.mkdir(parents=True, exist_ok=True)
 
     # Save stats file
-    output_file = stats_dir / f"{Path(file_path).stem}_stats.json"
+    output_file = stats_dir / f"{Path(file_path).name.split('.json')[0]}_stats.json"
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(stats, f, indent=2)
 
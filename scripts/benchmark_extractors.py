@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark bill text extractors.
+
+Times every installed extractor for each document format on sample
+documents (PDF, HTML, DOCX or plain text files) and reports throughput
+and output size, to choose the engine order in src/text_extraction.py or
+to pin an engine with analysis_pass.extractors.
+
+Usage:
+    python scripts/benchmark_extractors.py bill1.pdf bill2.pdf bill3.html
+    python scripts/benchmark_extractors.py --repeat 5 data/samples/*.pdf
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.text_extraction import EXTRACTORS
+
+# File extension -> document format
+FORMATS_BY_SUFFIX = {
+    '.pdf': 'pdf',
+    '.html': 'html',
+    '.htm': 'html',
+    '.docx': 'docx',
+    '.doc': 'docx',
+    '.txt': 'text'
+}
+
+
+def benchmark(extractor, documents, repeat):
+    """
+    Time an extractor over documents
+
+    Args:
+        extractor: DocumentExtractor instance
+        documents: List of document bytes
+        repeat: Number of passes over the documents
+
+    Returns:
+        (best pass seconds, characters extracted, failures)
+    """
+    best = None
+    chars = 0
+    failures = 0
+
+    for _ in range(repeat):
+        chars = 0
+        failures = 0
+        start = time.perf_counter()
+        for data in documents:
+            try:
+                text = extractor.extract(data)
+            except Exception:
+                text = None
+            if text:
+                chars += len(text)
+            else:
+                failures += 1
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, chars, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bill text extractors')
+    parser.add_argument('files', nargs='+', help='Sample documents (.pdf, .html, .docx, .txt)')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes per extractor; the best is reported (default: 3)')
+    args = parser.parse_args()
+
+    # Extractor failures are reported in the table, not logged
+    logging.disable(logging.CRITICAL)
+
+    documents = {}
+    for file_path in args.files:
+        path = Path(file_path)
+        doc_format = FORMATS_BY_SUFFIX.get(path.suffix.lower())
+        if not doc_format:
+            print(f"Skipping {path} (unknown file type)")
+            continue
+        documents.setdefault(doc_format, []).append(path.read_bytes())
+
+    for doc_format, docs in documents.items():
+        total_mb = sum(len(data) for data in docs) / (1024 * 1024)
+        print(f"\n{doc_format.upper()}: {len(docs)} document(s), {total_mb:.2f} MB")
+        print(f"  {'engine':<14} {'seconds':>9} {'MB/s':>8} {'chars':>10} {'failed':>7}")
+
+        for name, extractor_class in EXTRACTORS.get(doc_format, {}).items():
+            if not extractor_class.is_available():
+                print(f"  {name:<14} (not installed: pip install {extractor_class.package or extractor_class.requires})")
+                continue
+
+            seconds, chars, failures = benchmark(extractor_class(), docs, args.repeat)
+            throughput = total_mb / seconds if seconds else float('inf')
+            print(f"  {name:<14} {seconds:>9.3f} {throughput:>8.2f} {chars:>10} {failures:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark prompt serialization formats.
+
+Serializes the bills of a stored filter run in each prompt format (see
+src/prompt_format.py) and reports the input tokens per filter batch, to
+choose filter_pass.prompt_format.
+
+With --sample, a sample of the bills (half of them from the relevant
+ones) is also re-filtered in every format and the decisions are compared
+with the stored results, to check a compact format doesn't change them.
+This makes LLM calls and needs PORTKEY_API_KEY.
+
+Usage:
+    python scripts/benchmark_prompt_formats.py ct_bills_2025
+    python scripts/benchmark_prompt_formats.py ct_bills_2025 --sample 40
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.run_filter_pass import DEFAULT_BATCH_SIZE, DEFAULT_TIMEOUT, load_config, parse_bills_data
+from src.ai_filter_pass import AIFilterPass
+from src.prompt_format import PROMPT_FORMATS, format_items
+from src.storage_provider import StorageProviderFactory
+from src.token_budget import TokenEstimator
+
+
+def load_labeled_bills(storage_provider, run_id):
+    """
+    Load the bills of a filter run with their stored decisions
+
+    Bills are read from the run's source raw data, as the filter pass sends
+    them; if it is no longer available, the stored result records
+    (bill_number, title, url) are used instead.
+
+    Returns:
+        (list of bills, dict of bill_number -> relevant)
+    """
+    results = storage_provider.load_filtered_results(run_id)
+    labels = {}
+    for relevant, key in [(True, 'relevant_bills'), (False, 'not_relevant_bills')]:
+        for record in results.get(key, []):
+            labels.setdefault(record['bill_number'], relevant)
+
+    source_file = results.get('summary', {}).get('source_file', run_id)
+    try:
+        bills = parse_bills_data(storage_provider.load_raw_data(source_file))
+        bills = [
+            {k: v for k, v in bill.items() if k != 'change_hash'}
+            for bill in bills if bill.get('bill_number') in labels
+        ]
+    except FileNotFoundError:
+        print(f"Raw data {source_file} not found, using the stored result records")
+        bills = []
+
+    if not bills:
+        bills = [
+            {k: record.get(k) for k in ('bill_number', 'title', 'url')}
+            for key in ('relevant_bills', 'not_relevant_bills')
+            for record in results.get(key, [])
+        ]
+
+    return bills, labels
+
+
+def token_report(bills, batch_size, model):
+    """
+    Count input tokens of the bills per format, in batch_size batches
+
+    Returns:
+        Dict of format -> total tokens
+    """
+    estimator = TokenEstimator(model)
+    batches = [bills[i:i + batch_size] for i in range(0, len(bills), batch_size)]
+
+    totals = {}
+    for prompt_format in PROMPT_FORMATS:
+        totals[prompt_format] = sum(estimator.count(format_items(batch, prompt_format)) for batch in batches)
+
+    baseline = totals['json']
+    print(f"\n{len(bills)} bills in {len(batches)} batches of up to {batch_size} "
+          f"({'tiktoken' if estimator.exact else 'estimated'} tokens)\n")
+    print(f"{'Format':<10} {'Tokens':>10} {'Per bill':>10} {'Savings':>9}")
+    print("-" * 42)
+    for prompt_format, tokens in totals.items():
+        savings = 1 - tokens / baseline if baseline else 0.0
+        print(f"{prompt_format:<10} {tokens:>10} {tokens / max(1, len(bills)):>10.1f} {savings:>8.1%}")
+
+    return totals
+
+
+def accuracy_report(config, api_key, bills, labels, sample_size, batch_size, seed):
+    """
+    Re-filter a sample of bills in each format and compare with the stored decisions
+
+    Returns:
+        Dict of format -> {agreement, relevant_recall, unresolved, seconds}
+    """
+    rng = random.Random(seed)
+    relevant = [bill for bill in bills if labels.get(bill['bill_number'])]
+    not_relevant = [bill for bill in bills if not labels.get(bill['bill_number'])]
+    sample = rng.sample(relevant, min(len(relevant), sample_size // 2))
+    sample += rng.sample(not_relevant, min(len(not_relevant), sample_size - len(sample)))
+    rng.shuffle(sample)
+
+    timeout = config.get('filter_pass', {}).get('timeout', DEFAULT_TIMEOUT)
+
+    print(f"\nRe-filtering {len(sample)} bills ({sum(labels[b['bill_number']] for b in sample)} "
+          f"stored as relevant) in each format\n")
+    print(f"{'Format':<10} {'Agreement':>10} {'Recall':>8} {'Unresolved':>11} {'Seconds':>8}")
+    print("-" * 51)
+
+    report = {}
+    for prompt_format in PROMPT_FORMATS:
+        filter_pass = AIFilterPass(api_key=api_key, timeout=timeout, config=config, prompt_format=prompt_format)
+
+        start = time.perf_counter()
+        decisions = {}
+        unresolved = 0
+        for i in range(0, len(sample), batch_size):
+            outcome = filter_pass.filter_items(sample[i:i + batch_size])
+            decisions.update({result['bill_identifier']: result['relevant'] for result in outcome['results']})
+            unresolved += len(outcome.get('unresolved', []))
+        seconds = time.perf_counter() - start
+
+        decided = [bill['bill_number'] for bill in sample if bill['bill_number'] in decisions]
+        agreement = sum(decisions[n] == labels[n] for n in decided) / max(1, len(decided))
+        stored_relevant = [n for n in decided if labels[n]]
+        recall = sum(decisions[n] for n in stored_relevant) / max(1, len(stored_relevant))
+
+        report[prompt_format] = {
+            'agreement': agreement, 'relevant_recall': recall, 'unresolved': unresolved, 'seconds': seconds
+        }
+        print(f"{prompt_format:<10} {agreement:>10.1%} {recall:>8.1%} {unresolved:>11} {seconds:>8.1f}")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare prompt formats on stored filter results')
+    parser.add_argument('run_id', nargs='?', default='ct_bills_2025',
+                        help='Filter results identifier (default: ct_bills_2025)')
+    parser.add_argument('--sample', type=int, default=0,
+                        help='Re-filter this many bills per format and compare decisions (makes LLM calls)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the sample (default: 0)')
+    args = parser.parse_args()
+
+    config = load_config()
+    batch_size = config.get('filter_pass', {}).get('batch_size', DEFAULT_BATCH_SIZE)
+    model = config.get('llm', {}).get('model', 'gpt-4o-mini')
+
+    storage_provider = StorageProviderFactory.create_from_env(config)
+    try:
+        bills, labels = load_labeled_bills(storage_provider, args.run_id)
+    except FileNotFoundError:
+        print(f"ERROR: filter results for {args.run_id} not found")
+        print(f"Available results: {storage_provider.list_filtered_results()}")
+        return 1
+
+    if not bills:
+        print(f"ERROR: no bills in filter results for {args.run_id}")
+        return 1
+
+    token_report(bills, batch_size, model)
+
+    if args.sample:
+        api_key = os.getenv('PORTKEY_API_KEY')
+        if not api_key:
+            print("\nERROR: PORTKEY_API_KEY environment variable not set (needed for --sample)")
+            return 1
+        accuracy_report(config, api_key, bills, labels, args.sample, batch_size, args.seed)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
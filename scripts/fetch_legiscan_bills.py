@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 """
 LegiScan API Bill Fetcher
-Fetches bills from Connecticut using getSearch API with title and description.
+Fetches bills from one or more states using getSearch API with title and description.
+
+Page 1 of each search reveals the total page count; the remaining pages are
+then fetched concurrently through a bounded worker pool with retry.
+
+With --incremental, the session master lists (getMasterListRaw) are compared
+against the change_hash values already stored, and only stored bills that
+changed are re-fetched with getBill. Those bills are marked dirty so the next
+`run_filter_pass.py --dirty-only` re-filters just them. The master list covers
+every bill in the session, so bills not already stored are left out; a full
+fetch (without --incremental) picks up new bills matching the search.
 """
 
 import requests
 import json
 import os
 import sys
+import time
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 # Add parent directory to path for imports
 SCRIPT_DIR = Path(__file__).parent
@@ -24,19 +37,39 @@ STATE_CODE = "CT"
 YEAR = 2025
 OUTPUT_FILE = "ct_bills_2025.json"
 SAMPLES_FILE = "test_samples.txt"
+MAX_PAGES = 100  # Safety limit per state/year
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 3
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# One keep-alive session per worker thread
+_thread_local = threading.local()
+
 
+def _get_session() -> requests.Session:
+    """Get the calling thread's HTTP session"""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
 
-def make_api_call(api_key: str, operation: str, **params) -> Dict:
+
+def make_api_call(api_key: str, operation: str, max_retries: int = DEFAULT_RETRIES, **params) -> Dict:
     """
     Make a call to the LegiScan API.
 
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    exponential backoff (1s, 2s, 4s, ...).
+
     Args:
         api_key: LegiScan API key
         operation: API operation name
+        max_retries: Number of retries after the first attempt
         **params: Additional parameters for the API call
 
     Returns:
-        API response as dictionary
+        API response as dictionary (empty on failure)
     """
     params_dict = {
         'key': api_key,
@@ -44,16 +77,32 @@ def make_api_call(api_key: str, operation: str, **params) -> Dict:
         **params
     }
 
-    try:
-        response = requests.get(BASE_URL, params=params_dict, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"API Error: {e}")
-        return {}
-
-
-def search_bills(api_key: str, state: str = STATE_CODE, year: int = YEAR, page: int = 1) -> Dict:
+    for attempt in range(max_retries + 1):
+        try:
+            response = _get_session().get(BASE_URL, params=params_dict, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            status = getattr(e.response, 'status_code', None)
+            retryable = status is None or status in RETRYABLE_STATUS_CODES
+            if not retryable or attempt == max_retries:
+                print(f"API Error: {e}")
+                return {}
+
+            delay = 2 ** attempt
+            print(f"API Error: {e} - retrying in {delay}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+    return {}
+
+
+def search_bills(
+    api_key: str,
+    state: str = STATE_CODE,
+    year: int = YEAR,
+    page: int = 1,
+    max_retries: int = DEFAULT_RETRIES
+) -> Dict:
     """
     Search for bills using getSearch API.
 
@@ -62,6 +111,7 @@ def search_bills(api_key: str, state: str = STATE_CODE, year: int = YEAR, page:
         state: State code (e.g., 'CT')
         year: Year to search
         page: Page number for pagination
+        max_retries: Number of retries for failed requests
 
     Returns:
         Search results with bill summaries
@@ -72,6 +122,7 @@ def search_bills(api_key: str, state: str = STATE_CODE, year: int = YEAR, page:
     result = make_api_call(
         api_key,
         'getSearch',
+        max_retries=max_retries,
         state=state,
         year=year,
         page=page,
@@ -81,6 +132,116 @@ def search_bills(api_key: str, state: str = STATE_CODE, year: int = YEAR, page:
     return result
 
 
+def parse_search_page(result: Dict, page: int) -> Tuple[List[Dict], int]:
+    """
+    Extract bills and the total page count from a getSearch response.
+
+    Args:
+        result: getSearch API response
+        page: Page number that was requested
+
+    Returns:
+        Tuple of (bills on this page, total pages)
+    """
+    searchresult = result.get('searchresult', {})
+
+    # LegiScan API returns bills in numbered keys (0, 1, 2, ...), not in a 'results' array
+    # Extract all numeric keys, skipping non-numeric keys like 'summary', 'page', etc.
+    bills = [
+        extract_bill_data(value)
+        for key, value in searchresult.items()
+        if key.isdigit() and isinstance(value, dict)
+    ]
+
+    # The 'summary' key contains pagination info
+    total_pages = page
+    summary_info = searchresult.get('summary', {})
+    if isinstance(summary_info, dict):
+        # The page field is a string like "1 of 30"
+        page_str = summary_info.get('page', f'{page} of 1')
+        if ' of ' in str(page_str):
+            total_pages = int(str(page_str).split(' of ')[1])
+        else:
+            total_pages = int(summary_info.get('page_total', 1))
+
+    return bills, total_pages
+
+
+def fetch_all_bills(
+    api_key: str,
+    targets: List[Tuple[str, int]],
+    workers: int = DEFAULT_WORKERS,
+    max_retries: int = DEFAULT_RETRIES,
+    max_pages: int = MAX_PAGES
+) -> Dict[Tuple[str, int], List[Dict]]:
+    """
+    Fetch every search page for each (state, year) target.
+
+    Page 1 of every target is requested first; as soon as one reveals its
+    total page count, the remaining pages for that target are queued on
+    the same bounded pool. Results keep page order within each target.
+
+    Args:
+        api_key: LegiScan API key
+        targets: List of (state, year) pairs
+        workers: Maximum concurrent API requests
+        max_retries: Number of retries for failed requests
+        max_pages: Safety limit on pages per target
+
+    Returns:
+        Dict mapping (state, year) to its list of bills
+    """
+    pages: Dict[Tuple[str, int], Dict[int, List[Dict]]] = {target: {} for target in targets}
+    failed: List[Tuple[str, int, int]] = []
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='legiscan') as executor:
+        pending = {
+            executor.submit(search_bills, api_key, state, year, 1, max_retries): (state, year, 1)
+            for state, year in targets
+        }
+
+        while pending:
+            future = next(as_completed(pending))
+            state, year, page = pending.pop(future)
+            result = future.result()
+
+            if result.get('status') != 'OK':
+                alert = result.get('alert', {})
+                print(f"Search failed for {state} {year} page {page}: {alert.get('message', 'Unknown error')}")
+                failed.append((state, year, page))
+                continue
+
+            bills, total_pages = parse_search_page(result, page)
+            pages[(state, year)][page] = bills
+            print(f"Found {len(bills)} bills on {state} {year} page {page} of {total_pages}")
+
+            if page == 1 and bills:
+                if total_pages > max_pages:
+                    print(f"Warning: {state} {year} has {total_pages} pages, fetching first {max_pages}")
+                for next_page in range(2, min(total_pages, max_pages) + 1):
+                    future = executor.submit(search_bills, api_key, state, year, next_page, max_retries)
+                    pending[future] = (state, year, next_page)
+
+    if failed:
+        print(f"\nWarning: {len(failed)} page(s) failed after retries:")
+        for state, year, page in failed:
+            print(f"  {state} {year} page {page}")
+
+    all_bills = {}
+    for target, target_pages in pages.items():
+        # De-duplicate by bill_id in case results shifted between page requests
+        seen = set()
+        bills = []
+        for page in sorted(target_pages):
+            for bill in target_pages[page]:
+                if bill['bill_id'] not in seen:
+                    seen.add(bill['bill_id'])
+                    bills.append(bill)
+        all_bills[target] = bills
+
+    return all_bills
+
+
 def extract_bill_data(bill_summary: Dict) -> Dict:
     """
     Extract relevant fields from bill summary.
@@ -96,10 +257,167 @@ def extract_bill_data(bill_summary: Dict) -> Dict:
         'bill_number': bill_summary.get('bill_number', ''),
         'title': bill_summary.get('title', ''),
         'description': bill_summary.get('description', ''),
-        'url': bill_summary.get('url', '')
+        'url': bill_summary.get('url', ''),
+        'change_hash': bill_summary.get('change_hash', '')
     }
 
 
+def find_session_ids(api_key: str, state: str, year: int, max_retries: int = DEFAULT_RETRIES) -> List[int]:
+    """
+    Find the LegiScan sessions covering a year using getSessionList.
+
+    Args:
+        api_key: LegiScan API key
+        state: State code (e.g., 'CT')
+        year: Year to match against each session's year_start/year_end
+        max_retries: Number of retries for failed requests
+
+    Returns:
+        List of session IDs (regular and special sessions)
+    """
+    result = make_api_call(api_key, 'getSessionList', max_retries=max_retries, state=state)
+
+    if result.get('status') != 'OK':
+        alert = result.get('alert', {})
+        print(f"getSessionList failed for {state}: {alert.get('message', 'Unknown error')}")
+        return []
+
+    return [
+        session['session_id']
+        for session in result.get('sessions', [])
+        if session.get('year_start', 0) <= year <= session.get('year_end', 0)
+    ]
+
+
+def get_master_list_hashes(api_key: str, session_id: int, max_retries: int = DEFAULT_RETRIES) -> Dict[int, str]:
+    """
+    Get the current change_hash of every bill in a session using getMasterListRaw.
+
+    Args:
+        api_key: LegiScan API key
+        session_id: LegiScan session ID
+        max_retries: Number of retries for failed requests
+
+    Returns:
+        Dict mapping bill_id to change_hash
+    """
+    result = make_api_call(api_key, 'getMasterListRaw', max_retries=max_retries, id=session_id)
+
+    if result.get('status') != 'OK':
+        alert = result.get('alert', {})
+        print(f"getMasterListRaw failed for session {session_id}: {alert.get('message', 'Unknown error')}")
+        return {}
+
+    # Like getSearch, bills are in numbered keys; 'session' holds session info
+    return {
+        value['bill_id']: value.get('change_hash', '')
+        for key, value in result.get('masterlist', {}).items()
+        if key.isdigit() and isinstance(value, dict)
+    }
+
+
+def get_bill(api_key: str, bill_id: int, max_retries: int = DEFAULT_RETRIES) -> Dict:
+    """
+    Fetch full bill details using getBill.
+
+    Args:
+        api_key: LegiScan API key
+        bill_id: LegiScan bill ID
+        max_retries: Number of retries for failed requests
+
+    Returns:
+        Bill details (empty on failure)
+    """
+    result = make_api_call(api_key, 'getBill', max_retries=max_retries, id=bill_id)
+
+    if result.get('status') != 'OK':
+        alert = result.get('alert', {})
+        print(f"getBill failed for {bill_id}: {alert.get('message', 'Unknown error')}")
+        return {}
+
+    return result.get('bill', {})
+
+
+def sync_bills(
+    api_key: str,
+    state: str,
+    year: int,
+    storage_provider,
+    workers: int = DEFAULT_WORKERS,
+    max_retries: int = DEFAULT_RETRIES
+) -> Tuple[List[Dict], List[int]]:
+    """
+    Incrementally refresh stored bills for a state/year using change_hash.
+
+    Stored bills whose change_hash differs from the master list are
+    re-fetched with getBill, written to the LegiScan bill cache, updated in
+    place in the raw data and marked dirty. Bills in the master list but not
+    in the stored raw data are not added: the raw data holds the bills the
+    search matched, not the whole session. Bill text documents are cached by
+    doc_id, so only documents added to a bill's texts[] are downloaded again
+    later.
+
+    Args:
+        api_key: LegiScan API key
+        state: State code (e.g., 'CT')
+        year: Year
+        storage_provider: StorageProvider holding the previous raw data
+        workers: Maximum concurrent getBill requests
+        max_retries: Number of retries for failed requests
+
+    Returns:
+        Tuple of (updated bill list in stored order, sorted IDs of changed bills)
+    """
+    output_file = f"{state.lower()}_bills_{year}"
+
+    try:
+        stored = storage_provider.load_raw_data(output_file)
+    except FileNotFoundError:
+        stored = []
+
+    # Raw data may be a plain list or a LegiScan-style masterlist
+    if isinstance(stored, dict):
+        stored = stored.get('summary', {}).get('masterlist', stored.get('bills', []))
+
+    stored_bills = {bill['bill_id']: bill for bill in stored if isinstance(bill, dict) and bill.get('bill_id')}
+
+    current_hashes = {}
+    for session_id in find_session_ids(api_key, state, year, max_retries):
+        current_hashes.update(get_master_list_hashes(api_key, session_id, max_retries))
+
+    # Stored order, so the saved raw data only differs in the changed bills
+    changed_ids = [
+        bill_id for bill_id, bill in stored_bills.items()
+        if bill_id in current_hashes and bill.get('change_hash') != current_hashes[bill_id]
+    ]
+    untracked = sum(1 for bill_id in current_hashes if bill_id not in stored_bills)
+
+    print(f"{state} {year}: {len(current_hashes)} bills in master list, "
+          f"{len(stored_bills)} stored, {len(changed_ids)} changed")
+    if not stored_bills:
+        print(f"No stored bills for {state} {year}; run a full fetch (without --incremental) first")
+    elif untracked:
+        print(f"{untracked} master list bill(s) not in the stored data were skipped (run a full fetch for new bills)")
+
+    refreshed = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='legiscan') as executor:
+        futures = [(bill_id, executor.submit(get_bill, api_key, bill_id, max_retries)) for bill_id in changed_ids]
+
+        for bill_id, future in futures:
+            bill = future.result()
+            if not bill:
+                continue
+
+            storage_provider.save_bill_to_cache(bill_id, bill)
+            stored_bills[bill_id] = extract_bill_data(bill)
+            refreshed.append(bill_id)
+
+    if refreshed:
+        storage_provider.mark_bills_dirty(output_file, refreshed)
+
+    return list(stored_bills.values()), sorted(refreshed)
+
+
 def save_bills_json(bills: List[Dict], output_file: str, storage_provider=None):
     """
     Save bills to JSON file or storage provider.
@@ -143,22 +461,73 @@ def create_test_samples(bills: List[Dict], samples_file: str, num_samples: int =
     print(f"Created {len(bills_to_write)} bill entries in {samples_file}")
 
 
+def run_incremental_sync(api_key: str, targets: List[Tuple[str, int]], storage_provider, workers: int, max_retries: int):
+    """
+    Run sync_bills for each target and save the updated raw data.
+
+    Args:
+        api_key: LegiScan API key
+        targets: List of (state, year) pairs
+        storage_provider: StorageProvider instance
+        workers: Maximum concurrent getBill requests
+        max_retries: Number of retries for failed requests
+    """
+    total_changed = 0
+
+    for state, year in targets:
+        output_file = f"{state.lower()}_bills_{year}"
+
+        print("\n" + "=" * 80)
+        print(f"Incremental sync: {state} {year}")
+        print("=" * 80)
+
+        bills, changed_ids = sync_bills(api_key, state, year, storage_provider, workers, max_retries)
+        total_changed += len(changed_ids)
+
+        if changed_ids:
+            save_bills_json(bills, output_file, storage_provider)
+            print(f"Marked {len(changed_ids)} bill(s) dirty in {output_file}")
+        else:
+            print("No changes since last sync")
+
+    print("\n" + "=" * 80)
+    print("SYNC COMPLETE!")
+    print("=" * 80)
+    print(f"Changed bills: {total_changed}")
+    if total_changed:
+        print("\nNext steps:")
+        print(f"  1. Re-filter changed bills: python run_filter_pass.py <file> --dirty-only")
+        print(f"  2. Run analysis pass: python run_analysis_pass.py")
+
+
 def main():
     """
     Main execution function.
     """
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description='Fetch bills from LegiScan API')
-    parser.add_argument('--state', type=str, default=STATE_CODE,
-                        help=f'State code (default: {STATE_CODE})')
-    parser.add_argument('--year', type=int, default=YEAR,
-                        help=f'Year (default: {YEAR})')
+    parser.add_argument('--state', type=str, action='append',
+                        help=f'State code, repeatable (default: {STATE_CODE})')
+    parser.add_argument('--year', type=int, action='append',
+                        help=f'Year, repeatable; pairs with --state in order, '
+                             f'or a single --year applies to every state (default: {YEAR})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent API requests (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'Retries per failed request (default: {DEFAULT_RETRIES})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-fetch bills whose LegiScan change_hash changed, and mark them dirty')
     args = parser.parse_args()
 
-    state = args.state.upper()
-    year = args.year
-    output_file = f"{state.lower()}_bills_{year}"  # No .json extension, storage provider handles it
-    samples_file = f"{state.lower()}_test_samples.txt"
+    states = [state.upper() for state in (args.state or [STATE_CODE])]
+    years = args.year or [YEAR]
+
+    if len(years) == 1:
+        years = years * len(states)
+    elif len(years) != len(states):
+        parser.error('Provide one --year for all states, or one --year per --state')
+
+    targets = list(dict.fromkeys(zip(states, years)))
 
     # Get API key from environment
     api_key = os.getenv('LEGISCAN_API_KEY')
@@ -178,76 +547,43 @@ def main():
         storage_provider = None
 
     print("=" * 80)
-    print(f"LegiScan Bill Fetcher - {state} {year}")
+    print(f"LegiScan Bill Fetcher - {', '.join(f'{state} {year}' for state, year in targets)}")
+    print(f"Workers: {args.workers}, retries: {args.retries}")
     print("=" * 80)
 
-    # Fetch bills using getSearch with pagination
-    all_bills = []
-    page = 1
-    max_pages = 100  # Safety limit
-
-    while page <= max_pages:
-        result = search_bills(api_key, state, year, page)
-
-        if result.get('status') != 'OK':
-            alert = result.get('alert', {})
-            print(f"Search failed: {alert.get('message', 'Unknown error')}")
-            # Debug: print full result
-            print(f"Debug - Full API response: {json.dumps(result, indent=2)}")
-            break
-
-        searchresult = result.get('searchresult', {})
-
-        # LegiScan API returns bills in numbered keys (0, 1, 2, ...), not in a 'results' array
-        # Extract all numeric keys
-        bills_found = 0
-        for key, value in searchresult.items():
-            # Skip non-numeric keys like 'summary', 'page', etc.
-            if key.isdigit() and isinstance(value, dict):
-                bill_data = extract_bill_data(value)
-                all_bills.append(bill_data)
-                bills_found += 1
-
-        if bills_found == 0:
-            print("No more bills found.")
-            break
-
-        print(f"Found {bills_found} bills on page {page}")
-
-        # Check if there are more pages
-        # The 'summary' key contains pagination info
-        summary_info = searchresult.get('summary', {})
-        if isinstance(summary_info, dict):
-            # The page field is a string like "1 of 30"
-            page_str = summary_info.get('page', f'{page} of 1')
-            if ' of ' in str(page_str):
-                parts = str(page_str).split(' of ')
-                current_page = int(parts[0])
-                total_pages = int(parts[1])
-            else:
-                current_page = page
-                total_pages = int(summary_info.get('page_total', 1))
-
-            print(f"Progress: Page {current_page} of {total_pages}")
-
-            if current_page >= total_pages:
-                break
-
-        page += 1
+    if args.incremental:
+        if storage_provider is None:
+            print("ERROR: --incremental needs a storage provider holding the previous fetch")
+            return
+        run_incremental_sync(api_key, targets, storage_provider, args.workers, args.retries)
+        return
+
+    # Fetch bills using getSearch with concurrent pagination
+    results = fetch_all_bills(api_key, targets, workers=args.workers, max_retries=args.retries)
 
     # Save results
-    if all_bills:
+    saved = []
+    for (state, year), all_bills in results.items():
+        output_file = f"{state.lower()}_bills_{year}"  # No .json extension, storage provider handles it
+        samples_file = f"{state.lower()}_test_samples.txt"
+
         print("\n" + "=" * 80)
-        print("Saving results...")
+        if not all_bills:
+            print(f"No bills found for {state} {year}!")
+            continue
+
+        print(f"Saving results for {state} {year}...")
         save_bills_json(all_bills, output_file, storage_provider)
         create_test_samples(all_bills, samples_file)  # Will write all bills (no limit)
+        saved.append((output_file, samples_file, len(all_bills)))
 
+    if saved:
         print("\n" + "=" * 80)
         print("COMPLETE!")
         print("=" * 80)
-        print(f"Total bills fetched: {len(all_bills)}")
-        print(f"Full data: {output_file}")
-        print(f"Text samples: {samples_file}")
+        for output_file, samples_file, count in saved:
+            print(f"{output_file}: {count} bills fetched (samples: {samples_file})")
+        output_file, samples_file, _ = saved[0]
         print("\nNext steps:")
         print(f"  1. Review text file: less {samples_file}")
         print(f"  2. Run filter pass: python run_filter_pass.py {output_file}")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Migrate the local LegiScan cache between layouts
+
+Copies every cached bill (bill_{id}.json) and extracted bill text
+(bill_text_{doc_id}.txt) from the one-file-per-entry layout in
+data/cache/legiscan_cache/ into the SQLite cache, or back. Afterwards set
+storage.local.cache_format in config.json to the new layout.
+
+Usage:
+    python scripts/migrate_local_cache.py                    # files -> sqlite
+    python scripts/migrate_local_cache.py --delete           # ... and remove the migrated files
+    python scripts/migrate_local_cache.py --to files         # sqlite -> files
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.local_cache import CACHE_FORMATS, create_cache_backend, migrate_cache
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+CONFIG_FILE = PROJECT_ROOT / 'config.json'
+
+
+def load_config():
+    """Load configuration from config.json (optional - uses defaults if not found)"""
+    try:
+        with open(CONFIG_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.info("Config file not found, using default settings")
+        return {}
+
+
+def delete_file_cache(cache_dir: Path) -> int:
+    """Remove bill and bill text entries from the files layout, returning the count"""
+    removed = 0
+    for pattern in ['bill_*.json', 'bill_text_*.txt', 'bill_text_*.version']:
+        for cache_file in cache_dir.glob(pattern):
+            cache_file.unlink()
+            removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate the local LegiScan cache between layouts')
+    parser.add_argument('--to', choices=CACHE_FORMATS, default='sqlite',
+                        help='Target layout (default: sqlite); the other one is the source')
+    parser.add_argument('--delete', action='store_true',
+                        help='Remove the source entries once everything is copied')
+    args = parser.parse_args()
+
+    local_config = load_config().get('storage', {}).get('local', {})
+    data_directory = Path(local_config.get('data_directory', 'data'))
+    cache_dir = data_directory / 'cache' / 'legiscan_cache'
+    sqlite_path = Path(local_config.get('cache_path', data_directory / 'cache' / 'legiscan_cache.sqlite3'))
+
+    source_format = 'files' if args.to == 'sqlite' else 'sqlite'
+    if source_format == 'sqlite' and not sqlite_path.exists():
+        logger.error(f"SQLite cache not found: {sqlite_path}")
+        return 1
+
+    source = create_cache_backend(source_format, cache_dir, sqlite_path)
+    target = create_cache_backend(args.to, cache_dir, sqlite_path)
+
+    logger.info(f"Migrating LegiScan cache from {source_format} to {args.to} "
+                f"({cache_dir if source_format == 'files' else sqlite_path} -> "
+                f"{sqlite_path if args.to == 'sqlite' else cache_dir})")
+
+    start_time = time.time()
+    try:
+        bills, texts = migrate_cache(source, target)
+    finally:
+        source.close()
+        target.close()
+
+    logger.info(f"Copied {bills} bills and {texts} bill texts in {time.time() - start_time:.1f}s")
+
+    if args.delete:
+        if source_format == 'files':
+            removed = delete_file_cache(cache_dir)
+            logger.info(f"Removed {removed} files from {cache_dir}")
+        else:
+            for suffix in ['', '-wal', '-shm']:
+                Path(f"{sqlite_path}{suffix}").unlink(missing_ok=True)
+            logger.info(f"Removed {sqlite_path}")
+
+    logger.info(f"Set \"cache_format\": \"{args.to}\" under storage.local in config.json to use the new cache")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
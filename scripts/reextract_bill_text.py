@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Re-extract Bill Text - rebuild the extracted text cache offline
+
+Re-runs text extraction with the current extractors (analysis_pass.extractors)
+over every raw document in the storage provider's document cache, in
+parallel, and writes only the text cache entries that changed. No LegiScan
+or LLM calls are made, so this is the way to refresh cached text after
+switching or upgrading an extractor.
+
+Usage:
+    python scripts/reextract_bill_text.py                   # Update changed entries
+    python scripts/reextract_bill_text.py --dry-run         # Report and diff changes, write nothing
+    python scripts/reextract_bill_text.py --workers 8
+"""
+
+import argparse
+import difflib
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage_provider import StorageProviderFactory
+from src.text_extraction import DEFAULT_PDF_PAGES_PER_CHUNK, TextExtractionService
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+CONFIG_FILE = PROJECT_ROOT / 'config.json'
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5.0
+
+# Outcomes, in report order
+STATUSES = ['added', 'changed', 'restamped', 'unchanged', 'failed']
+
+
+def load_config():
+    """Load configuration from config.json (optional - uses defaults if not found)"""
+    try:
+        with open(CONFIG_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.info("Config file not found, using default settings")
+        return {}
+
+
+def reextract_document(storage_provider, text_extractor, doc_id: str, dry_run: bool) -> Dict[str, Any]:
+    """
+    Re-extract one cached document and update its text cache entry if it changed
+
+    Args:
+        storage_provider: StorageProvider with the document cache
+        text_extractor: TextExtractionService with the current extractors
+        doc_id: LegiScan document ID
+        dry_run: Compare only, don't write
+
+    Returns:
+        Dict with doc_id, status (one of STATUSES), size_bytes, cpu_seconds,
+        and for added/changed documents old_text and new_text
+    """
+    outcome = {'doc_id': doc_id, 'status': 'failed', 'size_bytes': 0, 'cpu_seconds': 0.0}
+
+    cached = storage_provider.get_document_from_cache(doc_id)
+    if not cached:
+        logger.warning(f"Cached document for doc_id {doc_id} is missing or corrupt")
+        return outcome
+
+    document, mime_type = cached
+    extractor_version = text_extractor.version_for(mime_type)
+    outcome['size_bytes'] = document.size
+
+    with document:
+        new_text, outcome['cpu_seconds'] = text_extractor.extract(document.path, mime_type)
+
+    # Keep the existing entry rather than replace it with nothing
+    if not new_text:
+        logger.warning(f"Could not extract text from doc_id {doc_id} (mime: {mime_type})")
+        return outcome
+
+    current_text = storage_provider.get_bill_text_from_cache(doc_id, extractor_version)
+    if current_text == new_text:
+        outcome['status'] = 'unchanged'
+        return outcome
+
+    old_text = current_text if current_text is not None else storage_provider.get_bill_text_from_cache(doc_id)
+    if old_text is None:
+        outcome['status'] = 'added'
+    elif old_text == new_text:
+        # Same text, but recorded with another extractor version
+        outcome['status'] = 'restamped'
+    else:
+        outcome['status'] = 'changed'
+
+    if outcome['status'] != 'restamped':
+        outcome['old_text'] = old_text
+        outcome['new_text'] = new_text
+
+    if not dry_run:
+        storage_provider.save_bill_text_to_cache(doc_id, new_text, extractor_version)
+
+    return outcome
+
+
+def print_diff(outcome: Dict[str, Any], max_lines: int) -> None:
+    """Print a unified diff between the cached and re-extracted text"""
+    diff = list(difflib.unified_diff(
+        (outcome['old_text'] or '').splitlines(),
+        outcome['new_text'].splitlines(),
+        fromfile=f"doc_{outcome['doc_id']} (cached)",
+        tofile=f"doc_{outcome['doc_id']} (re-extracted)",
+        lineterm=''
+    ))
+
+    for line in diff[:max_lines]:
+        print(line)
+    if len(diff) > max_lines:
+        print(f"... {len(diff) - max_lines} more diff lines")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract cached bill documents with the current extractors')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Documents extracted in parallel (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report what would change, with diffs, without writing')
+    parser.add_argument('--diff-lines', type=int, default=20,
+                        help='Diff lines shown per changed document in --dry-run (default: 20, 0 for none)')
+    args = parser.parse_args()
+
+    config = load_config()
+    analysis_config = config.get('analysis_pass', {})
+    workers = max(1, args.workers)
+
+    try:
+        storage_provider = StorageProviderFactory.create_from_env(config)
+        logger.info(f"Using storage backend: {type(storage_provider).__name__}")
+    except Exception as e:
+        logger.error(f"Could not initialize storage provider: {e}")
+        return 1
+
+    doc_ids = storage_provider.list_cached_documents()
+    if not doc_ids:
+        logger.info("No cached documents to re-extract (documents are cached as the analysis pass downloads them)")
+        return 0
+
+    # One thread per worker process: threads read and write the caches while
+    # the processes parse
+    text_extractor = TextExtractionService(
+        workers if workers > 1 else 0,
+        analysis_config.get('pdf_pages_per_chunk', DEFAULT_PDF_PAGES_PER_CHUNK),
+        analysis_config.get('extractors')
+    )
+
+    logger.info(f"Re-extracting {len(doc_ids)} cached documents with {workers} workers"
+                f"{' (dry run)' if args.dry_run else ''}")
+
+    counts = Counter()
+    total_bytes = 0
+    cpu_seconds = 0.0
+    start_time = time.time()
+    last_progress = start_time
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(reextract_document, storage_provider, text_extractor, doc_id, args.dry_run): doc_id
+                for doc_id in doc_ids
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logger.error(f"Error re-extracting doc_id {futures[future]}: {e}")
+                    outcome = {'status': 'failed', 'size_bytes': 0, 'cpu_seconds': 0.0}
+
+                counts[outcome['status']] += 1
+                total_bytes += outcome['size_bytes']
+                cpu_seconds += outcome['cpu_seconds']
+
+                if args.dry_run and args.diff_lines and outcome['status'] in ('added', 'changed'):
+                    print_diff(outcome, args.diff_lines)
+
+                now = time.time()
+                if now - last_progress >= PROGRESS_INTERVAL or done == len(doc_ids):
+                    elapsed = max(now - start_time, 0.001)
+                    logger.info(
+                        f"Progress: {done}/{len(doc_ids)} documents ({done / len(doc_ids):.0%}), "
+                        f"{done / elapsed:.1f} docs/s, {total_bytes / elapsed / (1024 * 1024):.2f} MB/s"
+                    )
+                    last_progress = now
+    finally:
+        text_extractor.close()
+
+    elapsed = max(time.time() - start_time, 0.001)
+
+    logger.info("=" * 60)
+    logger.info("Re-extraction Complete" + (" (dry run, nothing written)" if args.dry_run else ""))
+    for status in STATUSES:
+        logger.info(f"  {status.capitalize():<10} {counts[status]}")
+    logger.info(f"  Documents: {len(doc_ids)} ({total_bytes / (1024 * 1024):.1f} MB) in {elapsed:.1f}s")
+    logger.info(f"  Throughput: {len(doc_ids) / elapsed:.1f} docs/s, "
+                f"{total_bytes / elapsed / (1024 * 1024):.2f} MB/s")
+    logger.info(f"  Extraction CPU time: {cpu_seconds:.1f}s")
+    logger.info("=" * 60)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,13 +9,17 @@ import os
 import sys
 import json
 import logging
+import argparse
+from collections import Counter
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.ai_analysis_pass import AIAnalysisPass
+from src.ai_analysis_pass import DEFAULT_MAP_CHUNK_TOKENS, DEFAULT_MAP_CONCURRENCY, AIAnalysisPass
+from src.analysis_journal import AnalysisJournal
 from src.storage_provider import StorageProviderFactory
+from src.text_extraction import DEFAULT_PDF_PAGES_PER_CHUNK
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -65,12 +69,13 @@ def create_bill_lookup(source_bills):
     return {bill['bill_number']: bill for bill in source_bills}
 
 
-def calculate_timing_stats(all_timings):
+def calculate_timing_stats(all_timings, storage_cache_stats=None):
     """
     Calculate aggregate timing statistics from all bill timings.
 
     Args:
         all_timings: List of timing dicts from each bill analysis
+        storage_cache_stats: Storage memory cache counters (MemoryCachedStorage.cache_stats()), if enabled
 
     Returns:
         Dict with min, max, avg, median, sum for each timing component
@@ -106,7 +111,8 @@ def calculate_timing_stats(all_timings):
         'text_extraction_seconds': get_stats(extraction_times),
         'ai_analysis_seconds': get_stats(ai_times),
         'cache_hits': cache_hits,
-        'cache_misses': cache_misses
+        'cache_misses': cache_misses,
+        'storage_cache': storage_cache_stats
     }
 
 
@@ -198,6 +204,15 @@ def select_test_bills(bills, count=5):
 
 def main():
     """Main test execution"""
+    parser = argparse.ArgumentParser(description='Analyze filtered bills with full text')
+    parser.add_argument('filter_file', nargs='?', default='ct_bills_2025',
+                        help='Filter results identifier (default: ct_bills_2025)')
+    parser.add_argument('source_file', nargs='?', default='ct_bills_2025',
+                        help='Raw bills identifier for bill_id lookup (default: ct_bills_2025)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip bills already completed in an earlier, interrupted run')
+    args = parser.parse_args()
+
     logger.info("=" * 80)
     logger.info("AI Analysis Pass with Palliative Care Categorization")
     logger.info("=" * 80)
@@ -215,8 +230,8 @@ def main():
         return
 
     # Get file names from command line or use defaults
-    filter_file = sys.argv[1] if len(sys.argv) > 1 else 'ct_bills_2025'
-    source_file = sys.argv[2] if len(sys.argv) > 2 else 'ct_bills_2025'
+    filter_file = args.filter_file
+    source_file = args.source_file
 
     # Remove .json extension if provided
     if filter_file.endswith('.json'):
@@ -281,6 +296,8 @@ def main():
     analysis_config = config.get('analysis_pass', {})
     timeout = analysis_config.get('timeout', 90)
     api_delay = analysis_config.get('api_delay', 0.0)
+    concurrency = analysis_config.get('concurrency', 1)
+    extraction_workers = analysis_config.get('extraction_workers', 0)
 
     analyzer = AIAnalysisPass(
         api_key=api_key,
@@ -290,44 +307,100 @@ def main():
         timeout=timeout,
         legiscan_api_key=legiscan_api_key,
         api_delay=api_delay,
-        storage_provider=storage_provider
+        storage_provider=storage_provider,
+        extraction_workers=extraction_workers,
+        pdf_pages_per_chunk=analysis_config.get('pdf_pages_per_chunk', DEFAULT_PDF_PAGES_PER_CHUNK),
+        extractors=analysis_config.get('extractors'),
+        max_text_tokens=analysis_config.get('max_text_tokens'),
+        relevance_keywords=analysis_config.get('relevance_keywords'),
+        context_window=analysis_config.get('context_window'),
+        analysis_mode=analysis_config.get('analysis_mode', 'single'),
+        map_chunk_tokens=analysis_config.get('map_chunk_tokens', DEFAULT_MAP_CHUNK_TOKENS),
+        map_concurrency=analysis_config.get('map_concurrency', DEFAULT_MAP_CONCURRENCY)
     )
 
     logger.info(f"   Configuration: model={config.get('model', 'gpt-4o-mini')}, "
                 f"timeout={timeout}s, max_tokens={config.get('max_tokens', 2000)}, "
-                f"api_delay={api_delay}s")
+                f"api_delay={api_delay}s, concurrency={concurrency}, "
+                f"extraction_workers={extraction_workers}")
+
+    # Resolve bill IDs before dispatching analyses
+    jobs = []
+    for bill in bills_to_process:
+        bill_number = bill['bill_number']
+        source_bill = bill_lookup.get(bill_number)
+        bill_id = source_bill.get('bill_id') if source_bill else None
+
+        if not bill_id:
+            logger.warning(f"Could not find bill_id for {bill_number}, skipping")
+            continue
+
+        jobs.append((bill, bill_id))
 
-    # Analyze each bill
-    logger.info("\n6. Analyzing bills...")
+    # Load the cached bills and texts for the whole run up front in batched lookups
+    analyzer.prefetch_cache([bill_id for _, bill_id in jobs])
+
+    # Analyze each bill (LegiScan fetch, text extraction and LLM call run concurrently;
+    # results come back in input order)
+    logger.info(f"\n6. Analyzing {len(jobs)} bills (concurrency={concurrency})...")
     relevant_results = []
     not_relevant_results = []
     all_timings = []  # Collect timing data for statistics
 
-    for i, bill in enumerate(bills_to_process, 1):
+    # With a streaming result format (storage result_format 'jsonl') each result
+    # is appended as soon as it finishes instead of being held until the end
+    streaming = storage_provider is not None and storage_provider.streams_results
+    if streaming:
+        # Resumed bills are re-yielded by the journal, so always start from empty
+        storage_provider.clear_analysis_results(source_file)
+
+    counts = Counter()
+    category_counts = Counter()
+
+    def store_result(result):
+        """Tally a result, then stream it to storage or keep it for the final save"""
+        analysis = result['analysis']
+        if 'error' in analysis:
+            counts['errors'] += 1
+
+        if analysis.get('is_relevant', False):
+            counts['relevant'] += 1
+            if 'error' not in analysis:
+                category_counts.update(analysis.get('categories', []))
+            if not streaming:
+                relevant_results.append(result)
+        else:
+            counts['not_relevant'] += 1
+            if not streaming:
+                not_relevant_results.append(result)
+
+        if streaming:
+            storage_provider.append_analysis_result(source_file, result)
+
+    # Checkpoint each finished bill so an interrupted run can be resumed
+    journal = AnalysisJournal(storage_provider, source_file, resume=args.resume)
+    analyses = journal.analyze_many(
+        analyzer,
+        (
+            (format_bill_for_analysis(bill), bill_id, {
+                'focus': bill.get('reason'),
+                'change_hash': bill_lookup[bill['bill_number']].get('change_hash')
+            })
+            for bill, bill_id in jobs
+        ),
+        concurrency=concurrency
+    )
+
+    analyzed_ids = []  # Bills analyzed without error, whose dirty marks are cleared
+    for i, ((bill, bill_id), analysis) in enumerate(zip(jobs, analyses), 1):
         logger.info(f"\n{'=' * 80}")
-        logger.info(f"Analyzing Bill {i}/{len(bills_to_process)}: {bill['bill_number']}")
+        logger.info(f"Analyzed Bill {i}/{len(jobs)}: {bill['bill_number']}")
         logger.info(f"{'=' * 80}")
         logger.info(f"Title: {bill['title']}")
         logger.info(f"URL: {bill['url']}")
+        logger.info(f"Bill ID: {bill_id}")
 
         try:
-            # Get bill_id from lookup
-            bill_number = bill['bill_number']
-            source_bill = bill_lookup.get(bill_number)
-            bill_id = source_bill.get('bill_id') if source_bill else None
-
-            if bill_id:
-                logger.info(f"Bill ID: {bill_id}")
-            else:
-                logger.warning(f"Could not find bill_id for {bill_number}, skipping")
-                continue
-
-            # Format bill data for analysis
-            bill_data = format_bill_for_analysis(bill)
-
-            # Analyze (pass bill_id for LegiScan API fetch)
-            analysis = analyzer.analyze_data(bill_data, bill_id=bill_id)
-
             # Add bill info to results
             result = {
                 'bill': bill,
@@ -339,13 +412,12 @@ def main():
                 all_timings.append(analysis['timing'])
 
             # Sort by relevance
-            is_relevant = analysis.get('is_relevant', False)
-            if is_relevant:
-                relevant_results.append(result)
-            else:
-                not_relevant_results.append(result)
+            store_result(result)
+            if 'error' not in analysis:
+                analyzed_ids.append(bill_id)
 
             # Display results
+            is_relevant = analysis.get('is_relevant', False)
             logger.info("\n--- Analysis Results ---")
             logger.info(f"Relevant: {is_relevant}")
             logger.info(f"Reasoning: {analysis.get('relevance_reasoning', 'N/A')}")
@@ -381,20 +453,26 @@ def main():
 
         except Exception as e:
             logger.error(f"Error analyzing bill {bill['bill_number']}: {e}")
-            not_relevant_results.append({
+            store_result({
                 'bill': bill,
                 'analysis': {'error': str(e), 'is_relevant': False}
             })
 
+    analyzer.close()
+
     # Calculate timing statistics
-    timing_stats = calculate_timing_stats(all_timings)
+    storage_cache_stats = storage_provider.cache_stats() if hasattr(storage_provider, 'cache_stats') else None
+    timing_stats = calculate_timing_stats(all_timings, storage_cache_stats)
+
+    # Bills whose ID never resolved were not analyzed
+    total_processed = counts['relevant'] + counts['not_relevant']
 
     # Prepare results with timing stats
     results_with_stats = {
         'summary': {
-            'total_processed': len(bills_to_process),
-            'relevant_count': len(relevant_results),
-            'not_relevant_count': len(not_relevant_results),
+            'total_processed': total_processed,
+            'relevant_count': counts['relevant'],
+            'not_relevant_count': counts['not_relevant'],
             'source_file': source_file
         },
         'timing_stats': timing_stats,
@@ -403,9 +481,9 @@ def main():
 
     not_relevant_with_stats = {
         'summary': {
-            'total_processed': len(bills_to_process),
-            'relevant_count': len(relevant_results),
-            'not_relevant_count': len(not_relevant_results),
+            'total_processed': total_processed,
+            'relevant_count': counts['relevant'],
+            'not_relevant_count': counts['not_relevant'],
             'source_file': source_file
         },
         'timing_stats': timing_stats,
@@ -419,7 +497,13 @@ def main():
     # Save results via storage provider
     try:
         storage_provider.save_analysis_results(source_file, results_with_stats, not_relevant_with_stats)
-        logger.info(f"   Saved {len(relevant_results)} relevant and {len(not_relevant_results)} not relevant bills")
+        logger.info(f"   Saved {counts['relevant']} relevant and {counts['not_relevant']} not relevant bills")
+
+        # Changed bills marked by an incremental sync are now analyzed
+        dirty_ids = set(storage_provider.get_dirty_bills(source_file)) & set(analyzed_ids)
+        if dirty_ids:
+            storage_provider.clear_dirty_bills(source_file, sorted(dirty_ids))
+            logger.info(f"   Cleared {len(dirty_ids)} dirty mark(s)")
     except Exception as e:
         logger.error(f"   Error saving results via storage provider: {e}")
         # Fallback: try to save to local files
@@ -438,14 +522,14 @@ def main():
     logger.info("Analysis Summary")
     logger.info(f"{'=' * 80}")
 
-    total_analyzed = len(bills_to_process)
-    total_relevant = len(relevant_results)
-    total_not_relevant = len(not_relevant_results)
-    total_errors = sum(1 for r in not_relevant_results if 'error' in r['analysis'])
+    total_analyzed = total_processed
+    total_relevant = counts['relevant']
+    total_not_relevant = counts['not_relevant']
+    total_errors = counts['errors']
 
     logger.info(f"Total bills analyzed: {total_analyzed}")
-    logger.info(f"Relevant bills: {total_relevant} ({total_relevant/total_analyzed*100:.1f}%)")
-    logger.info(f"Not relevant bills: {total_not_relevant} ({total_not_relevant/total_analyzed*100:.1f}%)")
+    logger.info(f"Relevant bills: {total_relevant} ({total_relevant/max(1, total_analyzed)*100:.1f}%)")
+    logger.info(f"Not relevant bills: {total_not_relevant} ({total_not_relevant/max(1, total_analyzed)*100:.1f}%)")
     logger.info(f"Errors: {total_errors}")
 
     # Comparison with filter pass
@@ -458,15 +542,8 @@ def main():
             logger.info(f"  Precision improvement: {(total_relevant/filter_count)*100:.1f}% confirmation rate")
 
     # Category distribution
-    all_categories = []
-    for result in relevant_results:
-        if 'error' not in result['analysis']:
-            all_categories.extend(result['analysis'].get('categories', []))
-
-    if all_categories:
+    if category_counts:
         logger.info(f"\nCategory Distribution (Relevant Bills Only):")
-        from collections import Counter
-        category_counts = Counter(all_categories)
         for category, count in category_counts.most_common():
             logger.info(f"  {category}: {count}")
 
@@ -476,6 +553,11 @@ def main():
         logger.info(f"  Cache Performance:")
         logger.info(f"    Cache hits: {timing_stats['cache_hits']}")
         logger.info(f"    Cache misses: {timing_stats['cache_misses']}")
+        if timing_stats['storage_cache']:
+            storage_cache = timing_stats['storage_cache']
+            logger.info(f"    Storage memory cache: {storage_cache['memory_hits']} hits, "
+                        f"{storage_cache['memory_misses']} misses ({storage_cache['hit_rate']:.0%} hit rate, "
+                        f"{storage_cache['persistent_hits']} found in persistent cache)")
 
         if timing_stats['total_seconds']:
             logger.info(f"\n  Total Processing Time:")
@@ -10,8 +10,10 @@ import sys
 import json
 import logging
 import re
+import argparse
 import subprocess
 import shutil
+from collections import Counter
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -26,9 +28,12 @@ except ImportError:
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.ai_analysis_pass import AIAnalysisPass
+from src.ai_analysis_pass import DEFAULT_MAP_CHUNK_TOKENS, DEFAULT_MAP_CONCURRENCY, AIAnalysisPass
+from src.analysis_journal import AnalysisJournal
 from src.format_normalizer import normalize_filter_results, detect_format, get_format_info
+from src.result_stream import JSONL_SUFFIXES
 from src.storage_provider import StorageProviderFactory
+from src.text_extraction import DEFAULT_PDF_PAGES_PER_CHUNK
 from src.llm_provider import create_llm_provider
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -68,12 +73,13 @@ def get_source_bills_file(state: str, year: str) -> Path:
     return DATA_DIR / 'raw' / f'{state}_bills_{year}.json'
 
 
-def calculate_timing_stats(all_timings):
+def calculate_timing_stats(all_timings, storage_cache_stats=None):
     """
     Calculate aggregate timing statistics from all bill timings.
 
     Args:
         all_timings: List of timing dicts from each bill analysis
+        storage_cache_stats: Storage memory cache counters (MemoryCachedStorage.cache_stats()), if enabled
 
     Returns:
         Dict with min, max, avg, median, sum for each timing component
@@ -109,7 +115,8 @@ def calculate_timing_stats(all_timings):
         'text_extraction_seconds': get_stats(extraction_times),
         'ai_analysis_seconds': get_stats(ai_times),
         'cache_hits': cache_hits,
-        'cache_misses': cache_misses
+        'cache_misses': cache_misses,
+        'storage_cache': storage_cache_stats
     }
 
 
@@ -146,11 +153,37 @@ def fetch_bills_if_needed(state: str, year: str, source_file: Path):
         raise RuntimeError(f"Fetch script did not create expected file: {fetched_file}")
 
 
-def load_filter_results(filter_file: Path):
-    """Load and normalize filtered bill results from any format"""
+def filter_run_name(filter_file: Path) -> str:
+    """Filter results file name without its .json / .jsonl[.gz|.zst] extension"""
+    name = filter_file.name
+    for suffix in sorted(['.json', *JSONL_SUFFIXES.values()], key=len, reverse=True):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def load_filter_results(filter_file: Path, storage_provider=None):
+    """
+    Load and normalize filtered bill results from any format
+
+    JSONL filter results (storage result_format 'jsonl') are read one
+    record at a time through the storage provider's iter_filtered_results;
+    JSON files of either filter format are read directly.
+    """
     try:
-        with open(filter_file, 'r') as f:
-            data = json.load(f)
+        if '.jsonl' in filter_file.name:
+            if storage_provider is None:
+                raise RuntimeError("Reading JSONL filter results needs a storage provider")
+            data = {
+                'relevant_bills': [
+                    {key: value for key, value in record.items() if key != 'relevant'}
+                    for record in storage_provider.iter_filtered_results(filter_run_name(filter_file))
+                    if record.get('relevant')
+                ]
+            }
+        else:
+            with open(filter_file, 'r') as f:
+                data = json.load(f)
 
         # Detect and log format information
         format_info = get_format_info(data)
@@ -225,6 +258,52 @@ def format_bill_for_analysis(bill):
     return formatted
 
 
+def log_analysis_result(analysis):
+    """
+    Log the interesting fields of a single bill analysis.
+
+    Args:
+        analysis: Analysis dict returned by AIAnalysisPass
+    """
+    is_relevant = analysis.get('is_relevant', False)
+
+    logger.info("\n--- Analysis Results ---")
+    logger.info(f"Relevant: {is_relevant}")
+    logger.info(f"Reasoning: {analysis.get('relevance_reasoning', 'N/A')}")
+
+    if analysis.get('error'):
+        logger.info(f"Error: {analysis['error']}")
+
+    if is_relevant:
+        logger.info(f"Summary: {analysis.get('summary', 'N/A')}")
+        logger.info(f"Status: {analysis.get('bill_status', 'N/A')}")
+        logger.info(f"Type: {analysis.get('legislation_type', 'N/A')}")
+        logger.info(f"Categories: {', '.join(analysis.get('categories', []))}")
+        logger.info(f"Tags: {', '.join(analysis.get('tags', []))}")
+
+    if analysis.get('key_provisions'):
+        logger.info("\nKey Provisions:")
+        for j, provision in enumerate(analysis['key_provisions'], 1):
+            logger.info(f"  {j}. {provision}")
+
+    logger.info(f"\nPalliative Care Impact: {analysis.get('palliative_care_impact', 'N/A')}")
+
+    exclusion = analysis.get('exclusion_check', {})
+    logger.info(f"\nExclusion Check: {'EXCLUDED' if exclusion.get('is_excluded') else 'INCLUDED'}")
+    if exclusion.get('reason'):
+        logger.info(f"  Reason: {exclusion['reason']}")
+
+    flags = analysis.get('special_flags', {})
+    if any(flags.values()):
+        logger.info("\nSpecial Flags:")
+        if flags.get('references_regulation'):
+            logger.info(f"  - Regulation: {flags.get('regulation_details')}")
+        if flags.get('references_executive_order'):
+            logger.info(f"  - Executive Order: {flags.get('executive_order_details')}")
+        if flags.get('references_ballot_measure'):
+            logger.info(f"  - Ballot Measure: {flags.get('ballot_measure_details')}")
+
+
 def select_test_bills(bills, count=5):
     """
     Select diverse test bills for analysis.
@@ -274,17 +353,21 @@ def select_test_bills(bills, count=5):
 
 def main():
     """Main execution"""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description='Analyze pre-filtered bills from any filter format',
+        epilog='Example: python run_direct_analysis.py ../data/filtered/filter_results_alan_ct_bills_2025.json'
+    )
+    parser.add_argument('filter_file', help='Filter results JSON or JSONL file')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip bills already completed in an earlier, interrupted run')
+    args = parser.parse_args()
+
     logger.info("=" * 80)
     logger.info("Direct Analysis Pass - Dual-Format Support")
     logger.info("=" * 80)
 
-    # Parse command line arguments
-    if len(sys.argv) < 2:
-        logger.error("Usage: python run_direct_analysis.py <filter_results_file.json>")
-        logger.info("Example: python run_direct_analysis.py ../data/filtered/filter_results_alan_ct_bills_2025.json")
-        sys.exit(1)
-
-    filter_file = Path(sys.argv[1])
+    filter_file = Path(args.filter_file)
     if not filter_file.is_absolute():
         filter_file = PROJECT_ROOT / filter_file
 
@@ -295,7 +378,7 @@ def main():
     logger.info(f"Input file: {filter_file}")
 
     # Determine output file name based on input
-    filter_filename = filter_file.stem  # e.g., "filter_results_alan_ct_bills_2025"
+    filter_filename = filter_run_name(filter_file)  # e.g., "filter_results_alan_ct_bills_2025"
     output_prefix = filter_filename.replace('filter_results_', 'analysis_')
     RELEVANT_OUTPUT_FILE = ANALYZED_DIR / f"{output_prefix}_relevant.json"
     NOT_RELEVANT_OUTPUT_FILE = ANALYZED_DIR / f"{output_prefix}_not_relevant.json"
@@ -308,10 +391,20 @@ def main():
     test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
     test_count = int(os.getenv('TEST_COUNT', '5'))
 
-    # Create LLM provider from config and environment
+    # Initialize storage provider for caching
+    logger.info("   Initializing storage provider...")
+    try:
+        storage_provider = StorageProviderFactory.create_from_env(config)
+        logger.info(f"   Using storage backend: {type(storage_provider).__name__}")
+    except Exception as e:
+        logger.warning(f"Could not initialize storage provider: {e}")
+        logger.warning("Continuing without caching - this will be slower")
+        storage_provider = None
+
+    # Create LLM provider from config and environment (the response cache may reuse the storage provider)
     logger.info("   Creating LLM provider...")
     try:
-        provider = create_llm_provider(config=config)
+        provider = create_llm_provider(config=config, storage_provider=storage_provider)
         logger.info(f"   Using LLM provider: {provider.get_provider_name()}")
     except Exception as e:
         logger.error(f"Failed to create LLM provider: {e}")
@@ -323,7 +416,7 @@ def main():
 
     # Load and normalize filter results
     logger.info("\n2. Loading and normalizing filter results...")
-    normalized_bills = load_filter_results(filter_file)
+    normalized_bills = load_filter_results(filter_file, storage_provider)
     logger.info(f"   Loaded {len(normalized_bills)} bills from filter results")
 
     # Select bills to process
@@ -341,16 +434,6 @@ def main():
     if len(bills_to_process) > 10:
         logger.info(f"   ... and {len(bills_to_process) - 10} more bills")
 
-    # Initialize storage provider for caching
-    logger.info("   Initializing storage provider...")
-    try:
-        storage_provider = StorageProviderFactory.create_from_env(config)
-        logger.info(f"   Using storage backend: {type(storage_provider).__name__}")
-    except Exception as e:
-        logger.warning(f"Could not initialize storage provider: {e}")
-        logger.warning("Continuing without caching - this will be slower")
-        storage_provider = None
-
     # Get LegiScan API key
     legiscan_api_key = os.getenv('LEGISCAN_API_KEY')
     if not legiscan_api_key:
@@ -362,6 +445,8 @@ def main():
     analysis_config = config.get('analysis_pass', {})
     timeout = analysis_config.get('timeout', 90)
     api_delay = analysis_config.get('api_delay', 0.0)
+    concurrency = analysis_config.get('concurrency', 1)
+    extraction_workers = analysis_config.get('extraction_workers', 0)
 
     analyzer = AIAnalysisPass(
         provider=provider,
@@ -370,88 +455,143 @@ def main():
         timeout=timeout,
         legiscan_api_key=legiscan_api_key,
         api_delay=api_delay,
-        storage_provider=storage_provider
+        storage_provider=storage_provider,
+        extraction_workers=extraction_workers,
+        pdf_pages_per_chunk=analysis_config.get('pdf_pages_per_chunk', DEFAULT_PDF_PAGES_PER_CHUNK),
+        extractors=analysis_config.get('extractors'),
+        max_text_tokens=analysis_config.get('max_text_tokens'),
+        relevance_keywords=analysis_config.get('relevance_keywords'),
+        context_window=analysis_config.get('context_window'),
+        analysis_mode=analysis_config.get('analysis_mode', 'single'),
+        map_chunk_tokens=analysis_config.get('map_chunk_tokens', DEFAULT_MAP_CHUNK_TOKENS),
+        map_concurrency=analysis_config.get('map_concurrency', DEFAULT_MAP_CONCURRENCY)
     )
 
     logger.info(f"   Configuration: provider={provider.get_provider_name()}, "
                 f"timeout={timeout}s, max_tokens={config.get('max_tokens', 2000)}, "
-                f"api_delay={api_delay}s")
+                f"api_delay={api_delay}s, concurrency={concurrency}, "
+                f"extraction_workers={extraction_workers}")
 
-    # Analyze each bill
-    logger.info("\n5. Analyzing bills...")
+    # Resolve bill IDs for every bill before dispatching analyses
+    logger.info("\n5. Resolving bill IDs...")
     relevant_results = []
     not_relevant_results = []
     all_timings = []  # Collect timing data for statistics
 
     # Cache for loaded source bill files (by state/year)
     source_bill_cache = {}
+    jobs = []
+    change_hashes = {}  # bill_id -> LegiScan change_hash, so stale cached bills are re-fetched
+
+    for bill in bills_to_process:
+        bill_number = bill['bill_number']
+        bill_id = None
+
+        # First, try to get bill_id from extra_metadata (vector similarity format)
+        extra_metadata = bill.get('extra_metadata', {})
+        if extra_metadata.get('bill_id'):
+            bill_id = extra_metadata['bill_id']
+            change_hashes[bill_id] = extra_metadata.get('change_hash')
+        else:
+            # Fall back to lookup from source file (AI-filtered format)
+            # Extract state and year from THIS bill's URL
+            state = extract_state_from_url(bill['url'])
+            year = extract_year_from_url(bill['url'])
+
+            if not state:
+                logger.warning(f"Could not extract state from URL: {bill['url']}, skipping {bill_number}")
+                continue
 
-    for i, bill in enumerate(bills_to_process, 1):
+            # Check if we've already loaded this state/year combination
+            cache_key = f"{state}_{year}"
+            if cache_key not in source_bill_cache:
+                logger.info(f"   Loading source bills for {state.upper()} {year}...")
+                source_bills_file = get_source_bills_file(state, year)
+
+                # Fetch if needed
+                try:
+                    fetch_bills_if_needed(state, year, source_bills_file)
+                    source_bills = load_source_bills(source_bills_file)
+                    source_bill_cache[cache_key] = create_bill_lookup(source_bills)
+                    logger.info(f"   Loaded {len(source_bills)} bills for {state.upper()} {year}")
+                except Exception as e:
+                    logger.error(f"   Could not load source bills for {state.upper()} {year}: {e}")
+                    source_bill_cache[cache_key] = {}
+
+            # Lookup bill_id
+            bill_lookup = source_bill_cache[cache_key]
+            source_bill = bill_lookup.get(bill_number)
+            bill_id = source_bill.get('bill_id') if source_bill else None
+            if source_bill:
+                change_hashes[bill_id] = source_bill.get('change_hash')
+
+        if not bill_id:
+            logger.warning(f"Could not find bill_id for {bill_number}, skipping")
+            continue
+
+        jobs.append((bill, bill_id))
+
+    logger.info(f"   Resolved bill IDs for {len(jobs)} of {len(bills_to_process)} bills")
+
+    # Load the cached bills and texts for the whole run up front in batched lookups
+    analyzer.prefetch_cache([bill_id for _, bill_id in jobs])
+
+    # Analyze each bill (LegiScan fetch, text extraction and LLM call run concurrently;
+    # results come back in input order)
+    logger.info(f"\n6. Analyzing bills (concurrency={concurrency})...")
+
+    # With a streaming result format (storage result_format 'jsonl') each result
+    # is appended as soon as it finishes instead of being held until the end
+    streaming = storage_provider is not None and storage_provider.streams_results
+    if streaming:
+        # Resumed bills are re-yielded by the journal, so always start from empty
+        storage_provider.clear_analysis_results(output_prefix)
+
+    counts = Counter()
+    category_counts = Counter()
+
+    def store_result(result):
+        """Tally a result, then stream it to storage or keep it for the final save"""
+        analysis = result['analysis']
+        if 'error' in analysis:
+            counts['errors'] += 1
+
+        if analysis.get('is_relevant', False):
+            counts['relevant'] += 1
+            if 'error' not in analysis:
+                category_counts.update(analysis.get('categories', []))
+            if not streaming:
+                relevant_results.append(result)
+        else:
+            counts['not_relevant'] += 1
+            if not streaming:
+                not_relevant_results.append(result)
+
+        if streaming:
+            storage_provider.append_analysis_result(output_prefix, result)
+
+    # Checkpoint each finished bill so an interrupted run can be resumed
+    journal = AnalysisJournal(storage_provider, output_prefix, resume=args.resume)
+    analyses = journal.analyze_many(
+        analyzer,
+        (
+            (format_bill_for_analysis(bill), bill_id, {
+                'focus': bill.get('reason'),
+                'change_hash': change_hashes.get(bill_id)
+            })
+            for bill, bill_id in jobs
+        ),
+        concurrency=concurrency
+    )
+
+    for i, ((bill, bill_id), analysis) in enumerate(zip(jobs, analyses), 1):
         logger.info(f"\n{'=' * 80}")
-        logger.info(f"Analyzing Bill {i}/{len(bills_to_process)}: {bill['bill_number']}")
+        logger.info(f"Analyzed Bill {i}/{len(jobs)}: {bill['bill_number']} (bill_id {bill_id})")
         logger.info(f"{'=' * 80}")
         logger.info(f"Title: {bill['title']}")
         logger.info(f"URL: {bill['url']}")
 
         try:
-            bill_number = bill['bill_number']
-            bill_id = None
-
-            # First, try to get bill_id from extra_metadata (vector similarity format)
-            extra_metadata = bill.get('extra_metadata', {})
-            if extra_metadata.get('bill_id'):
-                bill_id = extra_metadata['bill_id']
-                logger.info(f"Bill ID (from filter results): {bill_id}")
-            else:
-                # Fall back to lookup from source file (AI-filtered format)
-                logger.info("Bill ID not in filter results, looking up from source file...")
-
-                # Extract state and year from THIS bill's URL
-                state = extract_state_from_url(bill['url'])
-                year = extract_year_from_url(bill['url'])
-
-                if not state:
-                    logger.warning(f"Could not extract state from URL: {bill['url']}, skipping")
-                    continue
-
-                logger.info(f"   State: {state.upper()}, Year: {year}")
-
-                # Check if we've already loaded this state/year combination
-                cache_key = f"{state}_{year}"
-                if cache_key not in source_bill_cache:
-                    logger.info(f"   Loading source bills for {state.upper()} {year}...")
-                    source_bills_file = get_source_bills_file(state, year)
-
-                    # Fetch if needed
-                    try:
-                        fetch_bills_if_needed(state, year, source_bills_file)
-                        source_bills = load_source_bills(source_bills_file)
-                        source_bill_cache[cache_key] = create_bill_lookup(source_bills)
-                        logger.info(f"   Loaded {len(source_bills)} bills for {state.upper()} {year}")
-                    except Exception as e:
-                        logger.error(f"   Could not load source bills for {state.upper()} {year}: {e}")
-                        source_bill_cache[cache_key] = {}
-                else:
-                    logger.info(f"   Using cached source bills for {state.upper()} {year}")
-
-                # Lookup bill_id
-                bill_lookup = source_bill_cache[cache_key]
-                source_bill = bill_lookup.get(bill_number)
-                bill_id = source_bill.get('bill_id') if source_bill else None
-
-                if bill_id:
-                    logger.info(f"Bill ID (from source lookup): {bill_id}")
-
-            if not bill_id:
-                logger.warning(f"Could not find bill_id for {bill_number}, skipping")
-                continue
-
-            # Format bill data for analysis
-            bill_data = format_bill_for_analysis(bill)
-
-            # Analyze (pass bill_id for LegiScan API fetch)
-            analysis = analyzer.analyze_data(bill_data, bill_id=bill_id)
-
             # Add bill info and extra metadata to results
             result = {
                 'bill': {
@@ -472,49 +612,13 @@ def main():
                 all_timings.append(analysis['timing'])
 
             # Sort by relevance
-            is_relevant = analysis.get('is_relevant', False)
-            if is_relevant:
-                relevant_results.append(result)
-            else:
-                not_relevant_results.append(result)
+            store_result(result)
 
-            # Display results
-            logger.info("\n--- Analysis Results ---")
-            logger.info(f"Relevant: {is_relevant}")
-            logger.info(f"Reasoning: {analysis.get('relevance_reasoning', 'N/A')}")
-
-            if is_relevant:
-                logger.info(f"Summary: {analysis.get('summary', 'N/A')}")
-                logger.info(f"Status: {analysis.get('bill_status', 'N/A')}")
-                logger.info(f"Type: {analysis.get('legislation_type', 'N/A')}")
-                logger.info(f"Categories: {', '.join(analysis.get('categories', []))}")
-                logger.info(f"Tags: {', '.join(analysis.get('tags', []))}")
-
-            if analysis.get('key_provisions'):
-                logger.info("\nKey Provisions:")
-                for j, provision in enumerate(analysis['key_provisions'], 1):
-                    logger.info(f"  {j}. {provision}")
-
-            logger.info(f"\nPalliative Care Impact: {analysis.get('palliative_care_impact', 'N/A')}")
-
-            exclusion = analysis.get('exclusion_check', {})
-            logger.info(f"\nExclusion Check: {'EXCLUDED' if exclusion.get('is_excluded') else 'INCLUDED'}")
-            if exclusion.get('reason'):
-                logger.info(f"  Reason: {exclusion['reason']}")
-
-            flags = analysis.get('special_flags', {})
-            if any(flags.values()):
-                logger.info("\nSpecial Flags:")
-                if flags.get('references_regulation'):
-                    logger.info(f"  - Regulation: {flags.get('regulation_details')}")
-                if flags.get('references_executive_order'):
-                    logger.info(f"  - Executive Order: {flags.get('executive_order_details')}")
-                if flags.get('references_ballot_measure'):
-                    logger.info(f"  - Ballot Measure: {flags.get('ballot_measure_details')}")
+            log_analysis_result(analysis)
 
         except Exception as e:
             logger.error(f"Error analyzing bill {bill['bill_number']}: {e}")
-            not_relevant_results.append({
+            store_result({
                 'bill': {
                     'bill_number': bill['bill_number'],
                     'title': bill['title'],
@@ -524,15 +628,21 @@ def main():
                 'analysis': {'error': str(e), 'is_relevant': False}
             })
 
+    analyzer.close()
+
     # Calculate timing statistics
-    timing_stats = calculate_timing_stats(all_timings)
+    storage_cache_stats = storage_provider.cache_stats() if hasattr(storage_provider, 'cache_stats') else None
+    timing_stats = calculate_timing_stats(all_timings, storage_cache_stats)
+
+    # Bills whose ID never resolved were not analyzed
+    total_processed = counts['relevant'] + counts['not_relevant']
 
     # Prepare results with timing stats
     results_with_stats = {
         'summary': {
-            'total_processed': len(bills_to_process),
-            'relevant_count': len(relevant_results),
-            'not_relevant_count': len(not_relevant_results),
+            'total_processed': total_processed,
+            'relevant_count': counts['relevant'],
+            'not_relevant_count': counts['not_relevant'],
             'source_file': filter_file.name
         },
         'timing_stats': timing_stats,
@@ -541,9 +651,9 @@ def main():
 
     not_relevant_with_stats = {
         'summary': {
-            'total_processed': len(bills_to_process),
-            'relevant_count': len(relevant_results),
-            'not_relevant_count': len(not_relevant_results),
+            'total_processed': total_processed,
+            'relevant_count': counts['relevant'],
+            'not_relevant_count': counts['not_relevant'],
             'source_file': filter_file.name
         },
         'timing_stats': timing_stats,
@@ -555,7 +665,7 @@ def main():
 
     # Save results to separate files
     logger.info(f"\n{'=' * 80}")
-    logger.info("6. Saving results...")
+    logger.info("7. Saving results...")
 
     # Construct run_id from filter file
     run_id = output_prefix  # e.g., "analysis_alan_ct_bills_2025"
@@ -564,7 +674,7 @@ def main():
     if storage_provider:
         try:
             storage_provider.save_analysis_results(run_id, results_with_stats, not_relevant_with_stats)
-            logger.info(f"   Saved {len(relevant_results)} relevant and {len(not_relevant_results)} not relevant bills via storage provider")
+            logger.info(f"   Saved {counts['relevant']} relevant and {counts['not_relevant']} not relevant bills via storage provider")
         except Exception as e:
             logger.error(f"   Error saving via storage provider: {e}")
             # Fallback to direct file writing
@@ -594,26 +704,19 @@ def main():
     logger.info("Analysis Summary")
     logger.info(f"{'=' * 80}")
 
-    total_analyzed = len(bills_to_process)
-    total_relevant = len(relevant_results)
-    total_not_relevant = len(not_relevant_results)
-    total_errors = sum(1 for r in not_relevant_results if 'error' in r['analysis'])
+    total_analyzed = total_processed
+    total_relevant = counts['relevant']
+    total_not_relevant = counts['not_relevant']
+    total_errors = counts['errors']
 
     logger.info(f"Total bills analyzed: {total_analyzed}")
-    logger.info(f"Relevant bills: {total_relevant} ({total_relevant/total_analyzed*100:.1f}%)")
-    logger.info(f"Not relevant bills: {total_not_relevant} ({total_not_relevant/total_analyzed*100:.1f}%)")
+    logger.info(f"Relevant bills: {total_relevant} ({total_relevant/max(1, total_analyzed)*100:.1f}%)")
+    logger.info(f"Not relevant bills: {total_not_relevant} ({total_not_relevant/max(1, total_analyzed)*100:.1f}%)")
     logger.info(f"Errors: {total_errors}")
 
     # Category distribution
-    all_categories = []
-    for result in relevant_results:
-        if 'error' not in result['analysis']:
-            all_categories.extend(result['analysis'].get('categories', []))
-
-    if all_categories:
+    if category_counts:
         logger.info(f"\nCategory Distribution (Relevant Bills Only):")
-        from collections import Counter
-        category_counts = Counter(all_categories)
         for category, count in category_counts.most_common():
             logger.info(f"  {category}: {count}")
 
@@ -623,6 +726,11 @@ def main():
         logger.info(f"  Cache Performance:")
         logger.info(f"    Cache hits: {timing_stats['cache_hits']}")
         logger.info(f"    Cache misses: {timing_stats['cache_misses']}")
+        if timing_stats['storage_cache']:
+            storage_cache = timing_stats['storage_cache']
+            logger.info(f"    Storage memory cache: {storage_cache['memory_hits']} hits, "
+                        f"{storage_cache['memory_misses']} misses ({storage_cache['hit_rate']:.0%} hit rate, "
+                        f"{storage_cache['persistent_hits']} found in persistent cache)")
 
         if timing_stats['total_seconds']:
             logger.info(f"\n  Total Processing Time:")
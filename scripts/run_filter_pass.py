@@ -3,23 +3,41 @@
 Filter Pass Script - First pass of two-stage AI pipeline
 Tests the filter with bills from JSON file (LegiScan data)
 Uses batch processing - splits large files into manageable chunks
+
+With --dirty-only, only bills marked dirty by an incremental sync
+(fetch_legiscan_bills.py --incremental) are re-filtered; their results
+replace the earlier ones in the existing filter results. Marks of bills
+found not relevant are cleared; relevant ones are cleared by the analysis
+pass once it has analyzed them.
+
+Batches run concurrently (filter_pass.concurrency) and each finished batch
+is checkpointed, so an interrupted run can be continued with --resume.
 """
 
 import os
 import sys
 import json
-import time
+import logging
+import argparse
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.ai_filter_pass import AIFilterPass
+from src.ai_filter_pass import (
+    DEFAULT_BATCH_INPUT_TOKENS, DEFAULT_REPAIR_ATTEMPTS, DEFAULT_TOKENS_PER_RESULT, AIFilterPass
+)
+from src.analysis_journal import AnalysisJournal
+from src.prompt_format import DEFAULT_PROMPT_FORMAT
 from src.storage_provider import StorageProviderFactory
 
+logger = logging.getLogger(__name__)
+
 # Default configuration (can be overridden by config.json)
-DEFAULT_BATCH_SIZE = 50  # Process 50 bills per API call
+DEFAULT_BATCH_SIZE = 50  # At most 50 bills per API call (fewer when they exceed the token budget)
 DEFAULT_TIMEOUT = 180  # 3 minutes timeout per batch
+DEFAULT_CONCURRENCY = 1  # Batches in flight at once without llm.rate_limit
+RATE_LIMITED_CONCURRENCY = 4  # Default once llm.rate_limit retries throttled batches
 
 
 def load_config():
@@ -76,7 +94,56 @@ def parse_bills_data(data):
 
     return bills
 
+def merge_filter_results(storage_provider, input_filename, new_data, refiltered_bills):
+    """
+    Replace entries for re-filtered bills in the previous filter results.
+
+    Args:
+        storage_provider: StorageProvider instance
+        input_filename: Raw data identifier the results belong to
+        new_data: Filter output for the re-filtered bills
+        refiltered_bills: Dict of re-filtered bills keyed by bill_number
+
+    Returns:
+        Merged filter output in the same format
+    """
+    try:
+        previous = storage_provider.load_filtered_results(input_filename)
+    except FileNotFoundError:
+        return new_data
+
+    relevant = [
+        item for item in previous.get('relevant_bills', [])
+        if item.get('bill_number') not in refiltered_bills
+    ] + new_data['relevant_bills']
+    not_relevant = [
+        item for item in previous.get('not_relevant_bills', [])
+        if item.get('bill_number') not in refiltered_bills
+    ] + new_data['not_relevant_bills']
+
+    print(f"Merged with previous results: {len(relevant)} relevant, {len(not_relevant)} not relevant")
+
+    return {
+        'summary': {
+            'total_analyzed': len(relevant) + len(not_relevant),
+            'relevant_count': len(relevant),
+            'not_relevant_count': len(not_relevant),
+            'source_file': input_filename
+        },
+        'relevant_bills': relevant,
+        'not_relevant_bills': not_relevant
+    }
+
 def main():
+    parser = argparse.ArgumentParser(description='Run AI filter pass over raw bill data')
+    parser.add_argument('input_file', nargs='?', default='ct_bills_2025',
+                        help='Raw data identifier (default: ct_bills_2025)')
+    parser.add_argument('--dirty-only', action='store_true',
+                        help='Only re-filter bills changed since the last sync and merge into existing results')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip batches already completed by an interrupted run with the same input')
+    args = parser.parse_args()
+
     # Set up paths
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -86,8 +153,14 @@ def main():
     filter_config = config.get('filter_pass', {})
     batch_size = filter_config.get('batch_size', DEFAULT_BATCH_SIZE)
     timeout = filter_config.get('timeout', DEFAULT_TIMEOUT)
+    rate_limited = bool(config.get('llm', {}).get('rate_limit'))
+    concurrency = filter_config.get('concurrency', RATE_LIMITED_CONCURRENCY if rate_limited else DEFAULT_CONCURRENCY)
+    repair_attempts = filter_config.get('repair_attempts', DEFAULT_REPAIR_ATTEMPTS)
 
-    print(f"Configuration: batch_size={batch_size}, timeout={timeout}s")
+    print(f"Configuration: batch_size={batch_size}, timeout={timeout}s, concurrency={concurrency}")
+    if concurrency > 1 and not rate_limited:
+        logger.warning("filter_pass.concurrency is above 1 but llm.rate_limit is not configured; batches "
+                       "throttled by the provider fail instead of being retried (re-run with --resume to retry them)")
 
     # Initialize storage provider
     try:
@@ -97,8 +170,7 @@ def main():
         print(f"ERROR: Could not initialize storage provider: {e}")
         return
 
-    # Get input file from command line or use default
-    input_filename = sys.argv[1] if len(sys.argv) > 1 else 'ct_bills_2025'
+    input_filename = args.input_file
     # Remove .json extension if provided
     if input_filename.endswith('.json'):
         input_filename = input_filename[:-5]
@@ -114,7 +186,13 @@ def main():
     # Initialize the filter pass with configured timeout
     print("Initializing AI Filter Pass...")
     # Use new provider-based initialization (backward compatible)
-    filter_pass = AIFilterPass(api_key=api_key, timeout=timeout, config=config)
+    filter_pass = AIFilterPass(
+        api_key=api_key,
+        timeout=timeout,
+        config=config,
+        prompt_format=filter_config.get('prompt_format', DEFAULT_PROMPT_FORMAT),
+        storage_provider=storage_provider
+    )
 
     # Read data from storage provider
     print(f"Reading data from storage: {input_filename}...")
@@ -142,6 +220,15 @@ def main():
 
         print(f"Found {len(bills)} bills in file")
 
+        if args.dirty_only:
+            dirty_ids = set(storage_provider.get_dirty_bills(input_filename))
+            bills = [bill for bill in bills if bill.get('bill_id') in dirty_ids]
+            print(f"Re-filtering {len(bills)} dirty bill(s)")
+
+            if not bills:
+                print("No dirty bills to process")
+                return
+
         # Create lookup dictionary by bill_number
         bills_by_number = {bill['bill_number']: bill for bill in bills}
 
@@ -151,60 +238,71 @@ def main():
 
     # Process bills in batches
     print("\n" + "=" * 80)
-    print(f"BATCH FILTERING (Processing {batch_size} bills per API call)")
+    print(f"BATCH FILTERING (Up to {batch_size} bills per API call, packed by token budget)")
     print("=" * 80)
 
     all_results = []
-    num_batches = (len(bills) + batch_size - 1) // batch_size
-
-    print(f"\nProcessing {len(bills)} bills in {num_batches} batches...")
-
-    for batch_num in range(num_batches):
-        start_idx = batch_num * batch_size
-        end_idx = min(start_idx + batch_size, len(bills))
-        batch_bills = bills[start_idx:end_idx]
-
-        print(f"\n[Batch {batch_num + 1}/{num_batches}] Processing bills {start_idx + 1}-{end_idx}...")
-
-        try:
-            # Convert batch to JSON string
-            batch_json = json.dumps(batch_bills, indent=2)
-
-            # Process batch
-            batch_result = filter_pass.filter_batch(batch_json)
-            batch_results = batch_result.get('results', [])
-
-            print(f"  Received {len(batch_results)} results")
-
-            # Display findings from this batch in real-time
-            batch_relevant = 0
-            for result in batch_results:
-                bill_number = result.get('bill_identifier', 'Unknown')
-                is_relevant = result.get('relevant', False)
-                reason = result.get('reason', 'No reason provided')
 
-                if is_relevant:
-                    batch_relevant += 1
-                    # Get bill info for display
-                    bill = bills_by_number.get(bill_number, {'title': 'Unknown'})
-                    print(f"  ✓ RELEVANT: {bill_number} - {bill['title'][:60]}...")
-                    print(f"    → {reason[:80]}...")
-
-            if batch_relevant > 0:
-                print(f"  Found {batch_relevant} relevant bill(s) in this batch")
-            else:
-                print(f"  No relevant bills in this batch")
-
-            all_results.extend(batch_results)
-
-            # Small delay between batches to avoid rate limiting
-            if batch_num < num_batches - 1:
-                time.sleep(1)
+    # Pack bills into batches by token count, up to batch_size bills each;
+    # change_hash is sync bookkeeping, not useful to the model
+    model_bills = [{k: v for k, v in bill.items() if k != 'change_hash'} for bill in bills]
+    batch_plan = filter_pass.plan_batches(
+        model_bills,
+        max_items=batch_size,
+        input_tokens=filter_config.get('batch_input_tokens', DEFAULT_BATCH_INPUT_TOKENS),
+        tokens_per_result=filter_config.get('tokens_per_result', DEFAULT_TOKENS_PER_RESULT),
+        context_window=filter_config.get('context_window'),
+        max_output_tokens=filter_config.get('max_output_tokens')
+    )
+    num_batches = len(batch_plan)
+
+    print(f"\nProcessing {len(bills)} bills in {num_batches} batches (concurrency={concurrency})...")
+
+    # Batches are checkpointed as they finish; results come back in batch order.
+    # Bills missing from a response are retried in smaller follow-up batches;
+    # a batch with bills still unresolved isn't checkpointed, so --resume retries it
+    journal = AnalysisJournal(storage_provider, f"filter_{input_filename}", resume=args.resume)
+    batch_outcomes = journal.process_many(
+        lambda pending, workers: filter_pass.filter_many(
+            (batch for batch, _ in pending), concurrency=workers, max_attempts=repair_attempts
+        ),
+        (((model_bills[start:end], max_tokens), None) for start, end, max_tokens in batch_plan),
+        concurrency=concurrency
+    )
+
+    unresolved_bills = []
+    for batch_num, ((start_idx, end_idx, _), batch_result) in enumerate(zip(batch_plan, batch_outcomes)):
+        print(f"\n[Batch {batch_num + 1}/{num_batches}] Bills {start_idx + 1}-{end_idx}")
+
+        if 'error' in batch_result:
+            print(f"  ERROR processing batch: {batch_result['error']}")
+            unresolved = batch_result.get('unresolved', [bill['bill_number'] for bill in model_bills[start_idx:end_idx]])
+            unresolved_bills.extend(unresolved)
+            print(f"  No result for: {', '.join(str(bill_number) for bill_number in unresolved)}")
+
+        batch_results = batch_result.get('results', [])
+        print(f"  Received {len(batch_results)} results")
+
+        # Display findings from this batch
+        batch_relevant = 0
+        for result in batch_results:
+            bill_number = result.get('bill_identifier', 'Unknown')
+            is_relevant = result.get('relevant', False)
+            reason = result.get('reason', 'No reason provided')
+
+            if is_relevant:
+                batch_relevant += 1
+                # Get bill info for display
+                bill = bills_by_number.get(bill_number, {'title': 'Unknown'})
+                print(f"  ✓ RELEVANT: {bill_number} - {bill['title'][:60]}...")
+                print(f"    → {reason[:80]}...")
+
+        if batch_relevant > 0:
+            print(f"  Found {batch_relevant} relevant bill(s) in this batch")
+        else:
+            print(f"  No relevant bills in this batch")
 
-        except Exception as e:
-            print(f"  ERROR processing batch: {e}")
-            print(f"  Skipping batch {batch_num + 1}")
-            continue
+        all_results.extend(batch_results)
 
     # Organize results
     print("\n" + "=" * 80)
@@ -241,6 +339,8 @@ def main():
     print("SUMMARY")
     print("=" * 80)
     print(f"Total bills analyzed: {len(all_results)}")
+    if unresolved_bills:
+        print(f"Bills without a result: {len(unresolved_bills)} (run again with --resume to retry them)")
     print(f"Relevant bills: {len(relevant_bills)}")
     print(f"Not relevant bills: {len(not_relevant_bills)}")
 
@@ -283,11 +383,28 @@ def main():
         ]
     }
 
+    if args.dirty_only:
+        output_data = merge_filter_results(storage_provider, input_filename, output_data, bills_by_number)
+
     try:
         storage_provider.save_filtered_results(input_filename, output_data)
         print(f"\n\nResults saved to storage: filter_results_{input_filename}")
     except Exception as e:
         print(f"\n\nERROR saving results: {e}")
+        return
+
+    if args.dirty_only:
+        # Bills found not relevant are done; relevant ones stay dirty until
+        # run_analysis_pass.py has analyzed them
+        processed_ids = [
+            bills_by_number[item['bill']['bill_number']]['bill_id']
+            for item in not_relevant_bills
+            if item['bill']['bill_number'] in bills_by_number
+        ]
+        storage_provider.clear_dirty_bills(input_filename, processed_ids)
+        print(f"Cleared {len(processed_ids)} dirty mark(s) of bills found not relevant")
+        if relevant_bills:
+            print(f"{len(relevant_bills)} relevant bill(s) stay dirty until the analysis pass has run")
 
 if __name__ == "__main__":
     main()
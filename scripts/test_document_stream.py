@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Document Stream Test Script
+Validates streaming base64 decoding of getBillText responses and zero-copy document access.
+"""
+
+import base64
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.document_stream import spool_document_response
+from src.text_extraction import open_document, read_document
+
+# Every byte value, so the base64 text contains '+' and '/'
+DOCUMENT = bytes(range(256)) * 40
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def check(condition, message):
+    """Print the outcome of a check and fail the test if it doesn't hold"""
+    if condition:
+        print_success(message)
+    else:
+        print_error(message)
+    assert condition, message
+
+
+def bill_text_response(encoded: str) -> bytes:
+    """getBillText response body carrying an already encoded document"""
+    return (
+        '{"status": "OK", "text": {"doc_id": 1, "mime": "application/pdf", '
+        f'"doc": "{encoded}", "mime_id": 2}}}}'
+    ).encode('utf-8')
+
+
+def chunked(data: bytes, size: int):
+    """Split a response body into chunks of size bytes"""
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def spool(body: bytes, chunk_size: int):
+    """Spool a response and return (response JSON, document bytes or None)"""
+    result, document = spool_document_response(chunked(body, chunk_size))
+    if document is None:
+        return result, None
+    with document:
+        data = read_document(document.path)
+    check(not os.path.exists(document.path), f"Temp file deleted on close (chunk size {chunk_size})")
+    return result, data
+
+
+def test_decoding():
+    """The document decodes identically whatever the chunk boundaries"""
+    print_header("1. Streaming Base64 Decode")
+
+    encoded = base64.b64encode(DOCUMENT).decode('ascii')
+    # PHP's json_encode escapes '/', and base64 may be wrapped in escaped newlines
+    php_encoded = '\\n'.join(encoded[start:start + 76] for start in range(0, len(encoded), 76)).replace('/', '\\/')
+
+    for label, body in (("plain", bill_text_response(encoded)), ("escaped", bill_text_response(php_encoded))):
+        for chunk_size in (1, 3, 7, 1000, len(body)):
+            result, data = spool(body, chunk_size)
+            check(data == DOCUMENT, f"Document decoded ({label}, chunk size {chunk_size})")
+            check(result["text"]["doc"] == "" and result["text"]["mime"] == "application/pdf" and
+                  result["text"]["mime_id"] == 2, f"Rest of the response parsed ({label}, chunk size {chunk_size})")
+
+    result, data = spool(b'{"status": "ERROR", "alert": {"message": "Unknown bill"}}', 5)
+    check(data is None and result["status"] == "ERROR", "Response without a document")
+
+
+def test_errors():
+    """Broken responses raise ValueError"""
+    print_header("2. Broken Responses")
+
+    encoded = base64.b64encode(DOCUMENT).decode('ascii')
+    for label, body in (
+        ("truncated document", bill_text_response(encoded)[:200]),
+        ("invalid base64", bill_text_response("QUJDR")),
+        ("invalid JSON", b'{"status": "OK", "text": {"doc": ""}')
+    ):
+        try:
+            _, document = spool_document_response(chunked(body, 64))
+            if document:
+                document.close()
+            raised = False
+        except ValueError:
+            raised = True
+        check(raised, f"ValueError for {label}")
+
+
+def test_open_document():
+    """Documents are read from bytes or memory-mapped from files"""
+    print_header("3. Document Access")
+
+    result, document = spool_document_response([bill_text_response(base64.b64encode(DOCUMENT).decode('ascii'))])
+    with document:
+        check(document.size == len(DOCUMENT), "Document size recorded")
+        with open_document(document.path) as stream:
+            check(stream[:256] == DOCUMENT[:256] and len(stream) == len(DOCUMENT), "File is memory-mapped")
+        with open_document(DOCUMENT) as stream:
+            check(stream.read() == DOCUMENT, "Bytes are wrapped in a stream")
+
+    empty = Path(document.path)
+    empty.write_bytes(b'')
+    try:
+        with open_document(str(empty)) as stream:
+            check(stream.read() == b'', "Empty file opens as an empty stream")
+    finally:
+        empty.unlink()
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - Document Stream Test Suite")
+    print("=" * 80)
+
+    try:
+        test_decoding()
+        test_errors()
+        test_open_document()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
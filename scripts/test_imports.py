@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Import Smoke Test Script
+Validates that every module under src/ and every pipeline script imports cleanly,
+so a helper removed from one module can't silently break another.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def import_all(package: str, paths) -> list:
+    """Import each module file as package.name, returning (module, error) for failures"""
+    failures = []
+    for path in sorted(paths):
+        module_name = f"{package}.{path.stem}"
+        try:
+            importlib.import_module(module_name)
+            print_success(f"Imported {module_name}")
+        except Exception as e:
+            print_error(f"Could not import {module_name}: {type(e).__name__}: {e}")
+            failures.append((module_name, e))
+    return failures
+
+
+def test_src_imports():
+    """Every module under src/ imports"""
+    print_header("1. src/ Modules")
+    failures = import_all('src', (PROJECT_ROOT / 'src').glob('*.py'))
+    assert not failures, f"Modules failed to import: {[name for name, _ in failures]}"
+
+
+def test_script_imports():
+    """Every pipeline script imports (scripts run their work under __main__ only)"""
+    print_header("2. Pipeline Scripts")
+    scripts = [path for path in (PROJECT_ROOT / 'scripts').glob('*.py') if not path.stem.startswith('test_')]
+    failures = import_all('scripts', scripts)
+    assert not failures, f"Scripts failed to import: {[name for name, _ in failures]}"
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - Import Smoke Test")
+    print("=" * 80)
+
+    try:
+        test_src_imports()
+        test_script_imports()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache Test Script
+Validates cache keying, JSON-only caching, expiry, eviction and storage reuse of the LLM response cache.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database_storage import DatabaseStorage
+from src.llm_cache import CachedProvider, SQLiteCompletionCache, is_json_response, make_cache_key
+from src.llm_provider import LLMProvider
+from src.memory_cache import MemoryCachedStorage
+
+MESSAGES = [
+    {"role": "system", "content": "You are a legislative analyst."},
+    {"role": "user", "content": "Is SB001 relevant?"}
+]
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def check(condition, message):
+    """Print the outcome of a check and fail the test if it doesn't hold"""
+    if condition:
+        print_success(message)
+    else:
+        print_error(message)
+    assert condition, message
+
+
+class CountingProvider(LLMProvider):
+    """Provider returning canned replies in order, counting calls"""
+
+    def __init__(self, replies):
+        super().__init__()
+        self.replies = list(replies)
+        self.calls = 0
+
+    def chat_completion(self, messages, temperature=0.3, max_tokens=2000, timeout=90, **kwargs):
+        self.calls += 1
+        return self.replies.pop(0)
+
+    def get_provider_name(self):
+        return "test/model"
+
+
+def test_cache_keys():
+    """Keys cover everything that changes the response, and only that"""
+    print_header("1. Cache Keys")
+
+    key = make_cache_key("portkey/gpt-4o-mini", MESSAGES, 0.3, 200)
+    check(key == make_cache_key("portkey/gpt-4o-mini", [dict(m) for m in MESSAGES], 0.3, 200),
+          "Same request gives the same key")
+    check(len(key) == 64, "Key is a hex SHA-256 digest")
+    check(key != make_cache_key("portkey/gpt-4o", MESSAGES, 0.3, 200), "Model is part of the key")
+    check(key != make_cache_key("portkey/gpt-4o-mini", MESSAGES, 0.0, 200), "Temperature is part of the key")
+    check(key != make_cache_key("portkey/gpt-4o-mini", MESSAGES, 0.3, 400), "max_tokens is part of the key")
+    check(key != make_cache_key("portkey/gpt-4o-mini", MESSAGES[:1], 0.3, 200), "Messages are part of the key")
+    check(key != make_cache_key("portkey/gpt-4o-mini", MESSAGES, 0.3, 200, response_format="json"),
+          "Extra request parameters are part of the key")
+    check(make_cache_key("p", MESSAGES, 0.3, 200, a=1, b=2) == make_cache_key("p", MESSAGES, 0.3, 200, b=2, a=1),
+          "Parameter order doesn't matter")
+
+
+def test_json_only():
+    """Only replies the passes can parse are cached by default"""
+    print_header("2. JSON-only Caching")
+
+    check(is_json_response('{"relevant": true}'), "Plain JSON")
+    check(is_json_response('```json\n{"relevant": true}\n```'), "JSON in a markdown code fence")
+    check(not is_json_response('{"relevant": tr'), "Truncated JSON")
+    check(not is_json_response('Sure! Here is the analysis'), "Prose")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        backend = SQLiteCompletionCache(str(Path(temp_dir) / 'llm_cache.sqlite3'))
+
+        provider = CountingProvider(['{"relevant": tr', '{"relevant": true}', 'unused'])
+        cached = CachedProvider(provider, backend)
+        check(cached.chat_completion(MESSAGES) == '{"relevant": tr', "Invalid reply is returned to the caller")
+        check(cached.chat_completion(MESSAGES) == '{"relevant": true}', "Invalid reply isn't served from the cache")
+        check(cached.chat_completion(MESSAGES) == '{"relevant": true}', "Valid reply is served from the cache")
+        check(provider.calls == 2 and cached.hits == 1 and cached.misses == 2, "Hits and misses are counted")
+
+        provider = CountingProvider(['not json', 'unused'])
+        cached = CachedProvider(provider, backend, json_only=False)
+        cached.chat_completion(MESSAGES, max_tokens=50)
+        check(cached.chat_completion(MESSAGES, max_tokens=50) == 'not json' and provider.calls == 1,
+              "json_only=False caches any reply")
+
+
+def test_expiry_and_eviction():
+    """TTL expiry and size-based eviction in the SQLite backend"""
+    print_header("3. Expiry and Eviction")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        backend = SQLiteCompletionCache(str(Path(temp_dir) / 'llm_cache.sqlite3'))
+
+        backend.set('expiring', 'test/model', '{}', ttl_seconds=0.01)
+        backend.set('kept', 'test/model', '{}', ttl_seconds=None)
+        time.sleep(0.02)
+        check(backend.get('expiring') is None, "Expired entry is a miss")
+        check(backend.get('kept') == '{}', "Entry without a TTL is kept")
+
+        for index in range(5):
+            backend.set(f'entry{index}', 'test/model', 'x' * 100, ttl_seconds=None)
+        backend.evict(max_bytes=250)
+        remaining = [index for index in range(5) if backend.get(f'entry{index}') is not None]
+        check(len(remaining) <= 2, f"Eviction keeps the cache within max_bytes ({len(remaining)} entries left)")
+
+
+def test_storage_reuse():
+    """The database backend reuses the run's storage provider behind the memory tier"""
+    print_header("4. Storage Provider Reuse")
+
+    # Not connected: from_config only has to recognise it
+    database = DatabaseStorage.__new__(DatabaseStorage)
+    config = {"llm": {"response_cache": {"backend": "database"}}}
+    cached = CachedProvider.from_config(CountingProvider([]), config, MemoryCachedStorage(database))
+    check(cached.backend.storage_provider is database, "DatabaseStorage is unwrapped from MemoryCachedStorage and reused")
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - LLM Response Cache Test Suite")
+    print("=" * 80)
+
+    try:
+        test_cache_keys()
+        test_json_only()
+        test_expiry_and_eviction()
+        test_storage_reuse()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
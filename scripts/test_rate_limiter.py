@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Test Script
+Validates token buckets, rate limit header parsing and retries of the LLM rate limit layer.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm_provider import LLMProvider, LLMProviderError
+from src.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    RateLimitedProvider,
+    TokenBucket,
+    parse_duration,
+    parse_retry_after
+)
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def check(condition, message):
+    """Print the outcome of a check and fail the test if it doesn't hold"""
+    if condition:
+        print_success(message)
+    else:
+        print_error(message)
+    assert condition, message
+
+
+class FlakyProvider(LLMProvider):
+    """Provider failing with the given errors before it answers"""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+
+    def chat_completion(self, messages, temperature=0.3, max_tokens=2000, timeout=90, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return '{"ok": true}'
+
+    def get_provider_name(self):
+        return "test/flaky"
+
+
+def test_token_bucket():
+    """Token bucket draws, refills and blocking"""
+    print_header("1. Token Bucket")
+
+    bucket = TokenBucket(rate=100.0, capacity=10)
+    check(bucket.acquire(10) == 0.0, "Full bucket hands out its capacity without waiting")
+
+    start = time.monotonic()
+    bucket.acquire(1)
+    check(time.monotonic() - start >= 0.005, "Empty bucket waits for the refill")
+
+    bucket = TokenBucket(rate=100.0, capacity=10)
+    check(bucket.acquire(50) == 0.0, "Requests above capacity are clamped to it instead of blocking forever")
+
+    bucket = TokenBucket(rate=1000.0, capacity=10)
+    bucket.sync_remaining(0)
+    check(bucket._tokens == 0, "sync_remaining lowers the count to the server's remaining quota")
+    bucket.sync_remaining(100)
+    check(bucket._tokens <= 10, "sync_remaining never raises the count above capacity")
+
+    bucket = TokenBucket(rate=1000.0, capacity=10)
+    bucket.block_for(0.05)
+    check(bucket.acquire(1) >= 0.04, "block_for holds tokens back for the requested time")
+
+    bucket.set_rate(2.0)
+    check(bucket.rate == 2.0 and bucket.capacity == 120.0, "set_rate resets capacity to one minute of refill")
+
+
+def test_concurrency_limiter():
+    """AIMD limit growth and backoff"""
+    print_header("2. Adaptive Concurrency")
+
+    limiter = AdaptiveConcurrencyLimiter(initial=8, min_limit=1, max_limit=10, increase_after=2)
+    limiter.on_success()
+    limiter.on_success()
+    check(limiter.limit == 9, "Limit grows by one after a streak of successes")
+
+    limiter.on_throttle()
+    check(limiter.limit == 4, "Limit halves on throttling")
+    limiter.on_throttle()
+    check(limiter.limit == 4, "A burst of throttles within the cooldown counts once")
+
+
+def test_header_parsing():
+    """Retry-After and x-ratelimit-reset parsing"""
+    print_header("3. Header Parsing")
+
+    check(parse_duration("12") == 12.0, "Plain seconds")
+    check(parse_duration("20ms") == 0.02, "Milliseconds")
+    check(parse_duration("6m0s") == 360.0, "Minutes and seconds")
+    check(parse_duration("1h2m3s") == 3723.0, "Hours, minutes and seconds")
+    check(parse_duration("soon") is None and parse_duration(None) is None, "Unparseable values give None")
+
+    check(parse_retry_after({"Retry-After": "3"}) == 3.0, "Retry-After in seconds")
+    check(parse_retry_after({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5, "retry-after-ms takes precedence")
+    http_date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    check(25 <= parse_retry_after({"Retry-After": http_date}) <= 31, "Retry-After as an HTTP date")
+    check(parse_retry_after({}) is None, "No header gives None")
+
+
+def test_retries():
+    """Retrying transient failures and learning limits from headers"""
+    print_header("4. Retries")
+
+    flaky = FlakyProvider([
+        LLMProviderError("throttled", status_code=429, headers={"retry-after-ms": "1"}, retryable=True),
+        LLMProviderError("server error", status_code=500, retryable=True)
+    ])
+    provider = RateLimitedProvider(flaky, max_retries=3, base_delay=0.001, max_delay=0.01)
+    check(provider.chat_completion([{"role": "user", "content": "hi"}]) == '{"ok": true}',
+          "Retryable failures are retried until the call succeeds")
+    check(flaky.calls == 3, "One call per attempt")
+
+    flaky = FlakyProvider([LLMProviderError("bad request", status_code=400)])
+    provider = RateLimitedProvider(flaky, max_retries=3, base_delay=0.001)
+    try:
+        provider.chat_completion([{"role": "user", "content": "hi"}])
+        raised = False
+    except LLMProviderError:
+        raised = True
+    check(raised and flaky.calls == 1, "Non-retryable errors are raised without retrying")
+
+    provider = RateLimitedProvider(FlakyProvider([]))
+    provider._update_from_headers({
+        "x-ratelimit-limit-requests": "600",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-limit-tokens": "60000"
+    })
+    check(provider.request_bucket.rate == 10.0, "Request limit learned from x-ratelimit headers")
+    check(provider.token_bucket._tokens == 0, "Token bucket synced to the remaining quota")
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - Rate Limiter Test Suite")
+    print("=" * 80)
+
+    try:
+        test_token_bucket()
+        test_concurrency_limiter()
+        test_header_parsing()
+        test_retries()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
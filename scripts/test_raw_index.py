@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Raw Index Test Script
+Validates the bill number index of raw data files: byte spans, fingerprints
+and indexed lookups through local file storage.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.local_file_storage import LocalFileStorage
+from src.raw_index import RAW_INDEX_VERSION, build_raw_index, index_bills, new_raw_index
+
+# Braces, brackets and escaped quotes inside strings, and non-ASCII text
+# (offsets are in bytes)
+BILLS = [
+    {"bill_id": 1, "bill_number": "SB001", "title": "Hospice {care} [pilot]", "state": "CT"},
+    {"bill_id": 2, "bill_number": "SB002", "title": "The \"Right to Try\" Act – soins palliatifs", "state": "CT"},
+    {"bill_id": 3, "bill_number": "SB003", "title": "Nested", "sponsors": [{"name": "A"}, {"name": "B"}]},
+    {"bill_id": 4, "bill_number": "SB001", "title": "Duplicate number"}
+]
+
+LAYOUTS = {
+    "list": BILLS,
+    "bills": {"bills": BILLS},
+    "masterlist": {"summary": {"masterlist": BILLS}},
+    "dict": {str(bill["bill_id"]): bill for bill in BILLS}
+}
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def check(condition, message):
+    """Print the outcome of a check and fail the test if it doesn't hold"""
+    if condition:
+        print_success(message)
+    else:
+        print_error(message)
+    assert condition, message
+
+
+def test_build_index():
+    """Spans in the index parse back to the indexed bills"""
+    print_header("1. Building the Index")
+
+    for layout, data in LAYOUTS.items():
+        for indent in (None, 2):
+            payload = json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+            bills = build_raw_index(payload)
+
+            check(sorted(bills) == ["SB001", "SB002", "SB003"], f"Every bill number indexed ({layout}, indent={indent})")
+            spans_match = all(
+                json.loads(payload[offset:offset + length]) == next(bill for bill in BILLS if bill["bill_id"] == bill_id)
+                for bill_id, offset, length in bills.values()
+            )
+            check(spans_match, f"Byte spans parse to the bills ({layout}, indent={indent})")
+            check(bills["SB001"][0] == 1, f"First bill with a number wins ({layout}, indent={indent})")
+
+    check(build_raw_index(b'"not bills"') == {}, "Unsupported layout gives an empty index")
+
+
+def test_fingerprints():
+    """Stored indexes are only used for the raw file they were built from"""
+    print_header("2. Fingerprints")
+
+    index = new_raw_index("100:1", {"SB001": [1, 0, 10]})
+    check(index_bills(index, "100:1") == {"SB001": [1, 0, 10]}, "Matching fingerprint")
+    check(index_bills(index, "100:2") is None, "Changed raw file")
+    check(index_bills({**index, "version": RAW_INDEX_VERSION - 1}, "100:1") is None, "Older index version")
+    check(index_bills(None, "100:1") is None, "Missing index")
+
+
+def test_storage_lookup():
+    """Indexed lookups through LocalFileStorage"""
+    print_header("3. Indexed Lookups")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage_provider = LocalFileStorage({'data_directory': temp_dir})
+        storage_provider.save_raw_data("test_bills", LAYOUTS["masterlist"])
+
+        check(storage_provider.get_bill_by_number("SB002", "test_bills") == BILLS[1], "Bill read from its span")
+        check(storage_provider.bill_exists_in_raw("SB003", "test_bills.json"), "Lookup with a .json filename")
+        check(storage_provider.get_bill_by_number("HB999", "test_bills") is None, "Unknown bill number")
+        check(not storage_provider.bill_exists_in_raw("SB001", "missing_file"), "Missing raw file")
+
+        # A raw file replaced by hand, with no index written for it
+        time.sleep(0.01)
+        replaced = [dict(BILLS[0], title="Amended"), {"bill_id": 9, "bill_number": "HB100", "title": "New"}]
+        raw_file = Path(temp_dir) / 'raw' / 'test_bills.json'
+        raw_file.write_text(json.dumps(replaced, ensure_ascii=False), encoding='utf-8')
+
+        fresh = LocalFileStorage({'data_directory': temp_dir})
+        check(fresh.get_bill_by_number("SB001", "test_bills")["title"] == "Amended", "Stale index rebuilt from the file")
+        check(fresh.bill_exists_in_raw("HB100", "test_bills") and not fresh.bill_exists_in_raw("SB002", "test_bills"),
+              "Rebuilt index matches the new contents")
+        check(storage_provider.get_bill_by_number("HB100", "test_bills") == replaced[1],
+              "In-memory index of another instance notices the change")
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - Raw Index Test Suite")
+    print("=" * 80)
+
+    try:
+        test_build_index()
+        test_fingerprints()
+        test_storage_lookup()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
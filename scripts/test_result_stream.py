@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Result Stream Test Script
+Validates the JSONL result format: record encoding, compressed streams and
+round-trips of filter and analysis results through local file storage.
+"""
+
+import gzip
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.local_file_storage import LocalFileStorage
+from src.result_stream import compression_for_name, encode_record, iter_records, validate_result_format
+
+RECORDS = [
+    {"bill_number": "SB001", "title": "Hospice care – pédiatrie", "relevant": True},
+    {"bill_number": "SB002", "title": "Road repairs", "relevant": False}
+]
+
+TEST_FILTER_RESULTS = {
+    "summary": {
+        "total_analyzed": 2,
+        "relevant_count": 1,
+        "not_relevant_count": 1,
+        "source_file": "test_bills"
+    },
+    "relevant_bills": [{"bill_number": "SB001", "reason": "Hospice care"}],
+    "not_relevant_bills": [{"bill_number": "SB002", "reason": "Transportation"}]
+}
+
+TEST_ANALYSIS_RESULTS = [
+    {"bill": {"bill_number": "SB001"}, "analysis": {"is_relevant": True, "summary": "Hospice"}},
+    {"bill": {"bill_number": "SB002"}, "analysis": {"is_relevant": False}}
+]
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def check(condition, message):
+    """Print the outcome of a check and fail the test if it doesn't hold"""
+    if condition:
+        print_success(message)
+    else:
+        print_error(message)
+    assert condition, message
+
+
+def test_records():
+    """Encoding and decoding of record streams"""
+    print_header("1. Record Streams")
+
+    for compression in (None, 'gzip'):
+        data = b"".join(encode_record(record, compression) for record in RECORDS)
+        check(list(iter_records(io.BytesIO(data), compression)) == RECORDS,
+              f"Records round-trip ({compression or 'uncompressed'}, one member per record)")
+
+    data = b"".join(encode_record(record) for record in RECORDS) + b'{"bill_number": "SB0'
+    check(list(iter_records(io.BytesIO(data))) == RECORDS, "Truncated last line is skipped")
+
+    data = b"".join(encode_record(record, 'gzip') for record in RECORDS)
+    truncated = data + gzip.compress(b'{"bill_number": "SB003"}\n')[:15]
+    check(list(iter_records(io.BytesIO(truncated), 'gzip')) == RECORDS, "Truncated gzip member is skipped")
+
+    check(compression_for_name("analysis_run.jsonl.gz") == 'gzip', "gzip inferred from the name")
+    check(compression_for_name("analysis_run.jsonl.zst") == 'zstd', "zstd inferred from the name")
+    check(compression_for_name("analysis_run.jsonl") is None, "Uncompressed JSONL inferred from the name")
+
+    for result_format, compression in (('csv', None), ('jsonl', 'lz4')):
+        try:
+            validate_result_format(result_format, compression)
+            raised = False
+        except ValueError:
+            raised = True
+        check(raised, f"Unknown setting rejected ({result_format}, {compression})")
+
+
+def test_storage_round_trip():
+    """Filter and analysis results saved as JSONL load back unchanged"""
+    print_header("2. Storage Round-trip")
+
+    for compression in (None, 'gzip'):
+        label = compression or 'uncompressed'
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage_provider = LocalFileStorage({
+                'data_directory': temp_dir,
+                'result_format': 'jsonl',
+                'compression': compression
+            })
+
+            storage_provider.save_filtered_results("test_run", TEST_FILTER_RESULTS)
+            loaded = storage_provider.load_filtered_results("test_run")
+            check(loaded["relevant_bills"] == TEST_FILTER_RESULTS["relevant_bills"] and
+                  loaded["not_relevant_bills"] == TEST_FILTER_RESULTS["not_relevant_bills"],
+                  f"Filter results round-trip ({label})")
+            check(loaded["summary"]["relevant_count"] == 1 and loaded["summary"]["not_relevant_count"] == 1,
+                  f"Filter summary rebuilt from the records ({label})")
+
+            for result in TEST_ANALYSIS_RESULTS:
+                storage_provider.append_analysis_result("test_run", result)
+            check(list(storage_provider.iter_analysis_results("test_run")) == TEST_ANALYSIS_RESULTS,
+                  f"Streamed analysis results read back in order ({label})")
+
+            relevant, not_relevant = storage_provider.load_analysis_results("test_run")
+            check(relevant == TEST_ANALYSIS_RESULTS[:1] and not_relevant == TEST_ANALYSIS_RESULTS[1:],
+                  f"Analysis results split by relevance ({label})")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        LocalFileStorage({'data_directory': temp_dir, 'result_format': 'jsonl'}) \
+            .save_filtered_results("test_run", TEST_FILTER_RESULTS)
+        storage_provider = LocalFileStorage({'data_directory': temp_dir})
+        storage_provider.save_filtered_results("test_run", {**TEST_FILTER_RESULTS, "not_relevant_bills": []})
+        check(storage_provider.load_filtered_results("test_run")["not_relevant_bills"] == [],
+              "Saving in the other format replaces the stale file")
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - Result Stream Test Suite")
+    print("=" * 80)
+
+    try:
+        test_records()
+        test_storage_round_trip()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Text Reduction Test Script
+Validates section splitting, relevance-aware reduction and chunking of long bill texts.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.text_reduction import TextReducer, chunk_text, focus_terms, split_sections
+
+FILLER = "The commissioner shall adopt regulations concerning highway maintenance schedules. " * 20
+
+BILL_TEXT = "\n".join([
+    "AN ACT CONCERNING HEALTH CARE.",
+    "Be it enacted by the Senate and House of Representatives in General Assembly convened:",
+    f"Section 1. {FILLER}",
+    "Sec. 2. Each hospital shall offer palliative care and hospice referrals to patients "
+    "with a serious illness, and record advance directives.",
+    f"Sec. 3. {FILLER}",
+    "Sec. 4. The department shall fund caregiver respite programs for families of dementia patients.",
+    f"Sec. 5. {FILLER}"
+])
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def check(condition, message):
+    """Print the outcome of a check and fail the test if it doesn't hold"""
+    if condition:
+        print_success(message)
+    else:
+        print_error(message)
+    assert condition, message
+
+
+class WordEstimator:
+    """Counts words as tokens, so budgets don't depend on whether tiktoken is installed"""
+
+    exact = False
+
+    def count(self, text):
+        return len(text.split())
+
+
+def test_split_sections():
+    """Sections split at headings, otherwise at paragraphs"""
+    print_header("1. Section Splitting")
+
+    sections = split_sections(BILL_TEXT)
+    check(len(sections) == 6, f"Preamble plus five numbered sections ({len(sections)} found)")
+    check(sections[0].startswith("AN ACT") and sections[2].startswith("Sec. 2."), "Sections start at their headings")
+
+    paragraphs = split_sections("First paragraph.\n\nSecond paragraph.\n  \nThird paragraph.")
+    check([paragraph.strip() for paragraph in paragraphs] == ["First paragraph.", "Second paragraph.", "Third paragraph."],
+          "Text without headings splits at blank lines")
+
+    check(focus_terms("Relevant because it concerns hospice and palliative care") == ["concerns", "hospice", "palliative"],
+          "Focus terms drop stopwords and short words")
+    check(focus_terms(None) == [], "No focus, no terms")
+
+
+def test_reduce():
+    """Over-budget text keeps the opening and the relevant sections"""
+    print_header("2. Reduction")
+
+    estimator = WordEstimator()
+    reducer = TextReducer(token_budget=100, estimator=estimator)
+    reduced, metadata = reducer.reduce(BILL_TEXT, focus="Hospital palliative care referrals")
+
+    check("AN ACT CONCERNING HEALTH CARE." in reduced, "Opening section kept")
+    check("palliative care and hospice referrals" in reduced and "caregiver respite" in reduced,
+          "Relevant sections kept")
+    check("highway maintenance" not in reduced, "Unrelated sections dropped")
+    check("section(s) omitted as not relevant to palliative care" in reduced, "Dropped sections marked")
+    check(estimator.count(reduced) <= 100 + 30, "Reduced text within the budget (plus omission markers)")
+    check(metadata["dropped_count"] == 3 and metadata["kept_sections"] == 3, "Metadata counts sections")
+    check("palliative" in metadata["matched_keywords"] and "hospice" in metadata["matched_keywords"],
+          "Metadata lists matched keywords")
+    check([section["heading"][:6] for section in metadata["dropped_sections"]] == ["Sectio", "Sec. 3", "Sec. 5"],
+          "Metadata lists dropped sections")
+
+    text, metadata = TextReducer(token_budget=100000, estimator=estimator).reduce(BILL_TEXT)
+    check(text == BILL_TEXT and metadata is None, "Text within budget passes through unchanged")
+
+    unrelated = "\n\n".join(f"Paragraph {index}. {FILLER}" for index in range(5))
+    reduced, metadata = TextReducer(token_budget=300, estimator=estimator).reduce(unrelated)
+    check(reduced.startswith("Paragraph 0.") and metadata["kept_sections"] >= 1,
+          "Without matches the leading sections are kept")
+
+    reduced, metadata = TextReducer(token_budget=250, keywords=["highway"], estimator=estimator).reduce(BILL_TEXT)
+    check(metadata["matched_keywords"] == ["highway"], "Configured keywords replace the defaults")
+
+
+def test_chunk_text():
+    """Chunks cover the whole text in order, within the chunk size"""
+    print_header("3. Chunking")
+
+    estimator = WordEstimator()
+    chunks = chunk_text(BILL_TEXT, 150, estimator)
+    check(len(chunks) > 1, f"Long text split into {len(chunks)} chunks")
+    check(all(estimator.count(chunk) <= 150 for chunk in chunks), "Every chunk within the chunk size")
+    check(" ".join(" ".join(chunks).split()) == " ".join(BILL_TEXT.split()), "Chunks cover the text in order")
+
+    one_line = " ".join(["word"] * 1000)
+    chunks = chunk_text(one_line, 100, estimator)
+    check(all(estimator.count(chunk) <= 100 for chunk in chunks) and
+          sum(estimator.count(chunk) for chunk in chunks) == 1000, "Overlong line cut at spaces")
+    check(chunk_text("Short bill.", 100, estimator) == ["Short bill."], "Short text is one chunk")
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - Text Reduction Test Suite")
+    print("=" * 80)
+
+    try:
+        test_split_sections()
+        test_reduce()
+        test_chunk_text()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
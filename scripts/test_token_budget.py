@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Token Budget Test Script
+Validates model limit lookup and token-budgeted packing of filter pass batches.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai_filter_pass import BATCH_MAX_TOKENS, AIFilterPass
+from src.token_budget import (
+    CONTEXT_SAFETY_MARGIN,
+    RESPONSE_OVERHEAD_TOKENS,
+    TokenBudgetBatcher,
+    TokenEstimator,
+    is_known_model,
+    model_limits
+)
+
+
+def print_header(title):
+    """Print formatted section header"""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_success(message):
+    """Print success message"""
+    print(f"✅ {message}")
+
+
+def print_error(message):
+    """Print error message"""
+    print(f"❌ {message}")
+
+
+def check(condition, message):
+    """Print the outcome of a check and fail the test if it doesn't hold"""
+    if condition:
+        print_success(message)
+    else:
+        print_error(message)
+    assert condition, message
+
+
+class NamedProvider:
+    """Provider stand-in: plan_batches only needs the name"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def get_provider_name(self):
+        return self.name
+
+
+def test_model_limits():
+    """Limits looked up from the model name, or configured"""
+    print_header("1. Model Limits")
+
+    check(model_limits("portkey/gpt-4o-mini") == (128000, 16384), "gpt-4o-mini through Portkey")
+    check(model_limits("ollama/llama3.1:8b-instruct") == (131072, 8192), "Longest matching prefix wins")
+    check(model_limits("portkey/gpt-4o-mini", 32000, 1000) == (32000, 1000), "Configured limits take precedence")
+    check(model_limits("gpt-4", max_output_tokens=100000) == (8192, 8192), "Completion limit capped at the window")
+    check(model_limits("azure/my-deployment") == (None, None), "Unknown model limits are unknown")
+    check(model_limits("azure/my-deployment", 64000) == (64000, None), "Only the configured limit is known")
+    check(is_known_model("portkey/gpt-4o") and not is_known_model("azure/my-deployment"), "is_known_model")
+
+    estimator = TokenEstimator("gpt-4o-mini")
+    check(0 < estimator.count("An Act Concerning Hospice Care") < 30,
+          f"Token estimate ({'tiktoken' if estimator.exact else 'characters per token'})")
+
+
+def test_batcher():
+    """Items packed by input budget, completion size and context window"""
+    print_header("2. Token Budget Batcher")
+
+    batcher = TokenBudgetBatcher(
+        context_window=100000, max_output_tokens=100000, prompt_tokens=500,
+        input_budget=1000, tokens_per_result=100
+    )
+    check(batcher.plan([300] * 10) == [(0, 3), (3, 6), (6, 9), (9, 10)], "Batches closed at the input budget")
+    check(batcher.plan([]) == [], "No items, no batches")
+    check(batcher.plan([5000, 100, 100]) == [(0, 1), (1, 3)], "Oversized item sent on its own")
+    check(batcher.max_tokens_for(3) == RESPONSE_OVERHEAD_TOKENS + 300, "Completion sized from the item count")
+
+    batcher = TokenBudgetBatcher(
+        context_window=100000, max_output_tokens=RESPONSE_OVERHEAD_TOKENS + 500, prompt_tokens=500,
+        input_budget=100000, tokens_per_result=100, max_items=20
+    )
+    check(batcher.max_items == 5, "Items per batch capped by the completion limit")
+    check(batcher.plan([10] * 12) == [(0, 5), (5, 10), (10, 12)], "Batches closed at the item cap")
+
+    window = 500 + 800 + RESPONSE_OVERHEAD_TOKENS + 200 + CONTEXT_SAFETY_MARGIN
+    batcher = TokenBudgetBatcher(
+        context_window=window, max_output_tokens=10000, prompt_tokens=500,
+        input_budget=100000, tokens_per_result=100
+    )
+    check(batcher.plan([400] * 3) == [(0, 2), (2, 3)], "Batches closed at the context window")
+
+    batcher = TokenBudgetBatcher(
+        context_window=None, max_output_tokens=10000, prompt_tokens=500,
+        input_budget=100000, tokens_per_result=100
+    )
+    check(batcher.plan([400] * 3) == [(0, 3)], "Context window not checked when unknown")
+
+
+def test_plan_batches():
+    """AIFilterPass.plan_batches covers every bill in order"""
+    print_header("3. Filter Pass Batch Plan")
+
+    bills = [{"bill_number": f"HB{index}", "title": "An Act Concerning Hospice Care " * (index % 5 + 1)}
+             for index in range(300)]
+
+    for name in ("portkey/gpt-4o-mini", "azure/my-deployment"):
+        filter_pass = AIFilterPass(provider=NamedProvider(name), filter_prompt="Filter these bills.")
+        plan = filter_pass.plan_batches(bills, max_items=100, input_tokens=4000)
+
+        covered = [index for start, end, _ in plan for index in range(start, end)]
+        check(covered == list(range(len(bills))), f"Batches cover every bill once, in order ({name})")
+        check(all(end - start <= 100 for start, end, _ in plan), f"max_items respected ({name})")
+
+    check(all(max_tokens <= BATCH_MAX_TOKENS for _, _, max_tokens in plan),
+          "Unknown model's completions capped at BATCH_MAX_TOKENS")
+    plan = filter_pass.plan_batches(bills, max_items=100, input_tokens=4000, max_output_tokens=2000)
+    check(all(max_tokens <= 2000 for _, _, max_tokens in plan), "Configured completion limit respected")
+
+
+def main():
+    """Main test execution"""
+    print("\n" + "=" * 80)
+    print("  LegiScan Bill Analysis Pipeline - Token Budget Test Suite")
+    print("=" * 80)
+
+    try:
+        test_model_limits()
+        test_batcher()
+        test_plan_batches()
+    except AssertionError:
+        print("\n  TEST SUITE: ❌ FAILED")
+        sys.exit(1)
+
+    print("\n  TEST SUITE: ✅ PASSED")
+
+
+if __name__ == "__main__":
+    main()
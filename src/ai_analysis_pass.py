@@ -10,15 +10,18 @@ import json
 import logging
 import os
 import time
-import base64
-import io
-from typing import Any, Dict, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from PyPDF2 import PdfReader
-from bs4 import BeautifulSoup
-from docx import Document
 
+from src.document_stream import STREAM_CHUNK_SIZE, DocumentFile, spool_document_response
 from src.llm_provider import LLMProvider, create_llm_provider
+from src.memory_cache import MemoryCachedStorage
+from src.text_extraction import DEFAULT_PDF_PAGES_PER_CHUNK, DocumentSource, TextExtractionService
+from src.text_reduction import DEFAULT_MAX_SECTION_TOKENS, TextReducer, chunk_text
+from src.token_budget import CONTEXT_SAFETY_MARGIN, TokenEstimator, is_known_model, model_limits
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -29,6 +32,17 @@ CONFIG_FILE = PROJECT_ROOT / 'config.json'
 PROMPTS_DIR = PROJECT_ROOT / 'prompts'
 LEGISCAN_API_BASE = "https://api.legiscan.com/"
 
+# Tokens of the prompt taken by bill metadata (title, sponsors, ...) rather
+# than the bill text, when sizing the bill text budget from the context window
+BILL_METADATA_TOKENS = 1000
+
+# analysis_mode values: one LLM call per bill, or for bill text longer than
+# map_chunk_tokens one call per chunk (map) plus one merging call (reduce)
+ANALYSIS_MODES = ('single', 'map_reduce')
+DEFAULT_MAP_CHUNK_TOKENS = 8000
+DEFAULT_MAP_CONCURRENCY = 4
+MAP_MAX_TOKENS = 1000
+
 
 class AIAnalysisPass:
     """
@@ -50,7 +64,16 @@ class AIAnalysisPass:
         api_delay: float = 0.0,
         storage_provider=None,
         provider: Optional[LLMProvider] = None,
-        config: Optional[Dict] = None
+        config: Optional[Dict] = None,
+        extraction_workers: int = 0,
+        pdf_pages_per_chunk: int = DEFAULT_PDF_PAGES_PER_CHUNK,
+        extractors: Optional[Dict[str, str]] = None,
+        max_text_tokens: Optional[int] = None,
+        relevance_keywords: Optional[List[str]] = None,
+        context_window: Optional[int] = None,
+        analysis_mode: str = 'single',
+        map_chunk_tokens: int = DEFAULT_MAP_CHUNK_TOKENS,
+        map_concurrency: int = DEFAULT_MAP_CONCURRENCY
     ):
         """
         Initialize analysis pass processor.
@@ -69,6 +92,21 @@ class AIAnalysisPass:
             storage_provider: StorageProvider instance for caching (optional)
             provider: LLMProvider instance (new preferred method)
             config: Configuration dict for creating provider
+            extraction_workers: Processes for document text extraction (default: 0, extract in-thread)
+            pdf_pages_per_chunk: Pages per worker task when splitting large PDFs
+            extractors: Extractor engine to pin per document format, e.g. {"pdf": "pypdf2"}
+                (default: fastest installed engine)
+            max_text_tokens: Bill text beyond this many tokens is reduced to its
+                most relevant sections (default: what fits the model's context
+                window, or no reduction if the window is unknown; 0 disables it)
+            relevance_keywords: Keywords marking relevant sections when reducing
+                bill text (default: palliative care terms, see src/text_reduction.py)
+            context_window: Model context window (default: looked up from the model name,
+                unknown for other models)
+            analysis_mode: 'single' (one call per bill) or 'map_reduce' (bill text
+                longer than map_chunk_tokens is analyzed in chunks, then merged)
+            map_chunk_tokens: Largest chunk of bill text per map call
+            map_concurrency: Chunks of one bill analyzed at once
         """
         # Store parameters for LLM calls
         self.temperature = temperature
@@ -78,11 +116,17 @@ class AIAnalysisPass:
         self.api_delay = api_delay
         self.storage_provider = storage_provider
 
+        # Per-thread scratch state so analyze_data can run from worker threads
+        self._thread_state = threading.local()
+
+        # CPU-bound document parsing, optionally in a process pool
+        self.text_extractor = TextExtractionService(extraction_workers, pdf_pages_per_chunk, extractors)
+
         # Use provided provider, or create one from legacy parameters
         if provider:
             self.provider = provider
         elif config:
-            self.provider = create_llm_provider(config=config)
+            self.provider = create_llm_provider(config=config, storage_provider=storage_provider)
         else:
             # Legacy mode: create provider from individual parameters
             self.provider = create_llm_provider(
@@ -94,12 +138,61 @@ class AIAnalysisPass:
         self.analysis_prompt = analysis_prompt or self._load_analysis_prompt()
         self.system_prompt = system_prompt or self._load_system_prompt()
 
+        if analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode '{analysis_mode}' (expected one of: {', '.join(ANALYSIS_MODES)})")
+        self.analysis_mode = analysis_mode
+        self.map_concurrency = max(1, int(map_concurrency))
+        self.map_prompt = self._load_map_prompt() if analysis_mode == 'map_reduce' else None
+
+        provider_name = self.provider.get_provider_name()
+        self.token_estimator = TokenEstimator(provider_name.split('/')[-1])
+        text_token_limit = self._text_token_limit(context_window)
+
+        # Chunks must also fit the context window on their own
+        self.map_chunk_tokens = min(map_chunk_tokens, text_token_limit) if text_token_limit else map_chunk_tokens
+
+        # Without a known context window, only an explicit max_text_tokens reduces text
+        text_budget = text_token_limit if max_text_tokens is None else max_text_tokens
+        self.text_reducer = None
+        if text_budget:
+            self.text_reducer = TextReducer(text_budget, keywords=relevance_keywords, estimator=self.token_estimator)
+            logger.info(f"Bill text over {self.text_reducer.token_budget} tokens will be reduced "
+                        f"to its most relevant sections")
+        elif max_text_tokens is None:
+            logger.info(f"Context window of {provider_name} is unknown, bill text will not be reduced "
+                        f"(set analysis_pass.context_window or max_text_tokens to enable it)")
+        if analysis_mode == 'map_reduce':
+            logger.info(f"Map-reduce analysis for bill text over {self.map_chunk_tokens} tokens "
+                        f"({self.map_concurrency} chunks at once)")
+
         logger.info(f"Initialized AIAnalysisPass with provider: {self.provider.get_provider_name()}")
         if self.legiscan_api_key:
             logger.info("LegiScan API integration enabled for bill text fetching")
         if self.storage_provider:
             logger.info(f"Using storage provider: {type(self.storage_provider).__name__}")
 
+    def _text_token_limit(self, context_window: Optional[int]) -> Optional[int]:
+        """
+        Largest bill text that fits one analysis call.
+
+        Args:
+            context_window: Configured context window override
+
+        Returns:
+            What the model's context window leaves after the prompts, bill
+            metadata and completion, in tokens, or None if the window is
+            neither configured nor known for the model (e.g. an Azure
+            deployment name)
+        """
+        if not context_window and not is_known_model(self.provider.get_provider_name()):
+            return None
+        context_window, _ = model_limits(self.provider.get_provider_name(), context_window)
+        prompt_tokens = self.token_estimator.count(self.system_prompt) + self.token_estimator.count(self.analysis_prompt)
+        return max(
+            DEFAULT_MAX_SECTION_TOKENS,
+            context_window - prompt_tokens - self.max_tokens - BILL_METADATA_TOKENS - CONTEXT_SAFETY_MARGIN
+        )
+
     def _load_analysis_prompt(self) -> str:
         """
         Load analysis prompt from prompts directory or return default.
@@ -173,13 +266,54 @@ Respond with ONLY valid JSON in the following format:
 
 Do not include any text before or after the JSON."""
 
-    def _call_ai(self, system_prompt: str, user_prompt: str) -> Dict:
+    def _load_map_prompt(self) -> str:
+        """
+        Load the map-reduce chunk prompt from prompts directory or return default.
+
+        Returns:
+            Map prompt string
+        """
+        prompt_file = PROMPTS_DIR / 'map_prompt.md'
+        try:
+            if prompt_file.exists():
+                content = prompt_file.read_text()
+                logger.info("Loaded map prompt from map_prompt.md")
+                return content
+            else:
+                logger.warning("map_prompt.md not found, using default")
+                return self._get_default_map_prompt()
+        except Exception as e:
+            logger.warning(f"Could not load map_prompt.md: {e}. Using default.")
+            return self._get_default_map_prompt()
+
+    def _get_default_map_prompt(self) -> str:
+        """
+        Get default map prompt.
+
+        Returns:
+            Default map prompt string
+        """
+        return """You are an expert data analyst. You receive one part of a long document. Extract what is relevant for a later analysis of the whole document.
+
+Respond with ONLY valid JSON in the following format:
+{
+  "relevant": true/false,
+  "provisions": ["specific provision in this part"],
+  "categories": ["category1"],
+  "tags": ["tag1", "tag2"],
+  "notes": "anything else the final analysis needs from this part"
+}
+
+Do not include any text before or after the JSON."""
+
+    def _call_ai(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> Dict:
         """
         Make API call to AI service via provider.
 
         Args:
             system_prompt: System context/instructions
             user_prompt: User query/data
+            max_tokens: Completion budget for this call (default: self.max_tokens)
 
         Returns:
             Parsed JSON response from AI
@@ -197,7 +331,7 @@ Do not include any text before or after the JSON."""
         content = self.provider.chat_completion(
             messages=messages,
             temperature=self.temperature,
-            max_tokens=self.max_tokens,
+            max_tokens=max_tokens or self.max_tokens,
             timeout=self.timeout
         )
 
@@ -220,13 +354,57 @@ Do not include any text before or after the JSON."""
             logger.error(f"JSON error: {e}")
             raise
 
-    def _fetch_bill_from_legiscan(self, bill_id: int) -> Optional[Dict]:
+    def prefetch_cache(self, bill_ids: List[int]) -> None:
+        """
+        Load the cached bills and latest bill texts for a run into the
+        storage memory cache with two batched lookups, instead of one
+        round-trip per bill as the analyses reach them.
+
+        Does nothing unless the storage provider has a memory cache
+        (storage.memory_cache_mb) and LegiScan fetching is enabled.
+        Failures are logged; the per-bill lookups still work without it.
+
+        Args:
+            bill_ids: LegiScan bill IDs about to be analyzed
+        """
+        if not bill_ids or not self.legiscan_api_key or not isinstance(self.storage_provider, MemoryCachedStorage):
+            return
+
+        start_time = time.time()
+        evictions_before = self.storage_provider.memory.evictions
+        try:
+            bills = self.storage_provider.get_bills_from_cache(bill_ids)
+
+            # Same document and extractor version _extract_bill_text will ask for
+            extractor_versions = {}
+            for bill_data in bills.values():
+                texts = bill_data.get('texts')
+                if isinstance(texts, list) and texts and texts[-1].get('doc_id'):
+                    latest_text = texts[-1]
+                    extractor_versions[str(latest_text['doc_id'])] = self.text_extractor.version_for(
+                        latest_text.get('mime', 'application/pdf')
+                    )
+
+            texts = self.storage_provider.get_bill_texts_from_cache(list(extractor_versions), extractor_versions)
+        except Exception as e:
+            logger.warning(f"Could not prefetch cached bills: {e}")
+            return
+
+        logger.info(f"Prefetched {len(bills)}/{len(bill_ids)} cached bills and "
+                    f"{len(texts)}/{len(extractor_versions)} bill texts in {time.time() - start_time:.1f}s")
+        if self.storage_provider.memory.evictions > evictions_before:
+            logger.warning("Storage memory cache is too small for this run's bills; "
+                           "raise storage.memory_cache_mb to keep them all in memory")
+
+    def _fetch_bill_from_legiscan(self, bill_id: int, change_hash: Optional[str] = None) -> Optional[Dict]:
         """
         Fetch full bill details from LegiScan API using getBill operation.
         Uses storage provider cache to avoid re-fetching the same bill.
 
         Args:
             bill_id: LegiScan bill ID
+            change_hash: Current LegiScan change_hash for the bill (optional).
+                A cached copy with a different change_hash is treated as stale.
 
         Returns:
             Bill details dict or None if fetch fails
@@ -238,13 +416,15 @@ Do not include any text before or after the JSON."""
         # Check cache first (via storage provider if available)
         if self.storage_provider:
             cached_data = self.storage_provider.get_bill_from_cache(bill_id)
-            if cached_data:
+            if cached_data and change_hash and cached_data.get('change_hash') != change_hash:
+                logger.info(f"Cached bill {bill_id} is stale (change_hash differs), re-fetching")
+            elif cached_data:
                 logger.info(f"Loading bill {bill_id} from storage provider cache")
-                self._last_fetch_was_cached = True
+                self._thread_state.last_fetch_was_cached = True
                 return cached_data
 
         # Fetch from API if not in cache
-        self._last_fetch_was_cached = False
+        self._thread_state.last_fetch_was_cached = False
         try:
             params = {
                 'key': self.legiscan_api_key,
@@ -284,184 +464,89 @@ Do not include any text before or after the JSON."""
             logger.error(f"Error fetching bill {bill_id} from LegiScan: {e}")
             return None
 
-    def _extract_text_from_pdf(self, base64_pdf: str) -> Optional[str]:
+    def _extract_text_by_format(self, source: DocumentSource, mime_type: str) -> Optional[str]:
         """
-        Extract text from base64-encoded PDF document.
+        Extract text from a decoded document based on MIME type.
 
-        Args:
-            base64_pdf: Base64-encoded PDF string
-
-        Returns:
-            Extracted text or None if extraction fails
-        """
-        try:
-            # Decode base64 to bytes
-            pdf_bytes = base64.b64decode(base64_pdf)
-
-            # Create PDF reader from bytes
-            pdf_file = io.BytesIO(pdf_bytes)
-            pdf_reader = PdfReader(pdf_file)
-
-            # Extract text from all pages
-            text_parts = []
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(f"--- Page {page_num} ---\n{page_text}")
-                except Exception as e:
-                    logger.warning(f"Could not extract text from page {page_num}: {e}")
-                    continue
-
-            if text_parts:
-                full_text = "\n\n".join(text_parts)
-                logger.info(f"Successfully extracted {len(full_text)} characters from {len(pdf_reader.pages)} pages")
-                return full_text
-            else:
-                logger.warning("No text could be extracted from PDF")
-                return None
-
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}")
-            return None
-
-    def _extract_text_from_html(self, base64_html: str) -> Optional[str]:
-        """
-        Extract text from base64-encoded HTML document.
+        Runs on the extraction service (process pool if configured) and adds
+        the CPU time used to this thread's extraction timing.
 
         Args:
-            base64_html: Base64-encoded HTML string
+            source: Document bytes or file path
+            mime_type: MIME type of the document
 
         Returns:
             Extracted text or None if extraction fails
         """
-        try:
-            # Decode base64 to bytes, then to string
-            html_bytes = base64.b64decode(base64_html)
-            html_string = html_bytes.decode('utf-8', errors='ignore')
-
-            # Parse HTML and extract text
-            soup = BeautifulSoup(html_string, 'lxml')
-
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-
-            # Get text
-            text = soup.get_text(separator='\n', strip=True)
-
-            # Clean up extra whitespace
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            clean_text = '\n'.join(lines)
-
-            logger.info(f"Successfully extracted {len(clean_text)} characters from HTML")
-            return clean_text
-
-        except Exception as e:
-            logger.error(f"Error extracting text from HTML: {e}")
-            return None
+        text, cpu_seconds = self.text_extractor.extract(source, mime_type)
+        self._thread_state.extraction_seconds = getattr(self._thread_state, 'extraction_seconds', 0.0) + cpu_seconds
+        return text
 
-    def _extract_text_from_docx(self, base64_docx: str) -> Optional[str]:
+    def _get_cached_document(self, doc_id: str) -> Optional[DocumentFile]:
         """
-        Extract text from base64-encoded DOCX document.
+        Get a raw document from the storage provider's document cache.
 
         Args:
-            base64_docx: Base64-encoded DOCX string
+            doc_id: LegiScan document ID
 
         Returns:
-            Extracted text or None if extraction fails
+            DocumentFile (the caller closes it) or None if not cached
         """
         try:
-            # Decode base64 to bytes
-            docx_bytes = base64.b64decode(base64_docx)
-
-            # Create DOCX document from bytes
-            docx_file = io.BytesIO(docx_bytes)
-            doc = Document(docx_file)
-
-            # Extract text from all paragraphs
-            paragraphs = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    paragraphs.append(para.text)
-
-            full_text = '\n\n'.join(paragraphs)
-            logger.info(f"Successfully extracted {len(full_text)} characters from DOCX ({len(paragraphs)} paragraphs)")
-            return full_text
-
+            cached = self.storage_provider.get_document_from_cache(doc_id)
         except Exception as e:
-            logger.error(f"Error extracting text from DOCX: {e}")
+            logger.warning(f"Could not read cached document for doc_id {doc_id}: {e}")
             return None
 
-    def _extract_text_from_plain_text(self, base64_text: str) -> Optional[str]:
-        """
-        Extract text from base64-encoded plain text document.
-
-        Args:
-            base64_text: Base64-encoded text string
-
-        Returns:
-            Decoded text or None if extraction fails
-        """
-        try:
-            # Decode base64 to bytes, then to string
-            text_bytes = base64.b64decode(base64_text)
-            text_string = text_bytes.decode('utf-8', errors='ignore')
-
-            logger.info(f"Successfully decoded {len(text_string)} characters from plain text")
-            return text_string
-
-        except Exception as e:
-            logger.error(f"Error extracting text from plain text: {e}")
-            return None
+        return cached[0] if cached else None
 
-    def _extract_text_by_format(self, base64_content: str, mime_type: str) -> Optional[str]:
+    def _extract_and_cache_text(
+        self,
+        doc_id: str,
+        document: DocumentFile,
+        mime_type: str,
+        extractor_version: str
+    ) -> Optional[str]:
         """
-        Extract text from base64-encoded document based on MIME type.
+        Extract text from a decoded document and save it to the text cache.
 
         Args:
-            base64_content: Base64-encoded document content
+            doc_id: LegiScan document ID
+            document: Decoded document (closed when done)
             mime_type: MIME type of the document
+            extractor_version: Version recorded with the cached text
 
         Returns:
             Extracted text or None if extraction fails
         """
-        if not base64_content:
-            return None
-
-        # Normalize mime type
-        mime_type = mime_type.lower() if mime_type else ''
-
-        # Route to appropriate extractor
-        if 'pdf' in mime_type or mime_type == 'application/pdf':
-            logger.info("Extracting text from PDF format")
-            return self._extract_text_from_pdf(base64_content)
+        with document:
+            bill_text = self._extract_text_by_format(document.path, mime_type)
 
-        elif 'html' in mime_type or mime_type == 'text/html':
-            logger.info("Extracting text from HTML format")
-            return self._extract_text_from_html(base64_content)
-
-        elif 'wordprocessingml' in mime_type or 'msword' in mime_type or mime_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-            logger.info("Extracting text from DOCX format")
-            return self._extract_text_from_docx(base64_content)
+        if not bill_text:
+            logger.warning(f"Could not extract text from document (mime: {mime_type}) for doc_id {doc_id}")
+            return None
 
-        elif 'plain' in mime_type or mime_type == 'text/plain':
-            logger.info("Extracting text from plain text format")
-            return self._extract_text_from_plain_text(base64_content)
+        # Save extracted text to cache (via storage provider if available)
+        if self.storage_provider:
+            try:
+                self.storage_provider.save_bill_text_to_cache(doc_id, bill_text, extractor_version)
+                logger.info(f"Cached extracted bill text for doc_id {doc_id}")
+            except Exception as e:
+                logger.warning(f"Could not save bill text for doc_id {doc_id} to cache: {e}")
 
-        else:
-            logger.warning(f"Unknown MIME type '{mime_type}', attempting plain text extraction")
-            # Fallback: try plain text
-            return self._extract_text_from_plain_text(base64_content)
+        return bill_text
 
     def _fetch_bill_text_from_legiscan(self, bill_id: int, doc_id: str, mime_type: str = 'application/pdf') -> Optional[str]:
         """
         Fetch actual bill text from LegiScan API using getBillText operation.
-        Uses storage provider cache to avoid re-fetching the same document.
+        Uses storage provider cache to avoid re-fetching the same document: the
+        extracted text if it's from the current extractor, otherwise the cached
+        raw document is re-extracted.
 
         Note: LegiScan returns bill text as base64-encoded documents in various formats
         (PDF, HTML, DOCX, plain text). This method decodes and extracts readable text
-        based on the MIME type.
+        based on the MIME type. The document is decoded to a temp file while the
+        response streams in, so at most one copy of it is held at a time.
 
         Args:
             bill_id: LegiScan bill ID
@@ -475,13 +560,22 @@ Do not include any text before or after the JSON."""
             logger.warning("LegiScan API key not set, cannot fetch bill text")
             return None
 
+        # Text extracted by a different engine version is re-extracted
+        extractor_version = self.text_extractor.version_for(mime_type)
+
         # Check cache first (via storage provider if available)
         if self.storage_provider:
-            cached_text = self.storage_provider.get_bill_text_from_cache(doc_id)
+            cached_text = self.storage_provider.get_bill_text_from_cache(doc_id, extractor_version)
             if cached_text:
                 logger.info(f"Loading bill text for doc_id {doc_id} from cache")
                 return cached_text
 
+            # Re-extract from the cached raw document (no API call) if we have it
+            cached_document = self._get_cached_document(doc_id)
+            if cached_document:
+                logger.info(f"Extracting bill text for doc_id {doc_id} from cached document")
+                return self._extract_and_cache_text(doc_id, cached_document, mime_type, extractor_version)
+
         # Fetch from API if not in cache
         try:
             params = {
@@ -491,32 +585,30 @@ Do not include any text before or after the JSON."""
             }
 
             logger.info(f"Fetching bill text for doc_id {doc_id} from LegiScan API...")
-            response = requests.get(LEGISCAN_API_BASE, params=params, timeout=30)
-            response.raise_for_status()
+            fetch_start = time.time()
+            with requests.get(LEGISCAN_API_BASE, params=params, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                result, document = spool_document_response(response.iter_content(STREAM_CHUNK_SIZE))
 
-            result = response.json()
+            self._thread_state.document_fetch_seconds = (
+                getattr(self._thread_state, 'document_fetch_seconds', 0.0) + time.time() - fetch_start
+            )
 
             if result.get('status') == 'OK':
-                text_data = result.get('text', {})
-                base64_content = text_data.get('doc', '')
-
                 logger.info(f"Successfully fetched bill text for doc_id {doc_id} from API")
 
-                # Extract text from base64-encoded document based on MIME type
                 bill_text = None
-                if base64_content:
-                    bill_text = self._extract_text_by_format(base64_content, mime_type)
-
-                    if bill_text:
-                        # Save extracted text to cache (via storage provider if available)
-                        if self.storage_provider:
-                            try:
-                                self.storage_provider.save_bill_text_to_cache(doc_id, bill_text)
-                                logger.info(f"Cached extracted bill text for doc_id {doc_id}")
-                            except Exception as e:
-                                logger.warning(f"Could not save bill text for doc_id {doc_id} to cache: {e}")
-                    else:
-                        logger.warning(f"Could not extract text from document (mime: {mime_type}) for doc_id {doc_id}")
+                if document:
+                    # Keep the raw document even if extraction fails, so a later
+                    # run (or another extractor) doesn't have to download it again
+                    if self.storage_provider:
+                        try:
+                            document_mime = result.get('text', {}).get('mime') or mime_type
+                            self.storage_provider.save_document_to_cache(doc_id, document.path, document_mime)
+                        except Exception as e:
+                            logger.warning(f"Could not save document for doc_id {doc_id} to cache: {e}")
+
+                    bill_text = self._extract_and_cache_text(doc_id, document, mime_type, extractor_version)
 
                 # Add delay after API call (only when not using cache)
                 if self.api_delay > 0:
@@ -525,24 +617,38 @@ Do not include any text before or after the JSON."""
 
                 return bill_text
             else:
+                if document:
+                    document.close()
                 logger.error(f"LegiScan API error: {result.get('alert', {}).get('message', 'Unknown error')}")
                 return None
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching bill text for doc_id {doc_id} from LegiScan: {e}")
             return None
+        except ValueError as e:
+            logger.error(f"Error decoding bill text response for doc_id {doc_id}: {e}")
+            return None
 
-    def _extract_bill_text(self, bill_data: Dict) -> str:
+    def _extract_bill_text(self, bill_data: Dict, focus: Optional[str] = None) -> str:
         """
         Extract readable text from LegiScan bill data.
         Fetches actual bill text via getBillText API if available.
 
+        Bill text over the reducer's token budget is cut down to its most
+        relevant sections; what was dropped is left in the thread state as
+        text_reduction for analyze_data. In map_reduce mode, bill text over
+        map_chunk_tokens is kept whole and its chunks are left in the thread
+        state as text_chunks (with the metadata lines) for analyze_data.
+
         Args:
             bill_data: Bill data from LegiScan API
+            focus: Filter pass reason, used to pick relevant sections of long bill text
 
         Returns:
             Formatted bill text with title, description, and full text
         """
+        self._thread_state.text_reduction = None
+        self._thread_state.text_chunks = None
         text_parts = []
 
         # Add bill metadata
@@ -593,6 +699,16 @@ Do not include any text before or after the JSON."""
                     bill_text = self._fetch_bill_text_from_legiscan(bill_id, str(doc_id), mime_type)
 
                     if bill_text:
+                        if (self.analysis_mode == 'map_reduce'
+                                and self.token_estimator.count(bill_text) > self.map_chunk_tokens):
+                            chunks = chunk_text(bill_text, self.map_chunk_tokens, self.token_estimator)
+                            self._thread_state.text_chunks = ("\n".join(text_parts), chunks)
+                            logger.info(f"Bill text will be analyzed in {len(chunks)} chunks")
+                        elif self.text_reducer:
+                            focus_text = ' '.join(part for part in [focus, bill_data.get('title')] if part)
+                            bill_text, self._thread_state.text_reduction = self.text_reducer.reduce(
+                                bill_text, focus_text
+                            )
                         text_parts.append(bill_text)
                         logger.info(f"Added full bill text ({len(bill_text)} characters)")
                     else:
@@ -601,7 +717,13 @@ Do not include any text before or after the JSON."""
 
         return "\n".join(text_parts)
 
-    def analyze_data(self, data_item: Any, bill_id: Optional[int] = None) -> Dict:
+    def analyze_data(
+        self,
+        data_item: Any,
+        bill_id: Optional[int] = None,
+        focus: Optional[str] = None,
+        change_hash: Optional[str] = None
+    ) -> Dict:
         """
         Analyze and structure relevant data item.
         If bill_id is provided and LegiScan API key is available, fetches full bill text.
@@ -609,11 +731,18 @@ Do not include any text before or after the JSON."""
         Args:
             data_item: Data to analyze (bill metadata)
             bill_id: LegiScan bill ID for fetching full text (optional)
+            focus: Filter pass reason, used to pick the relevant sections when
+                long bill text is reduced (optional)
+            change_hash: The bill's current LegiScan change_hash, from the raw
+                bill record; a cached copy of the bill with a different one is
+                re-fetched (optional)
 
         Returns:
             Dictionary containing:
             - analysis results as defined by system_prompt
             - full_bill_text: the complete bill text that was analyzed (if fetched)
+            - text_reduction: sections of the bill text left out (if it was reduced)
+            - map_reduce: chunk counts and map time (if analyzed in chunks)
             - timing: dict with processing time breakdown
         """
         # Start overall timing
@@ -636,6 +765,8 @@ Do not include any text before or after the JSON."""
 
         # Track the full bill text for inclusion in results
         full_bill_text = None
+        text_reduction = None
+        text_chunks = None
 
         # If bill_id provided and LegiScan API available, fetch full bill details
         if bill_id and self.legiscan_api_key:
@@ -643,41 +774,53 @@ Do not include any text before or after the JSON."""
 
             # Track LegiScan API time
             legiscan_start = time.time()
-            bill_data = self._fetch_bill_from_legiscan(bill_id)
+            bill_data = self._fetch_bill_from_legiscan(bill_id, change_hash)
             legiscan_time = time.time() - legiscan_start
 
             if bill_data:
-                # Track text extraction time
-                extraction_start = time.time()
-                bill_text = self._extract_bill_text(bill_data)
-                extraction_time = time.time() - extraction_start
+                # Document download counts as LegiScan time; extraction is reported as CPU time
+                self._thread_state.document_fetch_seconds = 0.0
+                self._thread_state.extraction_seconds = 0.0
+                bill_text = self._extract_bill_text(bill_data, focus)
+                text_reduction = self._thread_state.text_reduction
+                text_chunks = self._thread_state.text_chunks
 
-                timing['legiscan_api_seconds'] = round(legiscan_time, 2)
-                timing['text_extraction_seconds'] = round(extraction_time, 2)
+                timing['legiscan_api_seconds'] = round(legiscan_time + self._thread_state.document_fetch_seconds, 2)
+                timing['text_extraction_seconds'] = round(self._thread_state.extraction_seconds, 2)
 
                 # Check if data was from cache
-                if self.storage_provider and hasattr(self, '_last_fetch_was_cached'):
-                    timing['cache_hit'] = self._last_fetch_was_cached
+                if self.storage_provider:
+                    timing['cache_hit'] = getattr(self._thread_state, 'last_fetch_was_cached', False)
 
                 full_bill_text = bill_text  # Save for inclusion in results
-                data_str += f"\n\n## Full Bill Details from LegiScan API:\n\n{bill_text}"
-                logger.info("Bill text successfully added to analysis")
-                logger.info("=" * 80)
-                logger.info("FETCHED BILL CONTENT:")
-                logger.info("=" * 80)
-                logger.info(bill_text)
-                logger.info("=" * 80)
+                if text_chunks:
+                    # The text goes to the map calls; the final call gets their findings
+                    bill_header, chunks = text_chunks
+                    data_str += f"\n\n## Full Bill Details from LegiScan API:\n\n{bill_header}"
+                    map_bill_info = data_str
+                    data_str += f"\n[Full text analyzed in {len(chunks)} parts, see Findings from the Bill Text]"
+                else:
+                    data_str += f"\n\n## Full Bill Details from LegiScan API:\n\n{bill_text}"
+                logger.info(f"Bill text successfully added to analysis ({len(bill_text)} characters)")
+                logger.debug(f"FETCHED BILL CONTENT:\n{bill_text}")
             else:
                 logger.warning(f"Could not fetch bill text for bill_id {bill_id}, analyzing with metadata only")
         elif bill_id and not self.legiscan_api_key:
             logger.warning("LegiScan API key not configured, analyzing with metadata only")
 
-        # Format analysis prompt with data
-        user_prompt = self.analysis_prompt.format(data=data_str)
+        map_reduce = None
 
         try:
             # Track AI analysis time
             ai_start = time.time()
+
+            if text_chunks:
+                # Map: chunks analyzed concurrently; reduce: the usual analysis of their findings
+                findings, map_reduce = self._map_chunks(map_bill_info, text_chunks[1])
+                data_str += findings
+
+            # Format analysis prompt with data
+            user_prompt = self.analysis_prompt.format(data=data_str)
             result = self._call_ai(self.system_prompt, user_prompt)
             ai_time = time.time() - ai_start
             timing['ai_analysis_seconds'] = round(ai_time, 2)
@@ -689,6 +832,13 @@ Do not include any text before or after the JSON."""
             if full_bill_text:
                 result['full_bill_text'] = full_bill_text
 
+            # Sections of the bill text left out of the prompt
+            if text_reduction:
+                result['text_reduction'] = text_reduction
+
+            if map_reduce:
+                result['map_reduce'] = map_reduce
+
             # Add timing data to result
             result['timing'] = timing
 
@@ -706,3 +856,119 @@ Do not include any text before or after the JSON."""
             logger.error(f"Traceback: {traceback.format_exc()}")
             timing['total_seconds'] = round(time.time() - start_time, 2)
             return {"error": str(e), "full_bill_text": full_bill_text, "timing": timing}
+
+    def _map_chunks(self, bill_info: str, chunks: List[str]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Analyze the chunks of a long bill text concurrently (map step).
+
+        Args:
+            bill_info: Bill metadata, sent with every chunk
+            chunks: Bill text chunks, in order
+
+        Returns:
+            Tuple of (findings section for the final analysis prompt, map_reduce
+            result metadata)
+
+        Raises:
+            RuntimeError: If no chunk could be analyzed
+        """
+        map_start = time.time()
+
+        def run(index: int) -> Dict:
+            user_prompt = (
+                f"## Bill Information\n\n{bill_info}\n\n"
+                f"## Bill Text, Part {index + 1} of {len(chunks)}\n\n{chunks[index]}"
+            )
+            return self._call_ai(self.map_prompt, user_prompt, max_tokens=MAP_MAX_TOKENS)
+
+        findings = []
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(self.map_concurrency, len(chunks))) as executor:
+            futures = [executor.submit(run, index) for index in range(len(chunks))]
+            for index, future in enumerate(futures):
+                try:
+                    finding = future.result()
+                except Exception as e:
+                    logger.warning(f"Could not analyze part {index + 1} of {len(chunks)} of the bill text: {e}")
+                    failed.append(index + 1)
+                    continue
+
+                # Parts with nothing relevant are left out of the final prompt
+                if isinstance(finding, dict) and (finding.get('relevant') or finding.get('provisions')):
+                    findings.append({'part': index + 1, **finding})
+
+        if len(failed) == len(chunks):
+            raise RuntimeError(f"None of the {len(chunks)} parts of the bill text could be analyzed")
+
+        section = f"\n\n## Findings from the Bill Text\n\nThe full text was analyzed in {len(chunks)} parts. "
+        if findings:
+            section += "Findings from the relevant parts:\n\n"
+            section += json.dumps(findings, ensure_ascii=False, indent=2)
+        else:
+            section += "No part contained relevant provisions."
+        if failed:
+            section += f"\n\nParts {', '.join(str(part) for part in failed)} could not be analyzed."
+
+        metadata = {
+            'chunks': len(chunks),
+            'chunk_tokens': self.map_chunk_tokens,
+            'relevant_chunks': len(findings),
+            'failed_chunks': failed,
+            'map_seconds': round(time.time() - map_start, 2)
+        }
+        logger.info(f"Analyzed {len(chunks)} chunks in {metadata['map_seconds']}s "
+                    f"({len(findings)} relevant, {len(failed)} failed)")
+        return section, metadata
+
+    def close(self) -> None:
+        """Release the text extraction process pool (if any)"""
+        self.text_extractor.close()
+
+    def analyze_many(
+        self,
+        items: Iterable[Tuple],
+        concurrency: int = 1
+    ) -> Iterator[Dict]:
+        """
+        Analyze several data items, running up to `concurrency` analyses at once.
+
+        Each analysis (LegiScan fetch, text extraction and LLM call) runs in a
+        worker thread. Results are yielded in the same order as `items`, so
+        output files stay deterministic regardless of completion order.
+
+        Args:
+            items: Iterable of (data_item, bill_id) tuples, or (data_item, bill_id,
+                options) tuples where options is a dict of further analyze_data
+                keyword arguments (e.g. {'focus': reason, 'change_hash': ...})
+            concurrency: Maximum number of bills analyzed in parallel (default: 1)
+
+        Yields:
+            Analysis result dict for each item, in input order. Unexpected
+            exceptions are returned as {"error": ...} dicts, like analyze_data.
+        """
+        concurrency = max(1, int(concurrency))
+
+        def run(item):
+            data_item, bill_id, *options = item
+            try:
+                return self.analyze_data(data_item, bill_id=bill_id, **(options[0] if options else {}))
+            except Exception as e:
+                logger.error(f"Error in analyze_many for bill_id {bill_id}: {e}")
+                return {"error": str(e), "timing": {'total_seconds': 0.0}}
+
+        if concurrency == 1:
+            for item in items:
+                yield run(item)
+            return
+
+        # Keep a bounded window of in-flight futures so finished results that are
+        # waiting on a slower predecessor do not pile up in memory.
+        window = deque()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='analysis') as executor:
+            for item in items:
+                window.append(executor.submit(run, item))
+                if len(window) >= concurrency * 2:
+                    yield window.popleft().result()
+
+            while window:
+                yield window.popleft().result()
@@ -7,10 +7,19 @@ Determines if data items are relevant for further analysis.
 import requests
 import json
 import logging
-from typing import Any, Dict, Tuple, Optional
+import math
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
 from pathlib import Path
 
-from src.llm_provider import LLMProvider, create_llm_provider
+from src.llm_provider import LLMProvider, LLMProviderError, create_llm_provider
+from src.prompt_format import (
+    DEFAULT_PROMPT_FORMAT, format_item, format_items, table_columns, table_header, table_row,
+    validate_prompt_format
+)
+from src.token_budget import RESPONSE_OVERHEAD_TOKENS, TokenBudgetBatcher, TokenEstimator, model_limits
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -19,6 +28,47 @@ SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 PROMPTS_DIR = PROJECT_ROOT / 'prompts'
 
+# Completion budget for filter_batch when the caller doesn't size it
+BATCH_MAX_TOKENS = 8000
+
+# plan_batches defaults: bill tokens per request, and completion tokens
+# reserved per bill for its {"relevant", "reason", "bill_identifier"} result
+DEFAULT_BATCH_INPUT_TOKENS = 8000
+DEFAULT_TOKENS_PER_RESULT = 120
+
+# Providers already warned about unknown model limits (logged once per run)
+_UNKNOWN_LIMITS_WARNED = set()
+
+# Calls per bill (first try included) before filter_items gives up on it
+DEFAULT_REPAIR_ATTEMPTS = 3
+
+# Provider error text meaning the request was too large for the model
+CONTEXT_ERROR_MARKERS = (
+    'context_length_exceeded', 'context length', 'maximum context', 'too many tokens', 'prompt is too long'
+)
+
+
+def _is_batch_size_error(error: Exception) -> bool:
+    """
+    Whether a failed filter_batch call may succeed with fewer bills
+
+    True for unparseable or malformed responses (ValueError, including
+    json.JSONDecodeError) and for requests rejected as too large for the
+    model's context. Throttling and other transient failures are retried
+    by the rate limit layer (llm.rate_limit), not by splitting the batch.
+    """
+    if isinstance(error, LLMProviderError):
+        message = str(error).lower()
+        return error.status_code == 413 or (
+            error.status_code == 400 and any(marker in message for marker in CONTEXT_ERROR_MARKERS)
+        )
+    return isinstance(error, ValueError)
+
+
+def _normalize_identifier(identifier: Any) -> str:
+    """Bill number as compared against model output ("hb 1234" matches "HB1234")"""
+    return re.sub(r'\s+', '', str(identifier)).upper()
+
 
 class AIFilterPass:
     """
@@ -36,7 +86,9 @@ class AIFilterPass:
         max_tokens: int = 200,
         timeout: int = 120,
         provider: Optional[LLMProvider] = None,
-        config: Optional[Dict] = None
+        config: Optional[Dict] = None,
+        prompt_format: str = DEFAULT_PROMPT_FORMAT,
+        storage_provider=None
     ):
         """
         Initialize filter pass processor.
@@ -51,9 +103,14 @@ class AIFilterPass:
             timeout: API request timeout in seconds
             provider: LLMProvider instance (new preferred method)
             config: Configuration dict for creating provider
+            prompt_format: How bills are serialized into prompts: 'json',
+                'compact' or 'table' (see src/prompt_format.py)
+            storage_provider: StorageProvider reused by the database and
+                azure_blob LLM response cache backends (optional)
         """
         # Store parameters for LLM calls
         self.temperature = temperature
+        self.prompt_format = validate_prompt_format(prompt_format)
         self.max_tokens = max_tokens
         self.timeout = timeout
 
@@ -61,7 +118,7 @@ class AIFilterPass:
         if provider:
             self.provider = provider
         elif config:
-            self.provider = create_llm_provider(config=config)
+            self.provider = create_llm_provider(config=config, storage_provider=storage_provider)
         else:
             # Legacy mode: create provider from individual parameters
             self.provider = create_llm_provider(
@@ -109,13 +166,14 @@ Respond with ONLY a JSON object in this exact format:
   "reason": "brief explanation"
 }"""
 
-    def _call_ai(self, system_prompt: str, user_prompt: str) -> Dict:
+    def _call_ai(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> Dict:
         """
         Make API call to AI service via provider.
 
         Args:
             system_prompt: System context/instructions
             user_prompt: User query/data
+            max_tokens: Completion budget for this call (default: self.max_tokens)
 
         Returns:
             Parsed JSON response from AI
@@ -133,7 +191,7 @@ Respond with ONLY a JSON object in this exact format:
         content = self.provider.chat_completion(
             messages=messages,
             temperature=self.temperature,
-            max_tokens=self.max_tokens,
+            max_tokens=max_tokens or self.max_tokens,
             timeout=self.timeout
         )
 
@@ -159,10 +217,7 @@ Respond with ONLY a JSON object in this exact format:
         Returns:
             Tuple of (is_relevant: bool, reason: str)
         """
-        if isinstance(data_item, dict):
-            data_str = json.dumps(data_item, indent=2)
-        else:
-            data_str = str(data_item)
+        data_str = format_item(data_item, self.prompt_format)
 
         try:
             result = self._call_ai(self.filter_prompt, data_str)
@@ -174,13 +229,84 @@ Respond with ONLY a JSON object in this exact format:
             logger.error(f"Error in filter_data: {e}")
             return False, f"Error: {str(e)}"
 
-    def filter_batch(self, file_content: str) -> Dict[str, Any]:
+    def plan_batches(
+        self,
+        items: List[Dict[str, Any]],
+        max_items: Optional[int] = None,
+        input_tokens: int = DEFAULT_BATCH_INPUT_TOKENS,
+        tokens_per_result: int = DEFAULT_TOKENS_PER_RESULT,
+        context_window: Optional[int] = None,
+        max_output_tokens: Optional[int] = None
+    ) -> List[Tuple[int, int, int]]:
+        """
+        Pack items into filter_batch requests by token count rather than a fixed size.
+
+        Each batch holds as many consecutive items as fit the input token
+        budget and the model's context window, and gets a completion budget
+        sized for its number of results.
+
+        Args:
+            items: Items to filter (JSON-serializable), in order
+            max_items: Upper bound on items per batch (None = no bound)
+            input_tokens: Target tokens of items per request
+            tokens_per_result: Completion tokens reserved per item
+            context_window: Model context window (default: looked up from the model
+                name; not checked if unknown)
+            max_output_tokens: Model completion limit (default: looked up from the
+                model name, else BATCH_MAX_TOKENS)
+
+        Returns:
+            (start, end, max_tokens) per batch, covering items in order
+        """
+        provider_name = self.provider.get_provider_name()
+        context_window, max_output_tokens = model_limits(provider_name, context_window, max_output_tokens)
+        if (context_window is None or max_output_tokens is None) and provider_name not in _UNKNOWN_LIMITS_WARNED:
+            _UNKNOWN_LIMITS_WARNED.add(provider_name)
+            logger.warning(
+                f"Model limits of {provider_name} unknown "
+                f"(context window {context_window or 'unchecked'}, "
+                f"completion limit {max_output_tokens or BATCH_MAX_TOKENS}); "
+                f"set filter_pass.context_window and max_output_tokens for this model"
+            )
+        max_output_tokens = max_output_tokens or BATCH_MAX_TOKENS
+        estimator = TokenEstimator(provider_name.split('/')[-1])
+
+        prompt_tokens = estimator.count(self.filter_prompt)
+        if self.prompt_format == 'table':
+            # The header is sent once per batch, each bill is one row
+            columns = table_columns(items)
+            prompt_tokens += estimator.count(table_header(columns))
+            item_tokens = [estimator.count(table_row(item, columns)) for item in items]
+        else:
+            item_tokens = [estimator.count(format_item(item, self.prompt_format)) for item in items]
+
+        batcher = TokenBudgetBatcher(
+            context_window=context_window,
+            max_output_tokens=max_output_tokens,
+            prompt_tokens=prompt_tokens,
+            input_budget=input_tokens,
+            tokens_per_result=tokens_per_result,
+            max_items=max_items
+        )
+        ranges = batcher.plan(item_tokens)
+
+        logger.info(
+            f"Packed {len(items)} items into {len(ranges)} batches "
+            f"({sum(item_tokens)} {'tokens' if estimator.exact else 'estimated tokens'} as {self.prompt_format}, "
+            f"budget {input_tokens}/batch, context window {context_window or 'unknown'}, max {batcher.max_items} items/batch)"
+        )
+
+        return [(start, end, batcher.max_tokens_for(end - start)) for start, end in ranges]
+
+    def filter_batch(self, file_content: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """
         Filter multiple items from a file in a single API call.
         Passes entire file content to LLM for batch processing.
 
         Args:
             file_content: Raw file content (JSON or text) containing multiple items
+            max_tokens: Completion budget (default: BATCH_MAX_TOKENS); plan_batches
+                sizes it from the number of items
 
         Returns:
             Dict with structure: {
@@ -194,14 +320,9 @@ Respond with ONLY a JSON object in this exact format:
             Exception: If API call fails or response is invalid
         """
         try:
-            # Use higher max_tokens for batch processing
-            original_max_tokens = self.max_tokens
-            self.max_tokens = 8000  # Allow space for multiple bill results
-
-            result = self._call_ai(self.filter_prompt, file_content)
-
-            # Restore original max_tokens
-            self.max_tokens = original_max_tokens
+            # Passed per call rather than set on self, so concurrent batches
+            # can't leave max_tokens raised for filter_data
+            result = self._call_ai(self.filter_prompt, file_content, max_tokens=max_tokens or BATCH_MAX_TOKENS)
 
             # Validate response structure
             if 'results' not in result:
@@ -218,3 +339,180 @@ Respond with ONLY a JSON object in this exact format:
         except Exception as e:
             logger.error(f"Error in filter_batch: {e}")
             raise
+
+    def filter_items(
+        self,
+        items: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        max_attempts: int = DEFAULT_REPAIR_ATTEMPTS
+    ) -> Dict[str, Any]:
+        """
+        Filter a batch of bills, repairing partial and failed responses.
+
+        The results are reconciled against the bills that were sent (by
+        bill_number): results for bills not in the batch are dropped, and
+        bills with no valid result are re-sent in follow-up batches of at
+        most half the size. A request whose response can't be parsed, or
+        that is rejected as a bad request (too large for the model's context,
+        or a single bill tripping a content filter), is bisected and each half
+        retried, so one bad bill doesn't cost the whole batch; a single bill
+        that is still rejected is reported unresolved. Throttling and
+        transient API errors are left to the rate limit layer: if they
+        outlast its retries, the batch's bills are reported unresolved.
+        Other API errors (authentication, unknown model) are raised.
+
+        Args:
+            items: Bills to filter (dicts with bill_number), as sent to the model
+            max_tokens: Completion budget for the full batch; follow-up
+                batches get a proportional share
+            max_attempts: Calls per bill, first try included, before giving up on it
+
+        Returns:
+            Dict with "results" (one per resolved bill, in input order, with
+            bill_identifier set to the bill's bill_number). If some bills stay
+            unresolved, also "unresolved" (their bill_numbers) and "error".
+
+        Raises:
+            LLMProviderError: On a non-retryable API error other than a bad request (400) or 413
+        """
+        max_tokens = max_tokens or BATCH_MAX_TOKENS
+        identifiers = [item.get('bill_number') for item in items]
+        resolved: Dict[str, Dict[str, Any]] = {}
+        last_errors: Dict[str, str] = {}
+
+        def share(count: int) -> int:
+            """Completion budget for a follow-up batch of count bills"""
+            per_item = (max_tokens - RESPONSE_OVERHEAD_TOKENS) / max(1, len(items))
+            return min(max_tokens, math.ceil(per_item * count) + RESPONSE_OVERHEAD_TOKENS)
+
+        # (bills, attempt number of this call)
+        queue = deque([(items, 1)])
+        while queue:
+            batch, attempt = queue.popleft()
+
+            try:
+                response = self.filter_batch(format_items(batch, self.prompt_format), max_tokens=share(len(batch)))
+            except LLMProviderError as e:
+                # Bad requests may be down to one bill (too large, content filter)
+                splittable = _is_batch_size_error(e) or e.status_code == 400
+                if not e.retryable and not splittable:
+                    # Authentication, unknown model: no retry will help
+                    raise
+                if not splittable or len(batch) == 1:
+                    # Throttling/transient failures outlasted the provider's retries,
+                    # or a single bill is rejected: leave these bills unresolved
+                    for item in batch:
+                        last_errors[item.get('bill_number')] = str(e)
+                    continue
+                middle = len(batch) // 2
+                logger.warning(f"Batch of {len(batch)} bills rejected ({e}), retrying as two halves")
+                queue.append((batch[:middle], attempt))
+                queue.append((batch[middle:], attempt))
+                continue
+            except ValueError as e:
+                # Invalid JSON or response structure
+                if len(batch) > 1:
+                    middle = len(batch) // 2
+                    logger.warning(f"Batch of {len(batch)} bills failed ({e}), retrying as two halves")
+                    queue.append((batch[:middle], attempt))
+                    queue.append((batch[middle:], attempt))
+                elif attempt < max_attempts:
+                    queue.append((batch, attempt + 1))
+                else:
+                    last_errors[batch[0].get('bill_number')] = str(e)
+                continue
+
+            # Reconcile against what was sent
+            sent = {_normalize_identifier(item.get('bill_number')): item.get('bill_number') for item in batch}
+            unknown = []
+            for result in response['results']:
+                if not isinstance(result, dict):
+                    continue
+                bill_number = sent.get(_normalize_identifier(result.get('bill_identifier')))
+                if bill_number is None:
+                    unknown.append(result.get('bill_identifier'))
+                elif bill_number not in resolved and isinstance(result.get('relevant'), bool):
+                    resolved[bill_number] = dict(result, bill_identifier=bill_number)
+
+            if unknown:
+                logger.warning(f"Ignoring {len(unknown)} result(s) for bills not in the batch: {unknown[:5]}")
+
+            missing = [item for item in batch if item.get('bill_number') not in resolved]
+            if not missing:
+                continue
+
+            if attempt >= max_attempts:
+                for item in missing:
+                    last_errors[item.get('bill_number')] = "no valid result in the response"
+                continue
+
+            logger.info(f"{len(missing)} of {len(batch)} bills missing from the response, re-queuing")
+            chunk_size = max(1, len(batch) // 2)
+            for start in range(0, len(missing), chunk_size):
+                queue.append((missing[start:start + chunk_size], attempt + 1))
+
+        outcome: Dict[str, Any] = {
+            'results': [resolved[bill_number] for bill_number in identifiers if bill_number in resolved]
+        }
+
+        unresolved = [bill_number for bill_number in identifiers if bill_number not in resolved]
+        if unresolved:
+            outcome['unresolved'] = unresolved
+            outcome['error'] = (
+                f"No result for {len(unresolved)} of {len(items)} bills "
+                f"(last error: {last_errors.get(unresolved[0], 'unknown')})"
+            )
+        return outcome
+
+    def filter_many(
+        self,
+        batches: Iterable[Tuple[List[Dict[str, Any]], Optional[int]]],
+        concurrency: int = 1,
+        max_attempts: int = DEFAULT_REPAIR_ATTEMPTS
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Filter several batches, running up to `concurrency` batches at once.
+
+        Results are yielded in the same order as `batches`, so output stays
+        deterministic regardless of completion order. With an llm.rate_limit
+        section configured, the provider's adaptive limit and retries keep the
+        in-flight calls within quota.
+
+        Args:
+            batches: (bills, max_tokens) pairs, as passed to filter_items
+            concurrency: Maximum number of batches in flight (default: 1)
+            max_attempts: Calls per bill before giving up on it, as for filter_items
+
+        Yields:
+            filter_items outcome for each batch, in input order; a batch that
+            fails outright has every bill listed in "unresolved"
+        """
+        concurrency = max(1, int(concurrency))
+
+        def run(batch):
+            items, max_tokens = batch
+            try:
+                return self.filter_items(items, max_tokens=max_tokens, max_attempts=max_attempts)
+            except Exception as e:
+                logger.error(f"Batch of {len(items)} bills failed: {e}")
+                return {
+                    "error": str(e),
+                    "results": [],
+                    "unresolved": [item.get('bill_number') for item in items]
+                }
+
+        if concurrency == 1:
+            for batch in batches:
+                yield run(batch)
+            return
+
+        # Bounded window of in-flight futures, as in AIAnalysisPass.analyze_many
+        window = deque()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='filter') as executor:
+            for batch in batches:
+                window.append(executor.submit(run, batch))
+                if len(window) >= concurrency * 2:
+                    yield window.popleft().result()
+
+            while window:
+                yield window.popleft().result()
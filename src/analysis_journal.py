@@ -0,0 +1,148 @@
+"""
+Analysis Checkpoint Journal
+
+Records one entry per finished bill through the StorageProvider so an
+interrupted analysis run can be resumed without re-analyzing (and
+re-paying for) bills that already completed.
+
+Each record is keyed by an input hash covering the bill_id and the exact
+analysis input, so a bill whose input changed is analyzed again even
+when resuming. Analyses that ended in an error are not journaled and are
+retried on resume.
+
+The filter pass journals its batches the same way (process_many, with the
+batch JSON as input and no bill_id).
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisJournal:
+    """Append-only per-bill checkpoint journal for an analysis run"""
+
+    def __init__(self, storage_provider, run_id: str, resume: bool = False):
+        """
+        Initialize journal
+
+        Args:
+            storage_provider: StorageProvider instance (None disables checkpointing)
+            run_id: Analysis run identifier
+            resume: If True, load completed bills from an existing journal;
+                otherwise start a fresh journal for this run_id
+        """
+        self.storage_provider = storage_provider
+        self.run_id = run_id
+        self.completed: Dict[str, Dict[str, Any]] = {}
+
+        if not storage_provider:
+            if resume:
+                logger.warning("No storage provider available, --resume has no effect")
+            return
+
+        if resume:
+            for record in storage_provider.load_checkpoints(run_id):
+                self.completed[record['input_hash']] = record['analysis']
+            logger.info(f"Resuming run {run_id}: {len(self.completed)} already completed")
+        else:
+            storage_provider.clear_checkpoints(run_id)
+
+    @staticmethod
+    def input_hash(analysis_input: Any, bill_id: Optional[int], options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Hash the inputs that determine a bill's analysis
+
+        Args:
+            analysis_input: Data item passed to AIAnalysisPass.analyze_data
+            bill_id: LegiScan bill ID
+            options: Keyword arguments passed to analyze_data with the item (e.g. focus)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        if options:
+            analysis_input = f"{analysis_input}\n{json.dumps(options, sort_keys=True, default=str)}"
+        return hashlib.sha256(f"{bill_id}\n{analysis_input}".encode('utf-8')).hexdigest()
+
+    def record(self, input_hash: str, bill_id: Optional[int], analysis: Dict[str, Any]) -> None:
+        """
+        Append a finished bill to the journal (errors are skipped so they are retried)
+
+        Args:
+            input_hash: Hash from input_hash()
+            bill_id: LegiScan bill ID
+            analysis: Analysis result
+        """
+        if not self.storage_provider or 'error' in analysis:
+            return
+
+        try:
+            self.storage_provider.append_checkpoint(self.run_id, {
+                'input_hash': input_hash,
+                'bill_id': bill_id,
+                'analysis': analysis
+            })
+        except Exception as e:
+            logger.warning(f"Could not write checkpoint for bill {bill_id}: {e}")
+
+    def analyze_many(
+        self,
+        analyzer,
+        items: Iterable[Tuple[Any, Optional[int]]],
+        concurrency: int = 1
+    ) -> Iterator[Dict]:
+        """
+        Analyze items, serving completed bills from the journal and journaling new results
+
+        Args:
+            analyzer: AIAnalysisPass instance
+            items: (data_item, bill_id) or (data_item, bill_id, options) tuples,
+                as for AIAnalysisPass.analyze_many
+            concurrency: Number of bills analyzed in parallel
+
+        Yields:
+            Analysis dicts in the same order as items
+        """
+        return self.process_many(analyzer.analyze_many, items, concurrency)
+
+    def process_many(
+        self,
+        process: Callable[[List[Tuple], int], Iterator[Dict]],
+        items: Iterable[Tuple],
+        concurrency: int = 1
+    ) -> Iterator[Dict]:
+        """
+        Run items through process, serving completed ones from the journal and journaling new results
+
+        Args:
+            process: Called as process(pending_items, concurrency); must yield one
+                result dict per pending item, in order (results with an 'error'
+                key are not journaled)
+            items: (data_item, bill_id) pairs, or (data_item, bill_id, options)
+                tuples; pending items are passed to process as given
+            concurrency: Number of items processed in parallel
+
+        Yields:
+            Result dicts in the same order as items
+        """
+        items = [(entry, self.input_hash(*entry)) for entry in items]
+        pending = [entry for entry, key in items if key not in self.completed]
+
+        skipped = len(items) - len(pending)
+        if skipped:
+            logger.info(f"Skipping {skipped} items already completed in run {self.run_id}")
+
+        analyses = process(pending, concurrency)
+
+        for entry, key in items:
+            if key in self.completed:
+                yield self.completed[key]
+                continue
+
+            analysis = next(analyses)
+            self.record(key, entry[1], analysis)
+            yield analysis
@@ -7,9 +7,24 @@ Mirrors the local file structure but stores data in Azure Blob containers.
 
 import json
 import os
-from typing import Dict, List, Optional, Any, Tuple, Union
-
-from src.storage_provider import StorageProvider
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+
+from src.result_stream import (
+    JSONL_SUFFIXES, compression_for_name, encode_record, iter_records, validate_result_format
+)
+from src.document_stream import DocumentFile
+from src.storage_provider import (
+    StorageProvider, compress_bill_text, compress_document, decompress_bill_text, decompress_document,
+    hash_document, lookup_concurrently
+)
+from src.raw_index import build_raw_index, index_bills, new_raw_index
+from src.text_extraction import LEGACY_EXTRACTOR_VERSION
+
+# Streamed result blobs larger than this are spooled to a temp file while read
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
 
 
 class AzureBlobStorage(StorageProvider):
@@ -23,6 +38,8 @@ class AzureBlobStorage(StorageProvider):
             config: Configuration dictionary with:
                 - connection_string_env: Environment variable name for connection string
                 - container_name: Blob container name
+                - result_format: 'json' (default) or 'jsonl' for filter/analysis results
+                - compression: None (default), 'gzip' or 'zstd' for jsonl results
         """
         from azure.storage.blob import BlobServiceClient
 
@@ -34,6 +51,10 @@ class AzureBlobStorage(StorageProvider):
             raise ValueError(f"Azure Storage connection string not found in environment variable: {connection_string_env}")
 
         self.container_name = config.get('container_name', 'legiscan-data')
+        self.result_format = config.get('result_format', 'json')
+        self.compression = config.get('compression')
+        validate_result_format(self.result_format, self.compression)
+        self.streams_results = self.result_format == 'jsonl'
 
         # Initialize blob service client
         self.blob_service_client = BlobServiceClient.from_connection_string(connection_string)
@@ -51,6 +72,18 @@ class AzureBlobStorage(StorageProvider):
         self.filtered_prefix = 'filtered/'
         self.analyzed_prefix = 'analyzed/'
         self.cache_prefix = 'cache/legiscan_cache/'
+        self.text_cache_prefix = 'cache/text/'
+        self.document_cache_prefix = 'cache/documents/'
+        self.llm_cache_prefix = 'cache/llm/'
+        self.sync_prefix = 'cache/sync/'
+        self.checkpoint_prefix = 'cache/checkpoints/'
+        self.raw_index_prefix = 'cache/raw_index/'
+
+        # Bill number indexes of raw blobs: filename -> (ETag, bills). A memoized
+        # index is trusted for the life of this instance; reads of bill ranges
+        # are conditional on the ETag, so a replaced blob is re-indexed
+        self._raw_indexes: Dict[str, Tuple[str, Dict[str, List[int]]]] = {}
+        self._raw_index_lock = threading.Lock()
 
     def _get_blob_client(self, blob_path: str):
         """Get blob client for a specific blob path"""
@@ -92,7 +125,10 @@ class AzureBlobStorage(StorageProvider):
             filename = filename[:-5]
 
         blob_path = f"{self.raw_prefix}{filename}.json"
-        self._upload_json(blob_path, data)
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        result = self._get_blob_client(blob_path).upload_blob(payload, overwrite=True)
+
+        self._save_raw_index(filename, result['etag'], build_raw_index(payload, data))
 
     def load_raw_data(self, filename: str) -> Dict[str, Any]:
         """Load raw bill data from raw/{filename}.json"""
@@ -102,21 +138,73 @@ class AzureBlobStorage(StorageProvider):
         blob_path = f"{self.raw_prefix}{filename}.json"
         return self._download_json(blob_path)
 
+    def _filter_results_name(self, run_id: str) -> str:
+        """Normalize a run_id to the filter_results_{run_id} base name"""
+        filename = run_id if run_id.startswith('filter_results_') else f"filter_results_{run_id}"
+        for suffix in ['.json'] + list(JSONL_SUFFIXES.values()):
+            if filename.endswith(suffix):
+                return filename[:-len(suffix)]
+        return filename
+
+    def _analysis_prefix(self, run_id: str) -> str:
+        """Normalize a run_id to the analysis_{run_id} blob prefix"""
+        if run_id.startswith('analysis_'):
+            prefix = run_id
+        else:
+            prefix = f"analysis_{run_id}"
+
+        if prefix.endswith('.json'):
+            prefix = prefix[:-5]
+
+        return prefix
+
+    def _find_jsonl(self, prefix: str, name: str) -> Optional[str]:
+        """Find {prefix}{name}.jsonl[.gz|.zst], preferring the configured compression"""
+        compressions = [self.compression] + [c for c in JSONL_SUFFIXES if c != self.compression]
+        for compression in compressions:
+            blob_path = f"{prefix}{name}{JSONL_SUFFIXES[compression]}"
+            if self._blob_exists(blob_path):
+                return blob_path
+        return None
+
+    def _iter_jsonl(self, blob_path: str) -> Iterator[Dict[str, Any]]:
+        """Lazily read records from a JSONL blob (spooled to disk when large)"""
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+            self._get_blob_client(blob_path).download_blob().readinto(spool)
+            spool.seek(0)
+            yield from iter_records(spool, compression_for_name(blob_path))
+
     def save_filtered_results(self, run_id: str, data: Dict[str, Any]) -> None:
-        """Save filter results to filtered/filter_results_{run_id}.json"""
-        if run_id.startswith('filter_results_'):
-            filename = run_id
+        """
+        Save filter results to filtered/filter_results_{run_id}.json
+
+        With result_format 'jsonl', writes one record per bill (with a
+        'relevant' flag) to filter_results_{run_id}.jsonl[.gz|.zst] instead.
+        Results of the run in the other format are removed, so a stale blob
+        is never read in place of the new one.
+        """
+        filename = self._filter_results_name(run_id)
+        blob_paths = [f"{self.filtered_prefix}{filename}{suffix}" for suffix in ['.json', *JSONL_SUFFIXES.values()]]
+
+        if not self.streams_results:
+            blob_path = f"{self.filtered_prefix}{filename}.json"
+            self._upload_json(blob_path, data)
         else:
-            filename = f"filter_results_{run_id}"
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+                for relevant, key in [(True, 'relevant_bills'), (False, 'not_relevant_bills')]:
+                    for bill in data.get(key, []):
+                        spool.write(encode_record({**bill, 'relevant': relevant}, self.compression))
+                spool.seek(0)
 
-        if filename.endswith('.json'):
-            filename = filename[:-5]
+                blob_path = f"{self.filtered_prefix}{filename}{JSONL_SUFFIXES[self.compression]}"
+                self._get_blob_client(blob_path).upload_blob(spool, overwrite=True)
 
-        blob_path = f"{self.filtered_prefix}{filename}.json"
-        self._upload_json(blob_path, data)
+        for stale_path in blob_paths:
+            if stale_path != blob_path and self._blob_exists(stale_path):
+                self._get_blob_client(stale_path).delete_blob()
 
     def load_filtered_results(self, run_id: str) -> Dict[str, Any]:
-        """Load filter results from filtered/filter_results_{run_id}.json"""
+        """Load filter results from filtered/filter_results_{run_id}.json (or .jsonl)"""
         # Try different filename patterns
         possible_filenames = [
             run_id,
@@ -134,8 +222,40 @@ class AzureBlobStorage(StorageProvider):
             if self._blob_exists(blob_path):
                 return self._download_json(blob_path)
 
+        if self._find_jsonl(self.filtered_prefix, self._filter_results_name(run_id)):
+            relevant_bills = []
+            not_relevant_bills = []
+
+            for record in self.iter_filtered_results(run_id):
+                relevant = record.pop('relevant', False)
+                (relevant_bills if relevant else not_relevant_bills).append(record)
+
+            return {
+                'summary': {
+                    'total_analyzed': len(relevant_bills) + len(not_relevant_bills),
+                    'relevant_count': len(relevant_bills),
+                    'not_relevant_count': len(not_relevant_bills),
+                    'source_file': self._filter_results_name(run_id)[len('filter_results_'):]
+                },
+                'relevant_bills': relevant_bills,
+                'not_relevant_bills': not_relevant_bills
+            }
+
         raise FileNotFoundError(f"Filter results not found for run_id: {run_id}")
 
+    def iter_filtered_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate filter result records from filtered/ (JSONL read lazily)"""
+        blob_path = self._find_jsonl(self.filtered_prefix, self._filter_results_name(run_id))
+
+        if blob_path:
+            yield from self._iter_jsonl(blob_path)
+            return
+
+        data = self.load_filtered_results(run_id)
+        for relevant, key in [(True, 'relevant_bills'), (False, 'not_relevant_bills')]:
+            for bill in data.get(key, []):
+                yield {**bill, 'relevant': relevant}
+
     def save_analysis_results(
         self,
         run_id: str,
@@ -150,14 +270,27 @@ class AzureBlobStorage(StorageProvider):
         Accepts either:
         - List format (legacy): [{"bill": {...}, "analysis": {...}}, ...]
         - Dict format (with stats): {"summary": {...}, "timing_stats": {...}, "results": [...]}
+
+        With result_format 'jsonl', any results passed in are appended to
+        analysis_{run_id}.jsonl[.gz|.zst] and summary/timing_stats are written
+        to analysis_{run_id}_summary.json. Results of the run in the other
+        format are removed, so a stale blob is never read in place of the new ones.
         """
-        if run_id.startswith('analysis_'):
-            prefix = run_id
-        else:
-            prefix = f"analysis_{run_id}"
+        prefix = self._analysis_prefix(run_id)
 
-        if prefix.endswith('.json'):
-            prefix = prefix[:-5]
+        if self.streams_results:
+            for name in (f"{prefix}_relevant.json", f"{prefix}_not_relevant.json"):
+                if self._blob_exists(f"{self.analyzed_prefix}{name}"):
+                    self._get_blob_client(f"{self.analyzed_prefix}{name}").delete_blob()
+
+            for results in (relevant, not_relevant):
+                for result in results if isinstance(results, list) else results.get('results', []):
+                    self.append_analysis_result(run_id, result)
+
+            if isinstance(relevant, dict):
+                summary = {key: value for key, value in relevant.items() if key != 'results'}
+                self._upload_json(f"{self.analyzed_prefix}{prefix}_summary.json", summary)
+            return
 
         # Save relevant bills (handles both list and dict formats automatically)
         relevant_path = f"{self.analyzed_prefix}{prefix}_relevant.json"
@@ -167,19 +300,19 @@ class AzureBlobStorage(StorageProvider):
         not_relevant_path = f"{self.analyzed_prefix}{prefix}_not_relevant.json"
         self._upload_json(not_relevant_path, not_relevant)
 
+        self.clear_analysis_results(run_id)
+        summary_path = f"{self.analyzed_prefix}{prefix}_summary.json"
+        if self._blob_exists(summary_path):
+            self._get_blob_client(summary_path).delete_blob()
+
     def load_analysis_results(self, run_id: str) -> Tuple[List[Dict], List[Dict]]:
         """
         Load analysis results from:
         - analyzed/analysis_{run_id}_relevant.json
         - analyzed/analysis_{run_id}_not_relevant.json
+        (or from analysis_{run_id}.jsonl[.gz|.zst] for streamed runs)
         """
-        if run_id.startswith('analysis_'):
-            prefix = run_id
-        else:
-            prefix = f"analysis_{run_id}"
-
-        if prefix.endswith('.json'):
-            prefix = prefix[:-5]
+        prefix = self._analysis_prefix(run_id)
 
         relevant_path = f"{self.analyzed_prefix}{prefix}_relevant.json"
         not_relevant_path = f"{self.analyzed_prefix}{prefix}_not_relevant.json"
@@ -196,11 +329,47 @@ class AzureBlobStorage(StorageProvider):
         else:
             not_relevant = []
 
+        if not relevant and not not_relevant and self._find_jsonl(self.analyzed_prefix, prefix):
+            for result in self.iter_analysis_results(run_id):
+                is_relevant = result.get('analysis', {}).get('is_relevant', False)
+                (relevant if is_relevant else not_relevant).append(result)
+
         if not relevant and not not_relevant:
             raise FileNotFoundError(f"Analysis results not found for run_id: {run_id}")
 
         return relevant, not_relevant
 
+    def append_analysis_result(self, run_id: str, result: Dict[str, Any]) -> None:
+        """Append one result to the analyzed/analysis_{run_id}.jsonl[.gz|.zst] append blob"""
+        prefix = self._analysis_prefix(run_id)
+        blob_client = self._get_blob_client(
+            f"{self.analyzed_prefix}{prefix}{JSONL_SUFFIXES[self.compression]}"
+        )
+
+        if not blob_client.exists():
+            blob_client.create_append_blob()
+
+        blob_client.append_block(encode_record(result, self.compression))
+
+    def iter_analysis_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate analysis results, reading JSONL lazily (safe while a run is in progress)"""
+        blob_path = self._find_jsonl(self.analyzed_prefix, self._analysis_prefix(run_id))
+
+        if blob_path:
+            yield from self._iter_jsonl(blob_path)
+            return
+
+        for results in self.load_analysis_results(run_id):
+            yield from (results if isinstance(results, list) else results.get('results', []))
+
+    def clear_analysis_results(self, run_id: str) -> None:
+        """Delete streamed results for a run (analyzed/analysis_{run_id}.jsonl*)"""
+        prefix = self._analysis_prefix(run_id)
+        for suffix in JSONL_SUFFIXES.values():
+            blob_path = f"{self.analyzed_prefix}{prefix}{suffix}"
+            if self._blob_exists(blob_path):
+                self._get_blob_client(blob_path).delete_blob()
+
     def get_bill_from_cache(self, bill_id: int) -> Optional[Dict[str, Any]]:
         """Get cached bill from cache/legiscan_cache/bill_{bill_id}.json"""
         cache_path = f"{self.cache_prefix}bill_{bill_id}.json"
@@ -210,11 +379,207 @@ class AzureBlobStorage(StorageProvider):
 
         return self._download_json(cache_path)
 
+    def get_bills_from_cache(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Download cached bills concurrently"""
+        return lookup_concurrently(self.get_bill_from_cache, bill_ids)
+
     def save_bill_to_cache(self, bill_id: int, data: Dict[str, Any]) -> None:
         """Save bill to cache at cache/legiscan_cache/bill_{bill_id}.json"""
         cache_path = f"{self.cache_prefix}bill_{bill_id}.json"
         self._upload_json(cache_path, data)
 
+    def get_bill_text_from_cache(self, doc_id: str, extractor_version: Optional[str] = None) -> Optional[str]:
+        """
+        Get extracted bill text from cache/text/{doc_id}.txt.gz
+
+        The content hash and extractor version are kept in blob metadata.
+        """
+        from azure.core.exceptions import ResourceNotFoundError
+
+        blob_client = self._get_blob_client(f"{self.text_cache_prefix}{doc_id}.txt.gz")
+
+        try:
+            download_stream = blob_client.download_blob()
+        except ResourceNotFoundError:
+            return None
+
+        metadata = download_stream.properties.metadata or {}
+        recorded_version = metadata.get('extractor_version', LEGACY_EXTRACTOR_VERSION)
+        if extractor_version and recorded_version != extractor_version:
+            return None
+
+        return decompress_bill_text(download_stream.readall(), metadata.get('content_hash'))
+
+    def get_bill_texts_from_cache(
+        self,
+        doc_ids: Iterable[str],
+        extractor_versions: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Download cached bill texts concurrently"""
+        extractor_versions = extractor_versions or {}
+        return lookup_concurrently(
+            lambda doc_id: self.get_bill_text_from_cache(doc_id, extractor_versions.get(doc_id)), doc_ids
+        )
+
+    def save_bill_text_to_cache(self, doc_id: str, text: str, extractor_version: Optional[str] = None) -> None:
+        """Save gzip-compressed bill text to cache/text/{doc_id}.txt.gz"""
+        payload, content_hash = compress_bill_text(text)
+
+        blob_client = self._get_blob_client(f"{self.text_cache_prefix}{doc_id}.txt.gz")
+        blob_client.upload_blob(
+            payload,
+            overwrite=True,
+            metadata={
+                'content_hash': content_hash,
+                'extractor_version': extractor_version or LEGACY_EXTRACTOR_VERSION
+            }
+        )
+
+    def get_document_from_cache(self, doc_id: str) -> Optional[Tuple[DocumentFile, str]]:
+        """Get a cached raw document via cache/documents/refs/doc_{doc_id}.json"""
+        ref_path = f"{self.document_cache_prefix}refs/doc_{doc_id}.json"
+
+        if not self._blob_exists(ref_path):
+            return None
+
+        ref = self._download_json(ref_path)
+        object_path = f"{self.document_cache_prefix}{ref['content_hash']}.gz"
+
+        if not self._blob_exists(object_path):
+            return None
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+            self._get_blob_client(object_path).download_blob().readinto(spool)
+            spool.seek(0)
+            document = decompress_document(spool, ref['content_hash'])
+
+        return (document, ref.get('mime_type')) if document else None
+
+    def save_document_to_cache(self, doc_id: str, path: str, mime_type: str) -> str:
+        """Save a raw document to cache/documents/{hash}.gz (stored once per content hash)"""
+        content_hash = hash_document(path)
+        blob_client = self._get_blob_client(f"{self.document_cache_prefix}{content_hash}.gz")
+
+        if not blob_client.exists():
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+                compress_document(path, spool)
+                spool.seek(0)
+                blob_client.upload_blob(spool, overwrite=True)
+
+        self._upload_json(f"{self.document_cache_prefix}refs/doc_{doc_id}.json", {
+            'content_hash': content_hash,
+            'mime_type': mime_type,
+            'size': os.path.getsize(path)
+        })
+
+        return content_hash
+
+    def list_cached_documents(self) -> List[str]:
+        """List doc_ids referenced in cache/documents/refs/"""
+        prefix = f"{self.document_cache_prefix}refs/doc_"
+        return sorted(
+            blob_name[len(prefix):-len('.json')]
+            for blob_name in self._list_blobs(prefix)
+            if blob_name.endswith('.json')
+        )
+
+    def get_llm_response(self, cache_key: str) -> Optional[str]:
+        """Get cached LLM completion from cache/llm/{cache_key}.json"""
+        cache_path = f"{self.llm_cache_prefix}{cache_key}.json"
+
+        if not self._blob_exists(cache_path):
+            return None
+
+        entry = self._download_json(cache_path)
+        expires_at = entry.get('expires_at')
+        if expires_at and datetime.fromisoformat(expires_at) <= datetime.now(timezone.utc):
+            return None
+
+        return entry['response']
+
+    def save_llm_response(
+        self,
+        cache_key: str,
+        provider: str,
+        response: str,
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Save LLM completion to cache/llm/{cache_key}.json
+
+        Size-based eviction is not done here; use a container lifecycle
+        management rule on the cache/llm/ prefix to age out old entries.
+        """
+        now = datetime.now(timezone.utc)
+        entry = {
+            'provider': provider,
+            'response': response,
+            'created_at': now.isoformat(),
+            'expires_at': (now + timedelta(seconds=ttl_seconds)).isoformat() if ttl_seconds else None
+        }
+        self._upload_json(f"{self.llm_cache_prefix}{cache_key}.json", entry)
+
+    def append_checkpoint(self, run_id: str, record: Dict[str, Any]) -> None:
+        """Append a record to the cache/checkpoints/{run_id}.jsonl append blob"""
+        blob_client = self._get_blob_client(f"{self.checkpoint_prefix}{run_id}.jsonl")
+
+        if not blob_client.exists():
+            blob_client.create_append_blob()
+
+        blob_client.append_block(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def load_checkpoints(self, run_id: str) -> List[Dict[str, Any]]:
+        """Load records from cache/checkpoints/{run_id}.jsonl"""
+        blob_path = f"{self.checkpoint_prefix}{run_id}.jsonl"
+
+        if not self._blob_exists(blob_path):
+            return []
+
+        content = self._get_blob_client(blob_path).download_blob().readall().decode('utf-8')
+        return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    def clear_checkpoints(self, run_id: str) -> None:
+        """Delete cache/checkpoints/{run_id}.jsonl"""
+        blob_path = f"{self.checkpoint_prefix}{run_id}.jsonl"
+
+        if self._blob_exists(blob_path):
+            self._get_blob_client(blob_path).delete_blob()
+
+    def get_dirty_bills(self, filename: str) -> List[int]:
+        """Get dirty bill IDs from cache/sync/{filename}_dirty.json"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        blob_path = f"{self.sync_prefix}{filename}_dirty.json"
+
+        if not self._blob_exists(blob_path):
+            return []
+
+        return self._download_json(blob_path)
+
+    def mark_bills_dirty(self, filename: str, bill_ids: List[int]) -> None:
+        """Add bill IDs to cache/sync/{filename}_dirty.json"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        dirty = set(self.get_dirty_bills(filename)) | set(bill_ids)
+        self._upload_json(f"{self.sync_prefix}{filename}_dirty.json", sorted(dirty))
+
+    def clear_dirty_bills(self, filename: str, bill_ids: Optional[List[int]] = None) -> None:
+        """Remove bill IDs (or all) from cache/sync/{filename}_dirty.json"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        blob_path = f"{self.sync_prefix}{filename}_dirty.json"
+        remaining = set(self.get_dirty_bills(filename)) - set(bill_ids) if bill_ids is not None else set()
+
+        if not remaining:
+            if self._blob_exists(blob_path):
+                self._get_blob_client(blob_path).delete_blob()
+            return
+
+        self._upload_json(blob_path, sorted(remaining))
+
     def list_raw_files(self) -> List[str]:
         """List all JSON files in raw/ prefix"""
         blobs = self._list_blobs(self.raw_prefix)
@@ -232,67 +597,115 @@ class AzureBlobStorage(StorageProvider):
         """List all filter result files in filtered/ prefix"""
         blobs = self._list_blobs(self.filtered_prefix)
 
-        files = []
+        files = set()
         for blob_name in blobs:
             if blob_name.endswith('.json'):
                 # Extract filename without prefix and .json extension
                 filename = blob_name[len(self.filtered_prefix):-5]
-                files.append(filename)
+                files.add(filename)
+            elif '.jsonl' in blob_name:
+                files.add(blob_name[len(self.filtered_prefix):].split('.jsonl')[0])
 
         return sorted(files)
 
-    def bill_exists_in_raw(self, bill_number: str, filename: str) -> bool:
-        """Check if a bill exists in raw data by bill number"""
+    def list_analysis_results(self) -> List[str]:
+        """List analysis runs in analyzed/ prefix (relevant/not relevant JSON pairs or JSONL)"""
+        runs = set()
+        for blob_name in self._list_blobs(self.analyzed_prefix):
+            name = blob_name[len(self.analyzed_prefix):]
+            if '.jsonl' in name:
+                runs.add(name.split('.jsonl')[0])
+            elif name.endswith('_not_relevant.json'):
+                runs.add(name[:-len('_not_relevant.json')])
+            elif name.endswith('_relevant.json'):
+                runs.add(name[:-len('_relevant.json')])
+
+        return sorted(runs)
+
+    def _save_raw_index(self, filename: str, etag: str, bills: Dict[str, List[int]]) -> None:
+        """Upload the bill number index of a raw blob to cache/raw_index/{filename}.json"""
+        index_blob = self._get_blob_client(f"{self.raw_index_prefix}{filename}.json")
+        index_blob.upload_blob(json.dumps(new_raw_index(etag, bills), separators=(',', ':')), overwrite=True)
+
+        with self._raw_index_lock:
+            self._raw_indexes[filename] = (etag, bills)
+
+    def _get_raw_index(self, filename: str) -> Tuple[str, Dict[str, List[int]]]:
+        """
+        Get (ETag, bill number index) of a raw blob, rebuilding the index if the blob changed
+
+        Raises:
+            FileNotFoundError: If the raw blob doesn't exist
+            json.JSONDecodeError: If the raw blob has to be indexed and isn't valid JSON
+        """
+        from azure.core.exceptions import ResourceNotFoundError
+
+        with self._raw_index_lock:
+            memo = self._raw_indexes.get(filename)
+        if memo:
+            return memo
+
+        raw_path = f"{self.raw_prefix}{filename}.json"
+        raw_blob = self._get_blob_client(raw_path)
         try:
-            data = self.load_raw_data(filename)
-
-            # Handle different data structures
-            if isinstance(data, dict):
-                if 'summary' in data and 'masterlist' in data['summary']:
-                    bills = data['summary']['masterlist']
-                elif 'bills' in data:
-                    bills = data['bills']
-                else:
-                    bills = list(data.values()) if data else []
-            elif isinstance(data, list):
-                bills = data
-            else:
-                return False
+            etag = raw_blob.get_blob_properties().etag
+        except ResourceNotFoundError:
+            raise FileNotFoundError(f"Blob not found: {raw_path}")
 
-            # Search for bill by number
-            for bill in bills:
-                if isinstance(bill, dict) and bill.get('bill_number') == bill_number:
-                    return True
+        try:
+            index_blob = self._get_blob_client(f"{self.raw_index_prefix}{filename}.json")
+            bills = index_bills(json.loads(index_blob.download_blob().readall()), etag)
+        except (ResourceNotFoundError, json.JSONDecodeError):
+            bills = None
+
+        if bills is None:
+            download_stream = raw_blob.download_blob()
+            etag = download_stream.properties.etag
+            bills = build_raw_index(download_stream.readall())
+            self._save_raw_index(filename, etag, bills)
+        else:
+            with self._raw_index_lock:
+                self._raw_indexes[filename] = (etag, bills)
 
-            return False
+        return etag, bills
+
+    def bill_exists_in_raw(self, bill_number: str, filename: str) -> bool:
+        """Check if a bill exists in raw data by bill number (via the raw blob's index)"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
 
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        try:
+            return bill_number in self._get_raw_index(filename)[1]
+        except (FileNotFoundError, json.JSONDecodeError):
             return False
 
     def get_bill_by_number(self, bill_number: str, filename: str) -> Optional[Dict[str, Any]]:
-        """Get a specific bill from raw data by bill number"""
-        try:
-            data = self.load_raw_data(filename)
-
-            # Handle different data structures
-            if isinstance(data, dict):
-                if 'summary' in data and 'masterlist' in data['summary']:
-                    bills = data['summary']['masterlist']
-                elif 'bills' in data:
-                    bills = data['bills']
-                else:
-                    bills = list(data.values()) if data else []
-            elif isinstance(data, list):
-                bills = data
-            else:
-                return None
+        """Get a specific bill from raw data by bill number, downloading only its range of the blob"""
+        from azure.core import MatchConditions
+        from azure.core.exceptions import ResourceModifiedError
 
-            # Search for bill by number
-            for bill in bills:
-                if isinstance(bill, dict) and bill.get('bill_number') == bill_number:
-                    return bill
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        try:
+            # A second attempt re-indexes a blob that was replaced since it was indexed
+            for _ in range(2):
+                etag, bills = self._get_raw_index(filename)
+                entry = bills.get(bill_number)
+                if not entry:
+                    return None
+
+                _, offset, length = entry
+                try:
+                    download_stream = self._get_blob_client(f"{self.raw_prefix}{filename}.json").download_blob(
+                        offset=offset, length=length, etag=etag, match_condition=MatchConditions.IfNotModified
+                    )
+                    return json.loads(download_stream.readall())
+                except ResourceModifiedError:
+                    with self._raw_index_lock:
+                        self._raw_indexes.pop(filename, None)
 
             return None
 
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        except (FileNotFoundError, json.JSONDecodeError):
             return None
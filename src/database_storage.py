@@ -5,15 +5,60 @@ Implements PostgreSQL-based storage for team collaboration and queryable data.
 Supports optional dual-write mode to maintain file compatibility during migration.
 """
 
+import io
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import ThreadedConnectionPool
+
+from src.document_stream import DocumentFile
+from src.storage_provider import (
+    StorageProvider, compress_bill_text, compress_document, decompress_bill_text, decompress_document,
+    hash_document
+)
+from src.text_extraction import LEGACY_EXTRACTOR_VERSION
+
+# Rows sent per statement by the bulk upserts
+BATCH_PAGE_SIZE = 1000
+
+ANALYSIS_UPSERT_QUERY = """
+    INSERT INTO analysis_results (
+        bill_id, run_id, is_relevant, relevance_reasoning, summary,
+        bill_status, legislation_type, categories, tags, key_provisions,
+        palliative_care_impact, exclusion_check, special_flags
+    )
+    SELECT DISTINCT ON (v.bill_number)
+        b.bill_id, v.run_id, v.is_relevant, v.relevance_reasoning, v.summary,
+        v.bill_status, v.legislation_type, v.categories, v.tags, v.key_provisions,
+        v.palliative_care_impact, v.exclusion_check, v.special_flags
+    FROM (VALUES %s) AS v(
+        bill_number, run_id, is_relevant, relevance_reasoning, summary,
+        bill_status, legislation_type, categories, tags, key_provisions,
+        palliative_care_impact, exclusion_check, special_flags
+    )
+    JOIN bills b ON b.bill_number = v.bill_number
+    ORDER BY v.bill_number, b.updated_at DESC
+    ON CONFLICT (bill_id, run_id) DO UPDATE SET
+        is_relevant = EXCLUDED.is_relevant,
+        relevance_reasoning = EXCLUDED.relevance_reasoning,
+        summary = EXCLUDED.summary,
+        bill_status = EXCLUDED.bill_status,
+        legislation_type = EXCLUDED.legislation_type,
+        categories = EXCLUDED.categories,
+        tags = EXCLUDED.tags,
+        key_provisions = EXCLUDED.key_provisions,
+        palliative_care_impact = EXCLUDED.palliative_care_impact,
+        exclusion_check = EXCLUDED.exclusion_check,
+        special_flags = EXCLUDED.special_flags,
+        analyzed_at = CURRENT_TIMESTAMP
+"""
 
-from src.storage_provider import StorageProvider
+ANALYSIS_UPSERT_TEMPLATE = (
+    "(%s, %s, %s::boolean, %s, %s, %s, %s, %s::jsonb, %s::jsonb, %s::jsonb, %s, %s::jsonb, %s::jsonb)"
+)
 
 
 class DatabaseStorage(StorageProvider):
@@ -42,9 +87,9 @@ class DatabaseStorage(StorageProvider):
         pool_size = config.get('pool_size', 5)
         pool_max_overflow = config.get('pool_max_overflow', 10)
 
-        # Initialize connection pool
+        # Initialize connection pool (thread-safe: concurrent analysis workers share it)
         try:
-            self.pool = SimpleConnectionPool(
+            self.pool = ThreadedConnectionPool(
                 minconn=1,
                 maxconn=pool_size + pool_max_overflow,
                 dsn=self.connection_string
@@ -98,7 +143,7 @@ class DatabaseStorage(StorageProvider):
             self._return_connection(conn)
 
     def save_raw_data(self, filename: str, data: Dict[str, Any]) -> None:
-        """Save raw bill data to bills table"""
+        """Save raw bill data to bills table (bulk upsert)"""
         if filename.endswith('.json'):
             filename = filename[:-5]
 
@@ -112,70 +157,73 @@ class DatabaseStorage(StorageProvider):
         else:
             bills = []
 
+        # One row per bill_id (a statement can't upsert the same key twice)
+        now = datetime.now()
+        rows = {}
+        for bill in bills:
+            if not isinstance(bill, dict):
+                continue
+
+            bill_id = bill.get('bill_id')
+            if not bill_id:
+                continue
+
+            # Parse last_action_date
+            last_action_date = bill.get('last_action_date')
+            if last_action_date and isinstance(last_action_date, str):
+                try:
+                    last_action_date = datetime.strptime(last_action_date, '%Y-%m-%d').date()
+                except ValueError:
+                    last_action_date = None
+
+            rows[bill_id] = (
+                bill_id,
+                bill.get('bill_number'),
+                bill.get('state'),
+                bill.get('session'),
+                bill.get('title'),
+                bill.get('description'),
+                bill.get('status'),
+                bill.get('status_desc'),
+                bill.get('year'),
+                bill.get('change_hash'),
+                bill.get('last_action'),
+                last_action_date,
+                bill.get('url'),
+                bill.get('state_url'),
+                json.dumps(bill),
+                now
+            )
+
+        query = """
+            INSERT INTO bills (
+                bill_id, bill_number, state, session, title, description,
+                status, status_desc, year, change_hash, last_action,
+                last_action_date, url, state_url, raw_data, updated_at
+            ) VALUES %s
+            ON CONFLICT (bill_id) DO UPDATE SET
+                bill_number = EXCLUDED.bill_number,
+                state = EXCLUDED.state,
+                session = EXCLUDED.session,
+                title = EXCLUDED.title,
+                description = EXCLUDED.description,
+                status = EXCLUDED.status,
+                status_desc = EXCLUDED.status_desc,
+                year = EXCLUDED.year,
+                change_hash = EXCLUDED.change_hash,
+                last_action = EXCLUDED.last_action,
+                last_action_date = EXCLUDED.last_action_date,
+                url = EXCLUDED.url,
+                state_url = EXCLUDED.state_url,
+                raw_data = EXCLUDED.raw_data,
+                updated_at = EXCLUDED.updated_at
+        """
+
         # Insert bills into database
         conn = self._get_connection()
         try:
             with conn.cursor() as cursor:
-                for bill in bills:
-                    if not isinstance(bill, dict):
-                        continue
-
-                    # Prepare bill data
-                    bill_id = bill.get('bill_id')
-                    if not bill_id:
-                        continue
-
-                    # Insert or update bill
-                    query = """
-                        INSERT INTO bills (
-                            bill_id, bill_number, state, session, title, description,
-                            status, status_desc, year, change_hash, last_action,
-                            last_action_date, url, state_url, raw_data, updated_at
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (bill_id) DO UPDATE SET
-                            bill_number = EXCLUDED.bill_number,
-                            state = EXCLUDED.state,
-                            session = EXCLUDED.session,
-                            title = EXCLUDED.title,
-                            description = EXCLUDED.description,
-                            status = EXCLUDED.status,
-                            status_desc = EXCLUDED.status_desc,
-                            year = EXCLUDED.year,
-                            change_hash = EXCLUDED.change_hash,
-                            last_action = EXCLUDED.last_action,
-                            last_action_date = EXCLUDED.last_action_date,
-                            url = EXCLUDED.url,
-                            state_url = EXCLUDED.state_url,
-                            raw_data = EXCLUDED.raw_data,
-                            updated_at = EXCLUDED.updated_at
-                    """
-
-                    # Parse last_action_date
-                    last_action_date = bill.get('last_action_date')
-                    if last_action_date and isinstance(last_action_date, str):
-                        try:
-                            last_action_date = datetime.strptime(last_action_date, '%Y-%m-%d').date()
-                        except ValueError:
-                            last_action_date = None
-
-                    cursor.execute(query, (
-                        bill_id,
-                        bill.get('bill_number'),
-                        bill.get('state'),
-                        bill.get('session'),
-                        bill.get('title'),
-                        bill.get('description'),
-                        bill.get('status'),
-                        bill.get('status_desc'),
-                        bill.get('year'),
-                        bill.get('change_hash'),
-                        bill.get('last_action'),
-                        last_action_date,
-                        bill.get('url'),
-                        bill.get('state_url'),
-                        json.dumps(bill),
-                        datetime.now()
-                    ))
+                execute_values(cursor, query, list(rows.values()), page_size=BATCH_PAGE_SIZE)
 
             conn.commit()
         except Exception as e:
@@ -231,70 +279,43 @@ class DatabaseStorage(StorageProvider):
         }
 
     def save_filtered_results(self, run_id: str, data: Dict[str, Any]) -> None:
-        """Save filter results to filter_results table"""
+        """Save filter results to filter_results table (bulk upsert, bill_id resolved by join)"""
         # Extract relevant bills from data
         relevant_bills = data.get('relevant_bills', [])
         summary = data.get('summary', {})
         total_analyzed = summary.get('total_analyzed', 0)
         relevant_count = summary.get('relevant_count', 0)
-        not_relevant_count = summary.get('not_relevant_count', 0)
+
+        # One row per bill_number (a statement can't upsert the same key twice)
+        rows = {
+            bill_data['bill_number']: (bill_data['bill_number'], run_id, True, bill_data.get('reason', ''))
+            for bill_data in relevant_bills
+            if bill_data.get('bill_number')
+        }
+
+        # Bill numbers repeat across states/sessions; take the most recently updated bill
+        query = """
+            INSERT INTO filter_results (bill_id, run_id, is_relevant, reason)
+            SELECT DISTINCT ON (v.bill_number) b.bill_id, v.run_id, v.is_relevant, v.reason
+            FROM (VALUES %s) AS v(bill_number, run_id, is_relevant, reason)
+            JOIN bills b ON b.bill_number = v.bill_number
+            ORDER BY v.bill_number, b.updated_at DESC
+            ON CONFLICT (bill_id, run_id) DO UPDATE SET
+                is_relevant = EXCLUDED.is_relevant,
+                reason = EXCLUDED.reason,
+                filtered_at = CURRENT_TIMESTAMP
+        """
 
         conn = self._get_connection()
         try:
             with conn.cursor() as cursor:
-                # Insert filter results for each bill
-                for bill_data in relevant_bills:
-                    bill_number = bill_data.get('bill_number')
-                    if not bill_number:
-                        continue
-
-                    # Get bill_id from bills table
-                    cursor.execute(
-                        "SELECT bill_id FROM bills WHERE bill_number = %s",
-                        (bill_number,)
-                    )
-                    bill_row = cursor.fetchone()
-
-                    if not bill_row:
-                        continue
-
-                    bill_id = bill_row[0]
-
-                    # Insert filter result
-                    query = """
-                        INSERT INTO filter_results (bill_id, run_id, is_relevant, reason)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (bill_id, run_id) DO UPDATE SET
-                            is_relevant = EXCLUDED.is_relevant,
-                            reason = EXCLUDED.reason,
-                            filtered_at = CURRENT_TIMESTAMP
-                    """
-
-                    cursor.execute(query, (
-                        bill_id,
-                        run_id,
-                        True,
-                        bill_data.get('reason', '')
-                    ))
+                execute_values(
+                    cursor, query, list(rows.values()),
+                    template="(%s, %s, %s::boolean, %s)", page_size=BATCH_PAGE_SIZE
+                )
 
                 # Record pipeline run
-                cursor.execute("""
-                    INSERT INTO pipeline_runs (
-                        run_id, stage, status, bills_processed, bills_relevant, completed_at
-                    ) VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (run_id) DO UPDATE SET
-                        bills_processed = EXCLUDED.bills_processed,
-                        bills_relevant = EXCLUDED.bills_relevant,
-                        completed_at = EXCLUDED.completed_at,
-                        status = EXCLUDED.status
-                """, (
-                    run_id,
-                    'filter',
-                    'completed',
-                    total_analyzed,
-                    relevant_count,
-                    datetime.now()
-                ))
+                self._record_pipeline_run(cursor, run_id, 'filter', total_analyzed, relevant_count)
 
             conn.commit()
         except Exception as e:
@@ -307,6 +328,26 @@ class DatabaseStorage(StorageProvider):
         if self.enable_file_fallback:
             self.file_storage.save_filtered_results(run_id, data)
 
+    def _record_pipeline_run(self, cursor, run_id: str, stage: str, processed: int, relevant: int) -> None:
+        """Upsert a completed run into pipeline_runs"""
+        cursor.execute("""
+            INSERT INTO pipeline_runs (
+                run_id, stage, status, bills_processed, bills_relevant, completed_at
+            ) VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (run_id) DO UPDATE SET
+                bills_processed = EXCLUDED.bills_processed,
+                bills_relevant = EXCLUDED.bills_relevant,
+                completed_at = EXCLUDED.completed_at,
+                status = EXCLUDED.status
+        """, (
+            run_id,
+            stage,
+            'completed',
+            processed,
+            relevant,
+            datetime.now()
+        ))
+
     def load_filtered_results(self, run_id: str) -> Dict[str, Any]:
         """Load filter results from filter_results table"""
         query = """
@@ -355,6 +396,56 @@ class DatabaseStorage(StorageProvider):
             'relevant_bills': relevant_bills
         }
 
+    def iter_filtered_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate filter_results rows for a run (only relevant bills are stored)"""
+        query = """
+            SELECT b.bill_number, b.title, b.url, f.reason, f.is_relevant
+            FROM filter_results f
+            JOIN bills b ON f.bill_id = b.bill_id
+            WHERE f.run_id = %s
+            ORDER BY b.bill_number
+        """
+
+        for row in self._execute_query(query, (run_id,), fetch='all') or []:
+            yield {
+                'bill_number': row['bill_number'],
+                'title': row['title'],
+                'url': row['url'],
+                'reason': row['reason'],
+                'relevant': row['is_relevant']
+            }
+
+    @staticmethod
+    def _analysis_row(run_id: str, result: Dict[str, Any], is_relevant: bool) -> Optional[tuple]:
+        """
+        Build an ANALYSIS_UPSERT_TEMPLATE row from an analysis result
+
+        Accepts {"bill": {...}, "analysis": {...}} records as well as flat
+        legacy records that carry bill_number and analysis fields together.
+        """
+        bill = result.get('bill', result)
+        analysis = result.get('analysis', result)
+
+        bill_number = bill.get('bill_number')
+        if not bill_number:
+            return None
+
+        return (
+            bill_number,
+            run_id,
+            is_relevant,
+            analysis.get('relevance_reasoning', ''),
+            analysis.get('summary', ''),
+            analysis.get('bill_status', ''),
+            analysis.get('legislation_type', ''),
+            json.dumps(analysis.get('categories', [])),
+            json.dumps(analysis.get('tags', [])),
+            json.dumps(analysis.get('key_provisions', [])),
+            analysis.get('palliative_care_impact', ''),
+            json.dumps(analysis.get('exclusion_check', {})),
+            json.dumps(analysis.get('special_flags', {}))
+        )
+
     def save_analysis_results(
         self,
         run_id: str,
@@ -362,95 +453,39 @@ class DatabaseStorage(StorageProvider):
         not_relevant: Union[List[Dict[str, Any]], Dict[str, Any]]
     ) -> None:
         """
-        Save analysis results to analysis_results table
+        Save analysis results to analysis_results table (bulk upsert, bill_id resolved by join)
 
         Accepts either:
         - List format (legacy): [{"bill": {...}, "analysis": {...}}, ...]
         - Dict format (with stats): {"summary": {...}, "timing_stats": {...}, "results": [...]}
         """
+        # Extract results list from either format
+        relevant_list = relevant if isinstance(relevant, list) else relevant.get('results', [])
+        not_relevant_list = not_relevant if isinstance(not_relevant, list) else not_relevant.get('results', [])
+
+        # One row per bill_number (a statement can't upsert the same key twice)
+        rows = {}
+        for results, is_relevant in [(relevant_list, True), (not_relevant_list, False)]:
+            for result in results:
+                row = self._analysis_row(run_id, result, is_relevant)
+                if row:
+                    rows[row[0]] = row
+
+        # Streamed runs pass empty lists; take the counts from the summary instead
+        summary = relevant.get('summary', {}) if isinstance(relevant, dict) else {}
+        relevant_count = summary.get('relevant_count', len(relevant_list))
+        processed_count = relevant_count + summary.get('not_relevant_count', len(not_relevant_list))
+
         conn = self._get_connection()
         try:
             with conn.cursor() as cursor:
-                # Extract results list from either format
-                relevant_list = relevant if isinstance(relevant, list) else relevant.get('results', [])
-                not_relevant_list = not_relevant if isinstance(not_relevant, list) else not_relevant.get('results', [])
-
-                # Process both relevant and not relevant bills
-                all_bills = [(bill, True) for bill in relevant_list] + [(bill, False) for bill in not_relevant_list]
-
-                for bill_data, is_relevant in all_bills:
-                    bill_number = bill_data.get('bill_number')
-                    if not bill_number:
-                        continue
-
-                    # Get bill_id from bills table
-                    cursor.execute(
-                        "SELECT bill_id FROM bills WHERE bill_number = %s",
-                        (bill_number,)
-                    )
-                    bill_row = cursor.fetchone()
-
-                    if not bill_row:
-                        continue
-
-                    bill_id = bill_row[0]
-
-                    # Insert analysis result
-                    query = """
-                        INSERT INTO analysis_results (
-                            bill_id, run_id, is_relevant, relevance_reasoning, summary,
-                            bill_status, legislation_type, categories, tags, key_provisions,
-                            palliative_care_impact, exclusion_check, special_flags
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (bill_id, run_id) DO UPDATE SET
-                            is_relevant = EXCLUDED.is_relevant,
-                            relevance_reasoning = EXCLUDED.relevance_reasoning,
-                            summary = EXCLUDED.summary,
-                            bill_status = EXCLUDED.bill_status,
-                            legislation_type = EXCLUDED.legislation_type,
-                            categories = EXCLUDED.categories,
-                            tags = EXCLUDED.tags,
-                            key_provisions = EXCLUDED.key_provisions,
-                            palliative_care_impact = EXCLUDED.palliative_care_impact,
-                            exclusion_check = EXCLUDED.exclusion_check,
-                            special_flags = EXCLUDED.special_flags,
-                            analyzed_at = CURRENT_TIMESTAMP
-                    """
-
-                    cursor.execute(query, (
-                        bill_id,
-                        run_id,
-                        is_relevant,
-                        bill_data.get('relevance_reasoning', ''),
-                        bill_data.get('summary', ''),
-                        bill_data.get('bill_status', ''),
-                        bill_data.get('legislation_type', ''),
-                        json.dumps(bill_data.get('categories', [])),
-                        json.dumps(bill_data.get('tags', [])),
-                        json.dumps(bill_data.get('key_provisions', [])),
-                        bill_data.get('palliative_care_impact', ''),
-                        json.dumps(bill_data.get('exclusion_check', {})),
-                        json.dumps(bill_data.get('special_flags', {}))
-                    ))
+                execute_values(
+                    cursor, ANALYSIS_UPSERT_QUERY, list(rows.values()),
+                    template=ANALYSIS_UPSERT_TEMPLATE, page_size=BATCH_PAGE_SIZE
+                )
 
                 # Update pipeline run
-                cursor.execute("""
-                    INSERT INTO pipeline_runs (
-                        run_id, stage, status, bills_processed, bills_relevant, completed_at
-                    ) VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (run_id) DO UPDATE SET
-                        bills_processed = EXCLUDED.bills_processed,
-                        bills_relevant = EXCLUDED.bills_relevant,
-                        completed_at = EXCLUDED.completed_at,
-                        status = EXCLUDED.status
-                """, (
-                    run_id,
-                    'analysis',
-                    'completed',
-                    len(relevant) + len(not_relevant),
-                    len(relevant),
-                    datetime.now()
-                ))
+                self._record_pipeline_run(cursor, run_id, 'analysis', processed_count, relevant_count)
 
             conn.commit()
         except Exception as e:
@@ -519,6 +554,88 @@ class DatabaseStorage(StorageProvider):
 
         return relevant, not_relevant
 
+    def append_analysis_result(self, run_id: str, result: Dict[str, Any]) -> None:
+        """
+        Insert a single {"bill": {...}, "analysis": {...}} result into analysis_results
+
+        Results whose bill_number is not in the bills table are skipped.
+        """
+        row = self._analysis_row(run_id, result, result.get('analysis', {}).get('is_relevant', False))
+
+        if row:
+            conn = self._get_connection()
+            try:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, ANALYSIS_UPSERT_QUERY, [row], template=ANALYSIS_UPSERT_TEMPLATE)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                self._return_connection(conn)
+
+        # File fallback
+        if self.enable_file_fallback:
+            self.file_storage.append_analysis_result(run_id, result)
+
+    def iter_analysis_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate analysis_results rows using a server-side cursor"""
+        query = """
+            SELECT
+                b.bill_number, b.title, b.url,
+                a.is_relevant, a.relevance_reasoning, a.summary, a.bill_status,
+                a.legislation_type, a.categories, a.tags, a.key_provisions,
+                a.palliative_care_impact, a.exclusion_check, a.special_flags
+            FROM analysis_results a
+            JOIN bills b ON a.bill_id = b.bill_id
+            WHERE a.run_id = %s
+            ORDER BY b.bill_number
+        """
+
+        def _json(value, default):
+            if value is None:
+                return default
+            return value if isinstance(value, (dict, list)) else json.loads(value)
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor(name=f"iter_analysis_{os.getpid()}", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = 500
+                cursor.execute(query, (run_id,))
+
+                for row in cursor:
+                    yield {
+                        'bill': {
+                            'bill_number': row['bill_number'],
+                            'title': row['title'],
+                            'url': row['url']
+                        },
+                        'analysis': {
+                            'is_relevant': row['is_relevant'],
+                            'relevance_reasoning': row['relevance_reasoning'],
+                            'summary': row['summary'],
+                            'bill_status': row['bill_status'],
+                            'legislation_type': row['legislation_type'],
+                            'categories': _json(row['categories'], []),
+                            'tags': _json(row['tags'], []),
+                            'key_provisions': _json(row['key_provisions'], []),
+                            'palliative_care_impact': row['palliative_care_impact'],
+                            'exclusion_check': _json(row['exclusion_check'], {}),
+                            'special_flags': _json(row['special_flags'], {})
+                        }
+                    }
+            conn.commit()
+        finally:
+            self._return_connection(conn)
+
+    def clear_analysis_results(self, run_id: str) -> None:
+        """Delete a run's rows from analysis_results table"""
+        self._execute_query("DELETE FROM analysis_results WHERE run_id = %s", (run_id,))
+
+        # File fallback
+        if self.enable_file_fallback:
+            self.file_storage.clear_analysis_results(run_id)
+
     def get_bill_from_cache(self, bill_id: int) -> Optional[Dict[str, Any]]:
         """Get cached bill from legiscan_cache table"""
         query = "SELECT response_data FROM legiscan_cache WHERE bill_id = %s"
@@ -529,6 +646,17 @@ class DatabaseStorage(StorageProvider):
 
         return None
 
+    def get_bills_from_cache(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Get cached bills from legiscan_cache table in one query"""
+        bill_ids = [int(bill_id) for bill_id in bill_ids]
+        if not bill_ids:
+            return {}
+
+        query = "SELECT bill_id, response_data FROM legiscan_cache WHERE bill_id = ANY(%s)"
+        results = self._execute_query(query, (bill_ids,), fetch='all')
+
+        return {row['bill_id']: json.loads(row['response_data']) for row in results}
+
     def save_bill_to_cache(self, bill_id: int, data: Dict[str, Any]) -> None:
         """Save bill to legiscan_cache table"""
         query = """
@@ -545,6 +673,273 @@ class DatabaseStorage(StorageProvider):
         if self.enable_file_fallback:
             self.file_storage.save_bill_to_cache(bill_id, data)
 
+    def get_bill_text_from_cache(self, doc_id: str, extractor_version: Optional[str] = None) -> Optional[str]:
+        """Get extracted bill text from bill_text_cache table"""
+        query = "SELECT text_gzip, content_hash, extractor_version FROM bill_text_cache WHERE doc_id = %s"
+        result = self._execute_query(query, (str(doc_id),), fetch='one')
+
+        if not result:
+            return None
+
+        if extractor_version and result['extractor_version'] != extractor_version:
+            return None
+
+        return decompress_bill_text(bytes(result['text_gzip']), result['content_hash'])
+
+    def get_bill_texts_from_cache(
+        self,
+        doc_ids: Iterable[str],
+        extractor_versions: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Get extracted bill texts from bill_text_cache table in one query"""
+        doc_ids = [str(doc_id) for doc_id in doc_ids]
+        if not doc_ids:
+            return {}
+
+        extractor_versions = extractor_versions or {}
+        query = "SELECT doc_id, text_gzip, content_hash, extractor_version FROM bill_text_cache WHERE doc_id = ANY(%s)"
+        results = self._execute_query(query, (doc_ids,), fetch='all')
+
+        texts = {}
+        for row in results:
+            expected_version = extractor_versions.get(row['doc_id'])
+            if expected_version and row['extractor_version'] != expected_version:
+                continue
+            text = decompress_bill_text(bytes(row['text_gzip']), row['content_hash'])
+            if text is not None:
+                texts[row['doc_id']] = text
+        return texts
+
+    def save_bill_text_to_cache(self, doc_id: str, text: str, extractor_version: Optional[str] = None) -> None:
+        """Save gzip-compressed bill text to bill_text_cache table"""
+        payload, content_hash = compress_bill_text(text)
+
+        query = """
+            INSERT INTO bill_text_cache (doc_id, content_hash, extractor_version, text_gzip, text_length)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (doc_id) DO UPDATE SET
+                content_hash = EXCLUDED.content_hash,
+                extractor_version = EXCLUDED.extractor_version,
+                text_gzip = EXCLUDED.text_gzip,
+                text_length = EXCLUDED.text_length,
+                cached_at = CURRENT_TIMESTAMP
+        """
+
+        self._execute_query(query, (
+            str(doc_id),
+            content_hash,
+            extractor_version or LEGACY_EXTRACTOR_VERSION,
+            psycopg2.Binary(payload),
+            len(text)
+        ))
+
+        # File fallback
+        if self.enable_file_fallback:
+            self.file_storage.save_bill_text_to_cache(doc_id, text, extractor_version)
+
+    def append_checkpoint(self, run_id: str, record: Dict[str, Any]) -> None:
+        """Append a record to analysis_checkpoints table"""
+        query = "INSERT INTO analysis_checkpoints (run_id, record) VALUES (%s, %s)"
+        self._execute_query(query, (run_id, json.dumps(record)))
+
+    def load_checkpoints(self, run_id: str) -> List[Dict[str, Any]]:
+        """Load records from analysis_checkpoints table"""
+        query = "SELECT record FROM analysis_checkpoints WHERE run_id = %s ORDER BY id"
+        results = self._execute_query(query, (run_id,), fetch='all')
+        return [row['record'] if isinstance(row['record'], dict) else json.loads(row['record']) for row in results]
+
+    def clear_checkpoints(self, run_id: str) -> None:
+        """Delete a run's rows from analysis_checkpoints table"""
+        self._execute_query("DELETE FROM analysis_checkpoints WHERE run_id = %s", (run_id,))
+
+    def get_dirty_bills(self, filename: str) -> List[int]:
+        """Get dirty bill IDs from dirty_bills table"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        query = "SELECT bill_id FROM dirty_bills WHERE source = %s ORDER BY bill_id"
+        results = self._execute_query(query, (filename,), fetch='all')
+        return [row['bill_id'] for row in results]
+
+    def mark_bills_dirty(self, filename: str, bill_ids: List[int]) -> None:
+        """Add bill IDs to dirty_bills table"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        if not bill_ids:
+            return
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO dirty_bills (source, bill_id) VALUES %s
+                    ON CONFLICT (source, bill_id) DO UPDATE SET marked_at = CURRENT_TIMESTAMP
+                    """,
+                    [(filename, bill_id) for bill_id in bill_ids]
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self._return_connection(conn)
+
+    def clear_dirty_bills(self, filename: str, bill_ids: Optional[List[int]] = None) -> None:
+        """Remove bill IDs (or all) from dirty_bills table"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        if bill_ids is None:
+            self._execute_query("DELETE FROM dirty_bills WHERE source = %s", (filename,))
+        else:
+            self._execute_query(
+                "DELETE FROM dirty_bills WHERE source = %s AND bill_id = ANY(%s)",
+                (filename, list(bill_ids))
+            )
+
+    def get_document_from_cache(self, doc_id: str) -> Optional[Tuple[DocumentFile, str]]:
+        """Get a cached raw document from bill_document_refs / bill_documents tables"""
+        query = """
+            SELECT r.content_hash, r.mime_type, d.document_gzip
+            FROM bill_document_refs r
+            JOIN bill_documents d ON d.content_hash = r.content_hash
+            WHERE r.doc_id = %s
+        """
+        result = self._execute_query(query, (str(doc_id),), fetch='one')
+
+        if not result:
+            return None
+
+        document = decompress_document(io.BytesIO(bytes(result['document_gzip'])), result['content_hash'])
+        return (document, result['mime_type']) if document else None
+
+    def save_document_to_cache(self, doc_id: str, path: str, mime_type: str) -> str:
+        """Save a gzip-compressed raw document to bill_documents (once per content hash)"""
+        content_hash = hash_document(path)
+
+        payload = io.BytesIO()
+        compress_document(path, payload)
+
+        # Both statements run in one transaction
+        query = """
+            INSERT INTO bill_documents (content_hash, document_gzip, size_bytes)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (content_hash) DO NOTHING;
+
+            INSERT INTO bill_document_refs (doc_id, content_hash, mime_type)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (doc_id) DO UPDATE SET
+                content_hash = EXCLUDED.content_hash,
+                mime_type = EXCLUDED.mime_type,
+                cached_at = CURRENT_TIMESTAMP
+        """
+
+        self._execute_query(query, (
+            content_hash,
+            psycopg2.Binary(payload.getvalue()),
+            os.path.getsize(path),
+            str(doc_id),
+            content_hash,
+            mime_type
+        ))
+
+        # File fallback
+        if self.enable_file_fallback:
+            self.file_storage.save_document_to_cache(doc_id, path, mime_type)
+
+        return content_hash
+
+    def list_cached_documents(self) -> List[str]:
+        """List doc_ids in bill_document_refs table"""
+        results = self._execute_query("SELECT doc_id FROM bill_document_refs ORDER BY doc_id", fetch='all')
+        return [row['doc_id'] for row in results]
+
+    def get_llm_response(self, cache_key: str) -> Optional[str]:
+        """Get cached LLM completion from llm_response_cache table"""
+        query = """
+            UPDATE llm_response_cache
+            SET last_accessed_at = CURRENT_TIMESTAMP
+            WHERE cache_key = %s
+              AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP)
+            RETURNING response
+        """
+        result = self._execute_query(query, (cache_key,), fetch='one')
+
+        if result:
+            return result['response']
+
+        return None
+
+    def save_llm_response(
+        self,
+        cache_key: str,
+        provider: str,
+        response: str,
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Save LLM completion to llm_response_cache table"""
+        query = """
+            INSERT INTO llm_response_cache (cache_key, provider, response, size_bytes, expires_at)
+            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP + %s * INTERVAL '1 second')
+            ON CONFLICT (cache_key) DO UPDATE SET
+                provider = EXCLUDED.provider,
+                response = EXCLUDED.response,
+                size_bytes = EXCLUDED.size_bytes,
+                created_at = CURRENT_TIMESTAMP,
+                last_accessed_at = CURRENT_TIMESTAMP,
+                expires_at = EXCLUDED.expires_at
+        """
+
+        self._execute_query(query, (
+            cache_key,
+            provider,
+            response,
+            len(response.encode('utf-8')),
+            ttl_seconds
+        ))
+
+    def evict_llm_responses(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Remove expired LLM cache entries, then least recently used ones beyond max_bytes
+
+        Args:
+            max_bytes: Maximum total response size to keep (None = no size limit)
+
+        Returns:
+            Number of entries removed
+        """
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM llm_response_cache WHERE expires_at <= CURRENT_TIMESTAMP"
+                )
+                removed = cursor.rowcount
+
+                if max_bytes is not None:
+                    cursor.execute("""
+                        DELETE FROM llm_response_cache WHERE cache_key IN (
+                            SELECT cache_key FROM (
+                                SELECT cache_key,
+                                       SUM(size_bytes) OVER (ORDER BY last_accessed_at DESC) AS running_bytes
+                                FROM llm_response_cache
+                            ) ranked
+                            WHERE running_bytes > %s
+                        )
+                    """, (max_bytes,))
+                    removed += cursor.rowcount
+
+            conn.commit()
+            return removed
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self._return_connection(conn)
+
     def list_raw_files(self) -> List[str]:
         """List available states/years in bills table"""
         query = """
@@ -567,6 +962,17 @@ class DatabaseStorage(StorageProvider):
         results = self._execute_query(query, fetch='all')
         return [row['run_id'] for row in results]
 
+    def list_analysis_results(self) -> List[str]:
+        """List available analysis run IDs"""
+        query = """
+            SELECT DISTINCT run_id
+            FROM analysis_results
+            ORDER BY run_id
+        """
+
+        results = self._execute_query(query, fetch='all')
+        return [row['run_id'] for row in results]
+
     def bill_exists_in_raw(self, bill_number: str, filename: str) -> bool:
         """Check if a bill exists in bills table"""
         query = "SELECT 1 FROM bills WHERE bill_number = %s LIMIT 1"
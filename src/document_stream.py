@@ -0,0 +1,181 @@
+"""
+Streaming Bill Document Download
+
+LegiScan's getBillText returns the bill document base64-encoded inside the
+JSON response. Parsing the response with response.json() and decoding it with
+base64.b64decode holds the JSON text, the base64 string and the decoded bytes
+in memory at the same time. spool_document_response() instead decodes the
+"doc" field while the response streams in and writes the document straight
+to a temp file, which the extractors memory-map; only the rest of the JSON
+(status, MIME type, ...) is parsed.
+"""
+
+import binascii
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the response at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Start of the document field; the base64 value follows the opening quote
+_DOC_FIELD = re.compile(rb'"doc"\s*:\s*"')
+# Bytes held back while searching, so a marker split across chunks is found
+_MARKER_TAIL = 32
+# JSON escapes that can appear in a base64 string (PHP escapes '/'), and whitespace
+_BASE64_NOISE = re.compile(rb'\\[nrt]|\s')
+
+
+class DocumentFile:
+    """A decoded bill document in a temp file, deleted on close()"""
+
+    def __init__(self, path: str, size: int):
+        """
+        Args:
+            path: Temp file path
+            size: Document size in bytes
+        """
+        self.path = path
+        self.size = size
+
+    def close(self) -> None:
+        """Delete the temp file"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'DocumentFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _Base64FieldDecoder:
+    """Splits a streamed JSON response into the decoded "doc" field and the rest"""
+
+    def __init__(self, output):
+        """
+        Args:
+            output: Binary file the decoded document is written to
+        """
+        self.output = output
+        self.size = 0
+        self.found = False
+        # Response JSON with the document value left out
+        self.remainder = bytearray()
+        self._in_document = False
+        # Unsearched JSON tail, or base64 not yet decoded (less than one quantum)
+        self._pending = b''
+
+    def feed(self, chunk: bytes) -> None:
+        """Process the next chunk of the response"""
+        data = self._pending + chunk
+        self._pending = b''
+
+        if not self.found:
+            match = _DOC_FIELD.search(data)
+            if not match:
+                keep = max(0, len(data) - _MARKER_TAIL)
+                self.remainder += data[:keep]
+                self._pending = data[keep:]
+                return
+
+            self.remainder += data[:match.end()]
+            self.found = True
+            self._in_document = True
+            data = data[match.end():]
+
+        if self._in_document:
+            # Base64 never contains a quote, so the first one closes the string
+            end = data.find(b'"')
+            if end == -1:
+                self._decode(data, final=False)
+                return
+
+            self._decode(data[:end], final=True)
+            self._in_document = False
+            data = data[end:]
+
+        self.remainder += data
+
+    def finish(self) -> bytes:
+        """
+        Flush buffered input at the end of the response
+
+        Returns:
+            Response JSON with an empty "doc" value
+
+        Raises:
+            ValueError: If the response ended inside the document
+        """
+        if self._in_document:
+            raise ValueError("Response ended before the end of the document")
+
+        self.remainder += self._pending
+        self._pending = b''
+        return bytes(self.remainder)
+
+    def _decode(self, data: bytes, final: bool) -> None:
+        """Decode whole base64 quanta and keep the rest for the next chunk"""
+        # An escape may be split across chunks
+        if not final and data.endswith(b'\\'):
+            self._pending = data[-1:]
+            data = data[:-1]
+
+        data = _BASE64_NOISE.sub(b'', data.replace(b'\\/', b'/'))
+
+        if not final:
+            usable = len(data) - len(data) % 4
+            self._pending = data[usable:] + self._pending
+            data = data[:usable]
+
+        if data:
+            try:
+                decoded = binascii.a2b_base64(data)
+            except binascii.Error as e:
+                raise ValueError(f"Invalid base64 document: {e}") from e
+            self.output.write(decoded)
+            self.size += len(decoded)
+
+
+def spool_document_response(chunks: Iterable[bytes]) -> Tuple[Dict[str, Any], Optional[DocumentFile]]:
+    """
+    Parse a streamed getBillText response, decoding the document to a temp file
+
+    Args:
+        chunks: Response body chunks (e.g. response.iter_content(STREAM_CHUNK_SIZE))
+
+    Returns:
+        (response JSON with text.doc emptied, DocumentFile or None if the
+        response has no document)
+
+    Raises:
+        ValueError: If the response is not valid JSON or the document is not valid base64
+    """
+    fd, path = tempfile.mkstemp(prefix='bill_doc_')
+
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            decoder = _Base64FieldDecoder(output)
+            for chunk in chunks:
+                decoder.feed(chunk)
+            remainder = decoder.finish()
+
+        result = json.loads(remainder)
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    if not decoder.size:
+        os.unlink(path)
+        return result, None
+
+    logger.debug(f"Spooled {decoder.size} byte document to {path}")
+    return result, DocumentFile(path, decoder.size)
@@ -0,0 +1,433 @@
+"""
+LLM Response Cache
+
+Content-addressed cache for chat completions. The cache key is a SHA-256
+hash of the provider/model, temperature, max_tokens, extra request
+parameters and the full message list, so re-running a pass on unchanged
+inputs never re-sends the same prompt to the model. Changing a prompt
+only pays for the bills whose inputs actually changed.
+
+Backends:
+- sqlite: local SQLite file (default, no extra dependencies)
+- database: llm_response_cache table via DatabaseStorage
+- azure_blob: cache/llm/ blobs via AzureBlobStorage
+
+Enable it with an "llm.response_cache" section in config.json, e.g.:
+
+    "llm": {
+        "provider": "portkey",
+        "response_cache": {
+            "backend": "sqlite",
+            "path": "data/cache/llm_cache.sqlite3",
+            "max_size_mb": 512,
+            "ttl_days": 30
+        }
+    }
+
+Both passes expect JSON replies, so by default only completions that parse
+as JSON are cached: a truncated or malformed reply is re-requested on
+retry instead of being served again from the cache.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from src.llm_provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+# Run size-based eviction once per this many writes rather than on every write
+EVICT_EVERY_N_WRITES = 100
+
+
+def make_cache_key(
+    provider_name: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    **kwargs
+) -> str:
+    """
+    Build the content-addressed cache key for a completion request
+
+    Args:
+        provider_name: Provider/model identifier (e.g., "portkey/gpt-4o-mini")
+        messages: Chat messages
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        **kwargs: Extra request parameters that affect the response
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = json.dumps(
+        {
+            'provider': provider_name,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'messages': messages,
+            'params': kwargs
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def is_json_response(content: str) -> bool:
+    """Whether a completion parses as JSON once markdown code fences are stripped, as the passes parse it"""
+    content_clean = content.strip()
+    if content_clean.startswith('```json'):
+        content_clean = content_clean[7:]
+    if content_clean.startswith('```'):
+        content_clean = content_clean[3:]
+    if content_clean.endswith('```'):
+        content_clean = content_clean[:-3]
+
+    try:
+        json.loads(content_clean.strip())
+    except ValueError:
+        return False
+    return True
+
+
+class CompletionCacheBackend(ABC):
+    """Abstract base class for completion cache backends"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached completion
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached response text, or None on miss or expiry
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, provider_name: str, response: str, ttl_seconds: Optional[float]) -> None:
+        """
+        Store a completion
+
+        Args:
+            key: Cache key from make_cache_key
+            provider_name: Provider/model identifier (kept for inspection)
+            response: Response text
+            ttl_seconds: Time to live in seconds (None = never expires)
+        """
+        pass
+
+    def evict(self, max_bytes: Optional[int]) -> int:
+        """
+        Drop expired entries, then least recently used entries beyond max_bytes
+
+        Args:
+            max_bytes: Maximum total response size to keep (None = no size limit)
+
+        Returns:
+            Number of entries removed
+        """
+        return 0
+
+
+class SQLiteCompletionCache(CompletionCacheBackend):
+    """Completion cache stored in a local SQLite database"""
+
+    def __init__(self, path: str = 'data/cache/llm_cache.sqlite3'):
+        """
+        Initialize SQLite cache
+
+        Args:
+            path: Database file path (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                provider TEXT,
+                response TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed_at REAL NOT NULL,
+                expires_at REAL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_response_cache(last_accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM llm_response_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            response, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM llm_response_cache WHERE cache_key = ?", (key,))
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_response_cache SET last_accessed_at = ? WHERE cache_key = ?",
+                (now, key)
+            )
+            return response
+
+    def set(self, key: str, provider_name: str, response: str, ttl_seconds: Optional[float]) -> None:
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO llm_response_cache (
+                    cache_key, provider, response, size_bytes, created_at, last_accessed_at, expires_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    provider = excluded.provider,
+                    response = excluded.response,
+                    size_bytes = excluded.size_bytes,
+                    created_at = excluded.created_at,
+                    last_accessed_at = excluded.last_accessed_at,
+                    expires_at = excluded.expires_at
+                """,
+                (key, provider_name, response, len(response.encode('utf-8')), now, now, expires_at)
+            )
+
+    def evict(self, max_bytes: Optional[int]) -> int:
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),)
+            ).rowcount
+
+            if max_bytes is not None:
+                removed += self._conn.execute(
+                    """
+                    DELETE FROM llm_response_cache WHERE cache_key IN (
+                        SELECT cache_key FROM (
+                            SELECT cache_key,
+                                   SUM(size_bytes) OVER (ORDER BY last_accessed_at DESC) AS running_bytes
+                            FROM llm_response_cache
+                        ) WHERE running_bytes > ?
+                    )
+                    """,
+                    (max_bytes,)
+                ).rowcount
+
+            return removed
+
+
+class StorageCompletionCache(CompletionCacheBackend):
+    """
+    Completion cache backed by a StorageProvider
+
+    Works with any storage provider that implements get_llm_response,
+    save_llm_response and (optionally) evict_llm_responses - currently
+    DatabaseStorage and AzureBlobStorage.
+    """
+
+    def __init__(self, storage_provider):
+        """
+        Initialize storage-backed cache
+
+        Args:
+            storage_provider: DatabaseStorage or AzureBlobStorage instance
+        """
+        self.storage_provider = storage_provider
+
+    def get(self, key: str) -> Optional[str]:
+        return self.storage_provider.get_llm_response(key)
+
+    def set(self, key: str, provider_name: str, response: str, ttl_seconds: Optional[float]) -> None:
+        self.storage_provider.save_llm_response(key, provider_name, response, ttl_seconds)
+
+    def evict(self, max_bytes: Optional[int]) -> int:
+        if hasattr(self.storage_provider, 'evict_llm_responses'):
+            return self.storage_provider.evict_llm_responses(max_bytes)
+        return 0
+
+
+class CachedProvider(LLMProvider):
+    """
+    LLMProvider wrapper that serves repeated requests from a completion cache
+
+    Only successful completions are cached; errors always reach the caller.
+    With json_only, completions that don't parse as JSON (truncated or
+    malformed replies) aren't cached either, so retrying the request calls
+    the provider again.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        backend: CompletionCacheBackend,
+        max_size_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        json_only: bool = True
+    ):
+        """
+        Initialize cached provider
+
+        Args:
+            provider: LLMProvider to wrap
+            backend: Cache backend
+            max_size_bytes: Size limit for LRU eviction (None = unbounded)
+            ttl_seconds: Entry lifetime (None = never expires)
+            json_only: Only cache completions that parse as JSON
+        """
+        self.provider = provider
+        self.backend = backend
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        self.json_only = json_only
+
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._stats_lock = threading.Lock()
+
+        logger.info(
+            f"LLM response cache enabled ({type(backend).__name__}, "
+            f"max_size={max_size_bytes or 'unbounded'} bytes, ttl={ttl_seconds or 'none'}s)"
+        )
+
+    def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        timeout: int = 90,
+        **kwargs
+    ) -> str:
+        """Return the cached completion for this exact request, or call the provider and cache it"""
+        provider_name = self.provider.get_provider_name()
+        key = make_cache_key(provider_name, messages, temperature, max_tokens, **kwargs)
+
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed, calling provider: {e}")
+            cached = None
+
+        if cached is not None:
+            with self._stats_lock:
+                self.hits += 1
+            logger.info(f"LLM response cache hit ({key[:12]})")
+            return cached
+
+        with self._stats_lock:
+            self.misses += 1
+
+        content = self.provider.chat_completion(
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            **kwargs
+        )
+
+        if self.json_only and not is_json_response(content):
+            logger.warning(f"Not caching LLM response that isn't valid JSON ({key[:12]})")
+            return content
+
+        try:
+            self.backend.set(key, provider_name, content, self.ttl_seconds)
+            with self._stats_lock:
+                self._writes += 1
+                run_eviction = self._writes % EVICT_EVERY_N_WRITES == 0
+            if run_eviction:
+                removed = self.backend.evict(self.max_size_bytes)
+                if removed:
+                    logger.info(f"Evicted {removed} LLM cache entries")
+        except Exception as e:
+            logger.warning(f"Could not save LLM response to cache: {e}")
+
+        return content
+
+    def get_provider_name(self) -> str:
+        return self.provider.get_provider_name()
+
+    def close(self) -> None:
+        self.provider.close()
+
+    @classmethod
+    def from_config(
+        cls,
+        provider: LLMProvider,
+        config: Dict[str, Any],
+        storage_provider=None
+    ) -> 'CachedProvider':
+        """
+        Wrap provider using the "llm.response_cache" configuration section
+
+        Args:
+            provider: LLMProvider to wrap
+            config: Full configuration dict (the storage section is used for
+                the database and azure_blob backends)
+            storage_provider: The run's StorageProvider; the database and
+                azure_blob backends reuse it (and its connection pool) when it
+                is of the matching type, instead of opening their own
+
+        Returns:
+            CachedProvider instance
+
+        Raises:
+            ValueError: If the cache backend is unknown
+        """
+        cache_config = config.get('llm', {}).get('response_cache', {})
+        backend_type = cache_config.get('backend', 'sqlite')
+        storage_config = config.get('storage', {})
+
+        # StorageProviderFactory wraps backends in MemoryCachedStorage; the cache needs the backend itself
+        storage_provider = getattr(storage_provider, 'provider', storage_provider)
+
+        if backend_type == 'sqlite':
+            backend = SQLiteCompletionCache(cache_config.get('path', 'data/cache/llm_cache.sqlite3'))
+
+        elif backend_type == 'database':
+            from src.database_storage import DatabaseStorage
+            if not isinstance(storage_provider, DatabaseStorage):
+                storage_provider = DatabaseStorage(storage_config.get('database', {}))
+            backend = StorageCompletionCache(storage_provider)
+
+        elif backend_type == 'azure_blob':
+            from src.azure_blob_storage import AzureBlobStorage
+            if not isinstance(storage_provider, AzureBlobStorage):
+                storage_provider = AzureBlobStorage(storage_config.get('azure_blob', {}))
+            backend = StorageCompletionCache(storage_provider)
+
+        else:
+            raise ValueError(f"Unknown LLM response cache backend: {backend_type}")
+
+        max_size_mb = cache_config.get('max_size_mb')
+        ttl_days = cache_config.get('ttl_days')
+
+        return cls(
+            provider,
+            backend,
+            max_size_bytes=int(max_size_mb * 1024 * 1024) if max_size_mb else None,
+            ttl_seconds=ttl_days * 86400 if ttl_days else None,
+            json_only=cache_config.get('json_only', True)
+        )
@@ -9,20 +9,155 @@ Provides a unified interface for different LLM backends:
 
 This allows the application to switch between remote and local LLMs
 via configuration without code changes.
+
+Each provider keeps a keep-alive HTTP connection pool (requests.Session),
+so repeated completions reuse sockets instead of paying a TCP+TLS
+handshake per call. Providers also expose an awaitable
+achat_completion() for asyncio callers.
 """
 
 import os
+import asyncio
+import threading
 import requests
 import logging
 from abc import ABC, abstractmethod
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_MAXSIZE = 10
+
+# HTTP statuses worth retrying: rate limited, or a transient server-side failure
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Headers of the most recent successful response, per thread (read by RateLimitedProvider)
+_last_response = threading.local()
+
+
+class LLMProviderError(Exception):
+    """
+    Error raised when an LLM API call fails
+
+    Carries the HTTP status and response headers (when there was a response)
+    so callers such as RateLimitedProvider can decide whether and when to retry.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+        retryable: bool = False
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+        self.retryable = retryable
+
+
+def get_last_response_headers() -> Dict[str, str]:
+    """Return headers of the last successful completion made on this thread"""
+    return getattr(_last_response, 'headers', {})
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
 
+    # Maximum keep-alive connections per host (overridden by subclasses' __init__)
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+
+    _session: Optional[requests.Session] = None
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
+        """
+        Args:
+            pool_maxsize: Maximum keep-alive connections to the endpoint
+        """
+        self.pool_maxsize = pool_maxsize
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self) -> requests.Session:
+        """
+        Return this provider's shared HTTP session, creating it on first use
+
+        The session's connection pool is sized by pool_maxsize and is safe to
+        share between the worker threads of a concurrent run.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def _post_chat_completion(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: int,
+        label: str
+    ) -> str:
+        """
+        POST an OpenAI-compatible chat completion request and return the message content
+
+        Args:
+            url: Full chat completions URL
+            headers: Request headers
+            payload: JSON request body
+            timeout: Request timeout in seconds
+            label: Human-readable API name used in error messages (e.g., "Portkey API")
+
+        Returns:
+            Generated text response
+
+        Raises:
+            LLMProviderError: If the request fails or the response is malformed
+        """
+        try:
+            response = self._get_session().post(
+                url,
+                headers=headers,
+                json=payload,
+                timeout=timeout
+            )
+            response.raise_for_status()
+
+            result = response.json()
+            _last_response.headers = dict(response.headers)
+            return result['choices'][0]['message']['content']
+
+        except requests.exceptions.Timeout:
+            raise LLMProviderError(f"{label} request timed out after {timeout}s", retryable=True)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            # The error body says why (e.g. context_length_exceeded), the status line doesn't
+            detail = e.response.text[:300].strip() if e.response is not None else ''
+            raise LLMProviderError(
+                f"{label} request failed: {e}" + (f" ({detail})" if detail else ''),
+                status_code=status,
+                headers=e.response.headers if e.response is not None else None,
+                retryable=status in RETRYABLE_STATUS_CODES
+            )
+        except requests.exceptions.ConnectionError as e:
+            raise LLMProviderError(f"{label} request failed: {e}", retryable=True)
+        except requests.exceptions.RequestException as e:
+            raise LLMProviderError(f"{label} request failed: {e}")
+        except (KeyError, IndexError) as e:
+            raise LLMProviderError(f"Unexpected {label} response format: {e}")
+
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     @abstractmethod
     def chat_completion(
         self,
@@ -46,10 +181,40 @@ class LLMProvider(ABC):
             Generated text response
 
         Raises:
-            Exception: If API call fails
+            LLMProviderError: If API call fails
         """
         pass
 
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        timeout: int = 90,
+        **kwargs
+    ) -> str:
+        """
+        Awaitable version of chat_completion
+
+        The default implementation runs chat_completion in a worker thread, so
+        all in-flight requests share this provider's pooled connections.
+        Providers with a native async client can override it.
+
+        Args:
+            Same as chat_completion
+
+        Returns:
+            Generated text response
+        """
+        return await asyncio.to_thread(
+            self.chat_completion,
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            **kwargs
+        )
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """Return the name of this provider"""
@@ -69,6 +234,7 @@ class PortkeyProvider(LLMProvider):
         api_key: Optional[str] = None,
         model: str = "gpt-4o-mini",
         base_url: str = "https://api.portkey.ai/v1",
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
         **kwargs
     ):
         """
@@ -78,12 +244,14 @@ class PortkeyProvider(LLMProvider):
             api_key: Portkey API key (or reads from PORTKEY_API_KEY env var)
             model: Model identifier (e.g., "gpt-4o-mini")
             base_url: Portkey API base URL
+            pool_maxsize: Maximum keep-alive connections to the gateway
             **kwargs: Additional provider-specific parameters
         """
         self.api_key = api_key or os.getenv('PORTKEY_API_KEY')
         if not self.api_key:
             raise ValueError("Portkey API key required (set PORTKEY_API_KEY env var or pass api_key)")
 
+        super().__init__(pool_maxsize)
         self.model = model
         self.base_url = base_url.rstrip('/')
         self.kwargs = kwargs
@@ -113,24 +281,7 @@ class PortkeyProvider(LLMProvider):
             **kwargs
         }
 
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=timeout
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            return result['choices'][0]['message']['content']
-
-        except requests.exceptions.Timeout:
-            raise Exception(f"Portkey API request timed out after {timeout}s")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Portkey API request failed: {e}")
-        except (KeyError, IndexError) as e:
-            raise Exception(f"Unexpected Portkey API response format: {e}")
+        return self._post_chat_completion(f"{self.base_url}/chat/completions", headers, payload, timeout, "Portkey API")
 
     def get_provider_name(self) -> str:
         return f"portkey/{self.model}"
@@ -154,6 +305,7 @@ class AzureOpenAIProvider(LLMProvider):
         endpoint: Optional[str] = None,
         deployment_name: Optional[str] = None,
         api_version: str = "2024-02-15-preview",
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
         **kwargs
     ):
         """
@@ -164,6 +316,7 @@ class AzureOpenAIProvider(LLMProvider):
             endpoint: Azure OpenAI endpoint (or reads from AZURE_OPENAI_ENDPOINT env var)
             deployment_name: Deployment name in Azure (or reads from AZURE_OPENAI_DEPLOYMENT env var)
             api_version: Azure OpenAI API version
+            pool_maxsize: Maximum keep-alive connections to the endpoint
             **kwargs: Additional provider-specific parameters
         """
         self.api_key = api_key or os.getenv('AZURE_OPENAI_API_KEY')
@@ -177,6 +330,7 @@ class AzureOpenAIProvider(LLMProvider):
         if not self.deployment_name:
             raise ValueError("Azure OpenAI deployment name required (set AZURE_OPENAI_DEPLOYMENT env var or pass deployment_name)")
 
+        super().__init__(pool_maxsize)
         self.endpoint = self.endpoint.rstrip('/')
         self.api_version = api_version
         self.kwargs = kwargs
@@ -208,24 +362,7 @@ class AzureOpenAIProvider(LLMProvider):
         # Azure OpenAI uses deployment name in URL, not in payload
         url = f"{self.endpoint}/openai/deployments/{self.deployment_name}/chat/completions?api-version={self.api_version}"
 
-        try:
-            response = requests.post(
-                url,
-                headers=headers,
-                json=payload,
-                timeout=timeout
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            return result['choices'][0]['message']['content']
-
-        except requests.exceptions.Timeout:
-            raise Exception(f"Azure OpenAI API request timed out after {timeout}s")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Azure OpenAI API request failed: {e}")
-        except (KeyError, IndexError) as e:
-            raise Exception(f"Unexpected Azure OpenAI API response format: {e}")
+        return self._post_chat_completion(url, headers, payload, timeout, "Azure OpenAI API")
 
     def get_provider_name(self) -> str:
         return f"azure/{self.deployment_name}"
@@ -248,6 +385,7 @@ class OllamaProvider(LLMProvider):
         self,
         model: str = "llama3.1:8b-instruct",
         base_url: str = "http://localhost:11434/v1",
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
         **kwargs
     ):
         """
@@ -256,15 +394,17 @@ class OllamaProvider(LLMProvider):
         Args:
             model: Ollama model identifier (e.g., "llama3.1:8b-instruct")
             base_url: Ollama server URL (default: http://localhost:11434/v1)
+            pool_maxsize: Maximum keep-alive connections to the Ollama server
             **kwargs: Additional parameters to pass to Ollama
         """
+        super().__init__(pool_maxsize)
         self.model = model
         self.base_url = base_url.rstrip('/')
         self.kwargs = kwargs
 
         # Verify Ollama is accessible
         try:
-            response = requests.get(f"{self.base_url.replace('/v1', '')}/api/tags", timeout=5)
+            response = self._get_session().get(f"{self.base_url.replace('/v1', '')}/api/tags", timeout=5)
             response.raise_for_status()
             logger.info(f"Connected to Ollama server at {self.base_url}")
             logger.info(f"Initialized OllamaProvider with model: {model}")
@@ -297,34 +437,38 @@ class OllamaProvider(LLMProvider):
             **{k: v for k, v in kwargs.items() if k != 'options'}
         }
 
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=timeout
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            return result['choices'][0]['message']['content']
-
-        except requests.exceptions.Timeout:
-            raise Exception(f"Ollama request timed out after {timeout}s")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Ollama request failed: {e}")
-        except (KeyError, IndexError) as e:
-            raise Exception(f"Unexpected Ollama response format: {e}")
+        return self._post_chat_completion(f"{self.base_url}/chat/completions", headers, payload, timeout, "Ollama")
 
     def get_provider_name(self) -> str:
         return f"ollama/{self.model}"
 
 
+def _configured_concurrency(config: Dict[str, Any]) -> int:
+    """
+    Most LLM calls the filter or analysis pass keeps in flight at once
+
+    Args:
+        config: Configuration dict (filter_pass.concurrency, analysis_pass.concurrency
+            and analysis_pass.map_concurrency)
+
+    Returns:
+        Largest number of concurrent calls either pass is configured for
+    """
+    from src.ai_analysis_pass import DEFAULT_MAP_CONCURRENCY
+
+    filter_config = config.get('filter_pass', {})
+    analysis_config = config.get('analysis_pass', {})
+    return max(
+        int(filter_config.get('concurrency', 1)),
+        int(analysis_config.get('concurrency', 1)) * int(analysis_config.get('map_concurrency', DEFAULT_MAP_CONCURRENCY))
+    )
+
+
 class LLMProviderFactory:
     """Factory for creating LLM providers from configuration"""
 
     @staticmethod
-    def create_from_config(config: Dict[str, Any]) -> LLMProvider:
+    def create_from_config(config: Dict[str, Any], storage_provider=None) -> LLMProvider:
         """
         Create LLM provider from configuration dictionary
 
@@ -340,11 +484,16 @@ class LLMProviderFactory:
                         "endpoint": "https://your-resource.openai.azure.com/",
                         "deployment_name": "your-deployment",
                         "api_version": "2024-02-15-preview",
+                        "pool_maxsize": 10,  # optional, keep-alive connections (raised to the passes' concurrency)
+                        "rate_limit": {...},  # optional, see src/rate_limiter.py
+                        "response_cache": {...},  # optional, see src/llm_cache.py
                         ... # provider-specific options
                     },
                     # Fallback to root level if llm section doesn't exist
                     "model": "model-name"
                 }
+            storage_provider: StorageProvider reused by the database and
+                azure_blob response cache backends (optional)
 
         Returns:
             Configured LLM provider instance
@@ -358,33 +507,52 @@ class LLMProviderFactory:
         # Get model (prefer llm.model, fallback to root model)
         model = llm_config.get('model') or config.get('model', 'gpt-4o-mini')
 
+        # Size of the keep-alive connection pool shared by concurrent requests:
+        # at least one connection per call the passes keep in flight
+        pool_maxsize = max(llm_config.get('pool_maxsize', DEFAULT_POOL_MAXSIZE), _configured_concurrency(config))
+
         # Create provider based on type
         if provider_type == 'portkey':
-            return PortkeyProvider(
+            provider = PortkeyProvider(
                 api_key=llm_config.get('api_key'),
                 model=model,
-                base_url=llm_config.get('base_url', 'https://api.portkey.ai/v1')
+                base_url=llm_config.get('base_url', 'https://api.portkey.ai/v1'),
+                pool_maxsize=pool_maxsize
             )
 
         elif provider_type == 'azure':
-            return AzureOpenAIProvider(
+            provider = AzureOpenAIProvider(
                 api_key=llm_config.get('api_key'),
                 endpoint=llm_config.get('endpoint'),
                 deployment_name=llm_config.get('deployment_name'),
-                api_version=llm_config.get('api_version', '2024-02-15-preview')
+                api_version=llm_config.get('api_version', '2024-02-15-preview'),
+                pool_maxsize=pool_maxsize
             )
 
         elif provider_type == 'ollama':
-            return OllamaProvider(
+            provider = OllamaProvider(
                 model=model,
-                base_url=llm_config.get('base_url', 'http://localhost:11434/v1')
+                base_url=llm_config.get('base_url', 'http://localhost:11434/v1'),
+                pool_maxsize=pool_maxsize
             )
 
         else:
             raise ValueError(f"Unknown LLM provider type: {provider_type}")
 
+        # Optional rate limiting / retry layer
+        if llm_config.get('rate_limit'):
+            from src.rate_limiter import RateLimitedProvider
+            provider = RateLimitedProvider.from_config(provider, llm_config['rate_limit'])
+
+        # Optional response cache (outermost, so cache hits skip rate limiting)
+        if llm_config.get('response_cache'):
+            from src.llm_cache import CachedProvider
+            provider = CachedProvider.from_config(provider, config, storage_provider)
+
+        return provider
+
     @staticmethod
-    def create_from_env(config: Optional[Dict[str, Any]] = None) -> LLMProvider:
+    def create_from_env(config: Optional[Dict[str, Any]] = None, storage_provider=None) -> LLMProvider:
         """
         Create LLM provider from environment variables + config
 
@@ -396,6 +564,7 @@ class LLMProviderFactory:
 
         Args:
             config: Optional configuration dict (for defaults)
+            storage_provider: StorageProvider reused by the response cache (optional)
 
         Returns:
             Configured LLM provider instance
@@ -423,7 +592,7 @@ class LLMProviderFactory:
             # Use config as-is
             effective_config = config
 
-        return LLMProviderFactory.create_from_config(effective_config)
+        return LLMProviderFactory.create_from_config(effective_config, storage_provider)
 
 
 # Convenience function for backward compatibility
@@ -431,7 +600,8 @@ def create_llm_provider(
     api_key: Optional[str] = None,
     model: str = "gpt-4o-mini",
     base_url: str = "https://api.portkey.ai/v1",
-    config: Optional[Dict[str, Any]] = None
+    config: Optional[Dict[str, Any]] = None,
+    storage_provider=None
 ) -> LLMProvider:
     """
     Create LLM provider with backward compatibility
@@ -444,13 +614,14 @@ def create_llm_provider(
         model: Model identifier
         base_url: API base URL
         config: Optional config dict
+        storage_provider: StorageProvider reused by the response cache (optional)
 
     Returns:
         LLM provider instance
     """
     if config and 'llm' in config:
         # New configuration style
-        return LLMProviderFactory.create_from_config(config)
+        return LLMProviderFactory.create_from_config(config, storage_provider)
     else:
         # Legacy configuration - default to Portkey
         return PortkeyProvider(
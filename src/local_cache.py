@@ -0,0 +1,406 @@
+"""
+Local LegiScan Cache Backends
+
+LocalFileStorage keeps cached getBill responses and extracted bill text in
+one of two layouts, chosen with storage.local.cache_format:
+- files: one pretty-printed bill_{id}.json and bill_text_{doc_id}.txt per
+  entry in data/cache/legiscan_cache/ (default, the original layout)
+- sqlite: a single WAL-mode SQLite file holding compact, zlib-compressed
+  entries (data/cache/legiscan_cache.sqlite3). Hundreds of thousands of
+  entries stay one file, which keeps directory listings, backups and
+  Docker bind mounts fast.
+
+migrate_cache() copies every entry from one layout to the other
+(see scripts/migrate_local_cache.py).
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.storage_provider import lookup_concurrently
+from src.text_extraction import LEGACY_EXTRACTOR_VERSION
+
+CACHE_FORMATS = ('files', 'sqlite')
+
+# Rows written per transaction by the bulk save methods
+SQLITE_BATCH_SIZE = 1000
+
+# Keys per SELECT ... IN (...) in the bulk get methods (below SQLite's variable limit)
+SQLITE_LOOKUP_BATCH_SIZE = 500
+
+
+class LegiScanCacheBackend(ABC):
+    """Abstract base class for LocalFileStorage's bill and bill text cache"""
+
+    @abstractmethod
+    def get_bill(self, bill_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached getBill response
+
+        Args:
+            bill_id: LegiScan bill ID
+
+        Returns:
+            Bill data, or None if not cached
+        """
+        pass
+
+    @abstractmethod
+    def save_bill(self, bill_id: int, data: Dict[str, Any]) -> None:
+        """
+        Cache a getBill response
+
+        Args:
+            bill_id: LegiScan bill ID
+            data: Bill data
+        """
+        pass
+
+    @abstractmethod
+    def get_bill_text(self, doc_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Get cached extracted text
+
+        Args:
+            doc_id: LegiScan document ID
+
+        Returns:
+            (text, extractor version) or None if not cached
+        """
+        pass
+
+    @abstractmethod
+    def save_bill_text(self, doc_id: str, text: str, extractor_version: str) -> None:
+        """
+        Cache extracted text
+
+        Args:
+            doc_id: LegiScan document ID
+            text: Extracted text
+            extractor_version: Version of the extractor that produced it
+        """
+        pass
+
+    @abstractmethod
+    def iter_bills(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (bill_id, data) for every cached bill"""
+        pass
+
+    @abstractmethod
+    def iter_bill_texts(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield (doc_id, text, extractor version) for every cached text"""
+        pass
+
+    def get_bills(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get many cached getBill responses
+
+        Args:
+            bill_ids: LegiScan bill IDs
+
+        Returns:
+            Dict of bill_id -> data for the bills that are cached
+        """
+        bills = {}
+        for bill_id in bill_ids:
+            data = self.get_bill(bill_id)
+            if data is not None:
+                bills[bill_id] = data
+        return bills
+
+    def get_bill_texts(self, doc_ids: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Get many cached extracted texts
+
+        Args:
+            doc_ids: LegiScan document IDs
+
+        Returns:
+            Dict of doc_id -> (text, extractor version) for the texts that are cached
+        """
+        texts = {}
+        for doc_id in doc_ids:
+            entry = self.get_bill_text(doc_id)
+            if entry:
+                texts[doc_id] = entry
+        return texts
+
+    def save_bills(self, bills: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Cache many getBill responses
+
+        Args:
+            bills: (bill_id, data) pairs
+
+        Returns:
+            Number of bills saved
+        """
+        count = 0
+        for bill_id, data in bills:
+            self.save_bill(bill_id, data)
+            count += 1
+        return count
+
+    def save_bill_texts(self, texts: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Cache many extracted texts
+
+        Args:
+            texts: (doc_id, text, extractor version) tuples
+
+        Returns:
+            Number of texts saved
+        """
+        count = 0
+        for doc_id, text, extractor_version in texts:
+            self.save_bill_text(doc_id, text, extractor_version)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        """Release resources held by the backend"""
+        pass
+
+
+class FileCacheBackend(LegiScanCacheBackend):
+    """One file per entry in data/cache/legiscan_cache/ (original layout)"""
+
+    def __init__(self, cache_dir: Path):
+        """
+        Args:
+            cache_dir: Cache directory (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_bill(self, bill_id: int) -> Optional[Dict[str, Any]]:
+        cache_file = self.cache_dir / f"bill_{bill_id}.json"
+
+        if not cache_file.exists():
+            return None
+
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_bill(self, bill_id: int, data: Dict[str, Any]) -> None:
+        cache_file = self.cache_dir / f"bill_{bill_id}.json"
+
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def get_bill_text(self, doc_id: str) -> Optional[Tuple[str, str]]:
+        cache_file = self.cache_dir / f"bill_text_{doc_id}.txt"
+
+        if not cache_file.exists():
+            return None
+
+        # The extractor version is kept next to the text in bill_text_{doc_id}.version
+        version_file = self.cache_dir / f"bill_text_{doc_id}.version"
+        extractor_version = version_file.read_text().strip() if version_file.exists() else LEGACY_EXTRACTOR_VERSION
+
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return f.read(), extractor_version
+
+    def save_bill_text(self, doc_id: str, text: str, extractor_version: str) -> None:
+        cache_file = self.cache_dir / f"bill_text_{doc_id}.txt"
+
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        version_file = self.cache_dir / f"bill_text_{doc_id}.version"
+        version_file.write_text(extractor_version)
+
+    def get_bills(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        return lookup_concurrently(self.get_bill, bill_ids)
+
+    def get_bill_texts(self, doc_ids: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        return lookup_concurrently(self.get_bill_text, doc_ids)
+
+    def iter_bills(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        for cache_file in self.cache_dir.glob('bill_*.json'):
+            bill_id = cache_file.stem[len('bill_'):]
+            if bill_id.isdigit():
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    yield int(bill_id), json.load(f)
+
+    def iter_bill_texts(self) -> Iterator[Tuple[str, str, str]]:
+        for cache_file in self.cache_dir.glob('bill_text_*.txt'):
+            doc_id = cache_file.stem[len('bill_text_'):]
+            entry = self.get_bill_text(doc_id)
+            if entry:
+                yield doc_id, entry[0], entry[1]
+
+
+class SQLiteCacheBackend(LegiScanCacheBackend):
+    """All entries in one SQLite file, as compressed compact JSON / text"""
+
+    def __init__(self, path: str = 'data/cache/legiscan_cache.sqlite3'):
+        """
+        Args:
+            path: Database file path (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bills (
+                bill_id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bill_texts (
+                doc_id TEXT PRIMARY KEY,
+                extractor_version TEXT NOT NULL,
+                text BLOB NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def _pack_json(data: Dict[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    @staticmethod
+    def _unpack_json(blob: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(blob))
+
+    def get_bill(self, bill_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM bills WHERE bill_id = ?", (int(bill_id),)).fetchone()
+        return self._unpack_json(row[0]) if row else None
+
+    def save_bill(self, bill_id: int, data: Dict[str, Any]) -> None:
+        self.save_bills([(bill_id, data)])
+
+    def get_bill_text(self, doc_id: str) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, extractor_version FROM bill_texts WHERE doc_id = ?", (str(doc_id),)
+            ).fetchone()
+        return (zlib.decompress(row[0]).decode('utf-8'), row[1]) if row else None
+
+    def save_bill_text(self, doc_id: str, text: str, extractor_version: str) -> None:
+        self.save_bill_texts([(doc_id, text, extractor_version)])
+
+    def get_bills(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        rows = self._select_in("SELECT bill_id, data FROM bills WHERE bill_id IN ({})",
+                               [int(bill_id) for bill_id in bill_ids])
+        return {bill_id: self._unpack_json(data) for bill_id, data in rows}
+
+    def get_bill_texts(self, doc_ids: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        rows = self._select_in("SELECT doc_id, text, extractor_version FROM bill_texts WHERE doc_id IN ({})",
+                               [str(doc_id) for doc_id in doc_ids])
+        return {doc_id: (zlib.decompress(text).decode('utf-8'), version) for doc_id, text, version in rows}
+
+    def _select_in(self, query: str, keys: List[Any]) -> List[tuple]:
+        """Run a SELECT ... IN ({}) query over keys in batches of SQLITE_LOOKUP_BATCH_SIZE"""
+        rows = []
+        for start in range(0, len(keys), SQLITE_LOOKUP_BATCH_SIZE):
+            batch = keys[start:start + SQLITE_LOOKUP_BATCH_SIZE]
+            with self._lock:
+                rows.extend(self._conn.execute(query.format(','.join('?' * len(batch))), batch).fetchall())
+        return rows
+
+    def save_bills(self, bills: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        rows = ((int(bill_id), self._pack_json(data)) for bill_id, data in bills)
+        return self._write_batches("INSERT OR REPLACE INTO bills (bill_id, data) VALUES (?, ?)", rows)
+
+    def save_bill_texts(self, texts: Iterable[Tuple[str, str, str]]) -> int:
+        rows = (
+            (str(doc_id), extractor_version, zlib.compress(text.encode('utf-8')))
+            for doc_id, text, extractor_version in texts
+        )
+        return self._write_batches(
+            "INSERT OR REPLACE INTO bill_texts (doc_id, extractor_version, text) VALUES (?, ?, ?)", rows
+        )
+
+    def _write_batches(self, query: str, rows: Iterable[tuple]) -> int:
+        """Write rows in transactions of SQLITE_BATCH_SIZE"""
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= SQLITE_BATCH_SIZE:
+                count += self._write_batch(query, batch)
+                batch = []
+        if batch:
+            count += self._write_batch(query, batch)
+        return count
+
+    def _write_batch(self, query: str, batch: list) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(query, batch)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(batch)
+
+    def iter_bills(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        with self._lock:
+            bill_ids = [row[0] for row in self._conn.execute("SELECT bill_id FROM bills ORDER BY bill_id")]
+        for bill_id in bill_ids:
+            data = self.get_bill(bill_id)
+            if data is not None:
+                yield bill_id, data
+
+    def iter_bill_texts(self) -> Iterator[Tuple[str, str, str]]:
+        with self._lock:
+            doc_ids = [row[0] for row in self._conn.execute("SELECT doc_id FROM bill_texts ORDER BY doc_id")]
+        for doc_id in doc_ids:
+            entry = self.get_bill_text(doc_id)
+            if entry:
+                yield doc_id, entry[0], entry[1]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_cache_backend(cache_format: str, cache_dir: Path, sqlite_path: Path) -> LegiScanCacheBackend:
+    """
+    Create the cache backend for a storage.local.cache_format value
+
+    Args:
+        cache_format: 'files' or 'sqlite'
+        cache_dir: Directory for the files layout
+        sqlite_path: Database file for the sqlite layout
+
+    Returns:
+        LegiScanCacheBackend instance
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if cache_format == 'files':
+        return FileCacheBackend(cache_dir)
+    if cache_format == 'sqlite':
+        return SQLiteCacheBackend(str(sqlite_path))
+    raise ValueError(f"Unknown cache_format: {cache_format} (expected one of {list(CACHE_FORMATS)})")
+
+
+def migrate_cache(source: LegiScanCacheBackend, target: LegiScanCacheBackend) -> Tuple[int, int]:
+    """
+    Copy every cached bill and bill text from one backend to another
+
+    Args:
+        source: Backend to read
+        target: Backend to write (existing entries are overwritten)
+
+    Returns:
+        (bills copied, texts copied)
+    """
+    bills = target.save_bills(source.iter_bills())
+    texts = target.save_bill_texts(source.iter_bill_texts())
+    return bills, texts
@@ -7,10 +7,19 @@ This is the default storage provider and maintains backward compatibility.
 
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 
-from src.storage_provider import StorageProvider
+from src.result_stream import (
+    JSONL_SUFFIXES, compression_for_name, encode_record, iter_records, validate_result_format
+)
+from src.document_stream import DocumentFile
+from src.local_cache import create_cache_backend
+from src.raw_index import build_raw_index, index_bills, new_raw_index
+from src.storage_provider import StorageProvider, compress_document, decompress_document, hash_document
+from src.text_extraction import LEGACY_EXTRACTOR_VERSION
 
 
 class LocalFileStorage(StorageProvider):
@@ -21,21 +30,49 @@ class LocalFileStorage(StorageProvider):
         Initialize local file storage
 
         Args:
-            config: Configuration dictionary with 'data_directory' key
+            config: Configuration dictionary with keys:
+                - data_directory: Root data directory (default: data)
+                - result_format: 'json' (default) or 'jsonl' for filter/analysis results
+                - compression: None (default), 'gzip' or 'zstd' for jsonl results
+                - cache_format: 'files' (default) or 'sqlite' for the LegiScan bill
+                  and bill text cache (see src/local_cache.py)
+                - cache_path: SQLite file for cache_format 'sqlite'
+                  (default: {data_directory}/cache/legiscan_cache.sqlite3)
         """
         config = config or {}
         self.data_directory = Path(config.get('data_directory', 'data'))
+        self.result_format = config.get('result_format', 'json')
+        self.compression = config.get('compression')
+        validate_result_format(self.result_format, self.compression)
+        self.streams_results = self.result_format == 'jsonl'
 
         # Create directory structure
         self.raw_dir = self.data_directory / 'raw'
         self.filtered_dir = self.data_directory / 'filtered'
         self.analyzed_dir = self.data_directory / 'analyzed'
         self.cache_dir = self.data_directory / 'cache' / 'legiscan_cache'
+        self.sync_dir = self.data_directory / 'cache' / 'sync'
+        self.checkpoint_dir = self.data_directory / 'cache' / 'checkpoints'
+        self.document_dir = self.data_directory / 'cache' / 'documents'
+        self.document_ref_dir = self.document_dir / 'refs'
+        self.raw_index_dir = self.data_directory / 'cache' / 'raw_index'
 
         # Ensure directories exist
-        for directory in [self.raw_dir, self.filtered_dir, self.analyzed_dir, self.cache_dir]:
+        for directory in [self.raw_dir, self.filtered_dir, self.analyzed_dir, self.cache_dir,
+                          self.sync_dir, self.checkpoint_dir, self.document_ref_dir, self.raw_index_dir]:
             directory.mkdir(parents=True, exist_ok=True)
 
+        # Bill number indexes of raw files: filename -> (fingerprint, bills)
+        self._raw_indexes: Dict[str, Tuple[str, Dict[str, List[int]]]] = {}
+        self._raw_index_lock = threading.Lock()
+
+        self.cache_format = config.get('cache_format', 'files')
+        self.cache = create_cache_backend(
+            self.cache_format,
+            self.cache_dir,
+            Path(config.get('cache_path', self.data_directory / 'cache' / 'legiscan_cache.sqlite3'))
+        )
+
     def save_raw_data(self, filename: str, data: Dict[str, Any]) -> None:
         """Save raw bill data to data/raw/{filename}.json"""
         # Remove .json extension if provided
@@ -43,9 +80,12 @@ class LocalFileStorage(StorageProvider):
             filename = filename[:-5]
 
         filepath = self.raw_dir / f"{filename}.json"
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(payload)
+
+        self._save_raw_index(filename, self._raw_fingerprint(filepath), build_raw_index(payload, data))
 
     def load_raw_data(self, filename: str) -> Dict[str, Any]:
         """Load raw bill data from data/raw/{filename}.json"""
@@ -61,25 +101,65 @@ class LocalFileStorage(StorageProvider):
         with open(filepath, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    def _filter_results_name(self, run_id: str) -> str:
+        """Normalize a run_id to the filter_results_{run_id} base name"""
+        filename = run_id if run_id.startswith('filter_results_') else f"filter_results_{run_id}"
+        for suffix in ['.json'] + list(JSONL_SUFFIXES.values()):
+            if filename.endswith(suffix):
+                return filename[:-len(suffix)]
+        return filename
+
+    def _find_jsonl(self, directory: Path, name: str) -> Optional[Path]:
+        """Find {name}.jsonl[.gz|.zst], preferring the configured compression"""
+        compressions = [self.compression] + [c for c in JSONL_SUFFIXES if c != self.compression]
+        for compression in compressions:
+            path = directory / f"{name}{JSONL_SUFFIXES[compression]}"
+            if path.exists():
+                return path
+        return None
+
+    def _iter_jsonl(self, path: Path) -> Iterator[Dict[str, Any]]:
+        """Lazily read records from a JSONL result file"""
+        with open(path, 'rb') as f:
+            yield from iter_records(f, compression_for_name(path.name))
+
     def save_filtered_results(self, run_id: str, data: Dict[str, Any]) -> None:
-        """Save filter results to data/filtered/filter_results_{run_id}.json"""
-        # Remove filter_results_ prefix if already provided
-        if run_id.startswith('filter_results_'):
-            filename = run_id
-        else:
-            filename = f"filter_results_{run_id}"
+        """
+        Save filter results to data/filtered/filter_results_{run_id}.json
 
-        # Remove .json extension if provided
-        if filename.endswith('.json'):
-            filename = filename[:-5]
+        With result_format 'jsonl', writes one record per bill (with a
+        'relevant' flag) to filter_results_{run_id}.jsonl[.gz|.zst] instead.
+        Results of the run in the other format are removed, so a stale file
+        is never read in place of the new one.
+        """
+        filename = self._filter_results_name(run_id)
+
+        if not self.streams_results:
+            filepath = self.filtered_dir / f"{filename}.json"
+
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
 
-        filepath = self.filtered_dir / f"{filename}.json"
+            for suffix in JSONL_SUFFIXES.values():
+                (self.filtered_dir / f"{filename}{suffix}").unlink(missing_ok=True)
+            return
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        filepath = self.filtered_dir / f"{filename}{JSONL_SUFFIXES[self.compression]}"
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
+
+        with open(tmp_path, 'wb') as f:
+            for relevant, key in [(True, 'relevant_bills'), (False, 'not_relevant_bills')]:
+                for bill in data.get(key, []):
+                    f.write(encode_record({**bill, 'relevant': relevant}, self.compression))
+
+        os.replace(tmp_path, filepath)
+        (self.filtered_dir / f"{filename}.json").unlink(missing_ok=True)
+        for suffix in JSONL_SUFFIXES.values():
+            if suffix != JSONL_SUFFIXES[self.compression]:
+                (self.filtered_dir / f"{filename}{suffix}").unlink(missing_ok=True)
 
     def load_filtered_results(self, run_id: str) -> Dict[str, Any]:
-        """Load filter results from data/filtered/filter_results_{run_id}.json"""
+        """Load filter results from data/filtered/filter_results_{run_id}.json (or .jsonl)"""
         # Try different filename patterns
         possible_filenames = [
             run_id,  # Exact match
@@ -98,8 +178,54 @@ class LocalFileStorage(StorageProvider):
                 with open(filepath, 'r', encoding='utf-8') as f:
                     return json.load(f)
 
+        if self._find_jsonl(self.filtered_dir, self._filter_results_name(run_id)):
+            relevant_bills = []
+            not_relevant_bills = []
+
+            for record in self.iter_filtered_results(run_id):
+                relevant = record.pop('relevant', False)
+                (relevant_bills if relevant else not_relevant_bills).append(record)
+
+            return {
+                'summary': {
+                    'total_analyzed': len(relevant_bills) + len(not_relevant_bills),
+                    'relevant_count': len(relevant_bills),
+                    'not_relevant_count': len(not_relevant_bills),
+                    'source_file': self._filter_results_name(run_id)[len('filter_results_'):]
+                },
+                'relevant_bills': relevant_bills,
+                'not_relevant_bills': not_relevant_bills
+            }
+
         raise FileNotFoundError(f"Filter results not found for run_id: {run_id}")
 
+    def iter_filtered_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate filter result records from data/filtered/ (JSONL read lazily)"""
+        jsonl_path = self._find_jsonl(self.filtered_dir, self._filter_results_name(run_id))
+
+        if jsonl_path:
+            yield from self._iter_jsonl(jsonl_path)
+            return
+
+        data = self.load_filtered_results(run_id)
+        for relevant, key in [(True, 'relevant_bills'), (False, 'not_relevant_bills')]:
+            for bill in data.get(key, []):
+                yield {**bill, 'relevant': relevant}
+
+    def _analysis_prefix(self, run_id: str) -> str:
+        """Normalize a run_id to the analysis_{run_id} file prefix"""
+        # Determine filename prefix
+        if run_id.startswith('analysis_'):
+            prefix = run_id
+        else:
+            prefix = f"analysis_{run_id}"
+
+        # Remove .json if present
+        if prefix.endswith('.json'):
+            prefix = prefix[:-5]
+
+        return prefix
+
     def save_analysis_results(
         self,
         run_id: str,
@@ -114,16 +240,28 @@ class LocalFileStorage(StorageProvider):
         Accepts either:
         - List format (legacy): [{"bill": {...}, "analysis": {...}}, ...]
         - Dict format (with stats): {"summary": {...}, "timing_stats": {...}, "results": [...]}
+
+        With result_format 'jsonl', any results passed in are appended to
+        analysis_{run_id}.jsonl[.gz|.zst] (usually they were already streamed
+        with append_analysis_result) and summary/timing_stats are written to
+        analysis_{run_id}_summary.json. Results of the run in the other format
+        are removed, so a stale file is never read in place of the new ones.
         """
-        # Determine filename prefix
-        if run_id.startswith('analysis_'):
-            prefix = run_id
-        else:
-            prefix = f"analysis_{run_id}"
+        prefix = self._analysis_prefix(run_id)
 
-        # Remove .json if present
-        if prefix.endswith('.json'):
-            prefix = prefix[:-5]
+        if self.streams_results:
+            for name in (f"{prefix}_relevant.json", f"{prefix}_not_relevant.json"):
+                (self.analyzed_dir / name).unlink(missing_ok=True)
+
+            for results in (relevant, not_relevant):
+                for result in results if isinstance(results, list) else results.get('results', []):
+                    self.append_analysis_result(run_id, result)
+
+            if isinstance(relevant, dict):
+                summary = {key: value for key, value in relevant.items() if key != 'results'}
+                with open(self.analyzed_dir / f"{prefix}_summary.json", 'w', encoding='utf-8') as f:
+                    json.dump(summary, f, indent=2, ensure_ascii=False)
+            return
 
         # Save relevant bills (handles both list and dict formats automatically)
         relevant_path = self.analyzed_dir / f"{prefix}_relevant.json"
@@ -135,25 +273,30 @@ class LocalFileStorage(StorageProvider):
         with open(not_relevant_path, 'w', encoding='utf-8') as f:
             json.dump(not_relevant, f, indent=2, ensure_ascii=False)
 
+        self.clear_analysis_results(run_id)
+        (self.analyzed_dir / f"{prefix}_summary.json").unlink(missing_ok=True)
+
     def load_analysis_results(self, run_id: str) -> Tuple[List[Dict], List[Dict]]:
         """
         Load analysis results from:
         - data/analyzed/analysis_{run_id}_relevant.json
         - data/analyzed/analysis_{run_id}_not_relevant.json
+        (or from analysis_{run_id}.jsonl[.gz|.zst] for streamed runs)
         """
-        # Determine filename prefix
-        if run_id.startswith('analysis_'):
-            prefix = run_id
-        else:
-            prefix = f"analysis_{run_id}"
-
-        # Remove .json if present
-        if prefix.endswith('.json'):
-            prefix = prefix[:-5]
+        prefix = self._analysis_prefix(run_id)
 
         relevant_path = self.analyzed_dir / f"{prefix}_relevant.json"
         not_relevant_path = self.analyzed_dir / f"{prefix}_not_relevant.json"
 
+        if not relevant_path.exists() and not not_relevant_path.exists() and \
+                self._find_jsonl(self.analyzed_dir, prefix):
+            relevant = []
+            not_relevant = []
+            for result in self.iter_analysis_results(run_id):
+                is_relevant = result.get('analysis', {}).get('is_relevant', False)
+                (relevant if is_relevant else not_relevant).append(result)
+            return relevant, not_relevant
+
         # Load relevant bills
         if relevant_path.exists():
             with open(relevant_path, 'r', encoding='utf-8') as f:
@@ -173,22 +316,113 @@ class LocalFileStorage(StorageProvider):
 
         return relevant, not_relevant
 
+    def append_analysis_result(self, run_id: str, result: Dict[str, Any]) -> None:
+        """Append one result to data/analyzed/analysis_{run_id}.jsonl[.gz|.zst]"""
+        prefix = self._analysis_prefix(run_id)
+        filepath = self.analyzed_dir / f"{prefix}{JSONL_SUFFIXES[self.compression]}"
+
+        with open(filepath, 'ab') as f:
+            f.write(encode_record(result, self.compression))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def iter_analysis_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate analysis results, reading JSONL lazily (safe while a run is in progress)"""
+        jsonl_path = self._find_jsonl(self.analyzed_dir, self._analysis_prefix(run_id))
+
+        if jsonl_path:
+            yield from self._iter_jsonl(jsonl_path)
+            return
+
+        for results in self.load_analysis_results(run_id):
+            yield from (results if isinstance(results, list) else results.get('results', []))
+
+    def clear_analysis_results(self, run_id: str) -> None:
+        """Delete streamed results for a run (analysis_{run_id}.jsonl*)"""
+        prefix = self._analysis_prefix(run_id)
+        for suffix in JSONL_SUFFIXES.values():
+            (self.analyzed_dir / f"{prefix}{suffix}").unlink(missing_ok=True)
+
     def get_bill_from_cache(self, bill_id: int) -> Optional[Dict[str, Any]]:
-        """Get cached bill from data/cache/legiscan_cache/bill_{bill_id}.json"""
-        cache_file = self.cache_dir / f"bill_{bill_id}.json"
+        """Get cached bill from data/cache/legiscan_cache/bill_{bill_id}.json (or the SQLite cache)"""
+        return self.cache.get_bill(bill_id)
 
-        if not cache_file.exists():
-            return None
+    def get_bills_from_cache(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Get cached bills with parallel file reads (or one query per batch for the SQLite cache)"""
+        return self.cache.get_bills(bill_ids)
+
+    def save_bill_to_cache(self, bill_id: int, data: Dict[str, Any]) -> None:
+        """Save bill to cache at data/cache/legiscan_cache/bill_{bill_id}.json (or the SQLite cache)"""
+        self.cache.save_bill(bill_id, data)
+
+    def append_checkpoint(self, run_id: str, record: Dict[str, Any]) -> None:
+        """Append a record to data/cache/checkpoints/{run_id}.jsonl"""
+        journal_file = self.checkpoint_dir / f"{run_id}.jsonl"
+
+        with open(journal_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_checkpoints(self, run_id: str) -> List[Dict[str, Any]]:
+        """Load records from data/cache/checkpoints/{run_id}.jsonl"""
+        journal_file = self.checkpoint_dir / f"{run_id}.jsonl"
+
+        if not journal_file.exists():
+            return []
+
+        records = []
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated last line
+                    continue
+
+        return records
+
+    def clear_checkpoints(self, run_id: str) -> None:
+        """Delete data/cache/checkpoints/{run_id}.jsonl"""
+        (self.checkpoint_dir / f"{run_id}.jsonl").unlink(missing_ok=True)
+
+    def get_dirty_bills(self, filename: str) -> List[int]:
+        """Get dirty bill IDs from data/cache/sync/{filename}_dirty.json"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        dirty_file = self.sync_dir / f"{filename}_dirty.json"
 
-        with open(cache_file, 'r', encoding='utf-8') as f:
+        if not dirty_file.exists():
+            return []
+
+        with open(dirty_file, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    def save_bill_to_cache(self, bill_id: int, data: Dict[str, Any]) -> None:
-        """Save bill to cache at data/cache/legiscan_cache/bill_{bill_id}.json"""
-        cache_file = self.cache_dir / f"bill_{bill_id}.json"
+    def mark_bills_dirty(self, filename: str, bill_ids: List[int]) -> None:
+        """Add bill IDs to data/cache/sync/{filename}_dirty.json"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        dirty = set(self.get_dirty_bills(filename)) | set(bill_ids)
 
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(self.sync_dir / f"{filename}_dirty.json", 'w', encoding='utf-8') as f:
+            json.dump(sorted(dirty), f, indent=2)
+
+    def clear_dirty_bills(self, filename: str, bill_ids: Optional[List[int]] = None) -> None:
+        """Remove bill IDs (or all) from data/cache/sync/{filename}_dirty.json"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+
+        dirty_file = self.sync_dir / f"{filename}_dirty.json"
+        remaining = set(self.get_dirty_bills(filename)) - set(bill_ids) if bill_ids is not None else set()
+
+        if not remaining:
+            dirty_file.unlink(missing_ok=True)
+            return
+
+        with open(dirty_file, 'w', encoding='utf-8') as f:
+            json.dump(sorted(remaining), f, indent=2)
 
     def list_raw_files(self) -> List[str]:
         """List all JSON files in data/raw/ directory"""
@@ -207,88 +441,191 @@ class LocalFileStorage(StorageProvider):
         if not self.filtered_dir.exists():
             return []
 
-        files = []
+        files = set()
         for filepath in self.filtered_dir.glob('*.json'):
             # Return filename without .json extension
-            files.append(filepath.stem)
+            files.add(filepath.stem)
+        for filepath in self.filtered_dir.glob('*.jsonl*'):
+            if not filepath.name.endswith('.tmp'):
+                files.add(filepath.name.split('.jsonl')[0])
 
         return sorted(files)
 
-    def bill_exists_in_raw(self, bill_number: str, filename: str) -> bool:
-        """Check if a bill exists in raw data by bill number"""
+    def list_analysis_results(self) -> List[str]:
+        """List analysis runs in data/analyzed/ (relevant/not relevant JSON pairs or JSONL)"""
+        if not self.analyzed_dir.exists():
+            return []
+
+        runs = set()
+        for filepath in self.analyzed_dir.glob('analysis_*'):
+            name = filepath.name
+            if '.jsonl' in name:
+                if not name.endswith('.tmp'):
+                    runs.add(name.split('.jsonl')[0])
+            elif name.endswith('_not_relevant.json'):
+                runs.add(name[:-len('_not_relevant.json')])
+            elif name.endswith('_relevant.json'):
+                runs.add(name[:-len('_relevant.json')])
+
+        return sorted(runs)
+
+    def _raw_filepath(self, filename: str) -> Tuple[str, Path]:
+        """Normalize a raw data filename, returning (name without .json, data/raw/{name}.json)"""
+        if filename.endswith('.json'):
+            filename = filename[:-5]
+        return filename, self.raw_dir / f"{filename}.json"
+
+    @staticmethod
+    def _raw_fingerprint(filepath: Path) -> str:
+        """Size and modification time of a raw file, recorded in its index"""
+        stat = filepath.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _save_raw_index(self, filename: str, fingerprint: str, bills: Dict[str, List[int]]) -> None:
+        """Write the bill number index of a raw file to data/cache/raw_index/{filename}.json"""
+        index_file = self.raw_index_dir / f"{filename}.json"
+
+        fd, temp_path = tempfile.mkstemp(dir=self.raw_index_dir, suffix='.tmp')
         try:
-            data = self.load_raw_data(filename)
-
-            # Handle different data structures
-            if isinstance(data, dict):
-                # Check if it's a summary with masterlist
-                if 'summary' in data and 'masterlist' in data['summary']:
-                    bills = data['summary']['masterlist']
-                # Check if it has a direct list of bills
-                elif 'bills' in data:
-                    bills = data['bills']
-                # Assume the dict values are bills
-                else:
-                    bills = data.values() if not isinstance(list(data.values())[0], dict) else data
-            elif isinstance(data, list):
-                bills = data
-            else:
-                return False
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(new_raw_index(fingerprint, bills), f, separators=(',', ':'))
+            os.replace(temp_path, index_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
 
-            # Search for bill by number
-            for bill in bills:
-                if isinstance(bill, dict) and bill.get('bill_number') == bill_number:
-                    return True
+        with self._raw_index_lock:
+            self._raw_indexes[filename] = (fingerprint, bills)
 
-            return False
+    def _get_raw_index(self, filename: str) -> Dict[str, List[int]]:
+        """
+        Get the bill number index of a raw file, rebuilding it if the file changed
 
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        Raises:
+            FileNotFoundError: If the raw file doesn't exist
+            json.JSONDecodeError: If the raw file has to be indexed and isn't valid JSON
+        """
+        filename, filepath = self._raw_filepath(filename)
+        fingerprint = self._raw_fingerprint(filepath)
+
+        with self._raw_index_lock:
+            memo = self._raw_indexes.get(filename)
+        if memo and memo[0] == fingerprint:
+            return memo[1]
+
+        try:
+            with open(self.raw_index_dir / f"{filename}.json", 'r', encoding='utf-8') as f:
+                bills = index_bills(json.load(f), fingerprint)
+        except (FileNotFoundError, json.JSONDecodeError):
+            bills = None
+
+        if bills is None:
+            bills = build_raw_index(filepath.read_bytes())
+            self._save_raw_index(filename, fingerprint, bills)
+        else:
+            with self._raw_index_lock:
+                self._raw_indexes[filename] = (fingerprint, bills)
+
+        return bills
+
+    def bill_exists_in_raw(self, bill_number: str, filename: str) -> bool:
+        """Check if a bill exists in raw data by bill number (via the raw file's index)"""
+        try:
+            return bill_number in self._get_raw_index(filename)
+        except (FileNotFoundError, json.JSONDecodeError):
             return False
 
     def get_bill_by_number(self, bill_number: str, filename: str) -> Optional[Dict[str, Any]]:
-        """Get a specific bill from raw data by bill number"""
+        """Get a specific bill from raw data by bill number, reading only its span of the file"""
         try:
-            data = self.load_raw_data(filename)
-
-            # Handle different data structures
-            if isinstance(data, dict):
-                # Check if it's a summary with masterlist
-                if 'summary' in data and 'masterlist' in data['summary']:
-                    bills = data['summary']['masterlist']
-                # Check if it has a direct list of bills
-                elif 'bills' in data:
-                    bills = data['bills']
-                # Assume the dict values are bills
-                else:
-                    bills = list(data.values()) if data else []
-            elif isinstance(data, list):
-                bills = data
-            else:
+            entry = self._get_raw_index(filename).get(bill_number)
+            if not entry:
                 return None
 
-            # Search for bill by number
-            for bill in bills:
-                if isinstance(bill, dict) and bill.get('bill_number') == bill_number:
-                    return bill
+            _, offset, length = entry
+            with open(self._raw_filepath(filename)[1], 'rb') as f:
+                f.seek(offset)
+                return json.loads(f.read(length))
 
+        except (FileNotFoundError, json.JSONDecodeError):
             return None
 
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
-            return None
+    def get_bill_text_from_cache(self, doc_id: str, extractor_version: Optional[str] = None) -> Optional[str]:
+        """Get cached bill text from data/cache/legiscan_cache/bill_text_{doc_id}.txt (or the SQLite cache)"""
+        entry = self.cache.get_bill_text(doc_id)
 
-    def get_bill_text_from_cache(self, doc_id: str) -> Optional[str]:
-        """Get cached bill text from data/cache/legiscan_cache/bill_text_{doc_id}.txt"""
-        cache_file = self.cache_dir / f"bill_text_{doc_id}.txt"
+        if not entry:
+            return None
 
-        if not cache_file.exists():
+        text, recorded_version = entry
+        if extractor_version and recorded_version != extractor_version:
             return None
 
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return f.read()
+        return text
+
+    def get_bill_texts_from_cache(
+        self,
+        doc_ids: Iterable[str],
+        extractor_versions: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Get cached bill texts with parallel file reads (or one query per batch for the SQLite cache)"""
+        extractor_versions = extractor_versions or {}
+        return {
+            doc_id: text
+            for doc_id, (text, recorded_version) in self.cache.get_bill_texts(doc_ids).items()
+            if not extractor_versions.get(doc_id) or recorded_version == extractor_versions[doc_id]
+        }
+
+    def save_bill_text_to_cache(self, doc_id: str, text: str, extractor_version: Optional[str] = None) -> None:
+        """Save bill text to cache at data/cache/legiscan_cache/bill_text_{doc_id}.txt (or the SQLite cache)"""
+        self.cache.save_bill_text(doc_id, text, extractor_version or LEGACY_EXTRACTOR_VERSION)
+
+    def _document_object_path(self, content_hash: str) -> Path:
+        """Path of a cached raw document: data/cache/documents/{hash[:2]}/{hash}.gz"""
+        return self.document_dir / content_hash[:2] / f"{content_hash}.gz"
+
+    def get_document_from_cache(self, doc_id: str) -> Optional[Tuple[DocumentFile, str]]:
+        """Get a cached raw document via data/cache/documents/refs/doc_{doc_id}.json"""
+        ref_file = self.document_ref_dir / f"doc_{doc_id}.json"
 
-    def save_bill_text_to_cache(self, doc_id: str, text: str) -> None:
-        """Save bill text to cache at data/cache/legiscan_cache/bill_text_{doc_id}.txt"""
-        cache_file = self.cache_dir / f"bill_text_{doc_id}.txt"
+        try:
+            with open(ref_file, 'r', encoding='utf-8') as f:
+                ref = json.load(f)
+            with open(self._document_object_path(ref['content_hash']), 'rb') as f:
+                document = decompress_document(f, ref['content_hash'])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
 
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            f.write(text)
+        return (document, ref.get('mime_type')) if document else None
+
+    def save_document_to_cache(self, doc_id: str, path: str, mime_type: str) -> str:
+        """Save a raw document to data/cache/documents/ (stored once per content hash)"""
+        content_hash = hash_document(path)
+        object_path = self._document_object_path(content_hash)
+
+        if not object_path.exists():
+            object_path.parent.mkdir(exist_ok=True)
+
+            # Write under a temp name so readers never see a partial object
+            fd, temp_path = tempfile.mkstemp(dir=object_path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    compress_document(path, f)
+                os.replace(temp_path, object_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+        ref = {
+            'content_hash': content_hash,
+            'mime_type': mime_type,
+            'size': os.path.getsize(path)
+        }
+        with open(self.document_ref_dir / f"doc_{doc_id}.json", 'w', encoding='utf-8') as f:
+            json.dump(ref, f)
+
+        return content_hash
+
+    def list_cached_documents(self) -> List[str]:
+        """List doc_ids referenced in data/cache/documents/refs/"""
+        return sorted(f.stem[len('doc_'):] for f in self.document_ref_dir.glob('doc_*.json'))
@@ -0,0 +1,341 @@
+"""
+In-Process Memory Cache for Storage Providers
+
+MemoryCachedStorage wraps any StorageProvider with a bounded, size-aware
+LRU of cached bills (get_bill_from_cache) and extracted bill text
+(get_bill_text_from_cache). Repeat lookups within a process - the same
+bill in several filter files, retries, re-runs in one batch job - are
+answered from memory instead of re-reading and re-parsing a JSON file,
+downloading a blob or querying the database. Saves write through to the
+wrapped provider and update the memory tier; every other method is passed
+straight through. The batch lookups (get_bills_from_cache,
+get_bill_texts_from_cache) fetch everything not yet in memory with one
+provider call, which is how the analysis scripts prefetch their working set.
+
+Configured with storage.memory_cache_mb (default: 64, 0 disables it):
+
+    "storage": {
+        "backend": "local",
+        "memory_cache_mb": 128
+    }
+
+Cached bill dicts are shared between callers and must not be modified.
+"""
+
+import json
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.document_stream import DocumentFile
+from src.storage_provider import StorageProvider
+from src.text_extraction import LEGACY_EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_CACHE_MB = 64
+
+
+class LRUMemoryCache:
+    """Thread-safe LRU mapping bounded by the approximate size of its values"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Size limit; least recently used entries are evicted beyond it
+        """
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Any, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the value for key (marking it most recently used), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: Any, value: Any, size: int) -> None:
+        """
+        Store a value, evicting least recently used entries to stay within max_bytes
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size: Approximate size of the value in bytes (values larger than
+                max_bytes are not stored)
+        """
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, key: Any) -> None:
+        """Remove key if present"""
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: Any) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
+
+
+def _bill_size(data: Dict[str, Any]) -> int:
+    """Approximate in-memory footprint of a bill dict (its compact JSON size)"""
+    try:
+        return len(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    except (TypeError, ValueError):
+        return sys.getsizeof(data)
+
+
+class MemoryCachedStorage(StorageProvider):
+    """StorageProvider wrapper with an in-memory LRU tier in front of the bill and bill text caches"""
+
+    def __init__(self, provider: StorageProvider, max_bytes: int = DEFAULT_MEMORY_CACHE_MB * 1024 * 1024):
+        """
+        Initialize memory cache
+
+        Args:
+            provider: StorageProvider holding the persistent caches
+            max_bytes: Memory tier size limit
+        """
+        self.provider = provider
+        self.memory = LRUMemoryCache(max_bytes)
+
+        # Lookups answered from memory / passed to the provider, and how many
+        # of the latter the provider had
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+        self._stats_lock = threading.Lock()
+
+        logger.info(f"Storage memory cache enabled ({max_bytes / (1024 * 1024):.0f} MB) "
+                    f"for {type(provider).__name__}")
+
+    @property
+    def streams_results(self) -> bool:
+        return self.provider.streams_results
+
+    def __getattr__(self, name: str) -> Any:
+        # Optional provider methods (get_llm_response, ...) and attributes
+        if name == 'provider':
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    def _record(self, memory_hit: bool, persistent_hit: bool = False) -> None:
+        with self._stats_lock:
+            if memory_hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if persistent_hit:
+                    self.persistent_hits += 1
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get memory tier statistics
+
+        Returns:
+            Dict with memory_hits, memory_misses (lookups passed to the
+            provider), persistent_hits, persistent_misses, hit_rate, entries,
+            size_bytes and evictions
+        """
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'memory_hits': self.hits,
+                'memory_misses': self.misses,
+                'persistent_hits': self.persistent_hits,
+                'persistent_misses': self.misses - self.persistent_hits,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self.memory),
+                'size_bytes': self.memory.size_bytes,
+                'evictions': self.memory.evictions
+            }
+
+    # Cached lookups
+
+    def get_bill_from_cache(self, bill_id: int) -> Optional[Dict[str, Any]]:
+        key = ('bill', int(bill_id))
+        data = self.memory.get(key)
+        if data is not None:
+            self._record(True)
+            return data
+
+        data = self.provider.get_bill_from_cache(bill_id)
+        self._record(False, data is not None)
+        if data is not None:
+            self.memory.set(key, data, _bill_size(data))
+        return data
+
+    def get_bills_from_cache(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        bills = {}
+        missing = []
+        for bill_id in dict.fromkeys(bill_ids):
+            data = self.memory.get(('bill', int(bill_id)))
+            if data is not None:
+                self._record(True)
+                bills[bill_id] = data
+            else:
+                missing.append(bill_id)
+
+        if missing:
+            # One batched lookup for everything not in memory
+            found = self.provider.get_bills_from_cache(missing)
+            for bill_id in missing:
+                data = found.get(bill_id)
+                self._record(False, data is not None)
+                if data is not None:
+                    self.memory.set(('bill', int(bill_id)), data, _bill_size(data))
+                    bills[bill_id] = data
+        return bills
+
+    def save_bill_to_cache(self, bill_id: int, data: Dict[str, Any]) -> None:
+        key = ('bill', int(bill_id))
+        # Drop the old entry first so a failed write can't leave it behind
+        self.memory.discard(key)
+        self.provider.save_bill_to_cache(bill_id, data)
+        self.memory.set(key, data, _bill_size(data))
+
+    def get_bill_text_from_cache(self, doc_id: str, extractor_version: Optional[str] = None) -> Optional[str]:
+        # Entries are (text, extractor version); the version is None when the
+        # text was read without one and so isn't known
+        key = ('bill_text', str(doc_id))
+        entry = self.memory.get(key)
+        if entry is not None and (extractor_version is None or entry[1] == extractor_version):
+            self._record(True)
+            return entry[0]
+
+        text = self.provider.get_bill_text_from_cache(doc_id, extractor_version)
+        self._record(False, text is not None)
+        if text is not None:
+            self.memory.set(key, (text, extractor_version), len(text))
+        return text
+
+    def get_bill_texts_from_cache(
+        self,
+        doc_ids: Iterable[str],
+        extractor_versions: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        extractor_versions = extractor_versions or {}
+        texts = {}
+        missing = []
+        for doc_id in dict.fromkeys(doc_ids):
+            extractor_version = extractor_versions.get(doc_id)
+            entry = self.memory.get(('bill_text', str(doc_id)))
+            if entry is not None and (extractor_version is None or entry[1] == extractor_version):
+                self._record(True)
+                texts[doc_id] = entry[0]
+            else:
+                missing.append(doc_id)
+
+        if missing:
+            found = self.provider.get_bill_texts_from_cache(missing, extractor_versions)
+            for doc_id in missing:
+                text = found.get(doc_id)
+                self._record(False, text is not None)
+                if text is not None:
+                    self.memory.set(('bill_text', str(doc_id)), (text, extractor_versions.get(doc_id)), len(text))
+                    texts[doc_id] = text
+        return texts
+
+    def save_bill_text_to_cache(self, doc_id: str, text: str, extractor_version: Optional[str] = None) -> None:
+        key = ('bill_text', str(doc_id))
+        self.memory.discard(key)
+        self.provider.save_bill_text_to_cache(doc_id, text, extractor_version)
+        self.memory.set(key, (text, extractor_version or LEGACY_EXTRACTOR_VERSION), len(text))
+
+    # Pass-through
+
+    def save_raw_data(self, filename: str, data: Dict[str, Any]) -> None:
+        self.provider.save_raw_data(filename, data)
+
+    def load_raw_data(self, filename: str) -> Dict[str, Any]:
+        return self.provider.load_raw_data(filename)
+
+    def save_filtered_results(self, run_id: str, data: Dict[str, Any]) -> None:
+        self.provider.save_filtered_results(run_id, data)
+
+    def load_filtered_results(self, run_id: str) -> Dict[str, Any]:
+        return self.provider.load_filtered_results(run_id)
+
+    def iter_filtered_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        return self.provider.iter_filtered_results(run_id)
+
+    def save_analysis_results(
+        self,
+        run_id: str,
+        relevant: Union[List[Dict[str, Any]], Dict[str, Any]],
+        not_relevant: Union[List[Dict[str, Any]], Dict[str, Any]]
+    ) -> None:
+        self.provider.save_analysis_results(run_id, relevant, not_relevant)
+
+    def load_analysis_results(self, run_id: str) -> Tuple[List[Dict], List[Dict]]:
+        return self.provider.load_analysis_results(run_id)
+
+    def append_analysis_result(self, run_id: str, result: Dict[str, Any]) -> None:
+        self.provider.append_analysis_result(run_id, result)
+
+    def iter_analysis_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        return self.provider.iter_analysis_results(run_id)
+
+    def clear_analysis_results(self, run_id: str) -> None:
+        self.provider.clear_analysis_results(run_id)
+
+    def append_checkpoint(self, run_id: str, record: Dict[str, Any]) -> None:
+        self.provider.append_checkpoint(run_id, record)
+
+    def load_checkpoints(self, run_id: str) -> List[Dict[str, Any]]:
+        return self.provider.load_checkpoints(run_id)
+
+    def clear_checkpoints(self, run_id: str) -> None:
+        self.provider.clear_checkpoints(run_id)
+
+    def get_dirty_bills(self, filename: str) -> List[int]:
+        return self.provider.get_dirty_bills(filename)
+
+    def mark_bills_dirty(self, filename: str, bill_ids: List[int]) -> None:
+        self.provider.mark_bills_dirty(filename, bill_ids)
+
+    def clear_dirty_bills(self, filename: str, bill_ids: Optional[List[int]] = None) -> None:
+        self.provider.clear_dirty_bills(filename, bill_ids)
+
+    def list_raw_files(self) -> List[str]:
+        return self.provider.list_raw_files()
+
+    def list_filtered_results(self) -> List[str]:
+        return self.provider.list_filtered_results()
+
+    def list_analysis_results(self) -> List[str]:
+        return self.provider.list_analysis_results()
+
+    def bill_exists_in_raw(self, bill_number: str, filename: str) -> bool:
+        return self.provider.bill_exists_in_raw(bill_number, filename)
+
+    def get_bill_by_number(self, bill_number: str, filename: str) -> Optional[Dict[str, Any]]:
+        return self.provider.get_bill_by_number(bill_number, filename)
+
+    def get_document_from_cache(self, doc_id: str) -> Optional[Tuple[DocumentFile, str]]:
+        return self.provider.get_document_from_cache(doc_id)
+
+    def save_document_to_cache(self, doc_id: str, path: str, mime_type: str) -> str:
+        return self.provider.save_document_to_cache(doc_id, path, mime_type)
+
+    def list_cached_documents(self) -> List[str]:
+        return self.provider.list_cached_documents()
@@ -0,0 +1,97 @@
+"""
+Prompt Serialization Formats
+
+How bills are written into LLM prompts. Indentation and keys repeated for
+every bill can be a large share of a filter batch's input tokens, so the
+filter pass can pick a more compact wire format (filter_pass.prompt_format):
+
+- json: indented JSON, as the prompts were originally written against (default)
+- compact: minified JSON - same structure, no whitespace
+- table: tab-separated values with a header row naming the columns, so
+  keys are written once per batch instead of once per bill; nested values
+  are written as compact JSON
+
+scripts/benchmark_prompt_formats.py measures the token savings of each
+format on stored filter results, and optionally re-runs a sample of bills
+to check the filter decisions don't change.
+"""
+
+import json
+from typing import Any, Dict, List, Sequence
+
+PROMPT_FORMATS = ('json', 'compact', 'table')
+DEFAULT_PROMPT_FORMAT = 'json'
+
+# First line of a table, so the model knows how to read it
+TABLE_PREAMBLE = "Tab-separated values, one record per line; the first line names the columns."
+
+
+def validate_prompt_format(prompt_format: str) -> str:
+    """
+    Check a configured prompt format
+
+    Raises:
+        ValueError: If prompt_format is not one of PROMPT_FORMATS
+    """
+    if prompt_format not in PROMPT_FORMATS:
+        raise ValueError(f"Unknown prompt format '{prompt_format}' (expected one of: {', '.join(PROMPT_FORMATS)})")
+    return prompt_format
+
+
+def table_columns(items: Sequence[Dict[str, Any]]) -> List[str]:
+    """Keys of all items, in order of first appearance"""
+    return list(dict.fromkeys(key for item in items for key in item))
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    # Tabs and line breaks would split the row
+    return ' '.join(value.split())
+
+
+def table_row(item: Dict[str, Any], columns: Sequence[str]) -> str:
+    """One item as a tab-separated line (missing keys are left empty)"""
+    return '\t'.join(_cell(item.get(column)) for column in columns)
+
+
+def table_header(columns: Sequence[str]) -> str:
+    """Preamble and column name line of a table"""
+    return f"{TABLE_PREAMBLE}\n" + '\t'.join(columns)
+
+
+def format_items(items: Sequence[Dict[str, Any]], prompt_format: str = DEFAULT_PROMPT_FORMAT) -> str:
+    """
+    Serialize a list of items (a filter batch) for a prompt
+
+    Args:
+        items: JSON-serializable dicts
+        prompt_format: One of PROMPT_FORMATS
+
+    Returns:
+        Serialized items
+    """
+    if prompt_format == 'table':
+        columns = table_columns(items)
+        return '\n'.join([table_header(columns)] + [table_row(item, columns) for item in items])
+    if prompt_format == 'compact':
+        return json.dumps(list(items), ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(list(items), indent=2)
+
+
+def format_item(item: Any, prompt_format: str = DEFAULT_PROMPT_FORMAT) -> str:
+    """
+    Serialize a single item for a prompt
+
+    Dicts are written in prompt_format (a table has one row); anything else
+    is passed through str().
+    """
+    if not isinstance(item, dict):
+        return str(item)
+    if prompt_format == 'table':
+        return format_items([item], prompt_format)
+    if prompt_format == 'compact':
+        return json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(item, indent=2)
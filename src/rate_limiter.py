@@ -0,0 +1,416 @@
+"""
+Rate Limiting and Retry Layer for LLM Providers
+
+Wraps any LLMProvider so completions run at the provider's real quota
+ceiling instead of a fixed, conservative pace:
+
+- Token buckets for both requests/minute and tokens/minute
+- Honors Retry-After / retry-after-ms and x-ratelimit-* response headers
+- Jittered exponential backoff on 429, 5xx, timeouts and connection errors
+- AIMD concurrency control: the number of in-flight requests grows by one
+  after a streak of successes and halves whenever the provider throttles us
+
+Enable it with an "llm.rate_limit" section in config.json, e.g.:
+
+    "llm": {
+        "provider": "azure",
+        "rate_limit": {
+            "requests_per_minute": 500,
+            "tokens_per_minute": 150000,
+            "max_concurrency": 16
+        }
+    }
+"""
+
+import random
+import re
+import threading
+import time
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Any, Optional
+
+from src.llm_provider import LLMProvider, LLMProviderError, get_last_response_headers
+from src.token_budget import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize bucket
+
+        Args:
+            rate: Refill rate in tokens per second
+            capacity: Maximum burst size (default: one minute of refill)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate * 60
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last update (lock must be held)"""
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take `amount` tokens, sleeping until they are available
+
+        Requests larger than the bucket capacity are clamped so they can
+        still proceed once the bucket is full.
+
+        Args:
+            amount: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                else:
+                    delay = (amount - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Change refill rate (e.g., after learning the real limit from response headers)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity if capacity is not None else rate * 60
+            self._tokens = min(self._tokens, self.capacity)
+
+    def sync_remaining(self, remaining: float) -> None:
+        """Lower the local token count to what the server reports as remaining"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, max(0.0, remaining))
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (e.g., after a 429 with Retry-After)"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) limit on in-flight requests
+
+    The limit grows by one after `increase_after` consecutive successes and is
+    halved when the provider signals overload, staying within [min_limit, max_limit].
+    """
+
+    # A burst of concurrent 429s is one overload signal, not several
+    DECREASE_COOLDOWN_SECONDS = 1.0
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 64, increase_after: int = 10):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.increase_after = increase_after
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        return False
+
+    def on_success(self) -> None:
+        """Record a success; raise the limit after a streak of them"""
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def on_throttle(self) -> None:
+        """Record an overload signal; halve the limit"""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.DECREASE_COOLDOWN_SECONDS:
+                return
+            self._last_decrease = now
+
+            new_limit = max(self.min_limit, self.limit // 2)
+            if new_limit < self.limit:
+                logger.info(f"Throttled by provider, reducing concurrency {self.limit} -> {new_limit}")
+            self.limit = new_limit
+            self._successes = 0
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate limit reset duration into seconds
+
+    Accepts plain seconds ("12", "0.5") and OpenAI-style durations
+    ("20ms", "1s", "6m0s", "1h2m3s").
+
+    Args:
+        value: Header value
+
+    Returns:
+        Duration in seconds, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value)
+    if not parts:
+        return None
+
+    multipliers = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+    return sum(float(number) * multipliers[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers: Dict[str, str]) -> Optional[float]:
+    """
+    Extract the server-requested retry delay from response headers
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Delay in seconds, or None if the server did not specify one
+    """
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+    if 'retry-after-ms' in headers:
+        try:
+            return float(headers['retry-after-ms']) / 1000.0
+        except ValueError:
+            pass
+
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+
+    seconds = parse_duration(value)
+    if seconds is not None:
+        return seconds
+
+    # HTTP-date form
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedProvider(LLMProvider):
+    """
+    LLMProvider wrapper adding rate limiting, retries and adaptive concurrency
+
+    Drop-in replacement for the wrapped provider: AIFilterPass and
+    AIAnalysisPass call chat_completion exactly as before.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32
+    ):
+        """
+        Initialize rate limited provider
+
+        Args:
+            provider: LLMProvider to wrap
+            requests_per_minute: Request quota (None = learn from x-ratelimit headers)
+            tokens_per_minute: Token quota (None = learn from x-ratelimit headers)
+            max_retries: Retries after the first attempt for retryable failures
+            base_delay: Initial backoff delay in seconds
+            max_delay: Maximum backoff delay in seconds
+            initial_concurrency: Starting number of in-flight requests
+            min_concurrency: Lower bound for the adaptive concurrency limit
+            max_concurrency: Upper bound for the adaptive concurrency limit
+        """
+        self.provider = provider
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.request_bucket = TokenBucket(requests_per_minute / 60.0) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute / 60.0) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency
+        )
+        self._bucket_lock = threading.Lock()
+
+        logger.info(
+            f"Rate limiting {provider.get_provider_name()}: "
+            f"rpm={requests_per_minute or 'auto'}, tpm={tokens_per_minute or 'auto'}, "
+            f"concurrency={initial_concurrency} ({min_concurrency}-{max_concurrency}), "
+            f"max_retries={max_retries}"
+        )
+
+    @staticmethod
+    def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Estimate tokens charged for a request: prompt size plus reserved completion"""
+        prompt_chars = sum(len(m.get('content') or '') for m in messages)
+        return prompt_chars // CHARS_PER_TOKEN + max_tokens
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _update_from_headers(self, headers: Dict[str, str]) -> None:
+        """Adapt local buckets to the x-ratelimit-* headers reported by the provider"""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if not headers:
+            return
+
+        with self._bucket_lock:
+            for kind, attr in (('requests', 'request_bucket'), ('tokens', 'token_bucket')):
+                limit = headers.get(f'x-ratelimit-limit-{kind}')
+                remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+                reset = parse_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+
+                bucket = getattr(self, attr)
+                try:
+                    if limit is not None:
+                        per_second = float(limit) / 60.0
+                        if bucket is None:
+                            bucket = TokenBucket(per_second)
+                            setattr(self, attr, bucket)
+                            logger.info(f"Learned {kind} limit from provider: {limit}/min")
+                        elif abs(bucket.rate - per_second) > 1e-9:
+                            bucket.set_rate(per_second)
+                    if bucket is not None and remaining is not None:
+                        bucket.sync_remaining(float(remaining))
+                        if float(remaining) <= 0 and reset:
+                            bucket.block_for(reset)
+                except ValueError:
+                    continue
+
+    def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        timeout: int = 90,
+        **kwargs
+    ) -> str:
+        """Call the wrapped provider within quota, retrying throttled or transient failures"""
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
+        attempt = 0
+
+        while True:
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket:
+                self.token_bucket.acquire(estimated_tokens)
+
+            try:
+                with self.concurrency:
+                    content = self.provider.chat_completion(
+                        messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        timeout=timeout,
+                        **kwargs
+                    )
+            except LLMProviderError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+
+                self._update_from_headers(e.headers)
+                retry_after = parse_retry_after(e.headers)
+                if e.status_code == 429 or e.status_code == 503:
+                    self.concurrency.on_throttle()
+                    if retry_after:
+                        for bucket in (self.request_bucket, self.token_bucket):
+                            if bucket:
+                                bucket.block_for(retry_after)
+
+                delay = retry_after if retry_after is not None else self._backoff_delay(attempt)
+                attempt += 1
+                logger.warning(
+                    f"{self.provider.get_provider_name()} call failed ({e}); "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+
+            self.concurrency.on_success()
+            self._update_from_headers(get_last_response_headers())
+            return content
+
+    def get_provider_name(self) -> str:
+        return self.provider.get_provider_name()
+
+    def close(self) -> None:
+        self.provider.close()
+
+    @classmethod
+    def from_config(cls, provider: LLMProvider, rate_limit_config: Dict[str, Any]) -> 'RateLimitedProvider':
+        """
+        Wrap provider using an "llm.rate_limit" configuration section
+
+        Args:
+            provider: LLMProvider to wrap
+            rate_limit_config: Dict with any of the __init__ keyword arguments
+
+        Returns:
+            RateLimitedProvider instance
+        """
+        return cls(
+            provider,
+            requests_per_minute=rate_limit_config.get('requests_per_minute'),
+            tokens_per_minute=rate_limit_config.get('tokens_per_minute'),
+            max_retries=rate_limit_config.get('max_retries', 5),
+            base_delay=rate_limit_config.get('base_delay', 1.0),
+            max_delay=rate_limit_config.get('max_delay', 60.0),
+            initial_concurrency=rate_limit_config.get('initial_concurrency', 4),
+            min_concurrency=rate_limit_config.get('min_concurrency', 1),
+            max_concurrency=rate_limit_config.get('max_concurrency', 32)
+        )
@@ -0,0 +1,107 @@
+"""
+Raw Data Bill Index
+
+bill_exists_in_raw() and get_bill_by_number() look bills up by number in
+raw data files of several megabytes. Instead of parsing the whole file
+and scanning it on every call, the file-based backends keep an index per
+raw file mapping bill_number -> [bill_id, byte offset, byte length] of the
+bill's JSON object within the file, so a lookup reads and parses just that
+slice.
+
+The index is kept in the cache (data/cache/raw_index/ locally,
+cache/raw_index/ in Azure Blob). It is written when raw data is saved and
+rebuilt on first use when the raw file no longer matches the fingerprint
+recorded in it (size and mtime locally, the ETag for Azure Blob), e.g.
+for raw files written before the index existed or copied in by hand.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# Bump when the index layout changes; older indexes are rebuilt
+RAW_INDEX_VERSION = 1
+
+# JSON strings (skipped as a whole) and the brackets that open/close containers
+_JSON_STRUCTURE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+
+
+def bill_container_level(data: Any) -> Optional[int]:
+    """
+    Number of JSON containers enclosing each bill object in a raw data file
+
+    Supports the same layouts as load_raw_data callers: a list of bills,
+    {"bills": [...]}, a LegiScan {"summary": {"masterlist": ...}} and a dict
+    of bills.
+
+    Args:
+        data: Parsed raw data
+
+    Returns:
+        Nesting level of the bill objects, or None for unsupported data
+    """
+    if isinstance(data, list):
+        return 1
+    if isinstance(data, dict):
+        if isinstance(data.get('summary'), dict) and 'masterlist' in data['summary']:
+            return 3
+        if 'bills' in data:
+            return 2
+        return 1
+    return None
+
+
+def build_raw_index(payload: bytes, data: Any = None) -> Dict[str, List[int]]:
+    """
+    Index the bills in a serialized raw data file
+
+    Args:
+        payload: Raw file contents (UTF-8 JSON)
+        data: The parsed payload, if already available
+
+    Returns:
+        Dict of bill_number -> [bill_id, byte offset, byte length]; the first
+        bill with a given number wins, as with a linear scan
+
+    Raises:
+        json.JSONDecodeError: If the payload is not valid JSON
+    """
+    if data is None:
+        data = json.loads(payload)
+
+    level = bill_container_level(data)
+    if level is None:
+        return {}
+
+    bills = {}
+    depth = 0
+    start = None
+    for match in _JSON_STRUCTURE.finditer(payload):
+        token = match.group()
+        if token in (b'{', b'['):
+            if token == b'{' and depth == level:
+                start = match.start()
+            depth += 1
+        elif token in (b'}', b']'):
+            depth -= 1
+            if token == b'}' and depth == level and start is not None:
+                bill = json.loads(payload[start:match.end()])
+                bill_number = bill.get('bill_number')
+                if bill_number is not None and bill_number not in bills:
+                    bills[bill_number] = [bill.get('bill_id'), start, match.end() - start]
+                start = None
+
+    return bills
+
+
+def new_raw_index(fingerprint: str, bills: Dict[str, List[int]]) -> Dict[str, Any]:
+    """Index document as stored by the backends"""
+    return {'version': RAW_INDEX_VERSION, 'fingerprint': fingerprint, 'bills': bills}
+
+
+def index_bills(index: Any, fingerprint: str) -> Optional[Dict[str, List[int]]]:
+    """Bills of a stored index, or None if it is outdated or doesn't match the raw file"""
+    if (isinstance(index, dict) and index.get('version') == RAW_INDEX_VERSION
+            and index.get('fingerprint') == fingerprint):
+        return index.get('bills')
+    return None
@@ -0,0 +1,129 @@
+"""
+JSONL Result Streams
+
+Helpers shared by the storage providers for the streaming result format:
+one JSON record per line, optionally gzip- or zstd-compressed.
+
+Every append is written as its own compressed member/frame. Concatenated
+gzip members and zstd frames are valid streams, so records can be appended
+one at a time (and a crash loses at most the record being written), while
+readers decode the file as a single stream.
+"""
+
+import gzip
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+RESULT_FORMATS = ('json', 'jsonl')
+
+# File suffix for each compression setting
+JSONL_SUFFIXES = {
+    None: '.jsonl',
+    'gzip': '.jsonl.gz',
+    'zstd': '.jsonl.zst'
+}
+
+
+def _require_zstd():
+    """Import zstandard, with a helpful error if it is not installed"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd result compression requires the 'zstandard' package. "
+            "Install it with: pip install zstandard"
+        )
+    return zstandard
+
+
+def validate_result_format(result_format: str, compression: Optional[str]) -> None:
+    """
+    Validate result format settings from storage configuration
+
+    Args:
+        result_format: 'json' or 'jsonl'
+        compression: None, 'gzip' or 'zstd' (jsonl only)
+
+    Raises:
+        ValueError: If a setting is unknown
+        ImportError: If zstd is requested but zstandard is not installed
+    """
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Unknown result_format: {result_format} (expected one of {RESULT_FORMATS})")
+
+    if compression not in JSONL_SUFFIXES:
+        raise ValueError(f"Unknown compression: {compression} (expected gzip, zstd or null)")
+
+    if compression == 'zstd':
+        _require_zstd()
+
+
+def encode_record(record: Dict[str, Any], compression: Optional[str] = None) -> bytes:
+    """
+    Encode one record as a JSONL line, compressed as a standalone member/frame
+
+    Args:
+        record: JSON-serializable record
+        compression: None, 'gzip' or 'zstd'
+
+    Returns:
+        Bytes to append to the stream
+    """
+    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+    if compression == 'gzip':
+        return gzip.compress(line)
+    if compression == 'zstd':
+        return _require_zstd().ZstdCompressor().compress(line)
+
+    return line
+
+
+def iter_records(fileobj: BinaryIO, compression: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily decode records from a JSONL stream
+
+    A truncated final line (e.g., from a crash mid-write) is skipped.
+
+    Args:
+        fileobj: Binary file-like object positioned at the start of the stream
+        compression: None, 'gzip' or 'zstd'
+
+    Yields:
+        Decoded records in file order
+    """
+    if compression == 'gzip':
+        stream = gzip.GzipFile(fileobj=fileobj, mode='rb')
+    elif compression == 'zstd':
+        stream = _require_zstd().ZstdDecompressor().stream_reader(fileobj, read_across_frames=True)
+    else:
+        stream = fileobj
+
+    try:
+        for line in io.TextIOWrapper(stream, encoding='utf-8'):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+    except EOFError:
+        # Compressed stream cut off mid-member; everything before it was yielded
+        return
+
+
+def compression_for_name(name: str) -> Optional[str]:
+    """
+    Infer compression from a JSONL file/blob name
+
+    Args:
+        name: File or blob name
+
+    Returns:
+        None, 'gzip' or 'zstd'
+    """
+    for compression, suffix in JSONL_SUFFIXES.items():
+        if compression and name.endswith(suffix):
+            return compression
+    return None
@@ -5,13 +5,156 @@ Defines the interface for storage backends (local files, Azure Blob, PostgreSQL,
 Allows the application to run identically in local and Azure environments.
 """
 
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+
+from src.document_stream import DocumentFile
+
+# Bytes hashed or (de)compressed at a time for cached raw documents
+DOCUMENT_CHUNK_SIZE = 1024 * 1024
+
+# Concurrent lookups made by the batch cache methods of file and blob backends
+CACHE_LOOKUP_WORKERS = 16
+
+
+def lookup_concurrently(lookup: Callable[[Any], Optional[Any]], keys: Iterable[Any],
+                        workers: int = CACHE_LOOKUP_WORKERS) -> Dict[Any, Any]:
+    """
+    Run a single-key cache lookup for many keys in a thread pool
+
+    Args:
+        lookup: Function returning the cached value for a key, or None
+        keys: Keys to look up
+        workers: Maximum concurrent lookups
+
+    Returns:
+        Dict of key -> value for the keys that were found
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(keys))) as executor:
+        values = executor.map(lookup, keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+
+def compress_bill_text(text: str) -> Tuple[bytes, str]:
+    """
+    Compress extracted bill text for the remote text caches
+
+    Args:
+        text: Extracted bill text
+
+    Returns:
+        (gzip-compressed UTF-8 bytes, SHA-256 hex digest of the text)
+    """
+    data = text.encode('utf-8')
+    return gzip.compress(data), hashlib.sha256(data).hexdigest()
+
+
+def decompress_bill_text(payload: bytes, content_hash: Optional[str]) -> Optional[str]:
+    """
+    Decompress cached bill text, verifying it against its content hash
+
+    Args:
+        payload: Bytes from compress_bill_text()
+        content_hash: Stored SHA-256 hex digest (None skips the check)
+
+    Returns:
+        Bill text, or None if the entry is corrupt
+    """
+    try:
+        data = gzip.decompress(payload)
+    except (OSError, EOFError):
+        return None
+
+    if content_hash and hashlib.sha256(data).hexdigest() != content_hash:
+        return None
+
+    return data.decode('utf-8')
+
+
+def hash_document(path: str) -> str:
+    """
+    Content hash of a raw document file (its name in the raw document cache)
+
+    Args:
+        path: Document file path
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(DOCUMENT_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compress_document(path: str, output: BinaryIO) -> None:
+    """
+    Gzip a raw document file into a binary stream
+
+    Args:
+        path: Document file path
+        output: Writable binary stream
+    """
+    with open(path, 'rb') as source, gzip.GzipFile(fileobj=output, mode='wb', mtime=0) as compressed:
+        shutil.copyfileobj(source, compressed, DOCUMENT_CHUNK_SIZE)
+
+
+def decompress_document(stream: BinaryIO, content_hash: str) -> Optional[DocumentFile]:
+    """
+    Decompress a cached raw document into a temp file, verifying its content hash
+
+    Args:
+        stream: Readable binary stream written by compress_document()
+        content_hash: Expected SHA-256 hex digest of the document
+
+    Returns:
+        DocumentFile (the caller closes it), or None if the entry is corrupt
+    """
+    fd, path = tempfile.mkstemp(prefix='bill_doc_')
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, 'wb') as output, gzip.GzipFile(fileobj=stream, mode='rb') as compressed:
+            while True:
+                chunk = compressed.read(DOCUMENT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                output.write(chunk)
+                size += len(chunk)
+    except (OSError, EOFError):
+        os.unlink(path)
+        return None
+
+    if digest.hexdigest() != content_hash:
+        os.unlink(path)
+        return None
+
+    return DocumentFile(path, size)
 
 
 class StorageProvider(ABC):
     """Abstract base class for storage backends"""
 
+    # True when results are streamed with append_analysis_result as bills
+    # finish (result_format 'jsonl'); callers then need not hold them in memory
+    streams_results = False
+
     @abstractmethod
     def save_raw_data(self, filename: str, data: Dict[str, Any]) -> None:
         """
@@ -70,6 +213,22 @@ class StorageProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_filtered_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate filter results one bill at a time
+
+        Args:
+            run_id: Unique identifier for the filter run
+
+        Yields:
+            Bill records with bill_number, title, url, reason and a 'relevant' flag
+
+        Raises:
+            FileNotFoundError: If results don't exist
+        """
+        pass
+
     @abstractmethod
     def save_analysis_results(
         self,
@@ -116,6 +275,45 @@ class StorageProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    def append_analysis_result(self, run_id: str, result: Dict[str, Any]) -> None:
+        """
+        Append a single analysis result as soon as the bill finishes
+
+        Args:
+            run_id: Unique identifier for the analysis run
+            result: {"bill": {...}, "analysis": {...}} for one bill
+        """
+        pass
+
+    @abstractmethod
+    def iter_analysis_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate analysis results without loading the whole run into memory
+
+        Results streamed by an in-progress run are visible as they are appended.
+
+        Args:
+            run_id: Unique identifier for the analysis run
+
+        Yields:
+            {"bill": {...}, "analysis": {...}} records (relevance in analysis.is_relevant)
+
+        Raises:
+            FileNotFoundError: If results don't exist
+        """
+        pass
+
+    @abstractmethod
+    def clear_analysis_results(self, run_id: str) -> None:
+        """
+        Delete streamed results for a run before it is (re)started
+
+        Args:
+            run_id: Unique identifier for the analysis run
+        """
+        pass
+
     @abstractmethod
     def get_bill_from_cache(self, bill_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -129,6 +327,26 @@ class StorageProvider(ABC):
         """
         pass
 
+    def get_bills_from_cache(self, bill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get many cached LegiScan bills at once
+
+        The default looks bills up one at a time; backends override it with
+        a single query or concurrent reads.
+
+        Args:
+            bill_ids: LegiScan bill IDs
+
+        Returns:
+            Dict of bill_id -> cached bill data (bills not cached are left out)
+        """
+        bills = {}
+        for bill_id in bill_ids:
+            data = self.get_bill_from_cache(bill_id)
+            if data is not None:
+                bills[bill_id] = data
+        return bills
+
     @abstractmethod
     def save_bill_to_cache(self, bill_id: int, data: Dict[str, Any]) -> None:
         """
@@ -140,6 +358,75 @@ class StorageProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    def append_checkpoint(self, run_id: str, record: Dict[str, Any]) -> None:
+        """
+        Append one record to a run's checkpoint journal
+
+        Args:
+            run_id: Analysis run identifier
+            record: JSON-serializable record for one finished bill
+        """
+        pass
+
+    @abstractmethod
+    def load_checkpoints(self, run_id: str) -> List[Dict[str, Any]]:
+        """
+        Load all records from a run's checkpoint journal
+
+        Args:
+            run_id: Analysis run identifier
+
+        Returns:
+            Records in the order they were appended (empty if no journal)
+        """
+        pass
+
+    @abstractmethod
+    def clear_checkpoints(self, run_id: str) -> None:
+        """
+        Delete a run's checkpoint journal
+
+        Args:
+            run_id: Analysis run identifier
+        """
+        pass
+
+    @abstractmethod
+    def get_dirty_bills(self, filename: str) -> List[int]:
+        """
+        Get bills marked as changed since they were last filtered
+
+        Args:
+            filename: Raw data identifier (e.g., "ct_bills_2025")
+
+        Returns:
+            List of LegiScan bill IDs (empty if none are dirty)
+        """
+        pass
+
+    @abstractmethod
+    def mark_bills_dirty(self, filename: str, bill_ids: List[int]) -> None:
+        """
+        Mark bills as changed so they are re-filtered and re-analyzed
+
+        Args:
+            filename: Raw data identifier (e.g., "ct_bills_2025")
+            bill_ids: LegiScan bill IDs to add to the dirty set
+        """
+        pass
+
+    @abstractmethod
+    def clear_dirty_bills(self, filename: str, bill_ids: Optional[List[int]] = None) -> None:
+        """
+        Clear dirty marks after bills have been reprocessed
+
+        Args:
+            filename: Raw data identifier (e.g., "ct_bills_2025")
+            bill_ids: Bill IDs to clear (None = clear all)
+        """
+        pass
+
     @abstractmethod
     def list_raw_files(self) -> List[str]:
         """
@@ -160,6 +447,17 @@ class StorageProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    def list_analysis_results(self) -> List[str]:
+        """
+        List available analysis result run IDs (in either result format)
+
+        Returns:
+            List of run IDs accepted by iter_analysis_results
+            (e.g., ["analysis_ct_bills_2025", "analysis_alan_ct_bills_2025"])
+        """
+        pass
+
     @abstractmethod
     def bill_exists_in_raw(self, bill_number: str, filename: str) -> bool:
         """
@@ -189,26 +487,101 @@ class StorageProvider(ABC):
         pass
 
     @abstractmethod
-    def get_bill_text_from_cache(self, doc_id: str) -> Optional[str]:
+    def get_bill_text_from_cache(self, doc_id: str, extractor_version: Optional[str] = None) -> Optional[str]:
         """
         Get cached LegiScan bill text data
 
         Args:
             doc_id: LegiScan document ID
+            extractor_version: If given, text recorded with a different
+                extractor version is treated as a miss (entries without a
+                recorded version count as LEGACY_EXTRACTOR_VERSION)
 
         Returns:
             Cached bill text if exists, None otherwise
         """
         pass
 
+    def get_bill_texts_from_cache(
+        self,
+        doc_ids: Iterable[str],
+        extractor_versions: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """
+        Get many cached bill texts at once
+
+        The default looks texts up one at a time; backends override it with
+        a single query or concurrent reads.
+
+        Args:
+            doc_ids: LegiScan document IDs
+            extractor_versions: Expected extractor version per doc_id (as in
+                get_bill_text_from_cache); documents not listed match any version
+
+        Returns:
+            Dict of doc_id -> cached text (documents not cached are left out)
+        """
+        extractor_versions = extractor_versions or {}
+        texts = {}
+        for doc_id in doc_ids:
+            text = self.get_bill_text_from_cache(doc_id, extractor_versions.get(doc_id))
+            if text is not None:
+                texts[doc_id] = text
+        return texts
+
     @abstractmethod
-    def save_bill_text_to_cache(self, doc_id: str, text: str) -> None:
+    def save_bill_text_to_cache(self, doc_id: str, text: str, extractor_version: Optional[str] = None) -> None:
         """
         Save LegiScan bill text to cache
 
         Args:
             doc_id: LegiScan document ID
             text: Full bill text content
+            extractor_version: Version of the extractor that produced the text
+                (default: LEGACY_EXTRACTOR_VERSION)
+        """
+        pass
+
+    @abstractmethod
+    def get_document_from_cache(self, doc_id: str) -> Optional[Tuple[DocumentFile, str]]:
+        """
+        Get a cached raw LegiScan bill document (PDF, HTML, DOCX, ...)
+
+        Documents are stored gzip-compressed once per SHA-256 content hash,
+        with a reference from each doc_id, so text can be re-extracted
+        without calling the LegiScan API.
+
+        Args:
+            doc_id: LegiScan document ID
+
+        Returns:
+            (DocumentFile holding the document in a temp file - the caller
+            closes it, MIME type) if cached, None otherwise
+        """
+        pass
+
+    @abstractmethod
+    def save_document_to_cache(self, doc_id: str, path: str, mime_type: str) -> str:
+        """
+        Save a raw LegiScan bill document to cache
+
+        Args:
+            doc_id: LegiScan document ID
+            path: File holding the decoded document
+            mime_type: MIME type of the document
+
+        Returns:
+            SHA-256 content hash the document is stored under
+        """
+        pass
+
+    @abstractmethod
+    def list_cached_documents(self) -> List[str]:
+        """
+        List document IDs with a cached raw document
+
+        Returns:
+            LegiScan document IDs
         """
         pass
 
@@ -236,21 +609,28 @@ class StorageProviderFactory:
         if backend == 'local':
             from src.local_file_storage import LocalFileStorage
             local_config = storage_config.get('local', {})
-            return LocalFileStorage(local_config)
+            provider = LocalFileStorage(local_config)
 
         elif backend == 'azure_blob':
             from src.azure_blob_storage import AzureBlobStorage
             azure_config = storage_config.get('azure_blob', {})
-            return AzureBlobStorage(azure_config)
+            provider = AzureBlobStorage(azure_config)
 
         elif backend == 'database':
             from src.database_storage import DatabaseStorage
             db_config = storage_config.get('database', {})
-            return DatabaseStorage(db_config)
+            provider = DatabaseStorage(db_config)
 
         else:
             raise ValueError(f"Unknown storage backend: {backend}")
 
+        # In-process LRU in front of the bill and bill text caches (see src/memory_cache.py)
+        from src.memory_cache import DEFAULT_MEMORY_CACHE_MB, MemoryCachedStorage
+        memory_cache_mb = storage_config.get('memory_cache_mb', DEFAULT_MEMORY_CACHE_MB)
+        if memory_cache_mb:
+            return MemoryCachedStorage(provider, int(memory_cache_mb * 1024 * 1024))
+        return provider
+
     @staticmethod
     def create_from_env(config: Optional[Dict[str, Any]] = None) -> StorageProvider:
         """
@@ -0,0 +1,692 @@
+"""
+Bill Text Extraction
+
+Extracts readable text from the base64-encoded documents returned by
+LegiScan's getBillText operation (PDF, HTML, DOCX and plain text).
+
+Each document format has a registry of extractors in order of preference.
+The first one whose optional dependency is installed is used, and the
+others are tried in turn if it fails. The defaults were picked with
+scripts/benchmark_extractors.py:
+- PDF: pypdfium2 (~4x PyPDF2), then PyPDF2, then pdfminer.six with layout
+  analysis off (slower than PyPDF2, but tolerant of some malformed files)
+- HTML: lxml (~9x BeautifulSoup), then BeautifulSoup
+Engines can be pinned per format with analysis_pass.extractors in config.json.
+
+TextExtractionService optionally runs extraction in a process pool so
+CPU-bound parsing doesn't hold the GIL while other analysis workers are
+waiting on LegiScan or the LLM. Large PDFs are split into page ranges that
+are extracted by several workers at once.
+
+Documents can be given as bytes or as a file path (see
+src/document_stream.py); files are memory-mapped rather than read into
+memory where the engine accepts a stream.
+"""
+
+import base64
+import importlib.util
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Pages per worker task when a PDF is split across the pool
+DEFAULT_PDF_PAGES_PER_CHUNK = 50
+
+# Version recorded for text from the original PyPDF2 / BeautifulSoup /
+# python-docx extractors (and for cache entries written before versions were)
+LEGACY_EXTRACTOR_VERSION = '1'
+
+# A document given as raw bytes or as a file path
+DocumentSource = Union[bytes, str]
+
+
+@contextmanager
+def open_document(source: DocumentSource) -> Iterator[BinaryIO]:
+    """
+    Open a document as a read-only binary stream
+
+    Files are memory-mapped, so engines that read from a stream page the
+    document in from the OS cache instead of holding their own copy.
+
+    Args:
+        source: Document bytes or file path
+
+    Yields:
+        Seekable binary stream
+    """
+    if isinstance(source, bytes):
+        yield io.BytesIO(source)
+        return
+
+    with open(source, 'rb') as f:
+        # Empty files can't be mapped
+        if not os.fstat(f.fileno()).st_size:
+            yield io.BytesIO(b'')
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def read_document(source: DocumentSource) -> bytes:
+    """Document bytes, read from the file if given a path"""
+    if isinstance(source, bytes):
+        return source
+
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+class DocumentExtractor(ABC):
+    """Base class for a text extractor for one document format"""
+
+    # Engine name used in config (analysis_pass.extractors)
+    name = ''
+    # Recorded with cached text; change it when the engine's output changes
+    version = LEGACY_EXTRACTOR_VERSION
+    # Optional module the engine needs (None if always available)
+    requires: Optional[str] = None
+    # pip package providing it, if named differently
+    package: Optional[str] = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the engine's dependency is installed"""
+        return cls.requires is None or importlib.util.find_spec(cls.requires) is not None
+
+    @abstractmethod
+    def extract(self, source: DocumentSource) -> Optional[str]:
+        """
+        Extract text from a decoded document
+
+        Args:
+            source: Document bytes or file path
+
+        Returns:
+            Extracted text or None if nothing could be extracted
+        """
+        pass
+
+
+class PdfExtractor(DocumentExtractor):
+    """PDF extractor that can also work on page ranges (for parallel extraction)"""
+
+    @abstractmethod
+    def page_count(self, source: DocumentSource) -> int:
+        """Number of pages in a PDF"""
+        pass
+
+    @abstractmethod
+    def extract_pages(self, source: DocumentSource, start: int, end: int) -> List[str]:
+        """
+        Extract pages [start, end) as '--- Page N ---' sections
+
+        Args:
+            source: PDF bytes or file path
+            start: First page (0-based)
+            end: Page after the last one
+
+        Returns:
+            One section per page that had text
+        """
+        pass
+
+    def extract(self, source: DocumentSource) -> Optional[str]:
+        text_parts = self.extract_pages(source, 0, self.page_count(source))
+        return "\n\n".join(text_parts) if text_parts else None
+
+
+def _page_section(page_num: int, page_text: str) -> str:
+    """Format one page of PDF text (page_num is 0-based)"""
+    return f"--- Page {page_num + 1} ---\n{page_text}"
+
+
+class PyPDF2Extractor(PdfExtractor):
+    """PyPDF2: pure Python, always installed, slowest"""
+
+    name = 'pypdf2'
+
+    def page_count(self, source: DocumentSource) -> int:
+        from PyPDF2 import PdfReader
+
+        with open_document(source) as stream:
+            return len(PdfReader(stream).pages)
+
+    def extract_pages(self, source: DocumentSource, start: int, end: int) -> List[str]:
+        from PyPDF2 import PdfReader
+
+        text_parts = []
+        with open_document(source) as stream:
+            pdf_reader = PdfReader(stream)
+            for page_num in range(start, min(end, len(pdf_reader.pages))):
+                try:
+                    page_text = pdf_reader.pages[page_num].extract_text()
+                    if page_text:
+                        text_parts.append(_page_section(page_num, page_text))
+                except Exception as e:
+                    logger.warning(f"Could not extract text from page {page_num + 1}: {e}")
+                    continue
+        return text_parts
+
+
+# PDFium is not thread-safe; serialize calls made from analysis worker threads.
+# Held per call (open, one page, close) so threads extracting different PDFs
+# interleave page by page instead of waiting for whole documents
+_PDFIUM_LOCK = threading.Lock()
+
+
+class PdfiumExtractor(PdfExtractor):
+    """pypdfium2: bindings to Chrome's PDFium, by far the fastest"""
+
+    name = 'pypdfium2'
+    version = 'pypdfium2-1'
+    requires = 'pypdfium2'
+
+    def page_count(self, source: DocumentSource) -> int:
+        import pypdfium2
+
+        with _PDFIUM_LOCK:
+            pdf = pypdfium2.PdfDocument(source)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    def extract_pages(self, source: DocumentSource, start: int, end: int) -> List[str]:
+        import pypdfium2
+
+        text_parts = []
+        with _PDFIUM_LOCK:
+            pdf = pypdfium2.PdfDocument(source)
+            total_pages = len(pdf)
+        try:
+            for page_num in range(start, min(end, total_pages)):
+                try:
+                    with _PDFIUM_LOCK:
+                        page = pdf[page_num]
+                        try:
+                            textpage = page.get_textpage()
+                            page_text = textpage.get_text_bounded()
+                            textpage.close()
+                        finally:
+                            page.close()
+                except Exception as e:
+                    logger.warning(f"Could not extract text from page {page_num + 1}: {e}")
+                    continue
+
+                page_text = page_text.replace('\r\n', '\n')
+                if page_text.strip():
+                    text_parts.append(_page_section(page_num, page_text))
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
+        return text_parts
+
+
+class PdfMinerExtractor(PdfExtractor):
+    """pdfminer.six with layout analysis disabled"""
+
+    name = 'pdfminer'
+    version = 'pdfminer-1'
+    requires = 'pdfminer'
+    package = 'pdfminer.six'
+
+    def page_count(self, source: DocumentSource) -> int:
+        from pdfminer.pdfpage import PDFPage
+
+        with open_document(source) as fp:
+            return sum(1 for _ in PDFPage.get_pages(fp))
+
+    def extract_pages(self, source: DocumentSource, start: int, end: int) -> List[str]:
+        from pdfminer.high_level import extract_text_to_fp
+
+        output = io.StringIO()
+        with open_document(source) as fp:
+            # laparams=None skips layout analysis; pages are separated by form feeds
+            extract_text_to_fp(fp, output, page_numbers=range(start, end), laparams=None)
+
+        pages = output.getvalue().split('\x0c')
+        return [
+            _page_section(page_num, page_text)
+            for page_num, page_text in zip(range(start, end), pages)
+            if page_text.strip()
+        ]
+
+
+class LxmlHtmlExtractor(DocumentExtractor):
+    """lxml.html: text nodes straight from the parsed tree"""
+
+    name = 'lxml'
+    version = 'lxml-1'
+    requires = 'lxml'
+
+    def extract(self, source: DocumentSource) -> Optional[str]:
+        from lxml import etree, html
+
+        doc = html.fromstring(read_document(source))
+
+        # Remove script and style elements (and comments)
+        etree.strip_elements(doc, 'script', 'style', etree.Comment, with_tail=False)
+
+        lines = [line.strip() for text in doc.itertext() for line in text.splitlines() if line.strip()]
+        return '\n'.join(lines)
+
+
+class SoupHtmlExtractor(DocumentExtractor):
+    """BeautifulSoup over lxml: builds a full soup tree"""
+
+    name = 'bs4'
+
+    def extract(self, source: DocumentSource) -> Optional[str]:
+        from bs4 import BeautifulSoup
+
+        html_string = read_document(source).decode('utf-8', errors='ignore')
+
+        # Parse HTML and extract text
+        soup = BeautifulSoup(html_string, 'lxml')
+
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        # Get text
+        text = soup.get_text(separator='\n', strip=True)
+
+        # Clean up extra whitespace
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        return '\n'.join(lines)
+
+
+class DocxExtractor(DocumentExtractor):
+    """python-docx: paragraph text"""
+
+    name = 'python-docx'
+
+    def extract(self, source: DocumentSource) -> Optional[str]:
+        from docx import Document
+
+        # zipfile wants a seekable() stream, which mmap lacks; python-docx opens paths itself
+        doc = Document(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+        # Extract text from all paragraphs
+        paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
+        return '\n\n'.join(paragraphs)
+
+
+class PlainTextExtractor(DocumentExtractor):
+    """UTF-8 decode"""
+
+    name = 'plain'
+
+    def extract(self, source: DocumentSource) -> Optional[str]:
+        return read_document(source).decode('utf-8', errors='ignore')
+
+
+# Extractor classes per document format, in order of preference
+EXTRACTORS: Dict[str, Dict[str, type]] = {
+    'pdf': {
+        PdfiumExtractor.name: PdfiumExtractor,
+        PyPDF2Extractor.name: PyPDF2Extractor,
+        PdfMinerExtractor.name: PdfMinerExtractor
+    },
+    'html': {
+        LxmlHtmlExtractor.name: LxmlHtmlExtractor,
+        SoupHtmlExtractor.name: SoupHtmlExtractor
+    },
+    'docx': {
+        DocxExtractor.name: DocxExtractor
+    },
+    'text': {
+        PlainTextExtractor.name: PlainTextExtractor
+    }
+}
+
+
+def register_extractor(doc_format: str, extractor_class: type, preferred: bool = False) -> None:
+    """
+    Register a custom extractor for a document format.
+
+    Args:
+        doc_format: 'pdf', 'html', 'docx' or 'text'
+        extractor_class: Extractor class (must extend DocumentExtractor, PdfExtractor for 'pdf')
+        preferred: Put it ahead of the built-in extractors
+    """
+    base_class = PdfExtractor if doc_format == 'pdf' else DocumentExtractor
+    if not issubclass(extractor_class, base_class):
+        raise ValueError(f"Extractor class must extend {base_class.__name__}")
+
+    extractors = EXTRACTORS.setdefault(doc_format, {})
+    extractors[extractor_class.name] = extractor_class
+    if preferred:
+        EXTRACTORS[doc_format] = {extractor_class.name: extractor_class, **extractors}
+
+    logger.info(f"Registered {doc_format} extractor: {extractor_class.name}")
+
+
+def document_format(mime_type: str) -> str:
+    """
+    Map a MIME type to a document format
+
+    Args:
+        mime_type: MIME type from LegiScan
+
+    Returns:
+        'pdf', 'html', 'docx' or 'text' (unknown types are treated as plain text)
+    """
+    mime_type = mime_type.lower() if mime_type else ''
+
+    if 'pdf' in mime_type:
+        return 'pdf'
+    if 'html' in mime_type:
+        return 'html'
+    if 'wordprocessingml' in mime_type or 'msword' in mime_type:
+        return 'docx'
+    return 'text'
+
+
+def select_extractors(engines: Optional[Dict[str, str]] = None) -> Dict[str, List[DocumentExtractor]]:
+    """
+    Build the extractor chain for each document format
+
+    Args:
+        engines: Optional {format: engine name} to put first (e.g. {"pdf": "pypdf2"})
+
+    Returns:
+        {format: [primary extractor, fallbacks...]} with unavailable engines left out
+
+    Raises:
+        ValueError: If an engine name is unknown
+    """
+    engines = engines or {}
+    chains = {}
+
+    for doc_format, extractors in EXTRACTORS.items():
+        names = list(extractors)
+
+        pinned = engines.get(doc_format)
+        if pinned:
+            if pinned not in extractors:
+                raise ValueError(f"Unknown {doc_format} extractor: {pinned} (expected one of {names})")
+            if extractors[pinned].is_available():
+                names.remove(pinned)
+                names.insert(0, pinned)
+            else:
+                logger.warning(f"{doc_format} extractor '{pinned}' is not installed, using the default")
+
+        chains[doc_format] = [extractors[name]() for name in names if extractors[name].is_available()]
+
+    return chains
+
+
+def extract_text_with(chain: List[DocumentExtractor], source: DocumentSource, doc_format: str) -> Optional[str]:
+    """
+    Extract text with the first extractor in a chain that succeeds
+
+    Args:
+        chain: Extractors from select_extractors()
+        source: Decoded document bytes or file path
+        doc_format: Document format (for logging)
+
+    Returns:
+        Extracted text or None if every extractor failed
+    """
+    for extractor in chain:
+        try:
+            text = extractor.extract(source)
+        except Exception as e:
+            logger.error(f"Error extracting text from {doc_format.upper()} with {extractor.name}: {e}")
+            continue
+
+        if text:
+            logger.info(f"Successfully extracted {len(text)} characters from {doc_format.upper()} ({extractor.name})")
+            return text
+
+        logger.warning(f"No text could be extracted from {doc_format.upper()} with {extractor.name}")
+
+    return None
+
+
+def extract_document(
+    source: DocumentSource,
+    mime_type: str,
+    engines: Optional[Dict[str, str]] = None,
+    chains: Optional[Dict[str, List[DocumentExtractor]]] = None
+) -> Optional[str]:
+    """
+    Extract text from a decoded document based on MIME type.
+
+    Args:
+        source: Document bytes or file path
+        mime_type: MIME type of the document
+        engines: Optional {format: engine name} overrides
+        chains: Extractor chains from select_extractors() (default: selected from engines)
+
+    Returns:
+        Extracted text or None if extraction fails
+    """
+    doc_format = document_format(mime_type)
+    if doc_format == 'text' and 'plain' not in (mime_type or '').lower():
+        logger.warning(f"Unknown MIME type '{mime_type}', attempting plain text extraction")
+
+    chains = chains or select_extractors(engines)
+    return extract_text_with(chains[doc_format], source, doc_format)
+
+
+def extract_text_by_format(
+    base64_content: str,
+    mime_type: str,
+    engines: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """
+    Extract text from base64-encoded document based on MIME type.
+
+    Args:
+        base64_content: Base64-encoded document content
+        mime_type: MIME type of the document
+        engines: Optional {format: engine name} overrides
+
+    Returns:
+        Extracted text or None if extraction fails
+    """
+    if not base64_content:
+        return None
+
+    try:
+        data = base64.b64decode(base64_content)
+    except Exception as e:
+        logger.error(f"Error decoding base64 document: {e}")
+        return None
+
+    return extract_document(data, mime_type, engines)
+
+
+def _extract_pdf_range_worker(
+    engines: Dict[str, str],
+    pdf_path: str,
+    start: int,
+    end: int
+) -> Tuple[List[str], float]:
+    """Process pool task: extract a page range from a PDF file, with CPU seconds used"""
+    cpu_start = time.process_time()
+    text_parts = select_extractors(engines)['pdf'][0].extract_pages(pdf_path, start, end)
+    return text_parts, time.process_time() - cpu_start
+
+
+def _extract_document_worker(
+    engines: Dict[str, str],
+    source: DocumentSource,
+    mime_type: str
+) -> Tuple[Optional[str], float]:
+    """Process pool task: extract a whole document, with CPU seconds used"""
+    cpu_start = time.process_time()
+    text = extract_document(source, mime_type, engines)
+    return text, time.process_time() - cpu_start
+
+
+class TextExtractionService:
+    """
+    Document text extraction, in-thread or fanned out to a process pool.
+
+    Safe to share between analysis worker threads.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        pdf_pages_per_chunk: int = DEFAULT_PDF_PAGES_PER_CHUNK,
+        engines: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize extraction service
+
+        Args:
+            workers: Extraction processes (0 extracts in the calling thread)
+            pdf_pages_per_chunk: Pages per task when splitting a PDF across workers
+            engines: Optional {format: engine name} overrides (see EXTRACTORS)
+
+        Raises:
+            ValueError: If an engine name is unknown
+        """
+        self.workers = max(0, int(workers))
+        self.pdf_pages_per_chunk = max(1, int(pdf_pages_per_chunk))
+        self.chains = select_extractors(engines)
+        # Resolved primary engine per format, so pool workers use the same ones
+        self.engines = {doc_format: chain[0].name for doc_format, chain in self.chains.items() if chain}
+        self._executor = None
+
+        logger.info(f"Text extractors: {self.engines}")
+
+        if self.workers:
+            # spawn: forking a process that already runs worker threads can deadlock
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"Text extraction process pool started with {self.workers} workers")
+
+    def version_for(self, mime_type: str) -> str:
+        """
+        Version of the extractor that handles a MIME type (recorded with cached text)
+
+        Args:
+            mime_type: MIME type of the document
+
+        Returns:
+            Extractor version string
+        """
+        chain = self.chains.get(document_format(mime_type))
+        return chain[0].version if chain else LEGACY_EXTRACTOR_VERSION
+
+    def extract(self, source: DocumentSource, mime_type: str) -> Tuple[Optional[str], float]:
+        """
+        Extract text from a decoded document
+
+        Pass a file path for large documents: pool workers then open the
+        file themselves instead of receiving a pickled copy.
+
+        Args:
+            source: Document bytes or file path
+            mime_type: MIME type of the document
+
+        Returns:
+            (extracted text or None, CPU seconds spent extracting)
+        """
+        if not source:
+            return None, 0.0
+
+        if self._executor:
+            try:
+                if document_format(mime_type) == 'pdf' and self.workers > 1:
+                    result = self._extract_pdf_parallel(source)
+                    if result is not None:
+                        return result
+
+                return self._executor.submit(
+                    _extract_document_worker, self.engines, source, mime_type
+                ).result()
+            except BrokenProcessPool as e:
+                logger.error(f"Text extraction process pool failed ({e}), extracting in-thread from now on")
+                self._executor = None
+
+        cpu_start = time.thread_time()
+        text = extract_document(source, mime_type, chains=self.chains)
+        return text, time.thread_time() - cpu_start
+
+    def _extract_pdf_parallel(self, source: DocumentSource) -> Optional[Tuple[Optional[str], float]]:
+        """
+        Split a large PDF into page ranges extracted by several workers
+
+        Returns:
+            (text, CPU seconds) or None if the PDF is small or the primary
+            engine fails on it (the caller then extracts it as a single task,
+            which also tries the fallback engines)
+        """
+        extractor = self.chains['pdf'][0]
+
+        try:
+            page_count = extractor.page_count(source)
+        except Exception:
+            return None
+
+        if page_count <= self.pdf_pages_per_chunk:
+            return None
+
+        # Workers read the PDF from a file instead of receiving a pickled copy each
+        temp_path = None
+        if isinstance(source, bytes):
+            fd, temp_path = tempfile.mkstemp(suffix='.pdf')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(source)
+        pdf_path = temp_path or source
+
+        try:
+            futures = [
+                self._executor.submit(
+                    _extract_pdf_range_worker, self.engines, pdf_path,
+                    start, min(start + self.pdf_pages_per_chunk, page_count)
+                )
+                for start in range(0, page_count, self.pdf_pages_per_chunk)
+            ]
+
+            text_parts = []
+            cpu_seconds = 0.0
+            for future in futures:
+                parts, seconds = future.result()
+                text_parts.extend(parts)
+                cpu_seconds += seconds
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            logger.warning(f"Parallel PDF extraction with {extractor.name} failed: {e}")
+            return None
+        finally:
+            if temp_path:
+                os.unlink(temp_path)
+
+        if not text_parts:
+            return None
+
+        full_text = "\n\n".join(text_parts)
+        logger.info(
+            f"Successfully extracted {len(full_text)} characters from {page_count} pages "
+            f"({extractor.name}, {len(futures)} parallel chunks)"
+        )
+        return full_text, cpu_seconds
+
+    def close(self) -> None:
+        """Shut down the process pool"""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,278 @@
+"""
+Relevance-Aware Bill Text Reduction
+
+Extracted bill text can run to hundreds of pages, most of it unrelated to
+palliative care (appropriation tables, unrelated code sections in omnibus
+bills). Sending it whole costs the most tokens, takes the longest, and for
+the largest bills exceeds the model's context window.
+
+TextReducer splits a bill's text into sections (at "Sec. 1." / "SECTION 2"
+/ "§ 3" headings, otherwise at paragraphs) and, when the text is over its
+token budget, keeps only the sections that mention palliative-care terms
+or words from the filter pass reason, highest scoring first, plus the
+opening section (title and purpose). Dropped sections are replaced by
+an "[... omitted ...]" marker and listed in the reduction metadata that
+AIAnalysisPass adds to the result as text_reduction.
+
+Text within the budget is passed through unchanged.
+
+chunk_text() splits a text into consecutive chunks of whole sections
+instead, for the map-reduce analysis mode (see AIAnalysisPass).
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.token_budget import CHARS_PER_TOKEN, TokenEstimator
+
+logger = logging.getLogger(__name__)
+
+# Matched case-insensitively on word boundaries; analysis_pass.relevance_keywords replaces them
+DEFAULT_RELEVANCE_KEYWORDS = [
+    'palliative', 'hospice', 'end-of-life', 'end of life', 'terminal illness', 'terminally ill',
+    'serious illness', 'seriously ill', 'life-limiting', 'comfort care', 'advance directive',
+    'advance directives', 'advance care planning', 'POLST', 'MOLST', 'life-sustaining',
+    'do not resuscitate', 'DNR', 'medical aid in dying', 'aid in dying', 'death with dignity',
+    'pain management', 'symptom management', 'bereavement', 'caregiver', 'caregivers',
+    'respite', 'interdisciplinary', 'long-term care', 'nursing home', 'home health',
+    'health care proxy', 'chronic illness', 'dementia', 'pediatric'
+]
+
+# Sections are split further beyond this many tokens, so one long
+# section can't take the whole budget
+DEFAULT_MAX_SECTION_TOKENS = 1500
+
+# Dropped sections listed individually in the metadata
+MAX_LISTED_SECTIONS = 100
+
+# Words of the filter reason too common to identify relevant sections
+_STOPWORDS = frozenset("""
+    about above after again against also among because been before being below between both bill bills
+    care concerning could does doing during each from further have having here into itself more most
+    other over provide provides relevant relevance same should some such than that their them then
+    there these they this those through under until very what when where which while with would your
+    potential potentially policy indicators indicator related relates relating include includes including
+""".split())
+
+_HEADING = re.compile(
+    r'^[ \t]*(?:\d+[ \t]+)?(?:sec(?:tion)?\.?|article|part|§+)[ \t]*[0-9ivxlc]+[a-z0-9\-]*[.:]',
+    re.IGNORECASE | re.MULTILINE
+)
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+_WORD = re.compile(r"[a-z][a-z\-']{3,}")
+
+
+def focus_terms(text: Optional[str]) -> List[str]:
+    """Distinctive words of a filter reason or title, used to score sections"""
+    if not text:
+        return []
+    return sorted({word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS})
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> Optional['re.Pattern']:
+    keywords = [keyword for keyword in keywords if keyword]
+    if not keywords:
+        return None
+    alternatives = sorted((re.escape(keyword) for keyword in keywords), key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b', re.IGNORECASE)
+
+
+def split_sections(text: str) -> List[str]:
+    """
+    Split bill text into sections
+
+    Splits before each section heading when the text has at least two,
+    otherwise at blank lines. Leading text before the first heading is a
+    section of its own.
+    """
+    starts = [match.start() for match in _HEADING.finditer(text)]
+    if len(starts) < 2:
+        starts = [0] + [match.end() for match in _PARAGRAPH_BREAK.finditer(text)]
+    elif starts[0] != 0:
+        starts = [0] + starts
+
+    bounds = starts + [len(text)]
+    sections = [text[start:end].strip('\n') for start, end in zip(bounds, bounds[1:])]
+    return [section for section in sections if section.strip()]
+
+
+def _split_long_lines(section: str, max_tokens: int) -> Iterator[str]:
+    """Lines of a section, with lines over max_tokens cut at spaces"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    for line in section.split('\n'):
+        while len(line) > max_chars:
+            cut = line.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            yield line[:cut]
+            line = line[cut:].lstrip(' ')
+        yield line
+
+
+def bounded_sections(text: str, max_section_tokens: int, estimator: TokenEstimator) -> List[str]:
+    """split_sections, with sections over max_section_tokens split at line breaks"""
+    sections = []
+    for section in split_sections(text):
+        if estimator.count(section) <= max_section_tokens:
+            sections.append(section)
+            continue
+
+        piece: List[str] = []
+        piece_tokens = 0
+        for line in _split_long_lines(section, max_section_tokens):
+            line_tokens = estimator.count(line) + 1
+            if piece and piece_tokens + line_tokens > max_section_tokens:
+                sections.append('\n'.join(piece))
+                piece, piece_tokens = [], 0
+            piece.append(line)
+            piece_tokens += line_tokens
+        if piece:
+            sections.append('\n'.join(piece))
+    return sections
+
+
+def chunk_text(text: str, chunk_tokens: int, estimator: Optional[TokenEstimator] = None) -> List[str]:
+    """
+    Split text into consecutive chunks of whole sections
+
+    Args:
+        text: Bill text
+        chunk_tokens: Largest chunk, in tokens (longer sections are split at line breaks)
+        estimator: Token counter (default: TokenEstimator())
+
+    Returns:
+        Chunks in text order
+    """
+    estimator = estimator or TokenEstimator()
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+    for section in bounded_sections(text, chunk_tokens, estimator):
+        section_tokens = estimator.count(section) + 1
+        if current and current_tokens + section_tokens > chunk_tokens:
+            chunks.append('\n\n'.join(current))
+            current, current_tokens = [], 0
+        current.append(section)
+        current_tokens += section_tokens
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+
+class TextReducer:
+    """Keeps the sections of a long bill text most relevant to palliative care, within a token budget"""
+
+    def __init__(
+        self,
+        token_budget: int,
+        keywords: Optional[List[str]] = None,
+        estimator: Optional[TokenEstimator] = None,
+        max_section_tokens: int = DEFAULT_MAX_SECTION_TOKENS
+    ):
+        """
+        Args:
+            token_budget: Largest text to pass through, in tokens
+            keywords: Relevance keywords (default: DEFAULT_RELEVANCE_KEYWORDS)
+            estimator: Token counter (default: TokenEstimator())
+            max_section_tokens: Sections longer than this are split at line breaks
+        """
+        self.token_budget = token_budget
+        self.keywords = DEFAULT_RELEVANCE_KEYWORDS if keywords is None else keywords
+        self.estimator = estimator or TokenEstimator()
+        self.max_section_tokens = max_section_tokens
+        self._keyword_pattern = _keyword_pattern(self.keywords)
+
+    def _score(self, section: str, terms: List[str]) -> Tuple[float, List[str]]:
+        """Relevance score of a section and the keywords it mentions"""
+        matched = []
+        score = 0.0
+        if self._keyword_pattern is not None:
+            hits = [hit.lower() for hit in self._keyword_pattern.findall(section)]
+            matched = sorted(set(hits))
+            # Distinct keywords count most; repeats add a little
+            score += 2.0 * len(matched) + 0.25 * min(len(hits), 20)
+
+        if terms:
+            lowered = section.lower()
+            score += 0.5 * sum(1 for term in terms if term in lowered)
+
+        return score, matched
+
+    def reduce(self, text: str, focus: Optional[str] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Reduce text to its most relevant sections if it exceeds the token budget
+
+        Args:
+            text: Extracted bill text
+            focus: Filter pass reason and/or bill title; sections sharing its
+                words score higher
+
+        Returns:
+            (text to send, reduction metadata or None if the text was within budget)
+        """
+        original_tokens = self.estimator.count(text)
+        if original_tokens <= self.token_budget:
+            return text, None
+
+        sections = bounded_sections(text, self.max_section_tokens, self.estimator)
+        section_tokens = [self.estimator.count(section) for section in sections]
+        terms = focus_terms(focus)
+        scored = [self._score(section, terms) for section in sections]
+
+        # Opening section (title, purpose) first, then by score
+        ranking = [0] + sorted(
+            (index for index in range(1, len(sections)) if scored[index][0] > 0),
+            key=lambda index: (-scored[index][0], index)
+        )
+        if len(ranking) == 1:
+            # Nothing matches: fall back to the leading sections
+            ranking = list(range(len(sections)))
+
+        kept = set()
+        used = 0
+        for index in ranking:
+            if used + section_tokens[index] <= self.token_budget:
+                kept.add(index)
+                used += section_tokens[index]
+
+        parts = []
+        omitted = 0
+        for index, section in enumerate(sections):
+            if index in kept:
+                if omitted:
+                    parts.append(f"[... {omitted} section(s) omitted as not relevant to palliative care ...]")
+                    omitted = 0
+                parts.append(section)
+            else:
+                omitted += 1
+        if omitted:
+            parts.append(f"[... {omitted} section(s) omitted as not relevant to palliative care ...]")
+        reduced = '\n\n'.join(parts)
+
+        dropped = [index for index in range(len(sections)) if index not in kept]
+        metadata = {
+            'original_tokens': original_tokens,
+            'reduced_tokens': self.estimator.count(reduced),
+            'token_budget': self.token_budget,
+            'sections': len(sections),
+            'kept_sections': len(kept),
+            'dropped_count': len(dropped),
+            'dropped_tokens': sum(section_tokens[index] for index in dropped),
+            'dropped_sections': [
+                {
+                    'index': index,
+                    'heading': sections[index].strip().split('\n', 1)[0][:80],
+                    'tokens': section_tokens[index],
+                    'score': scored[index][0]
+                }
+                for index in dropped[:MAX_LISTED_SECTIONS]
+            ],
+            'matched_keywords': sorted({keyword for index in kept for keyword in scored[index][1]}),
+            'focus_terms': terms
+        }
+
+        logger.info(
+            f"Reduced bill text from {original_tokens} to {metadata['reduced_tokens']} tokens "
+            f"(kept {len(kept)} of {len(sections)} sections)"
+        )
+        return reduced, metadata
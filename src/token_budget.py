@@ -0,0 +1,201 @@
+"""
+Token Budgets for Batched LLM Requests
+
+Local token estimates and per-model context limits, used to pack items
+into batched requests by size instead of by a fixed count (see
+AIFilterPass.plan_batches):
+
+- TokenEstimator counts tokens with tiktoken when it is installed
+  (pip install tiktoken), otherwise estimates them from the text length
+- model_limits() looks up a model's context window and maximum completion
+  size from the provider name ("portkey/gpt-4o-mini", "ollama/llama3.1", ...);
+  limits that are neither configured nor known for the model are None
+- TokenBudgetBatcher splits items into consecutive batches that fit an
+  input token budget, and sizes max_tokens from the number of items
+"""
+
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for English prose, used where tokens are
+# estimated without a tokenizer (here and for rate limiter token bucket draws)
+CHARS_PER_TOKEN = 4
+
+# (model name prefix, context window, max completion tokens); the longest
+# matching prefix wins
+MODEL_LIMITS = [
+    ('gpt-4.1', 1047576, 32768),
+    ('gpt-4o', 128000, 16384),
+    ('gpt-4-turbo', 128000, 4096),
+    ('gpt-4', 8192, 8192),
+    ('gpt-3.5-turbo', 16385, 4096),
+    ('o1', 200000, 100000),
+    ('o3', 200000, 100000),
+    ('o4-mini', 200000, 100000),
+    ('claude', 200000, 8192),
+    ('llama3.1', 131072, 8192),
+    ('llama3.2', 131072, 8192),
+    ('llama3', 8192, 8192),
+    ('mistral', 32768, 8192),
+    ('qwen2.5', 32768, 8192),
+]
+
+# Tokens kept free in the context window for message framing and estimate error
+CONTEXT_SAFETY_MARGIN = 256
+
+# Completion tokens reserved per request for the response wrapper
+RESPONSE_OVERHEAD_TOKENS = 50
+
+
+def model_limits(
+    provider_name: str,
+    context_window: Optional[int] = None,
+    max_output_tokens: Optional[int] = None
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Get the context window and maximum completion size of a model
+
+    Args:
+        provider_name: LLMProvider.get_provider_name() value, or a bare model name
+        context_window: Configured override
+        max_output_tokens: Configured override
+
+    Returns:
+        (context window, max completion tokens); either is None when it is
+        neither configured nor known for the model (e.g. an Azure deployment name)
+    """
+    model = provider_name.split('/')[-1].lower()
+    matches = [limits for limits in MODEL_LIMITS if model.startswith(limits[0])]
+    if matches:
+        _, known_context, known_output = max(matches, key=lambda limits: len(limits[0]))
+    else:
+        known_context, known_output = None, None
+
+    context_window = context_window or known_context
+    max_output_tokens = max_output_tokens or known_output
+    if context_window and max_output_tokens:
+        max_output_tokens = min(max_output_tokens, context_window)
+    return context_window, max_output_tokens
+
+
+def is_known_model(provider_name: str) -> bool:
+    """Whether model_limits knows the model's limits from its name"""
+    model = provider_name.split('/')[-1].lower()
+    return any(model.startswith(limits[0]) for limits in MODEL_LIMITS)
+
+
+class TokenEstimator:
+    """Token counts from tiktoken when installed, otherwise a characters-per-token estimate"""
+
+    def __init__(self, model: Optional[str] = None):
+        """
+        Args:
+            model: Model name used to pick the tiktoken encoding (default: o200k_base)
+        """
+        self._encoding = None
+        try:
+            import tiktoken
+        except ImportError:
+            return
+
+        try:
+            self._encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding('o200k_base')
+        except KeyError:
+            self._encoding = tiktoken.get_encoding('o200k_base')
+
+    @property
+    def exact(self) -> bool:
+        """True when counts come from a tokenizer rather than the length estimate"""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text"""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // CHARS_PER_TOKEN + 1
+
+
+class TokenBudgetBatcher:
+    """
+    Packs items into consecutive batches that fit a model's limits
+
+    A batch is closed when adding the next item would exceed the input token
+    budget, the item cap, or the context window (prompt + items + the
+    completion reserved for their results; not checked when the window is
+    unknown). An item too large for any batch is sent on its own.
+    """
+
+    def __init__(
+        self,
+        context_window: Optional[int],
+        max_output_tokens: int,
+        prompt_tokens: int,
+        input_budget: int,
+        tokens_per_result: int,
+        response_overhead: int = RESPONSE_OVERHEAD_TOKENS,
+        max_items: Optional[int] = None
+    ):
+        """
+        Args:
+            context_window: Model context window in tokens (None = unknown, not checked)
+            max_output_tokens: Largest completion the model can return
+            prompt_tokens: Tokens of the fixed part of every request (system prompt)
+            input_budget: Target tokens of items per request
+            tokens_per_result: Completion tokens reserved per item
+            response_overhead: Completion tokens reserved per request (JSON wrapper)
+            max_items: Upper bound on items per batch (None = no bound)
+        """
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.prompt_tokens = prompt_tokens
+        self.input_budget = input_budget
+        self.tokens_per_result = tokens_per_result
+        self.response_overhead = response_overhead
+
+        # As many results as fit in one completion
+        output_cap = max(1, (max_output_tokens - response_overhead) // tokens_per_result)
+        self.max_items = min(max_items, output_cap) if max_items else output_cap
+
+    def max_tokens_for(self, item_count: int) -> int:
+        """Completion budget for a batch of item_count items"""
+        return min(self.max_output_tokens, self.response_overhead + item_count * self.tokens_per_result)
+
+    def fits(self, item_count: int, input_tokens: int) -> bool:
+        """Whether a batch of this size fits the budget, item cap and context window"""
+        if item_count > self.max_items or input_tokens > self.input_budget:
+            return False
+        if self.context_window is None:
+            return True
+        total = self.prompt_tokens + input_tokens + self.max_tokens_for(item_count) + CONTEXT_SAFETY_MARGIN
+        return total <= self.context_window
+
+    def plan(self, item_tokens: Sequence[int]) -> List[Tuple[int, int]]:
+        """
+        Split items into batches
+
+        Args:
+            item_tokens: Token count of each item, in order
+
+        Returns:
+            (start, end) index ranges covering every item, in order
+        """
+        batches = []
+        start = 0
+        input_tokens = 0
+
+        for index, tokens in enumerate(item_tokens):
+            if index > start and not self.fits(index - start + 1, input_tokens + tokens):
+                batches.append((start, index))
+                start = index
+                input_tokens = 0
+            input_tokens += tokens
+
+            if index == start and not self.fits(1, tokens):
+                logger.warning(f"Item {index} ({tokens} tokens) exceeds the batch token budget, sending it alone")
+
+        if start < len(item_tokens):
+            batches.append((start, len(item_tokens)))
+
+        return batches